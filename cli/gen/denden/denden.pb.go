@@ -118,6 +118,107 @@ func (ResponseStatus) EnumDescriptor() ([]byte, []int) {
 	return file_denden_proto_rawDescGZIP(), []int{1}
 }
 
+type JobState int32
+
+const (
+	JobState_PENDING   JobState = 0
+	JobState_RUNNING   JobState = 1
+	JobState_DONE      JobState = 2
+	JobState_NOT_FOUND JobState = 3 // unknown, expired, or already collected
+)
+
+// Enum value maps for JobState.
+var (
+	JobState_name = map[int32]string{
+		0: "PENDING",
+		1: "RUNNING",
+		2: "DONE",
+		3: "NOT_FOUND",
+	}
+	JobState_value = map[string]int32{
+		"PENDING":   0,
+		"RUNNING":   1,
+		"DONE":      2,
+		"NOT_FOUND": 3,
+	}
+)
+
+func (x JobState) Enum() *JobState {
+	p := new(JobState)
+	*p = x
+	return p
+}
+
+func (x JobState) String() string {
+	return protoimpl.X.EnumStringOf(x.Descriptor(), protoreflect.EnumNumber(x))
+}
+
+func (JobState) Descriptor() protoreflect.EnumDescriptor {
+	return file_denden_proto_enumTypes[2].Descriptor()
+}
+
+func (JobState) Type() protoreflect.EnumType {
+	return &file_denden_proto_enumTypes[2]
+}
+
+func (x JobState) Number() protoreflect.EnumNumber {
+	return protoreflect.EnumNumber(x)
+}
+
+// Deprecated: Use JobState.Descriptor instead.
+func (JobState) EnumDescriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{2}
+}
+
+type TraceQueryKind int32
+
+const (
+	TraceQueryKind_SUBTREE          TraceQueryKind = 0 // the node and all its descendants, pre-order
+	TraceQueryKind_CRITICAL_PATH    TraceQueryKind = 1 // node to leaf, following the last child to finish
+	TraceQueryKind_SLOWEST_BRANCHES TraceQueryKind = 2 // child subtrees of the node, longest first
+)
+
+// Enum value maps for TraceQueryKind.
+var (
+	TraceQueryKind_name = map[int32]string{
+		0: "SUBTREE",
+		1: "CRITICAL_PATH",
+		2: "SLOWEST_BRANCHES",
+	}
+	TraceQueryKind_value = map[string]int32{
+		"SUBTREE":          0,
+		"CRITICAL_PATH":    1,
+		"SLOWEST_BRANCHES": 2,
+	}
+)
+
+func (x TraceQueryKind) Enum() *TraceQueryKind {
+	p := new(TraceQueryKind)
+	*p = x
+	return p
+}
+
+func (x TraceQueryKind) String() string {
+	return protoimpl.X.EnumStringOf(x.Descriptor(), protoreflect.EnumNumber(x))
+}
+
+func (TraceQueryKind) Descriptor() protoreflect.EnumDescriptor {
+	return file_denden_proto_enumTypes[3].Descriptor()
+}
+
+func (TraceQueryKind) Type() protoreflect.EnumType {
+	return &file_denden_proto_enumTypes[3]
+}
+
+func (x TraceQueryKind) Number() protoreflect.EnumNumber {
+	return protoreflect.EnumNumber(x)
+}
+
+// Deprecated: Use TraceQueryKind.Descriptor instead.
+func (TraceQueryKind) EnumDescriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{3}
+}
+
 type DenDenRequest struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	DendenVersion string                 `protobuf:"bytes,1,opt,name=denden_version,json=dendenVersion,proto3" json:"denden_version,omitempty"`
@@ -128,6 +229,7 @@ type DenDenRequest struct {
 	//	*DenDenRequest_AskUser
 	//	*DenDenRequest_Delegate
 	//	*DenDenRequest_Remember
+	//	*DenDenRequest_Recall
 	Payload       isDenDenRequest_Payload `protobuf_oneof:"payload"`
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
@@ -218,6 +320,15 @@ func (x *DenDenRequest) GetRemember() *RememberPayload {
 	return nil
 }
 
+func (x *DenDenRequest) GetRecall() *RecallPayload {
+	if x != nil {
+		if x, ok := x.Payload.(*DenDenRequest_Recall); ok {
+			return x.Recall
+		}
+	}
+	return nil
+}
+
 type isDenDenRequest_Payload interface {
 	isDenDenRequest_Payload()
 }
@@ -234,12 +345,18 @@ type DenDenRequest_Remember struct {
 	Remember *RememberPayload `protobuf:"bytes,12,opt,name=remember,proto3,oneof"`
 }
 
+type DenDenRequest_Recall struct {
+	Recall *RecallPayload `protobuf:"bytes,13,opt,name=recall,proto3,oneof"`
+}
+
 func (*DenDenRequest_AskUser) isDenDenRequest_Payload() {}
 
 func (*DenDenRequest_Delegate) isDenDenRequest_Payload() {}
 
 func (*DenDenRequest_Remember) isDenDenRequest_Payload() {}
 
+func (*DenDenRequest_Recall) isDenDenRequest_Payload() {}
+
 type Trace struct {
 	state                 protoimpl.MessageState `protogen:"open.v1"`
 	RunId                 string                 `protobuf:"bytes,1,opt,name=run_id,json=runId,proto3" json:"run_id,omitempty"`
@@ -442,6 +559,7 @@ type Task struct {
 	ArtifactRefs  []string               `protobuf:"bytes,2,rep,name=artifact_refs,json=artifactRefs,proto3" json:"artifact_refs,omitempty"`
 	Extra         *structpb.Struct       `protobuf:"bytes,3,opt,name=extra,proto3" json:"extra,omitempty"`
 	ReturnFormat  Format                 `protobuf:"varint,4,opt,name=return_format,json=returnFormat,proto3,enum=denden.Format" json:"return_format,omitempty"`
+	ExtraEncoded  *EncodedValue          `protobuf:"bytes,5,opt,name=extra_encoded,json=extraEncoded,proto3" json:"extra_encoded,omitempty"` // extra as JSON/msgpack bytes, skipping Struct
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
@@ -504,6 +622,13 @@ func (x *Task) GetReturnFormat() Format {
 	return Format_TEXT
 }
 
+func (x *Task) GetExtraEncoded() *EncodedValue {
+	if x != nil {
+		return x.ExtraEncoded
+	}
+	return nil
+}
+
 type RememberPayload struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Content       string                 `protobuf:"bytes,1,opt,name=content,proto3" json:"content,omitempty"`
@@ -564,6 +689,74 @@ func (x *RememberPayload) GetScope() string {
 	return ""
 }
 
+type RecallPayload struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Query         string                 `protobuf:"bytes,1,opt,name=query,proto3" json:"query,omitempty"`            // free text, ranked by relevance
+	Keywords      []string               `protobuf:"bytes,2,rep,name=keywords,proto3" json:"keywords,omitempty"`      // only entries tagged with all of these
+	Scopes        []string               `protobuf:"bytes,3,rep,name=scopes,proto3" json:"scopes,omitempty"`          // empty = every scope
+	TopK          int32                  `protobuf:"varint,4,opt,name=top_k,json=topK,proto3" json:"top_k,omitempty"` // 0 = 10
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *RecallPayload) Reset() {
+	*x = RecallPayload{}
+	mi := &file_denden_proto_msgTypes[6]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *RecallPayload) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*RecallPayload) ProtoMessage() {}
+
+func (x *RecallPayload) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[6]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use RecallPayload.ProtoReflect.Descriptor instead.
+func (*RecallPayload) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{6}
+}
+
+func (x *RecallPayload) GetQuery() string {
+	if x != nil {
+		return x.Query
+	}
+	return ""
+}
+
+func (x *RecallPayload) GetKeywords() []string {
+	if x != nil {
+		return x.Keywords
+	}
+	return nil
+}
+
+func (x *RecallPayload) GetScopes() []string {
+	if x != nil {
+		return x.Scopes
+	}
+	return nil
+}
+
+func (x *RecallPayload) GetTopK() int32 {
+	if x != nil {
+		return x.TopK
+	}
+	return 0
+}
+
 type DenDenResponse struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	DendenVersion string                 `protobuf:"bytes,1,opt,name=denden_version,json=dendenVersion,proto3" json:"denden_version,omitempty"`
@@ -575,6 +768,7 @@ type DenDenResponse struct {
 	//	*DenDenResponse_AskUserResult
 	//	*DenDenResponse_DelegateResult
 	//	*DenDenResponse_RememberResult
+	//	*DenDenResponse_RecallResult
 	Result        isDenDenResponse_Result `protobuf_oneof:"result"`
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
@@ -582,7 +776,7 @@ type DenDenResponse struct {
 
 func (x *DenDenResponse) Reset() {
 	*x = DenDenResponse{}
-	mi := &file_denden_proto_msgTypes[6]
+	mi := &file_denden_proto_msgTypes[7]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -594,7 +788,7 @@ func (x *DenDenResponse) String() string {
 func (*DenDenResponse) ProtoMessage() {}
 
 func (x *DenDenResponse) ProtoReflect() protoreflect.Message {
-	mi := &file_denden_proto_msgTypes[6]
+	mi := &file_denden_proto_msgTypes[7]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -607,7 +801,7 @@ func (x *DenDenResponse) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use DenDenResponse.ProtoReflect.Descriptor instead.
 func (*DenDenResponse) Descriptor() ([]byte, []int) {
-	return file_denden_proto_rawDescGZIP(), []int{6}
+	return file_denden_proto_rawDescGZIP(), []int{7}
 }
 
 func (x *DenDenResponse) GetDendenVersion() string {
@@ -672,6 +866,15 @@ func (x *DenDenResponse) GetRememberResult() *RememberResult {
 	return nil
 }
 
+func (x *DenDenResponse) GetRecallResult() *RecallResult {
+	if x != nil {
+		if x, ok := x.Result.(*DenDenResponse_RecallResult); ok {
+			return x.RecallResult
+		}
+	}
+	return nil
+}
+
 type isDenDenResponse_Result interface {
 	isDenDenResponse_Result()
 }
@@ -688,24 +891,31 @@ type DenDenResponse_RememberResult struct {
 	RememberResult *RememberResult `protobuf:"bytes,12,opt,name=remember_result,json=rememberResult,proto3,oneof"`
 }
 
+type DenDenResponse_RecallResult struct {
+	RecallResult *RecallResult `protobuf:"bytes,13,opt,name=recall_result,json=recallResult,proto3,oneof"`
+}
+
 func (*DenDenResponse_AskUserResult) isDenDenResponse_Result() {}
 
 func (*DenDenResponse_DelegateResult) isDenDenResponse_Result() {}
 
 func (*DenDenResponse_RememberResult) isDenDenResponse_Result() {}
 
+func (*DenDenResponse_RecallResult) isDenDenResponse_Result() {}
+
 type ErrorDetail struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Code          string                 `protobuf:"bytes,1,opt,name=code,proto3" json:"code,omitempty"`
 	Message       string                 `protobuf:"bytes,2,opt,name=message,proto3" json:"message,omitempty"`
 	Retryable     bool                   `protobuf:"varint,3,opt,name=retryable,proto3" json:"retryable,omitempty"`
+	RetryAfterMs  int64                  `protobuf:"varint,4,opt,name=retry_after_ms,json=retryAfterMs,proto3" json:"retry_after_ms,omitempty"` // with retryable: how long to back off first (0 = no hint)
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
 
 func (x *ErrorDetail) Reset() {
 	*x = ErrorDetail{}
-	mi := &file_denden_proto_msgTypes[7]
+	mi := &file_denden_proto_msgTypes[8]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -717,7 +927,7 @@ func (x *ErrorDetail) String() string {
 func (*ErrorDetail) ProtoMessage() {}
 
 func (x *ErrorDetail) ProtoReflect() protoreflect.Message {
-	mi := &file_denden_proto_msgTypes[7]
+	mi := &file_denden_proto_msgTypes[8]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -730,7 +940,7 @@ func (x *ErrorDetail) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use ErrorDetail.ProtoReflect.Descriptor instead.
 func (*ErrorDetail) Descriptor() ([]byte, []int) {
-	return file_denden_proto_rawDescGZIP(), []int{7}
+	return file_denden_proto_rawDescGZIP(), []int{8}
 }
 
 func (x *ErrorDetail) GetCode() string {
@@ -754,6 +964,13 @@ func (x *ErrorDetail) GetRetryable() bool {
 	return false
 }
 
+func (x *ErrorDetail) GetRetryAfterMs() int64 {
+	if x != nil {
+		return x.RetryAfterMs
+	}
+	return 0
+}
+
 type AskUserResult struct {
 	state protoimpl.MessageState `protogen:"open.v1"`
 	// Types that are valid to be assigned to Content:
@@ -767,7 +984,7 @@ type AskUserResult struct {
 
 func (x *AskUserResult) Reset() {
 	*x = AskUserResult{}
-	mi := &file_denden_proto_msgTypes[8]
+	mi := &file_denden_proto_msgTypes[9]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -779,7 +996,7 @@ func (x *AskUserResult) String() string {
 func (*AskUserResult) ProtoMessage() {}
 
 func (x *AskUserResult) ProtoReflect() protoreflect.Message {
-	mi := &file_denden_proto_msgTypes[8]
+	mi := &file_denden_proto_msgTypes[9]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -792,7 +1009,7 @@ func (x *AskUserResult) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use AskUserResult.ProtoReflect.Descriptor instead.
 func (*AskUserResult) Descriptor() ([]byte, []int) {
-	return file_denden_proto_rawDescGZIP(), []int{8}
+	return file_denden_proto_rawDescGZIP(), []int{9}
 }
 
 func (x *AskUserResult) GetContent() isAskUserResult_Content {
@@ -841,13 +1058,15 @@ type DelegateResult struct {
 	OutputFormat  Format                 `protobuf:"varint,1,opt,name=output_format,json=outputFormat,proto3,enum=denden.Format" json:"output_format,omitempty"`
 	Output        *structpb.Struct       `protobuf:"bytes,2,opt,name=output,proto3" json:"output,omitempty"`
 	Summary       string                 `protobuf:"bytes,3,opt,name=summary,proto3" json:"summary,omitempty"`
+	ArtifactRefs  []string               `protobuf:"bytes,4,rep,name=artifact_refs,json=artifactRefs,proto3" json:"artifact_refs,omitempty"`    // outputs stored with PutArtifact
+	OutputEncoded *EncodedValue          `protobuf:"bytes,5,opt,name=output_encoded,json=outputEncoded,proto3" json:"output_encoded,omitempty"` // output as JSON/msgpack bytes, skipping Struct
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
 
 func (x *DelegateResult) Reset() {
 	*x = DelegateResult{}
-	mi := &file_denden_proto_msgTypes[9]
+	mi := &file_denden_proto_msgTypes[10]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -859,7 +1078,7 @@ func (x *DelegateResult) String() string {
 func (*DelegateResult) ProtoMessage() {}
 
 func (x *DelegateResult) ProtoReflect() protoreflect.Message {
-	mi := &file_denden_proto_msgTypes[9]
+	mi := &file_denden_proto_msgTypes[10]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -872,7 +1091,7 @@ func (x *DelegateResult) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use DelegateResult.ProtoReflect.Descriptor instead.
 func (*DelegateResult) Descriptor() ([]byte, []int) {
-	return file_denden_proto_rawDescGZIP(), []int{9}
+	return file_denden_proto_rawDescGZIP(), []int{10}
 }
 
 func (x *DelegateResult) GetOutputFormat() Format {
@@ -896,6 +1115,75 @@ func (x *DelegateResult) GetSummary() string {
 	return ""
 }
 
+func (x *DelegateResult) GetArtifactRefs() []string {
+	if x != nil {
+		return x.ArtifactRefs
+	}
+	return nil
+}
+
+func (x *DelegateResult) GetOutputEncoded() *EncodedValue {
+	if x != nil {
+		return x.OutputEncoded
+	}
+	return nil
+}
+
+// A value encoded by the sender, carried as opaque bytes. Unlike
+// google.protobuf.Struct it costs nothing to pass along, keeps integers
+// exact and is decoded only by whoever reads it.
+type EncodedValue struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	ContentType   string                 `protobuf:"bytes,1,opt,name=content_type,json=contentType,proto3" json:"content_type,omitempty"` // "application/json" (also when empty) or "application/msgpack"
+	Data          []byte                 `protobuf:"bytes,2,opt,name=data,proto3" json:"data,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *EncodedValue) Reset() {
+	*x = EncodedValue{}
+	mi := &file_denden_proto_msgTypes[11]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *EncodedValue) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*EncodedValue) ProtoMessage() {}
+
+func (x *EncodedValue) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[11]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use EncodedValue.ProtoReflect.Descriptor instead.
+func (*EncodedValue) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{11}
+}
+
+func (x *EncodedValue) GetContentType() string {
+	if x != nil {
+		return x.ContentType
+	}
+	return ""
+}
+
+func (x *EncodedValue) GetData() []byte {
+	if x != nil {
+		return x.Data
+	}
+	return nil
+}
+
 type RememberResult struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Status        string                 `protobuf:"bytes,1,opt,name=status,proto3" json:"status,omitempty"` // "accepted" | "duplicate" | "queued"
@@ -906,7 +1194,7 @@ type RememberResult struct {
 
 func (x *RememberResult) Reset() {
 	*x = RememberResult{}
-	mi := &file_denden_proto_msgTypes[10]
+	mi := &file_denden_proto_msgTypes[12]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -918,7 +1206,7 @@ func (x *RememberResult) String() string {
 func (*RememberResult) ProtoMessage() {}
 
 func (x *RememberResult) ProtoReflect() protoreflect.Message {
-	mi := &file_denden_proto_msgTypes[10]
+	mi := &file_denden_proto_msgTypes[12]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -931,7 +1219,7 @@ func (x *RememberResult) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use RememberResult.ProtoReflect.Descriptor instead.
 func (*RememberResult) Descriptor() ([]byte, []int) {
-	return file_denden_proto_rawDescGZIP(), []int{10}
+	return file_denden_proto_rawDescGZIP(), []int{12}
 }
 
 func (x *RememberResult) GetStatus() string {
@@ -948,27 +1236,28 @@ func (x *RememberResult) GetEntryId() string {
 	return ""
 }
 
-type StatusRequest struct {
+type RecallResult struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
+	Entries       []*RecalledEntry       `protobuf:"bytes,1,rep,name=entries,proto3" json:"entries,omitempty"` // best match first
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
 
-func (x *StatusRequest) Reset() {
-	*x = StatusRequest{}
-	mi := &file_denden_proto_msgTypes[11]
+func (x *RecallResult) Reset() {
+	*x = RecallResult{}
+	mi := &file_denden_proto_msgTypes[13]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
 
-func (x *StatusRequest) String() string {
+func (x *RecallResult) String() string {
 	return protoimpl.X.MessageStringOf(x)
 }
 
-func (*StatusRequest) ProtoMessage() {}
+func (*RecallResult) ProtoMessage() {}
 
-func (x *StatusRequest) ProtoReflect() protoreflect.Message {
-	mi := &file_denden_proto_msgTypes[11]
+func (x *RecallResult) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[13]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -979,34 +1268,44 @@ func (x *StatusRequest) ProtoReflect() protoreflect.Message {
 	return mi.MessageOf(x)
 }
 
-// Deprecated: Use StatusRequest.ProtoReflect.Descriptor instead.
-func (*StatusRequest) Descriptor() ([]byte, []int) {
-	return file_denden_proto_rawDescGZIP(), []int{11}
+// Deprecated: Use RecallResult.ProtoReflect.Descriptor instead.
+func (*RecallResult) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{13}
 }
 
-type StatusResponse struct {
+func (x *RecallResult) GetEntries() []*RecalledEntry {
+	if x != nil {
+		return x.Entries
+	}
+	return nil
+}
+
+type RecalledEntry struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
-	UptimeSeconds int64                  `protobuf:"varint,1,opt,name=uptime_seconds,json=uptimeSeconds,proto3" json:"uptime_seconds,omitempty"`
-	ActiveAgents  int32                  `protobuf:"varint,2,opt,name=active_agents,json=activeAgents,proto3" json:"active_agents,omitempty"`
+	EntryId       string                 `protobuf:"bytes,1,opt,name=entry_id,json=entryId,proto3" json:"entry_id,omitempty"`
+	Scope         string                 `protobuf:"bytes,2,opt,name=scope,proto3" json:"scope,omitempty"`
+	Content       string                 `protobuf:"bytes,3,opt,name=content,proto3" json:"content,omitempty"`
+	Keywords      []string               `protobuf:"bytes,4,rep,name=keywords,proto3" json:"keywords,omitempty"`
+	Score         float64                `protobuf:"fixed64,5,opt,name=score,proto3" json:"score,omitempty"`
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
 
-func (x *StatusResponse) Reset() {
-	*x = StatusResponse{}
-	mi := &file_denden_proto_msgTypes[12]
+func (x *RecalledEntry) Reset() {
+	*x = RecalledEntry{}
+	mi := &file_denden_proto_msgTypes[14]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
 
-func (x *StatusResponse) String() string {
+func (x *RecalledEntry) String() string {
 	return protoimpl.X.MessageStringOf(x)
 }
 
-func (*StatusResponse) ProtoMessage() {}
+func (*RecalledEntry) ProtoMessage() {}
 
-func (x *StatusResponse) ProtoReflect() protoreflect.Message {
-	mi := &file_denden_proto_msgTypes[12]
+func (x *RecalledEntry) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[14]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -1017,39 +1316,1507 @@ func (x *StatusResponse) ProtoReflect() protoreflect.Message {
 	return mi.MessageOf(x)
 }
 
-// Deprecated: Use StatusResponse.ProtoReflect.Descriptor instead.
-func (*StatusResponse) Descriptor() ([]byte, []int) {
-	return file_denden_proto_rawDescGZIP(), []int{12}
+// Deprecated: Use RecalledEntry.ProtoReflect.Descriptor instead.
+func (*RecalledEntry) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{14}
 }
 
-func (x *StatusResponse) GetUptimeSeconds() int64 {
+func (x *RecalledEntry) GetEntryId() string {
 	if x != nil {
-		return x.UptimeSeconds
+		return x.EntryId
 	}
-	return 0
+	return ""
 }
 
-func (x *StatusResponse) GetActiveAgents() int32 {
+func (x *RecalledEntry) GetScope() string {
 	if x != nil {
-		return x.ActiveAgents
+		return x.Scope
 	}
-	return 0
+	return ""
 }
 
-var File_denden_proto protoreflect.FileDescriptor
+func (x *RecalledEntry) GetContent() string {
+	if x != nil {
+		return x.Content
+	}
+	return ""
+}
 
-const file_denden_proto_rawDesc = "" +
-	"\n" +
-	"\fdenden.proto\x12\x06denden\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto\"\xa8\x02\n" +
-	"\rDenDenRequest\x12%\n" +
-	"\x0edenden_version\x18\x01 \x01(\tR\rdendenVersion\x12\x1d\n" +
-	"\n" +
+func (x *RecalledEntry) GetKeywords() []string {
+	if x != nil {
+		return x.Keywords
+	}
+	return nil
+}
+
+func (x *RecalledEntry) GetScore() float64 {
+	if x != nil {
+		return x.Score
+	}
+	return 0
+}
+
+type StreamEvent struct {
+	state     protoimpl.MessageState `protogen:"open.v1"`
+	RequestId string                 `protobuf:"bytes,1,opt,name=request_id,json=requestId,proto3" json:"request_id,omitempty"`
+	Seq       int64                  `protobuf:"varint,2,opt,name=seq,proto3" json:"seq,omitempty"` // 1-based position in the stream
+	// Types that are valid to be assigned to Event:
+	//
+	//	*StreamEvent_Progress
+	//	*StreamEvent_Partial
+	//	*StreamEvent_Response
+	Event         isStreamEvent_Event `protobuf_oneof:"event"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *StreamEvent) Reset() {
+	*x = StreamEvent{}
+	mi := &file_denden_proto_msgTypes[15]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *StreamEvent) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*StreamEvent) ProtoMessage() {}
+
+func (x *StreamEvent) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[15]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use StreamEvent.ProtoReflect.Descriptor instead.
+func (*StreamEvent) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{15}
+}
+
+func (x *StreamEvent) GetRequestId() string {
+	if x != nil {
+		return x.RequestId
+	}
+	return ""
+}
+
+func (x *StreamEvent) GetSeq() int64 {
+	if x != nil {
+		return x.Seq
+	}
+	return 0
+}
+
+func (x *StreamEvent) GetEvent() isStreamEvent_Event {
+	if x != nil {
+		return x.Event
+	}
+	return nil
+}
+
+func (x *StreamEvent) GetProgress() *Progress {
+	if x != nil {
+		if x, ok := x.Event.(*StreamEvent_Progress); ok {
+			return x.Progress
+		}
+	}
+	return nil
+}
+
+func (x *StreamEvent) GetPartial() *structpb.Struct {
+	if x != nil {
+		if x, ok := x.Event.(*StreamEvent_Partial); ok {
+			return x.Partial
+		}
+	}
+	return nil
+}
+
+func (x *StreamEvent) GetResponse() *DenDenResponse {
+	if x != nil {
+		if x, ok := x.Event.(*StreamEvent_Response); ok {
+			return x.Response
+		}
+	}
+	return nil
+}
+
+type isStreamEvent_Event interface {
+	isStreamEvent_Event()
+}
+
+type StreamEvent_Progress struct {
+	Progress *Progress `protobuf:"bytes,10,opt,name=progress,proto3,oneof"`
+}
+
+type StreamEvent_Partial struct {
+	Partial *structpb.Struct `protobuf:"bytes,11,opt,name=partial,proto3,oneof"` // a chunk of early output
+}
+
+type StreamEvent_Response struct {
+	Response *DenDenResponse `protobuf:"bytes,12,opt,name=response,proto3,oneof"` // final event
+}
+
+func (*StreamEvent_Progress) isStreamEvent_Event() {}
+
+func (*StreamEvent_Partial) isStreamEvent_Event() {}
+
+func (*StreamEvent_Response) isStreamEvent_Event() {}
+
+type Progress struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Message       string                 `protobuf:"bytes,1,opt,name=message,proto3" json:"message,omitempty"`
+	Fraction      float64                `protobuf:"fixed64,2,opt,name=fraction,proto3" json:"fraction,omitempty"` // 0..1, or 0 when unknown
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *Progress) Reset() {
+	*x = Progress{}
+	mi := &file_denden_proto_msgTypes[16]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *Progress) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*Progress) ProtoMessage() {}
+
+func (x *Progress) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[16]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use Progress.ProtoReflect.Descriptor instead.
+func (*Progress) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{16}
+}
+
+func (x *Progress) GetMessage() string {
+	if x != nil {
+		return x.Message
+	}
+	return ""
+}
+
+func (x *Progress) GetFraction() float64 {
+	if x != nil {
+		return x.Fraction
+	}
+	return 0
+}
+
+type BatchRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Requests      []*DenDenRequest       `protobuf:"bytes,1,rep,name=requests,proto3" json:"requests,omitempty"`
+	MaxParallel   int32                  `protobuf:"varint,2,opt,name=max_parallel,json=maxParallel,proto3" json:"max_parallel,omitempty"` // 0 = server default; capped by the server limit
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *BatchRequest) Reset() {
+	*x = BatchRequest{}
+	mi := &file_denden_proto_msgTypes[17]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *BatchRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*BatchRequest) ProtoMessage() {}
+
+func (x *BatchRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[17]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use BatchRequest.ProtoReflect.Descriptor instead.
+func (*BatchRequest) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{17}
+}
+
+func (x *BatchRequest) GetRequests() []*DenDenRequest {
+	if x != nil {
+		return x.Requests
+	}
+	return nil
+}
+
+func (x *BatchRequest) GetMaxParallel() int32 {
+	if x != nil {
+		return x.MaxParallel
+	}
+	return 0
+}
+
+type BatchResponse struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Responses     []*DenDenResponse      `protobuf:"bytes,1,rep,name=responses,proto3" json:"responses,omitempty"` // same order as BatchRequest.requests
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *BatchResponse) Reset() {
+	*x = BatchResponse{}
+	mi := &file_denden_proto_msgTypes[18]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *BatchResponse) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*BatchResponse) ProtoMessage() {}
+
+func (x *BatchResponse) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[18]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use BatchResponse.ProtoReflect.Descriptor instead.
+func (*BatchResponse) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{18}
+}
+
+func (x *BatchResponse) GetResponses() []*DenDenResponse {
+	if x != nil {
+		return x.Responses
+	}
+	return nil
+}
+
+type BatchItem struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Index         int32                  `protobuf:"varint,1,opt,name=index,proto3" json:"index,omitempty"` // position in BatchRequest.requests
+	Response      *DenDenResponse        `protobuf:"bytes,2,opt,name=response,proto3" json:"response,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *BatchItem) Reset() {
+	*x = BatchItem{}
+	mi := &file_denden_proto_msgTypes[19]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *BatchItem) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*BatchItem) ProtoMessage() {}
+
+func (x *BatchItem) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[19]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use BatchItem.ProtoReflect.Descriptor instead.
+func (*BatchItem) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{19}
+}
+
+func (x *BatchItem) GetIndex() int32 {
+	if x != nil {
+		return x.Index
+	}
+	return 0
+}
+
+func (x *BatchItem) GetResponse() *DenDenResponse {
+	if x != nil {
+		return x.Response
+	}
+	return nil
+}
+
+type JobHandle struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	JobId         string                 `protobuf:"bytes,1,opt,name=job_id,json=jobId,proto3" json:"job_id,omitempty"`
+	RequestId     string                 `protobuf:"bytes,2,opt,name=request_id,json=requestId,proto3" json:"request_id,omitempty"`
+	State         JobState               `protobuf:"varint,3,opt,name=state,proto3,enum=denden.JobState" json:"state,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *JobHandle) Reset() {
+	*x = JobHandle{}
+	mi := &file_denden_proto_msgTypes[20]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *JobHandle) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*JobHandle) ProtoMessage() {}
+
+func (x *JobHandle) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[20]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use JobHandle.ProtoReflect.Descriptor instead.
+func (*JobHandle) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{20}
+}
+
+func (x *JobHandle) GetJobId() string {
+	if x != nil {
+		return x.JobId
+	}
+	return ""
+}
+
+func (x *JobHandle) GetRequestId() string {
+	if x != nil {
+		return x.RequestId
+	}
+	return ""
+}
+
+func (x *JobHandle) GetState() JobState {
+	if x != nil {
+		return x.State
+	}
+	return JobState_PENDING
+}
+
+type AwaitRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	JobId         string                 `protobuf:"bytes,1,opt,name=job_id,json=jobId,proto3" json:"job_id,omitempty"`
+	TimeoutMs     int64                  `protobuf:"varint,2,opt,name=timeout_ms,json=timeoutMs,proto3" json:"timeout_ms,omitempty"` // 0 = wait until done or the RPC deadline
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *AwaitRequest) Reset() {
+	*x = AwaitRequest{}
+	mi := &file_denden_proto_msgTypes[21]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *AwaitRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*AwaitRequest) ProtoMessage() {}
+
+func (x *AwaitRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[21]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use AwaitRequest.ProtoReflect.Descriptor instead.
+func (*AwaitRequest) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{21}
+}
+
+func (x *AwaitRequest) GetJobId() string {
+	if x != nil {
+		return x.JobId
+	}
+	return ""
+}
+
+func (x *AwaitRequest) GetTimeoutMs() int64 {
+	if x != nil {
+		return x.TimeoutMs
+	}
+	return 0
+}
+
+type PollRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	JobId         string                 `protobuf:"bytes,1,opt,name=job_id,json=jobId,proto3" json:"job_id,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *PollRequest) Reset() {
+	*x = PollRequest{}
+	mi := &file_denden_proto_msgTypes[22]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *PollRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*PollRequest) ProtoMessage() {}
+
+func (x *PollRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[22]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use PollRequest.ProtoReflect.Descriptor instead.
+func (*PollRequest) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{22}
+}
+
+func (x *PollRequest) GetJobId() string {
+	if x != nil {
+		return x.JobId
+	}
+	return ""
+}
+
+type JobStatus struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	JobId         string                 `protobuf:"bytes,1,opt,name=job_id,json=jobId,proto3" json:"job_id,omitempty"`
+	State         JobState               `protobuf:"varint,2,opt,name=state,proto3,enum=denden.JobState" json:"state,omitempty"`
+	Response      *DenDenResponse        `protobuf:"bytes,3,opt,name=response,proto3" json:"response,omitempty"` // set when state == DONE
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *JobStatus) Reset() {
+	*x = JobStatus{}
+	mi := &file_denden_proto_msgTypes[23]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *JobStatus) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*JobStatus) ProtoMessage() {}
+
+func (x *JobStatus) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[23]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use JobStatus.ProtoReflect.Descriptor instead.
+func (*JobStatus) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{23}
+}
+
+func (x *JobStatus) GetJobId() string {
+	if x != nil {
+		return x.JobId
+	}
+	return ""
+}
+
+func (x *JobStatus) GetState() JobState {
+	if x != nil {
+		return x.State
+	}
+	return JobState_PENDING
+}
+
+func (x *JobStatus) GetResponse() *DenDenResponse {
+	if x != nil {
+		return x.Response
+	}
+	return nil
+}
+
+type TraceQuery struct {
+	state           protoimpl.MessageState `protogen:"open.v1"`
+	RunId           string                 `protobuf:"bytes,1,opt,name=run_id,json=runId,proto3" json:"run_id,omitempty"`
+	AgentInstanceId string                 `protobuf:"bytes,2,opt,name=agent_instance_id,json=agentInstanceId,proto3" json:"agent_instance_id,omitempty"` // empty = the whole run
+	Kind            TraceQueryKind         `protobuf:"varint,3,opt,name=kind,proto3,enum=denden.TraceQueryKind" json:"kind,omitempty"`
+	Limit           int32                  `protobuf:"varint,4,opt,name=limit,proto3" json:"limit,omitempty"` // SLOWEST_BRANCHES only; 0 = 5
+	unknownFields   protoimpl.UnknownFields
+	sizeCache       protoimpl.SizeCache
+}
+
+func (x *TraceQuery) Reset() {
+	*x = TraceQuery{}
+	mi := &file_denden_proto_msgTypes[24]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *TraceQuery) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*TraceQuery) ProtoMessage() {}
+
+func (x *TraceQuery) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[24]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use TraceQuery.ProtoReflect.Descriptor instead.
+func (*TraceQuery) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{24}
+}
+
+func (x *TraceQuery) GetRunId() string {
+	if x != nil {
+		return x.RunId
+	}
+	return ""
+}
+
+func (x *TraceQuery) GetAgentInstanceId() string {
+	if x != nil {
+		return x.AgentInstanceId
+	}
+	return ""
+}
+
+func (x *TraceQuery) GetKind() TraceQueryKind {
+	if x != nil {
+		return x.Kind
+	}
+	return TraceQueryKind_SUBTREE
+}
+
+func (x *TraceQuery) GetLimit() int32 {
+	if x != nil {
+		return x.Limit
+	}
+	return 0
+}
+
+type TraceNode struct {
+	state                 protoimpl.MessageState `protogen:"open.v1"`
+	AgentInstanceId       string                 `protobuf:"bytes,1,opt,name=agent_instance_id,json=agentInstanceId,proto3" json:"agent_instance_id,omitempty"`
+	ParentAgentInstanceId string                 `protobuf:"bytes,2,opt,name=parent_agent_instance_id,json=parentAgentInstanceId,proto3" json:"parent_agent_instance_id,omitempty"`
+	Depth                 int32                  `protobuf:"varint,3,opt,name=depth,proto3" json:"depth,omitempty"` // relative to the queried node
+	StartedAt             *timestamppb.Timestamp `protobuf:"bytes,4,opt,name=started_at,json=startedAt,proto3" json:"started_at,omitempty"`
+	EndedAt               *timestamppb.Timestamp `protobuf:"bytes,5,opt,name=ended_at,json=endedAt,proto3" json:"ended_at,omitempty"`                                  // unset while calls are in flight
+	DurationMs            int64                  `protobuf:"varint,6,opt,name=duration_ms,json=durationMs,proto3" json:"duration_ms,omitempty"`                        // this agent's first call to its last response
+	SubtreeDurationMs     int64                  `protobuf:"varint,7,opt,name=subtree_duration_ms,json=subtreeDurationMs,proto3" json:"subtree_duration_ms,omitempty"` // this agent's start to the last response in its subtree
+	Calls                 int32                  `protobuf:"varint,8,opt,name=calls,proto3" json:"calls,omitempty"`
+	InFlight              int32                  `protobuf:"varint,9,opt,name=in_flight,json=inFlight,proto3" json:"in_flight,omitempty"`
+	Ok                    int32                  `protobuf:"varint,10,opt,name=ok,proto3" json:"ok,omitempty"`
+	Denied                int32                  `protobuf:"varint,11,opt,name=denied,proto3" json:"denied,omitempty"`
+	Error                 int32                  `protobuf:"varint,12,opt,name=error,proto3" json:"error,omitempty"`
+	LastErrorCode         string                 `protobuf:"bytes,13,opt,name=last_error_code,json=lastErrorCode,proto3" json:"last_error_code,omitempty"`
+	unknownFields         protoimpl.UnknownFields
+	sizeCache             protoimpl.SizeCache
+}
+
+func (x *TraceNode) Reset() {
+	*x = TraceNode{}
+	mi := &file_denden_proto_msgTypes[25]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *TraceNode) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*TraceNode) ProtoMessage() {}
+
+func (x *TraceNode) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[25]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use TraceNode.ProtoReflect.Descriptor instead.
+func (*TraceNode) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{25}
+}
+
+func (x *TraceNode) GetAgentInstanceId() string {
+	if x != nil {
+		return x.AgentInstanceId
+	}
+	return ""
+}
+
+func (x *TraceNode) GetParentAgentInstanceId() string {
+	if x != nil {
+		return x.ParentAgentInstanceId
+	}
+	return ""
+}
+
+func (x *TraceNode) GetDepth() int32 {
+	if x != nil {
+		return x.Depth
+	}
+	return 0
+}
+
+func (x *TraceNode) GetStartedAt() *timestamppb.Timestamp {
+	if x != nil {
+		return x.StartedAt
+	}
+	return nil
+}
+
+func (x *TraceNode) GetEndedAt() *timestamppb.Timestamp {
+	if x != nil {
+		return x.EndedAt
+	}
+	return nil
+}
+
+func (x *TraceNode) GetDurationMs() int64 {
+	if x != nil {
+		return x.DurationMs
+	}
+	return 0
+}
+
+func (x *TraceNode) GetSubtreeDurationMs() int64 {
+	if x != nil {
+		return x.SubtreeDurationMs
+	}
+	return 0
+}
+
+func (x *TraceNode) GetCalls() int32 {
+	if x != nil {
+		return x.Calls
+	}
+	return 0
+}
+
+func (x *TraceNode) GetInFlight() int32 {
+	if x != nil {
+		return x.InFlight
+	}
+	return 0
+}
+
+func (x *TraceNode) GetOk() int32 {
+	if x != nil {
+		return x.Ok
+	}
+	return 0
+}
+
+func (x *TraceNode) GetDenied() int32 {
+	if x != nil {
+		return x.Denied
+	}
+	return 0
+}
+
+func (x *TraceNode) GetError() int32 {
+	if x != nil {
+		return x.Error
+	}
+	return 0
+}
+
+func (x *TraceNode) GetLastErrorCode() string {
+	if x != nil {
+		return x.LastErrorCode
+	}
+	return ""
+}
+
+type TraceResult struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	RunId         string                 `protobuf:"bytes,1,opt,name=run_id,json=runId,proto3" json:"run_id,omitempty"`
+	Found         bool                   `protobuf:"varint,2,opt,name=found,proto3" json:"found,omitempty"`
+	Nodes         []*TraceNode           `protobuf:"bytes,3,rep,name=nodes,proto3" json:"nodes,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *TraceResult) Reset() {
+	*x = TraceResult{}
+	mi := &file_denden_proto_msgTypes[26]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *TraceResult) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*TraceResult) ProtoMessage() {}
+
+func (x *TraceResult) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[26]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use TraceResult.ProtoReflect.Descriptor instead.
+func (*TraceResult) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{26}
+}
+
+func (x *TraceResult) GetRunId() string {
+	if x != nil {
+		return x.RunId
+	}
+	return ""
+}
+
+func (x *TraceResult) GetFound() bool {
+	if x != nil {
+		return x.Found
+	}
+	return false
+}
+
+func (x *TraceResult) GetNodes() []*TraceNode {
+	if x != nil {
+		return x.Nodes
+	}
+	return nil
+}
+
+type StatusRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Local         bool                   `protobuf:"varint,1,opt,name=local,proto3" json:"local,omitempty"` // only this process, not merged across --workers siblings
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *StatusRequest) Reset() {
+	*x = StatusRequest{}
+	mi := &file_denden_proto_msgTypes[27]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *StatusRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*StatusRequest) ProtoMessage() {}
+
+func (x *StatusRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[27]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use StatusRequest.ProtoReflect.Descriptor instead.
+func (*StatusRequest) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{27}
+}
+
+func (x *StatusRequest) GetLocal() bool {
+	if x != nil {
+		return x.Local
+	}
+	return false
+}
+
+type StatusResponse struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	UptimeSeconds int64                  `protobuf:"varint,1,opt,name=uptime_seconds,json=uptimeSeconds,proto3" json:"uptime_seconds,omitempty"`
+	ActiveAgents  int32                  `protobuf:"varint,2,opt,name=active_agents,json=activeAgents,proto3" json:"active_agents,omitempty"` // distinct agents seen recently
+	InFlight      int64                  `protobuf:"varint,3,opt,name=in_flight,json=inFlight,proto3" json:"in_flight,omitempty"`             // requests currently being handled
+	QueueDepth    int64                  `protobuf:"varint,4,opt,name=queue_depth,json=queueDepth,proto3" json:"queue_depth,omitempty"`       // work items waiting for an executor thread
+	Payloads      []*PayloadStats        `protobuf:"bytes,5,rep,name=payloads,proto3" json:"payloads,omitempty"`
+	Lanes         []*LaneStats           `protobuf:"bytes,6,rep,name=lanes,proto3" json:"lanes,omitempty"`      // configured priority lanes, by name
+	Workers       int32                  `protobuf:"varint,7,opt,name=workers,proto3" json:"workers,omitempty"` // server processes merged into this response
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *StatusResponse) Reset() {
+	*x = StatusResponse{}
+	mi := &file_denden_proto_msgTypes[28]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *StatusResponse) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*StatusResponse) ProtoMessage() {}
+
+func (x *StatusResponse) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[28]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use StatusResponse.ProtoReflect.Descriptor instead.
+func (*StatusResponse) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{28}
+}
+
+func (x *StatusResponse) GetUptimeSeconds() int64 {
+	if x != nil {
+		return x.UptimeSeconds
+	}
+	return 0
+}
+
+func (x *StatusResponse) GetActiveAgents() int32 {
+	if x != nil {
+		return x.ActiveAgents
+	}
+	return 0
+}
+
+func (x *StatusResponse) GetInFlight() int64 {
+	if x != nil {
+		return x.InFlight
+	}
+	return 0
+}
+
+func (x *StatusResponse) GetQueueDepth() int64 {
+	if x != nil {
+		return x.QueueDepth
+	}
+	return 0
+}
+
+func (x *StatusResponse) GetPayloads() []*PayloadStats {
+	if x != nil {
+		return x.Payloads
+	}
+	return nil
+}
+
+func (x *StatusResponse) GetLanes() []*LaneStats {
+	if x != nil {
+		return x.Lanes
+	}
+	return nil
+}
+
+func (x *StatusResponse) GetWorkers() int32 {
+	if x != nil {
+		return x.Workers
+	}
+	return 0
+}
+
+type LaneStats struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Name          string                 `protobuf:"bytes,1,opt,name=name,proto3" json:"name,omitempty"`
+	Concurrency   int32                  `protobuf:"varint,2,opt,name=concurrency,proto3" json:"concurrency,omitempty"`              // handlers the lane runs at once
+	MaxQueued     int32                  `protobuf:"varint,3,opt,name=max_queued,json=maxQueued,proto3" json:"max_queued,omitempty"` // requests that may wait; 0 = unbounded
+	Running       int64                  `protobuf:"varint,4,opt,name=running,proto3" json:"running,omitempty"`
+	Queued        int64                  `protobuf:"varint,5,opt,name=queued,proto3" json:"queued,omitempty"`     // requests waiting for a slot
+	Rejected      int64                  `protobuf:"varint,6,opt,name=rejected,proto3" json:"rejected,omitempty"` // answered ERR_RESOURCE_EXHAUSTED because the queue was full
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *LaneStats) Reset() {
+	*x = LaneStats{}
+	mi := &file_denden_proto_msgTypes[29]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *LaneStats) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*LaneStats) ProtoMessage() {}
+
+func (x *LaneStats) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[29]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use LaneStats.ProtoReflect.Descriptor instead.
+func (*LaneStats) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{29}
+}
+
+func (x *LaneStats) GetName() string {
+	if x != nil {
+		return x.Name
+	}
+	return ""
+}
+
+func (x *LaneStats) GetConcurrency() int32 {
+	if x != nil {
+		return x.Concurrency
+	}
+	return 0
+}
+
+func (x *LaneStats) GetMaxQueued() int32 {
+	if x != nil {
+		return x.MaxQueued
+	}
+	return 0
+}
+
+func (x *LaneStats) GetRunning() int64 {
+	if x != nil {
+		return x.Running
+	}
+	return 0
+}
+
+func (x *LaneStats) GetQueued() int64 {
+	if x != nil {
+		return x.Queued
+	}
+	return 0
+}
+
+func (x *LaneStats) GetRejected() int64 {
+	if x != nil {
+		return x.Rejected
+	}
+	return 0
+}
+
+type PayloadStats struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	PayloadType   string                 `protobuf:"bytes,1,opt,name=payload_type,json=payloadType,proto3" json:"payload_type,omitempty"` // "ask_user" | "delegate" | "remember" | ...
+	InFlight      int64                  `protobuf:"varint,2,opt,name=in_flight,json=inFlight,proto3" json:"in_flight,omitempty"`
+	Ok            int64                  `protobuf:"varint,3,opt,name=ok,proto3" json:"ok,omitempty"`
+	Denied        int64                  `protobuf:"varint,4,opt,name=denied,proto3" json:"denied,omitempty"`
+	Error         int64                  `protobuf:"varint,5,opt,name=error,proto3" json:"error,omitempty"`
+	P50Ms         float64                `protobuf:"fixed64,6,opt,name=p50_ms,json=p50Ms,proto3" json:"p50_ms,omitempty"`
+	P90Ms         float64                `protobuf:"fixed64,7,opt,name=p90_ms,json=p90Ms,proto3" json:"p90_ms,omitempty"`
+	P99Ms         float64                `protobuf:"fixed64,8,opt,name=p99_ms,json=p99Ms,proto3" json:"p99_ms,omitempty"`
+	MaxMs         float64                `protobuf:"fixed64,9,opt,name=max_ms,json=maxMs,proto3" json:"max_ms,omitempty"`
+	Errors        []*ErrorCount          `protobuf:"bytes,10,rep,name=errors,proto3" json:"errors,omitempty"` // DENIED/ERROR responses by code
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *PayloadStats) Reset() {
+	*x = PayloadStats{}
+	mi := &file_denden_proto_msgTypes[30]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *PayloadStats) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*PayloadStats) ProtoMessage() {}
+
+func (x *PayloadStats) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[30]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use PayloadStats.ProtoReflect.Descriptor instead.
+func (*PayloadStats) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{30}
+}
+
+func (x *PayloadStats) GetPayloadType() string {
+	if x != nil {
+		return x.PayloadType
+	}
+	return ""
+}
+
+func (x *PayloadStats) GetInFlight() int64 {
+	if x != nil {
+		return x.InFlight
+	}
+	return 0
+}
+
+func (x *PayloadStats) GetOk() int64 {
+	if x != nil {
+		return x.Ok
+	}
+	return 0
+}
+
+func (x *PayloadStats) GetDenied() int64 {
+	if x != nil {
+		return x.Denied
+	}
+	return 0
+}
+
+func (x *PayloadStats) GetError() int64 {
+	if x != nil {
+		return x.Error
+	}
+	return 0
+}
+
+func (x *PayloadStats) GetP50Ms() float64 {
+	if x != nil {
+		return x.P50Ms
+	}
+	return 0
+}
+
+func (x *PayloadStats) GetP90Ms() float64 {
+	if x != nil {
+		return x.P90Ms
+	}
+	return 0
+}
+
+func (x *PayloadStats) GetP99Ms() float64 {
+	if x != nil {
+		return x.P99Ms
+	}
+	return 0
+}
+
+func (x *PayloadStats) GetMaxMs() float64 {
+	if x != nil {
+		return x.MaxMs
+	}
+	return 0
+}
+
+func (x *PayloadStats) GetErrors() []*ErrorCount {
+	if x != nil {
+		return x.Errors
+	}
+	return nil
+}
+
+type ErrorCount struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Code          string                 `protobuf:"bytes,1,opt,name=code,proto3" json:"code,omitempty"`
+	Count         int64                  `protobuf:"varint,2,opt,name=count,proto3" json:"count,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *ErrorCount) Reset() {
+	*x = ErrorCount{}
+	mi := &file_denden_proto_msgTypes[31]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *ErrorCount) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*ErrorCount) ProtoMessage() {}
+
+func (x *ErrorCount) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[31]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use ErrorCount.ProtoReflect.Descriptor instead.
+func (*ErrorCount) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{31}
+}
+
+func (x *ErrorCount) GetCode() string {
+	if x != nil {
+		return x.Code
+	}
+	return ""
+}
+
+func (x *ErrorCount) GetCount() int64 {
+	if x != nil {
+		return x.Count
+	}
+	return 0
+}
+
+type ArtifactChunk struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Data          []byte                 `protobuf:"bytes,1,opt,name=data,proto3" json:"data,omitempty"`
+	RunId         string                 `protobuf:"bytes,2,opt,name=run_id,json=runId,proto3" json:"run_id,omitempty"` // first PutArtifact chunk only: the run holding the artifact
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *ArtifactChunk) Reset() {
+	*x = ArtifactChunk{}
+	mi := &file_denden_proto_msgTypes[32]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *ArtifactChunk) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*ArtifactChunk) ProtoMessage() {}
+
+func (x *ArtifactChunk) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[32]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use ArtifactChunk.ProtoReflect.Descriptor instead.
+func (*ArtifactChunk) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{32}
+}
+
+func (x *ArtifactChunk) GetData() []byte {
+	if x != nil {
+		return x.Data
+	}
+	return nil
+}
+
+func (x *ArtifactChunk) GetRunId() string {
+	if x != nil {
+		return x.RunId
+	}
+	return ""
+}
+
+type ArtifactRef struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Ref           string                 `protobuf:"bytes,1,opt,name=ref,proto3" json:"ref,omitempty"` // "sha256:<hex digest>", for Task.artifact_refs
+	Size          int64                  `protobuf:"varint,2,opt,name=size,proto3" json:"size,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *ArtifactRef) Reset() {
+	*x = ArtifactRef{}
+	mi := &file_denden_proto_msgTypes[33]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *ArtifactRef) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*ArtifactRef) ProtoMessage() {}
+
+func (x *ArtifactRef) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[33]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use ArtifactRef.ProtoReflect.Descriptor instead.
+func (*ArtifactRef) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{33}
+}
+
+func (x *ArtifactRef) GetRef() string {
+	if x != nil {
+		return x.Ref
+	}
+	return ""
+}
+
+func (x *ArtifactRef) GetSize() int64 {
+	if x != nil {
+		return x.Size
+	}
+	return 0
+}
+
+type GetArtifactRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Ref           string                 `protobuf:"bytes,1,opt,name=ref,proto3" json:"ref,omitempty"`
+	Offset        int64                  `protobuf:"varint,2,opt,name=offset,proto3" json:"offset,omitempty"`
+	Length        int64                  `protobuf:"varint,3,opt,name=length,proto3" json:"length,omitempty"` // 0 = to the end
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *GetArtifactRequest) Reset() {
+	*x = GetArtifactRequest{}
+	mi := &file_denden_proto_msgTypes[34]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *GetArtifactRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*GetArtifactRequest) ProtoMessage() {}
+
+func (x *GetArtifactRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[34]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use GetArtifactRequest.ProtoReflect.Descriptor instead.
+func (*GetArtifactRequest) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{34}
+}
+
+func (x *GetArtifactRequest) GetRef() string {
+	if x != nil {
+		return x.Ref
+	}
+	return ""
+}
+
+func (x *GetArtifactRequest) GetOffset() int64 {
+	if x != nil {
+		return x.Offset
+	}
+	return 0
+}
+
+func (x *GetArtifactRequest) GetLength() int64 {
+	if x != nil {
+		return x.Length
+	}
+	return 0
+}
+
+type ReleaseArtifactsRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	RunId         string                 `protobuf:"bytes,1,opt,name=run_id,json=runId,proto3" json:"run_id,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *ReleaseArtifactsRequest) Reset() {
+	*x = ReleaseArtifactsRequest{}
+	mi := &file_denden_proto_msgTypes[35]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *ReleaseArtifactsRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*ReleaseArtifactsRequest) ProtoMessage() {}
+
+func (x *ReleaseArtifactsRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[35]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use ReleaseArtifactsRequest.ProtoReflect.Descriptor instead.
+func (*ReleaseArtifactsRequest) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{35}
+}
+
+func (x *ReleaseArtifactsRequest) GetRunId() string {
+	if x != nil {
+		return x.RunId
+	}
+	return ""
+}
+
+type ReleaseArtifactsResponse struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Released      int64                  `protobuf:"varint,1,opt,name=released,proto3" json:"released,omitempty"` // references the run held
+	Deleted       int64                  `protobuf:"varint,2,opt,name=deleted,proto3" json:"deleted,omitempty"`   // artifacts removed because no run holds them anymore
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *ReleaseArtifactsResponse) Reset() {
+	*x = ReleaseArtifactsResponse{}
+	mi := &file_denden_proto_msgTypes[36]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *ReleaseArtifactsResponse) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*ReleaseArtifactsResponse) ProtoMessage() {}
+
+func (x *ReleaseArtifactsResponse) ProtoReflect() protoreflect.Message {
+	mi := &file_denden_proto_msgTypes[36]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use ReleaseArtifactsResponse.ProtoReflect.Descriptor instead.
+func (*ReleaseArtifactsResponse) Descriptor() ([]byte, []int) {
+	return file_denden_proto_rawDescGZIP(), []int{36}
+}
+
+func (x *ReleaseArtifactsResponse) GetReleased() int64 {
+	if x != nil {
+		return x.Released
+	}
+	return 0
+}
+
+func (x *ReleaseArtifactsResponse) GetDeleted() int64 {
+	if x != nil {
+		return x.Deleted
+	}
+	return 0
+}
+
+var File_denden_proto protoreflect.FileDescriptor
+
+const file_denden_proto_rawDesc = "" +
+	"\n" +
+	"\fdenden.proto\x12\x06denden\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto\"\xd9\x02\n" +
+	"\rDenDenRequest\x12%\n" +
+	"\x0edenden_version\x18\x01 \x01(\tR\rdendenVersion\x12\x1d\n" +
+	"\n" +
 	"request_id\x18\x02 \x01(\tR\trequestId\x12#\n" +
 	"\x05trace\x18\x03 \x01(\v2\r.denden.TraceR\x05trace\x123\n" +
 	"\bask_user\x18\n" +
 	" \x01(\v2\x16.denden.AskUserPayloadH\x00R\aaskUser\x125\n" +
 	"\bdelegate\x18\v \x01(\v2\x17.denden.DelegatePayloadH\x00R\bdelegate\x125\n" +
-	"\bremember\x18\f \x01(\v2\x17.denden.RememberPayloadH\x00R\brememberB\t\n" +
+	"\bremember\x18\f \x01(\v2\x17.denden.RememberPayloadH\x00R\bremember\x12/\n" +
+	"\x06recall\x18\r \x01(\v2\x15.denden.RecallPayloadH\x00R\x06recallB\t\n" +
 	"\apayload\"\xbe\x01\n" +
 	"\x05Trace\x12\x15\n" +
 	"\x06run_id\x18\x01 \x01(\tR\x05runId\x12*\n" +
@@ -1066,16 +2833,22 @@ const file_denden_proto_rawDesc = "" +
 	"\x0fDelegatePayload\x12\x1f\n" +
 	"\vdelegate_to\x18\x01 \x01(\tR\n" +
 	"delegateTo\x12 \n" +
-	"\x04task\x18\x02 \x01(\v2\f.denden.TaskR\x04task\"\xa3\x01\n" +
+	"\x04task\x18\x02 \x01(\v2\f.denden.TaskR\x04task\"\xde\x01\n" +
 	"\x04Task\x12\x12\n" +
 	"\x04text\x18\x01 \x01(\tR\x04text\x12#\n" +
 	"\rartifact_refs\x18\x02 \x03(\tR\fartifactRefs\x12-\n" +
 	"\x05extra\x18\x03 \x01(\v2\x17.google.protobuf.StructR\x05extra\x123\n" +
-	"\rreturn_format\x18\x04 \x01(\x0e2\x0e.denden.FormatR\freturnFormat\"]\n" +
+	"\rreturn_format\x18\x04 \x01(\x0e2\x0e.denden.FormatR\freturnFormat\x129\n" +
+	"\rextra_encoded\x18\x05 \x01(\v2\x14.denden.EncodedValueR\fextraEncoded\"]\n" +
 	"\x0fRememberPayload\x12\x18\n" +
 	"\acontent\x18\x01 \x01(\tR\acontent\x12\x1a\n" +
 	"\bkeywords\x18\x02 \x03(\tR\bkeywords\x12\x14\n" +
-	"\x05scope\x18\x03 \x01(\tR\x05scope\"\x82\x03\n" +
+	"\x05scope\x18\x03 \x01(\tR\x05scope\"n\n" +
+	"\rRecallPayload\x12\x14\n" +
+	"\x05query\x18\x01 \x01(\tR\x05query\x12\x1a\n" +
+	"\bkeywords\x18\x02 \x03(\tR\bkeywords\x12\x16\n" +
+	"\x06scopes\x18\x03 \x03(\tR\x06scopes\x12\x13\n" +
+	"\x05top_k\x18\x04 \x01(\x05R\x04topK\"\xbf\x03\n" +
 	"\x0eDenDenResponse\x12%\n" +
 	"\x0edenden_version\x18\x01 \x01(\tR\rdendenVersion\x12\x1d\n" +
 	"\n" +
@@ -1085,27 +2858,150 @@ const file_denden_proto_rawDesc = "" +
 	"\x0fask_user_result\x18\n" +
 	" \x01(\v2\x15.denden.AskUserResultH\x00R\raskUserResult\x12A\n" +
 	"\x0fdelegate_result\x18\v \x01(\v2\x16.denden.DelegateResultH\x00R\x0edelegateResult\x12A\n" +
-	"\x0fremember_result\x18\f \x01(\v2\x16.denden.RememberResultH\x00R\x0erememberResultB\b\n" +
-	"\x06result\"Y\n" +
+	"\x0fremember_result\x18\f \x01(\v2\x16.denden.RememberResultH\x00R\x0erememberResult\x12;\n" +
+	"\rrecall_result\x18\r \x01(\v2\x14.denden.RecallResultH\x00R\frecallResultB\b\n" +
+	"\x06result\"\x7f\n" +
 	"\vErrorDetail\x12\x12\n" +
 	"\x04code\x18\x01 \x01(\tR\x04code\x12\x18\n" +
 	"\amessage\x18\x02 \x01(\tR\amessage\x12\x1c\n" +
-	"\tretryable\x18\x03 \x01(\bR\tretryable\"_\n" +
+	"\tretryable\x18\x03 \x01(\bR\tretryable\x12$\n" +
+	"\x0eretry_after_ms\x18\x04 \x01(\x03R\fretryAfterMs\"_\n" +
 	"\rAskUserResult\x12\x14\n" +
 	"\x04text\x18\x01 \x01(\tH\x00R\x04text\x12-\n" +
 	"\x04json\x18\x02 \x01(\v2\x17.google.protobuf.StructH\x00R\x04jsonB\t\n" +
-	"\acontent\"\x90\x01\n" +
+	"\acontent\"\xf2\x01\n" +
 	"\x0eDelegateResult\x123\n" +
 	"\routput_format\x18\x01 \x01(\x0e2\x0e.denden.FormatR\foutputFormat\x12/\n" +
 	"\x06output\x18\x02 \x01(\v2\x17.google.protobuf.StructR\x06output\x12\x18\n" +
-	"\asummary\x18\x03 \x01(\tR\asummary\"C\n" +
+	"\asummary\x18\x03 \x01(\tR\asummary\x12#\n" +
+	"\rartifact_refs\x18\x04 \x03(\tR\fartifactRefs\x12;\n" +
+	"\x0eoutput_encoded\x18\x05 \x01(\v2\x14.denden.EncodedValueR\routputEncoded\"E\n" +
+	"\fEncodedValue\x12!\n" +
+	"\fcontent_type\x18\x01 \x01(\tR\vcontentType\x12\x12\n" +
+	"\x04data\x18\x02 \x01(\fR\x04data\"C\n" +
 	"\x0eRememberResult\x12\x16\n" +
 	"\x06status\x18\x01 \x01(\tR\x06status\x12\x19\n" +
-	"\bentry_id\x18\x02 \x01(\tR\aentryId\"\x0f\n" +
-	"\rStatusRequest\"\\\n" +
+	"\bentry_id\x18\x02 \x01(\tR\aentryId\"?\n" +
+	"\fRecallResult\x12/\n" +
+	"\aentries\x18\x01 \x03(\v2\x15.denden.RecalledEntryR\aentries\"\x8c\x01\n" +
+	"\rRecalledEntry\x12\x19\n" +
+	"\bentry_id\x18\x01 \x01(\tR\aentryId\x12\x14\n" +
+	"\x05scope\x18\x02 \x01(\tR\x05scope\x12\x18\n" +
+	"\acontent\x18\x03 \x01(\tR\acontent\x12\x1a\n" +
+	"\bkeywords\x18\x04 \x03(\tR\bkeywords\x12\x14\n" +
+	"\x05score\x18\x05 \x01(\x01R\x05score\"\xe2\x01\n" +
+	"\vStreamEvent\x12\x1d\n" +
+	"\n" +
+	"request_id\x18\x01 \x01(\tR\trequestId\x12\x10\n" +
+	"\x03seq\x18\x02 \x01(\x03R\x03seq\x12.\n" +
+	"\bprogress\x18\n" +
+	" \x01(\v2\x10.denden.ProgressH\x00R\bprogress\x123\n" +
+	"\apartial\x18\v \x01(\v2\x17.google.protobuf.StructH\x00R\apartial\x124\n" +
+	"\bresponse\x18\f \x01(\v2\x16.denden.DenDenResponseH\x00R\bresponseB\a\n" +
+	"\x05event\"@\n" +
+	"\bProgress\x12\x18\n" +
+	"\amessage\x18\x01 \x01(\tR\amessage\x12\x1a\n" +
+	"\bfraction\x18\x02 \x01(\x01R\bfraction\"d\n" +
+	"\fBatchRequest\x121\n" +
+	"\brequests\x18\x01 \x03(\v2\x15.denden.DenDenRequestR\brequests\x12!\n" +
+	"\fmax_parallel\x18\x02 \x01(\x05R\vmaxParallel\"E\n" +
+	"\rBatchResponse\x124\n" +
+	"\tresponses\x18\x01 \x03(\v2\x16.denden.DenDenResponseR\tresponses\"U\n" +
+	"\tBatchItem\x12\x14\n" +
+	"\x05index\x18\x01 \x01(\x05R\x05index\x122\n" +
+	"\bresponse\x18\x02 \x01(\v2\x16.denden.DenDenResponseR\bresponse\"i\n" +
+	"\tJobHandle\x12\x15\n" +
+	"\x06job_id\x18\x01 \x01(\tR\x05jobId\x12\x1d\n" +
+	"\n" +
+	"request_id\x18\x02 \x01(\tR\trequestId\x12&\n" +
+	"\x05state\x18\x03 \x01(\x0e2\x10.denden.JobStateR\x05state\"D\n" +
+	"\fAwaitRequest\x12\x15\n" +
+	"\x06job_id\x18\x01 \x01(\tR\x05jobId\x12\x1d\n" +
+	"\n" +
+	"timeout_ms\x18\x02 \x01(\x03R\ttimeoutMs\"$\n" +
+	"\vPollRequest\x12\x15\n" +
+	"\x06job_id\x18\x01 \x01(\tR\x05jobId\"~\n" +
+	"\tJobStatus\x12\x15\n" +
+	"\x06job_id\x18\x01 \x01(\tR\x05jobId\x12&\n" +
+	"\x05state\x18\x02 \x01(\x0e2\x10.denden.JobStateR\x05state\x122\n" +
+	"\bresponse\x18\x03 \x01(\v2\x16.denden.DenDenResponseR\bresponse\"\x91\x01\n" +
+	"\n" +
+	"TraceQuery\x12\x15\n" +
+	"\x06run_id\x18\x01 \x01(\tR\x05runId\x12*\n" +
+	"\x11agent_instance_id\x18\x02 \x01(\tR\x0fagentInstanceId\x12*\n" +
+	"\x04kind\x18\x03 \x01(\x0e2\x16.denden.TraceQueryKindR\x04kind\x12\x14\n" +
+	"\x05limit\x18\x04 \x01(\x05R\x05limit\"\xe2\x03\n" +
+	"\tTraceNode\x12*\n" +
+	"\x11agent_instance_id\x18\x01 \x01(\tR\x0fagentInstanceId\x127\n" +
+	"\x18parent_agent_instance_id\x18\x02 \x01(\tR\x15parentAgentInstanceId\x12\x14\n" +
+	"\x05depth\x18\x03 \x01(\x05R\x05depth\x129\n" +
+	"\n" +
+	"started_at\x18\x04 \x01(\v2\x1a.google.protobuf.TimestampR\tstartedAt\x125\n" +
+	"\bended_at\x18\x05 \x01(\v2\x1a.google.protobuf.TimestampR\aendedAt\x12\x1f\n" +
+	"\vduration_ms\x18\x06 \x01(\x03R\n" +
+	"durationMs\x12.\n" +
+	"\x13subtree_duration_ms\x18\a \x01(\x03R\x11subtreeDurationMs\x12\x14\n" +
+	"\x05calls\x18\b \x01(\x05R\x05calls\x12\x1b\n" +
+	"\tin_flight\x18\t \x01(\x05R\binFlight\x12\x0e\n" +
+	"\x02ok\x18\n" +
+	" \x01(\x05R\x02ok\x12\x16\n" +
+	"\x06denied\x18\v \x01(\x05R\x06denied\x12\x14\n" +
+	"\x05error\x18\f \x01(\x05R\x05error\x12&\n" +
+	"\x0flast_error_code\x18\r \x01(\tR\rlastErrorCode\"c\n" +
+	"\vTraceResult\x12\x15\n" +
+	"\x06run_id\x18\x01 \x01(\tR\x05runId\x12\x14\n" +
+	"\x05found\x18\x02 \x01(\bR\x05found\x12'\n" +
+	"\x05nodes\x18\x03 \x03(\v2\x11.denden.TraceNodeR\x05nodes\"%\n" +
+	"\rStatusRequest\x12\x14\n" +
+	"\x05local\x18\x01 \x01(\bR\x05local\"\x8f\x02\n" +
 	"\x0eStatusResponse\x12%\n" +
 	"\x0euptime_seconds\x18\x01 \x01(\x03R\ruptimeSeconds\x12#\n" +
-	"\ractive_agents\x18\x02 \x01(\x05R\factiveAgents*\x1c\n" +
+	"\ractive_agents\x18\x02 \x01(\x05R\factiveAgents\x12\x1b\n" +
+	"\tin_flight\x18\x03 \x01(\x03R\binFlight\x12\x1f\n" +
+	"\vqueue_depth\x18\x04 \x01(\x03R\n" +
+	"queueDepth\x120\n" +
+	"\bpayloads\x18\x05 \x03(\v2\x14.denden.PayloadStatsR\bpayloads\x12'\n" +
+	"\x05lanes\x18\x06 \x03(\v2\x11.denden.LaneStatsR\x05lanes\x12\x18\n" +
+	"\aworkers\x18\a \x01(\x05R\aworkers\"\xae\x01\n" +
+	"\tLaneStats\x12\x12\n" +
+	"\x04name\x18\x01 \x01(\tR\x04name\x12 \n" +
+	"\vconcurrency\x18\x02 \x01(\x05R\vconcurrency\x12\x1d\n" +
+	"\n" +
+	"max_queued\x18\x03 \x01(\x05R\tmaxQueued\x12\x18\n" +
+	"\arunning\x18\x04 \x01(\x03R\arunning\x12\x16\n" +
+	"\x06queued\x18\x05 \x01(\x03R\x06queued\x12\x1a\n" +
+	"\brejected\x18\x06 \x01(\x03R\brejected\"\x94\x02\n" +
+	"\fPayloadStats\x12!\n" +
+	"\fpayload_type\x18\x01 \x01(\tR\vpayloadType\x12\x1b\n" +
+	"\tin_flight\x18\x02 \x01(\x03R\binFlight\x12\x0e\n" +
+	"\x02ok\x18\x03 \x01(\x03R\x02ok\x12\x16\n" +
+	"\x06denied\x18\x04 \x01(\x03R\x06denied\x12\x14\n" +
+	"\x05error\x18\x05 \x01(\x03R\x05error\x12\x15\n" +
+	"\x06p50_ms\x18\x06 \x01(\x01R\x05p50Ms\x12\x15\n" +
+	"\x06p90_ms\x18\a \x01(\x01R\x05p90Ms\x12\x15\n" +
+	"\x06p99_ms\x18\b \x01(\x01R\x05p99Ms\x12\x15\n" +
+	"\x06max_ms\x18\t \x01(\x01R\x05maxMs\x12*\n" +
+	"\x06errors\x18\n" +
+	" \x03(\v2\x12.denden.ErrorCountR\x06errors\"6\n" +
+	"\n" +
+	"ErrorCount\x12\x12\n" +
+	"\x04code\x18\x01 \x01(\tR\x04code\x12\x14\n" +
+	"\x05count\x18\x02 \x01(\x03R\x05count\":\n" +
+	"\rArtifactChunk\x12\x12\n" +
+	"\x04data\x18\x01 \x01(\fR\x04data\x12\x15\n" +
+	"\x06run_id\x18\x02 \x01(\tR\x05runId\"3\n" +
+	"\vArtifactRef\x12\x10\n" +
+	"\x03ref\x18\x01 \x01(\tR\x03ref\x12\x12\n" +
+	"\x04size\x18\x02 \x01(\x03R\x04size\"V\n" +
+	"\x12GetArtifactRequest\x12\x10\n" +
+	"\x03ref\x18\x01 \x01(\tR\x03ref\x12\x16\n" +
+	"\x06offset\x18\x02 \x01(\x03R\x06offset\x12\x16\n" +
+	"\x06length\x18\x03 \x01(\x03R\x06length\"0\n" +
+	"\x17ReleaseArtifactsRequest\x12\x15\n" +
+	"\x06run_id\x18\x01 \x01(\tR\x05runId\"P\n" +
+	"\x18ReleaseArtifactsResponse\x12\x1a\n" +
+	"\breleased\x18\x01 \x01(\x03R\breleased\x12\x18\n" +
+	"\adeleted\x18\x02 \x01(\x03R\adeleted*\x1c\n" +
 	"\x06Format\x12\b\n" +
 	"\x04TEXT\x10\x00\x12\b\n" +
 	"\x04JSON\x10\x01*/\n" +
@@ -1113,10 +3009,31 @@ const file_denden_proto_rawDesc = "" +
 	"\x02OK\x10\x00\x12\n" +
 	"\n" +
 	"\x06DENIED\x10\x01\x12\t\n" +
-	"\x05ERROR\x10\x022x\n" +
+	"\x05ERROR\x10\x02*=\n" +
+	"\bJobState\x12\v\n" +
+	"\aPENDING\x10\x00\x12\v\n" +
+	"\aRUNNING\x10\x01\x12\b\n" +
+	"\x04DONE\x10\x02\x12\r\n" +
+	"\tNOT_FOUND\x10\x03*F\n" +
+	"\x0eTraceQueryKind\x12\v\n" +
+	"\aSUBTREE\x10\x00\x12\x11\n" +
+	"\rCRITICAL_PATH\x10\x01\x12\x14\n" +
+	"\x10SLOWEST_BRANCHES\x10\x022\xd1\x05\n" +
 	"\x06Denden\x125\n" +
-	"\x04Send\x12\x15.denden.DenDenRequest\x1a\x16.denden.DenDenResponse\x127\n" +
-	"\x06Status\x12\x15.denden.StatusRequest\x1a\x16.denden.StatusResponseB+Z)github.com/strawpot/denden/cli/gen/dendenb\x06proto3"
+	"\x04Send\x12\x15.denden.DenDenRequest\x1a\x16.denden.DenDenResponse\x12:\n" +
+	"\n" +
+	"SendStream\x12\x15.denden.DenDenRequest\x1a\x13.denden.StreamEvent0\x01\x128\n" +
+	"\tSendBatch\x12\x14.denden.BatchRequest\x1a\x15.denden.BatchResponse\x12<\n" +
+	"\x0fSendBatchStream\x12\x14.denden.BatchRequest\x1a\x11.denden.BatchItem0\x01\x122\n" +
+	"\x06Submit\x12\x15.denden.DenDenRequest\x1a\x11.denden.JobHandle\x120\n" +
+	"\x05Await\x12\x14.denden.AwaitRequest\x1a\x11.denden.JobStatus\x12.\n" +
+	"\x04Poll\x12\x13.denden.PollRequest\x1a\x11.denden.JobStatus\x125\n" +
+	"\n" +
+	"QueryTrace\x12\x12.denden.TraceQuery\x1a\x13.denden.TraceResult\x127\n" +
+	"\x06Status\x12\x15.denden.StatusRequest\x1a\x16.denden.StatusResponse\x12;\n" +
+	"\vPutArtifact\x12\x15.denden.ArtifactChunk\x1a\x13.denden.ArtifactRef(\x01\x12B\n" +
+	"\vGetArtifact\x12\x1a.denden.GetArtifactRequest\x1a\x15.denden.ArtifactChunk0\x01\x12U\n" +
+	"\x10ReleaseArtifacts\x12\x1f.denden.ReleaseArtifactsRequest\x1a .denden.ReleaseArtifactsResponseB+Z)github.com/strawpot/denden/cli/gen/dendenb\x06proto3"
 
 var (
 	file_denden_proto_rawDescOnce sync.Once
@@ -1130,54 +3047,121 @@ func file_denden_proto_rawDescGZIP() []byte {
 	return file_denden_proto_rawDescData
 }
 
-var file_denden_proto_enumTypes = make([]protoimpl.EnumInfo, 2)
-var file_denden_proto_msgTypes = make([]protoimpl.MessageInfo, 13)
+var file_denden_proto_enumTypes = make([]protoimpl.EnumInfo, 4)
+var file_denden_proto_msgTypes = make([]protoimpl.MessageInfo, 37)
 var file_denden_proto_goTypes = []any{
-	(Format)(0),                   // 0: denden.Format
-	(ResponseStatus)(0),           // 1: denden.ResponseStatus
-	(*DenDenRequest)(nil),         // 2: denden.DenDenRequest
-	(*Trace)(nil),                 // 3: denden.Trace
-	(*AskUserPayload)(nil),        // 4: denden.AskUserPayload
-	(*DelegatePayload)(nil),       // 5: denden.DelegatePayload
-	(*Task)(nil),                  // 6: denden.Task
-	(*RememberPayload)(nil),       // 7: denden.RememberPayload
-	(*DenDenResponse)(nil),        // 8: denden.DenDenResponse
-	(*ErrorDetail)(nil),           // 9: denden.ErrorDetail
-	(*AskUserResult)(nil),         // 10: denden.AskUserResult
-	(*DelegateResult)(nil),        // 11: denden.DelegateResult
-	(*RememberResult)(nil),        // 12: denden.RememberResult
-	(*StatusRequest)(nil),         // 13: denden.StatusRequest
-	(*StatusResponse)(nil),        // 14: denden.StatusResponse
-	(*timestamppb.Timestamp)(nil), // 15: google.protobuf.Timestamp
-	(*structpb.Struct)(nil),       // 16: google.protobuf.Struct
+	(Format)(0),                      // 0: denden.Format
+	(ResponseStatus)(0),              // 1: denden.ResponseStatus
+	(JobState)(0),                    // 2: denden.JobState
+	(TraceQueryKind)(0),              // 3: denden.TraceQueryKind
+	(*DenDenRequest)(nil),            // 4: denden.DenDenRequest
+	(*Trace)(nil),                    // 5: denden.Trace
+	(*AskUserPayload)(nil),           // 6: denden.AskUserPayload
+	(*DelegatePayload)(nil),          // 7: denden.DelegatePayload
+	(*Task)(nil),                     // 8: denden.Task
+	(*RememberPayload)(nil),          // 9: denden.RememberPayload
+	(*RecallPayload)(nil),            // 10: denden.RecallPayload
+	(*DenDenResponse)(nil),           // 11: denden.DenDenResponse
+	(*ErrorDetail)(nil),              // 12: denden.ErrorDetail
+	(*AskUserResult)(nil),            // 13: denden.AskUserResult
+	(*DelegateResult)(nil),           // 14: denden.DelegateResult
+	(*EncodedValue)(nil),             // 15: denden.EncodedValue
+	(*RememberResult)(nil),           // 16: denden.RememberResult
+	(*RecallResult)(nil),             // 17: denden.RecallResult
+	(*RecalledEntry)(nil),            // 18: denden.RecalledEntry
+	(*StreamEvent)(nil),              // 19: denden.StreamEvent
+	(*Progress)(nil),                 // 20: denden.Progress
+	(*BatchRequest)(nil),             // 21: denden.BatchRequest
+	(*BatchResponse)(nil),            // 22: denden.BatchResponse
+	(*BatchItem)(nil),                // 23: denden.BatchItem
+	(*JobHandle)(nil),                // 24: denden.JobHandle
+	(*AwaitRequest)(nil),             // 25: denden.AwaitRequest
+	(*PollRequest)(nil),              // 26: denden.PollRequest
+	(*JobStatus)(nil),                // 27: denden.JobStatus
+	(*TraceQuery)(nil),               // 28: denden.TraceQuery
+	(*TraceNode)(nil),                // 29: denden.TraceNode
+	(*TraceResult)(nil),              // 30: denden.TraceResult
+	(*StatusRequest)(nil),            // 31: denden.StatusRequest
+	(*StatusResponse)(nil),           // 32: denden.StatusResponse
+	(*LaneStats)(nil),                // 33: denden.LaneStats
+	(*PayloadStats)(nil),             // 34: denden.PayloadStats
+	(*ErrorCount)(nil),               // 35: denden.ErrorCount
+	(*ArtifactChunk)(nil),            // 36: denden.ArtifactChunk
+	(*ArtifactRef)(nil),              // 37: denden.ArtifactRef
+	(*GetArtifactRequest)(nil),       // 38: denden.GetArtifactRequest
+	(*ReleaseArtifactsRequest)(nil),  // 39: denden.ReleaseArtifactsRequest
+	(*ReleaseArtifactsResponse)(nil), // 40: denden.ReleaseArtifactsResponse
+	(*timestamppb.Timestamp)(nil),    // 41: google.protobuf.Timestamp
+	(*structpb.Struct)(nil),          // 42: google.protobuf.Struct
 }
 var file_denden_proto_depIdxs = []int32{
-	3,  // 0: denden.DenDenRequest.trace:type_name -> denden.Trace
-	4,  // 1: denden.DenDenRequest.ask_user:type_name -> denden.AskUserPayload
-	5,  // 2: denden.DenDenRequest.delegate:type_name -> denden.DelegatePayload
-	7,  // 3: denden.DenDenRequest.remember:type_name -> denden.RememberPayload
-	15, // 4: denden.Trace.created_at:type_name -> google.protobuf.Timestamp
-	0,  // 5: denden.AskUserPayload.response_format:type_name -> denden.Format
-	6,  // 6: denden.DelegatePayload.task:type_name -> denden.Task
-	16, // 7: denden.Task.extra:type_name -> google.protobuf.Struct
-	0,  // 8: denden.Task.return_format:type_name -> denden.Format
-	1,  // 9: denden.DenDenResponse.status:type_name -> denden.ResponseStatus
-	9,  // 10: denden.DenDenResponse.error:type_name -> denden.ErrorDetail
-	10, // 11: denden.DenDenResponse.ask_user_result:type_name -> denden.AskUserResult
-	11, // 12: denden.DenDenResponse.delegate_result:type_name -> denden.DelegateResult
-	12, // 13: denden.DenDenResponse.remember_result:type_name -> denden.RememberResult
-	16, // 14: denden.AskUserResult.json:type_name -> google.protobuf.Struct
-	0,  // 15: denden.DelegateResult.output_format:type_name -> denden.Format
-	16, // 16: denden.DelegateResult.output:type_name -> google.protobuf.Struct
-	2,  // 17: denden.Denden.Send:input_type -> denden.DenDenRequest
-	13, // 18: denden.Denden.Status:input_type -> denden.StatusRequest
-	8,  // 19: denden.Denden.Send:output_type -> denden.DenDenResponse
-	14, // 20: denden.Denden.Status:output_type -> denden.StatusResponse
-	19, // [19:21] is the sub-list for method output_type
-	17, // [17:19] is the sub-list for method input_type
-	17, // [17:17] is the sub-list for extension type_name
-	17, // [17:17] is the sub-list for extension extendee
-	0,  // [0:17] is the sub-list for field type_name
+	5,  // 0: denden.DenDenRequest.trace:type_name -> denden.Trace
+	6,  // 1: denden.DenDenRequest.ask_user:type_name -> denden.AskUserPayload
+	7,  // 2: denden.DenDenRequest.delegate:type_name -> denden.DelegatePayload
+	9,  // 3: denden.DenDenRequest.remember:type_name -> denden.RememberPayload
+	10, // 4: denden.DenDenRequest.recall:type_name -> denden.RecallPayload
+	41, // 5: denden.Trace.created_at:type_name -> google.protobuf.Timestamp
+	0,  // 6: denden.AskUserPayload.response_format:type_name -> denden.Format
+	8,  // 7: denden.DelegatePayload.task:type_name -> denden.Task
+	42, // 8: denden.Task.extra:type_name -> google.protobuf.Struct
+	0,  // 9: denden.Task.return_format:type_name -> denden.Format
+	15, // 10: denden.Task.extra_encoded:type_name -> denden.EncodedValue
+	1,  // 11: denden.DenDenResponse.status:type_name -> denden.ResponseStatus
+	12, // 12: denden.DenDenResponse.error:type_name -> denden.ErrorDetail
+	13, // 13: denden.DenDenResponse.ask_user_result:type_name -> denden.AskUserResult
+	14, // 14: denden.DenDenResponse.delegate_result:type_name -> denden.DelegateResult
+	16, // 15: denden.DenDenResponse.remember_result:type_name -> denden.RememberResult
+	17, // 16: denden.DenDenResponse.recall_result:type_name -> denden.RecallResult
+	42, // 17: denden.AskUserResult.json:type_name -> google.protobuf.Struct
+	0,  // 18: denden.DelegateResult.output_format:type_name -> denden.Format
+	42, // 19: denden.DelegateResult.output:type_name -> google.protobuf.Struct
+	15, // 20: denden.DelegateResult.output_encoded:type_name -> denden.EncodedValue
+	18, // 21: denden.RecallResult.entries:type_name -> denden.RecalledEntry
+	20, // 22: denden.StreamEvent.progress:type_name -> denden.Progress
+	42, // 23: denden.StreamEvent.partial:type_name -> google.protobuf.Struct
+	11, // 24: denden.StreamEvent.response:type_name -> denden.DenDenResponse
+	4,  // 25: denden.BatchRequest.requests:type_name -> denden.DenDenRequest
+	11, // 26: denden.BatchResponse.responses:type_name -> denden.DenDenResponse
+	11, // 27: denden.BatchItem.response:type_name -> denden.DenDenResponse
+	2,  // 28: denden.JobHandle.state:type_name -> denden.JobState
+	2,  // 29: denden.JobStatus.state:type_name -> denden.JobState
+	11, // 30: denden.JobStatus.response:type_name -> denden.DenDenResponse
+	3,  // 31: denden.TraceQuery.kind:type_name -> denden.TraceQueryKind
+	41, // 32: denden.TraceNode.started_at:type_name -> google.protobuf.Timestamp
+	41, // 33: denden.TraceNode.ended_at:type_name -> google.protobuf.Timestamp
+	29, // 34: denden.TraceResult.nodes:type_name -> denden.TraceNode
+	34, // 35: denden.StatusResponse.payloads:type_name -> denden.PayloadStats
+	33, // 36: denden.StatusResponse.lanes:type_name -> denden.LaneStats
+	35, // 37: denden.PayloadStats.errors:type_name -> denden.ErrorCount
+	4,  // 38: denden.Denden.Send:input_type -> denden.DenDenRequest
+	4,  // 39: denden.Denden.SendStream:input_type -> denden.DenDenRequest
+	21, // 40: denden.Denden.SendBatch:input_type -> denden.BatchRequest
+	21, // 41: denden.Denden.SendBatchStream:input_type -> denden.BatchRequest
+	4,  // 42: denden.Denden.Submit:input_type -> denden.DenDenRequest
+	25, // 43: denden.Denden.Await:input_type -> denden.AwaitRequest
+	26, // 44: denden.Denden.Poll:input_type -> denden.PollRequest
+	28, // 45: denden.Denden.QueryTrace:input_type -> denden.TraceQuery
+	31, // 46: denden.Denden.Status:input_type -> denden.StatusRequest
+	36, // 47: denden.Denden.PutArtifact:input_type -> denden.ArtifactChunk
+	38, // 48: denden.Denden.GetArtifact:input_type -> denden.GetArtifactRequest
+	39, // 49: denden.Denden.ReleaseArtifacts:input_type -> denden.ReleaseArtifactsRequest
+	11, // 50: denden.Denden.Send:output_type -> denden.DenDenResponse
+	19, // 51: denden.Denden.SendStream:output_type -> denden.StreamEvent
+	22, // 52: denden.Denden.SendBatch:output_type -> denden.BatchResponse
+	23, // 53: denden.Denden.SendBatchStream:output_type -> denden.BatchItem
+	24, // 54: denden.Denden.Submit:output_type -> denden.JobHandle
+	27, // 55: denden.Denden.Await:output_type -> denden.JobStatus
+	27, // 56: denden.Denden.Poll:output_type -> denden.JobStatus
+	30, // 57: denden.Denden.QueryTrace:output_type -> denden.TraceResult
+	32, // 58: denden.Denden.Status:output_type -> denden.StatusResponse
+	37, // 59: denden.Denden.PutArtifact:output_type -> denden.ArtifactRef
+	36, // 60: denden.Denden.GetArtifact:output_type -> denden.ArtifactChunk
+	40, // 61: denden.Denden.ReleaseArtifacts:output_type -> denden.ReleaseArtifactsResponse
+	50, // [50:62] is the sub-list for method output_type
+	38, // [38:50] is the sub-list for method input_type
+	38, // [38:38] is the sub-list for extension type_name
+	38, // [38:38] is the sub-list for extension extendee
+	0,  // [0:38] is the sub-list for field type_name
 }
 
 func init() { file_denden_proto_init() }
@@ -1189,23 +3173,30 @@ func file_denden_proto_init() {
 		(*DenDenRequest_AskUser)(nil),
 		(*DenDenRequest_Delegate)(nil),
 		(*DenDenRequest_Remember)(nil),
+		(*DenDenRequest_Recall)(nil),
 	}
-	file_denden_proto_msgTypes[6].OneofWrappers = []any{
+	file_denden_proto_msgTypes[7].OneofWrappers = []any{
 		(*DenDenResponse_AskUserResult)(nil),
 		(*DenDenResponse_DelegateResult)(nil),
 		(*DenDenResponse_RememberResult)(nil),
+		(*DenDenResponse_RecallResult)(nil),
 	}
-	file_denden_proto_msgTypes[8].OneofWrappers = []any{
+	file_denden_proto_msgTypes[9].OneofWrappers = []any{
 		(*AskUserResult_Text)(nil),
 		(*AskUserResult_Json)(nil),
 	}
+	file_denden_proto_msgTypes[15].OneofWrappers = []any{
+		(*StreamEvent_Progress)(nil),
+		(*StreamEvent_Partial)(nil),
+		(*StreamEvent_Response)(nil),
+	}
 	type x struct{}
 	out := protoimpl.TypeBuilder{
 		File: protoimpl.DescBuilder{
 			GoPackagePath: reflect.TypeOf(x{}).PkgPath(),
 			RawDescriptor: unsafe.Slice(unsafe.StringData(file_denden_proto_rawDesc), len(file_denden_proto_rawDesc)),
-			NumEnums:      2,
-			NumMessages:   13,
+			NumEnums:      4,
+			NumMessages:   37,
 			NumExtensions: 0,
 			NumServices:   1,
 		},
@@ -19,8 +19,18 @@ import (
 const _ = grpc.SupportPackageIsVersion9
 
 const (
-	Denden_Send_FullMethodName   = "/denden.Denden/Send"
-	Denden_Status_FullMethodName = "/denden.Denden/Status"
+	Denden_Send_FullMethodName             = "/denden.Denden/Send"
+	Denden_SendStream_FullMethodName       = "/denden.Denden/SendStream"
+	Denden_SendBatch_FullMethodName        = "/denden.Denden/SendBatch"
+	Denden_SendBatchStream_FullMethodName  = "/denden.Denden/SendBatchStream"
+	Denden_Submit_FullMethodName           = "/denden.Denden/Submit"
+	Denden_Await_FullMethodName            = "/denden.Denden/Await"
+	Denden_Poll_FullMethodName             = "/denden.Denden/Poll"
+	Denden_QueryTrace_FullMethodName       = "/denden.Denden/QueryTrace"
+	Denden_Status_FullMethodName           = "/denden.Denden/Status"
+	Denden_PutArtifact_FullMethodName      = "/denden.Denden/PutArtifact"
+	Denden_GetArtifact_FullMethodName      = "/denden.Denden/GetArtifact"
+	Denden_ReleaseArtifacts_FullMethodName = "/denden.Denden/ReleaseArtifacts"
 )
 
 // DendenClient is the client API for Denden service.
@@ -29,8 +39,29 @@ const (
 type DendenClient interface {
 	// Synchronous request dispatch (ask_user or delegate).
 	Send(ctx context.Context, in *DenDenRequest, opts ...grpc.CallOption) (*DenDenResponse, error)
+	// Like Send, but streams progress and partial results before the final
+	// response. The last event on the stream always carries the response.
+	SendStream(ctx context.Context, in *DenDenRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[StreamEvent], error)
+	// Dispatch many requests concurrently; responses come back in request order.
+	SendBatch(ctx context.Context, in *BatchRequest, opts ...grpc.CallOption) (*BatchResponse, error)
+	// Like SendBatch, but stream each response as soon as it completes.
+	SendBatchStream(ctx context.Context, in *BatchRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[BatchItem], error)
+	// Start a request in the background and return a job handle immediately.
+	Submit(ctx context.Context, in *DenDenRequest, opts ...grpc.CallOption) (*JobHandle, error)
+	// Wait for a submitted job to finish (bounded by timeout_ms / the deadline).
+	Await(ctx context.Context, in *AwaitRequest, opts ...grpc.CallOption) (*JobStatus, error)
+	// Report the state of a submitted job without waiting.
+	Poll(ctx context.Context, in *PollRequest, opts ...grpc.CallOption) (*JobStatus, error)
+	// Query the agent call tree of a run.
+	QueryTrace(ctx context.Context, in *TraceQuery, opts ...grpc.CallOption) (*TraceResult, error)
 	// Health check.
 	Status(ctx context.Context, in *StatusRequest, opts ...grpc.CallOption) (*StatusResponse, error)
+	// Upload an artifact in chunks and get back its content-addressed ref.
+	PutArtifact(ctx context.Context, opts ...grpc.CallOption) (grpc.ClientStreamingClient[ArtifactChunk, ArtifactRef], error)
+	// Download an artifact (or a byte range of it) in chunks.
+	GetArtifact(ctx context.Context, in *GetArtifactRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[ArtifactChunk], error)
+	// Drop a run's references to artifacts, deleting those no run holds.
+	ReleaseArtifacts(ctx context.Context, in *ReleaseArtifactsRequest, opts ...grpc.CallOption) (*ReleaseArtifactsResponse, error)
 }
 
 type dendenClient struct {
@@ -51,6 +82,94 @@ func (c *dendenClient) Send(ctx context.Context, in *DenDenRequest, opts ...grpc
 	return out, nil
 }
 
+func (c *dendenClient) SendStream(ctx context.Context, in *DenDenRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[StreamEvent], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &Denden_ServiceDesc.Streams[0], Denden_SendStream_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[DenDenRequest, StreamEvent]{ClientStream: stream}
+	if err := x.ClientStream.SendMsg(in); err != nil {
+		return nil, err
+	}
+	if err := x.ClientStream.CloseSend(); err != nil {
+		return nil, err
+	}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type Denden_SendStreamClient = grpc.ServerStreamingClient[StreamEvent]
+
+func (c *dendenClient) SendBatch(ctx context.Context, in *BatchRequest, opts ...grpc.CallOption) (*BatchResponse, error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	out := new(BatchResponse)
+	err := c.cc.Invoke(ctx, Denden_SendBatch_FullMethodName, in, out, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
+func (c *dendenClient) SendBatchStream(ctx context.Context, in *BatchRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[BatchItem], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &Denden_ServiceDesc.Streams[1], Denden_SendBatchStream_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[BatchRequest, BatchItem]{ClientStream: stream}
+	if err := x.ClientStream.SendMsg(in); err != nil {
+		return nil, err
+	}
+	if err := x.ClientStream.CloseSend(); err != nil {
+		return nil, err
+	}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type Denden_SendBatchStreamClient = grpc.ServerStreamingClient[BatchItem]
+
+func (c *dendenClient) Submit(ctx context.Context, in *DenDenRequest, opts ...grpc.CallOption) (*JobHandle, error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	out := new(JobHandle)
+	err := c.cc.Invoke(ctx, Denden_Submit_FullMethodName, in, out, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
+func (c *dendenClient) Await(ctx context.Context, in *AwaitRequest, opts ...grpc.CallOption) (*JobStatus, error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	out := new(JobStatus)
+	err := c.cc.Invoke(ctx, Denden_Await_FullMethodName, in, out, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
+func (c *dendenClient) Poll(ctx context.Context, in *PollRequest, opts ...grpc.CallOption) (*JobStatus, error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	out := new(JobStatus)
+	err := c.cc.Invoke(ctx, Denden_Poll_FullMethodName, in, out, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
+func (c *dendenClient) QueryTrace(ctx context.Context, in *TraceQuery, opts ...grpc.CallOption) (*TraceResult, error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	out := new(TraceResult)
+	err := c.cc.Invoke(ctx, Denden_QueryTrace_FullMethodName, in, out, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
 func (c *dendenClient) Status(ctx context.Context, in *StatusRequest, opts ...grpc.CallOption) (*StatusResponse, error) {
 	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
 	out := new(StatusResponse)
@@ -61,14 +180,77 @@ func (c *dendenClient) Status(ctx context.Context, in *StatusRequest, opts ...gr
 	return out, nil
 }
 
+func (c *dendenClient) PutArtifact(ctx context.Context, opts ...grpc.CallOption) (grpc.ClientStreamingClient[ArtifactChunk, ArtifactRef], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &Denden_ServiceDesc.Streams[2], Denden_PutArtifact_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[ArtifactChunk, ArtifactRef]{ClientStream: stream}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type Denden_PutArtifactClient = grpc.ClientStreamingClient[ArtifactChunk, ArtifactRef]
+
+func (c *dendenClient) GetArtifact(ctx context.Context, in *GetArtifactRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[ArtifactChunk], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &Denden_ServiceDesc.Streams[3], Denden_GetArtifact_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[GetArtifactRequest, ArtifactChunk]{ClientStream: stream}
+	if err := x.ClientStream.SendMsg(in); err != nil {
+		return nil, err
+	}
+	if err := x.ClientStream.CloseSend(); err != nil {
+		return nil, err
+	}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type Denden_GetArtifactClient = grpc.ServerStreamingClient[ArtifactChunk]
+
+func (c *dendenClient) ReleaseArtifacts(ctx context.Context, in *ReleaseArtifactsRequest, opts ...grpc.CallOption) (*ReleaseArtifactsResponse, error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	out := new(ReleaseArtifactsResponse)
+	err := c.cc.Invoke(ctx, Denden_ReleaseArtifacts_FullMethodName, in, out, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
 // DendenServer is the server API for Denden service.
 // All implementations must embed UnimplementedDendenServer
 // for forward compatibility.
 type DendenServer interface {
 	// Synchronous request dispatch (ask_user or delegate).
 	Send(context.Context, *DenDenRequest) (*DenDenResponse, error)
+	// Like Send, but streams progress and partial results before the final
+	// response. The last event on the stream always carries the response.
+	SendStream(*DenDenRequest, grpc.ServerStreamingServer[StreamEvent]) error
+	// Dispatch many requests concurrently; responses come back in request order.
+	SendBatch(context.Context, *BatchRequest) (*BatchResponse, error)
+	// Like SendBatch, but stream each response as soon as it completes.
+	SendBatchStream(*BatchRequest, grpc.ServerStreamingServer[BatchItem]) error
+	// Start a request in the background and return a job handle immediately.
+	Submit(context.Context, *DenDenRequest) (*JobHandle, error)
+	// Wait for a submitted job to finish (bounded by timeout_ms / the deadline).
+	Await(context.Context, *AwaitRequest) (*JobStatus, error)
+	// Report the state of a submitted job without waiting.
+	Poll(context.Context, *PollRequest) (*JobStatus, error)
+	// Query the agent call tree of a run.
+	QueryTrace(context.Context, *TraceQuery) (*TraceResult, error)
 	// Health check.
 	Status(context.Context, *StatusRequest) (*StatusResponse, error)
+	// Upload an artifact in chunks and get back its content-addressed ref.
+	PutArtifact(grpc.ClientStreamingServer[ArtifactChunk, ArtifactRef]) error
+	// Download an artifact (or a byte range of it) in chunks.
+	GetArtifact(*GetArtifactRequest, grpc.ServerStreamingServer[ArtifactChunk]) error
+	// Drop a run's references to artifacts, deleting those no run holds.
+	ReleaseArtifacts(context.Context, *ReleaseArtifactsRequest) (*ReleaseArtifactsResponse, error)
 	mustEmbedUnimplementedDendenServer()
 }
 
@@ -82,9 +264,39 @@ type UnimplementedDendenServer struct{}
 func (UnimplementedDendenServer) Send(context.Context, *DenDenRequest) (*DenDenResponse, error) {
 	return nil, status.Error(codes.Unimplemented, "method Send not implemented")
 }
+func (UnimplementedDendenServer) SendStream(*DenDenRequest, grpc.ServerStreamingServer[StreamEvent]) error {
+	return status.Error(codes.Unimplemented, "method SendStream not implemented")
+}
+func (UnimplementedDendenServer) SendBatch(context.Context, *BatchRequest) (*BatchResponse, error) {
+	return nil, status.Error(codes.Unimplemented, "method SendBatch not implemented")
+}
+func (UnimplementedDendenServer) SendBatchStream(*BatchRequest, grpc.ServerStreamingServer[BatchItem]) error {
+	return status.Error(codes.Unimplemented, "method SendBatchStream not implemented")
+}
+func (UnimplementedDendenServer) Submit(context.Context, *DenDenRequest) (*JobHandle, error) {
+	return nil, status.Error(codes.Unimplemented, "method Submit not implemented")
+}
+func (UnimplementedDendenServer) Await(context.Context, *AwaitRequest) (*JobStatus, error) {
+	return nil, status.Error(codes.Unimplemented, "method Await not implemented")
+}
+func (UnimplementedDendenServer) Poll(context.Context, *PollRequest) (*JobStatus, error) {
+	return nil, status.Error(codes.Unimplemented, "method Poll not implemented")
+}
+func (UnimplementedDendenServer) QueryTrace(context.Context, *TraceQuery) (*TraceResult, error) {
+	return nil, status.Error(codes.Unimplemented, "method QueryTrace not implemented")
+}
 func (UnimplementedDendenServer) Status(context.Context, *StatusRequest) (*StatusResponse, error) {
 	return nil, status.Error(codes.Unimplemented, "method Status not implemented")
 }
+func (UnimplementedDendenServer) PutArtifact(grpc.ClientStreamingServer[ArtifactChunk, ArtifactRef]) error {
+	return status.Error(codes.Unimplemented, "method PutArtifact not implemented")
+}
+func (UnimplementedDendenServer) GetArtifact(*GetArtifactRequest, grpc.ServerStreamingServer[ArtifactChunk]) error {
+	return status.Error(codes.Unimplemented, "method GetArtifact not implemented")
+}
+func (UnimplementedDendenServer) ReleaseArtifacts(context.Context, *ReleaseArtifactsRequest) (*ReleaseArtifactsResponse, error) {
+	return nil, status.Error(codes.Unimplemented, "method ReleaseArtifacts not implemented")
+}
 func (UnimplementedDendenServer) mustEmbedUnimplementedDendenServer() {}
 func (UnimplementedDendenServer) testEmbeddedByValue()                {}
 
@@ -124,6 +336,118 @@ func _Denden_Send_Handler(srv interface{}, ctx context.Context, dec func(interfa
 	return interceptor(ctx, in, info, handler)
 }
 
+func _Denden_SendStream_Handler(srv interface{}, stream grpc.ServerStream) error {
+	m := new(DenDenRequest)
+	if err := stream.RecvMsg(m); err != nil {
+		return err
+	}
+	return srv.(DendenServer).SendStream(m, &grpc.GenericServerStream[DenDenRequest, StreamEvent]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type Denden_SendStreamServer = grpc.ServerStreamingServer[StreamEvent]
+
+func _Denden_SendBatch_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(BatchRequest)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(DendenServer).SendBatch(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: Denden_SendBatch_FullMethodName,
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(DendenServer).SendBatch(ctx, req.(*BatchRequest))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
+func _Denden_SendBatchStream_Handler(srv interface{}, stream grpc.ServerStream) error {
+	m := new(BatchRequest)
+	if err := stream.RecvMsg(m); err != nil {
+		return err
+	}
+	return srv.(DendenServer).SendBatchStream(m, &grpc.GenericServerStream[BatchRequest, BatchItem]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type Denden_SendBatchStreamServer = grpc.ServerStreamingServer[BatchItem]
+
+func _Denden_Submit_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(DenDenRequest)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(DendenServer).Submit(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: Denden_Submit_FullMethodName,
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(DendenServer).Submit(ctx, req.(*DenDenRequest))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
+func _Denden_Await_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(AwaitRequest)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(DendenServer).Await(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: Denden_Await_FullMethodName,
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(DendenServer).Await(ctx, req.(*AwaitRequest))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
+func _Denden_Poll_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(PollRequest)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(DendenServer).Poll(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: Denden_Poll_FullMethodName,
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(DendenServer).Poll(ctx, req.(*PollRequest))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
+func _Denden_QueryTrace_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(TraceQuery)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(DendenServer).QueryTrace(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: Denden_QueryTrace_FullMethodName,
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(DendenServer).QueryTrace(ctx, req.(*TraceQuery))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
 func _Denden_Status_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
 	in := new(StatusRequest)
 	if err := dec(in); err != nil {
@@ -142,6 +466,42 @@ func _Denden_Status_Handler(srv interface{}, ctx context.Context, dec func(inter
 	return interceptor(ctx, in, info, handler)
 }
 
+func _Denden_PutArtifact_Handler(srv interface{}, stream grpc.ServerStream) error {
+	return srv.(DendenServer).PutArtifact(&grpc.GenericServerStream[ArtifactChunk, ArtifactRef]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type Denden_PutArtifactServer = grpc.ClientStreamingServer[ArtifactChunk, ArtifactRef]
+
+func _Denden_GetArtifact_Handler(srv interface{}, stream grpc.ServerStream) error {
+	m := new(GetArtifactRequest)
+	if err := stream.RecvMsg(m); err != nil {
+		return err
+	}
+	return srv.(DendenServer).GetArtifact(m, &grpc.GenericServerStream[GetArtifactRequest, ArtifactChunk]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type Denden_GetArtifactServer = grpc.ServerStreamingServer[ArtifactChunk]
+
+func _Denden_ReleaseArtifacts_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(ReleaseArtifactsRequest)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(DendenServer).ReleaseArtifacts(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: Denden_ReleaseArtifacts_FullMethodName,
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(DendenServer).ReleaseArtifacts(ctx, req.(*ReleaseArtifactsRequest))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
 // Denden_ServiceDesc is the grpc.ServiceDesc for Denden service.
 // It's only intended for direct use with grpc.RegisterService,
 // and not to be introspected or modified (even as a copy)
@@ -153,11 +513,56 @@ var Denden_ServiceDesc = grpc.ServiceDesc{
 			MethodName: "Send",
 			Handler:    _Denden_Send_Handler,
 		},
+		{
+			MethodName: "SendBatch",
+			Handler:    _Denden_SendBatch_Handler,
+		},
+		{
+			MethodName: "Submit",
+			Handler:    _Denden_Submit_Handler,
+		},
+		{
+			MethodName: "Await",
+			Handler:    _Denden_Await_Handler,
+		},
+		{
+			MethodName: "Poll",
+			Handler:    _Denden_Poll_Handler,
+		},
+		{
+			MethodName: "QueryTrace",
+			Handler:    _Denden_QueryTrace_Handler,
+		},
 		{
 			MethodName: "Status",
 			Handler:    _Denden_Status_Handler,
 		},
+		{
+			MethodName: "ReleaseArtifacts",
+			Handler:    _Denden_ReleaseArtifacts_Handler,
+		},
+	},
+	Streams: []grpc.StreamDesc{
+		{
+			StreamName:    "SendStream",
+			Handler:       _Denden_SendStream_Handler,
+			ServerStreams: true,
+		},
+		{
+			StreamName:    "SendBatchStream",
+			Handler:       _Denden_SendBatchStream_Handler,
+			ServerStreams: true,
+		},
+		{
+			StreamName:    "PutArtifact",
+			Handler:       _Denden_PutArtifact_Handler,
+			ClientStreams: true,
+		},
+		{
+			StreamName:    "GetArtifact",
+			Handler:       _Denden_GetArtifact_Handler,
+			ServerStreams: true,
+		},
 	},
-	Streams:  []grpc.StreamDesc{},
 	Metadata: "denden.proto",
 }
@@ -1,11 +1,20 @@
 package main
 
 import (
+	"bytes"
 	"context"
+	"crypto/sha256"
+	"encoding/base64"
+	"encoding/hex"
 	"encoding/json"
+	"errors"
 	"fmt"
+	"io"
 	"math"
+	"math/rand"
 	"os"
+	"strconv"
+	"strings"
 	"time"
 
 	"github.com/google/uuid"
@@ -14,6 +23,7 @@ import (
 	"google.golang.org/grpc/credentials/insecure"
 	"google.golang.org/grpc/status"
 	"google.golang.org/protobuf/encoding/protojson"
+	"google.golang.org/protobuf/proto"
 	"google.golang.org/protobuf/types/known/timestamppb"
 )
 
@@ -28,8 +38,22 @@ func main() {
 	switch os.Args[1] {
 	case "send":
 		handleSend()
+	case "batch":
+		handleBatch()
+	case "submit":
+		handleSubmit()
+	case "await":
+		handleJobStatus(true)
+	case "poll":
+		handleJobStatus(false)
 	case "status":
 		handleStatus()
+	case "trace":
+		handleTrace()
+	case "put":
+		handlePut()
+	case "get":
+		handleGet()
 	case "--help", "-h", "help":
 		printUsage()
 	default:
@@ -44,32 +68,371 @@ func printUsage() {
 
 commands:
   send   <json>   Send a DenDenRequest (auto-fills request_id, version, trace, timestamp)
+         --stream     print progress, partial results and the final response as NDJSON
+  batch           Send many requests from stdin (JSON array or NDJSON) in one call;
+                  prints one response per line, in input order
+         --stream     print {"index", "response"} lines as each request completes
+         --parallel N ask the server to run at most N requests at once
+  submit <json>   Start a DenDenRequest in the background and print its job handle
+  await  <job>    Wait for a submitted job (exit 3 if still running when the timeout hits)
+  poll   <job>    Print a submitted job's state without waiting
   status          Check orchestrator health
+  trace  [run_id] Print a run's agent call tree (default run: DENDEN_RUN_ID)
+         --agent ID   start from this agent instead of the run's roots
+         --critical   print only the critical path (the branch that finished last)
+         --slowest N  print the N slowest child branches
+  put    <file>   Upload a file (- for stdin) as an artifact held by DENDEN_RUN_ID;
+                  prints its ref and size, for task.artifactRefs
+  get    <ref>    Download an artifact to stdout, checking its digest
+         -o FILE      write it to FILE instead
 
 environment:
-  DENDEN_ADDR              server address (default: 127.0.0.1:9700)
+  DENDEN_ADDR              server address: host:port, unix:PATH or unix-abstract:NAME;
+                           comma-separated lists prefer the unix socket (default: 127.0.0.1:9700)
   DENDEN_AGENT_ID          this agent's instance ID (auto-set by orchestrator)
   DENDEN_PARENT_AGENT_ID   parent agent's instance ID
   DENDEN_RUN_ID            run ID
-  DENDEN_TIMEOUT           request timeout e.g. "30s" (default: no timeout)`)
+  DENDEN_TIMEOUT           request timeout e.g. "30s" (default: no timeout)
+  DENDEN_RETRIES           retries of a send the server refuses as overloaded, with
+                           jittered backoff (default: 5; 0 disables)
+  DENDEN_DEADLINE          absolute deadline in Unix epoch ms (set by the parent's handler);
+                           the earlier of it and DENDEN_TIMEOUT applies
+  DENDEN_RAW_JSON          1: send delegate.task.extra as JSON bytes (extraEncoded), not a
+                           Struct, keeping large integers exact (the handler must read it)`)
 }
 
 // handleSend parses raw JSON, auto-fills envelope fields, sends via gRPC.
 func handleSend() {
+	var stream bool
+	var args []string
+	for _, arg := range os.Args[2:] {
+		if arg == "--stream" {
+			stream = true
+			continue
+		}
+		args = append(args, arg)
+	}
+	if len(args) < 1 {
+		fmt.Fprintln(os.Stderr, "usage: denden send [--stream] '<json>'")
+		os.Exit(1)
+	}
+	req := buildRequest(args[0])
+
+	// Send via gRPC.
+	conn, ctx, cancel := dial()
+	defer conn.Close()
+	defer cancel()
+
+	client := pb.NewDendenClient(conn)
+	var resp *pb.DenDenResponse
+	if stream {
+		resp = sendStream(ctx, client, req)
+	} else {
+		var err error
+		resp, err = sendWithRetry(ctx, client, req, rand.Float64)
+		if err != nil {
+			printGRPCError(err)
+			os.Exit(1)
+		}
+
+		// Output response as JSON.
+		printProto(resp)
+	}
+
+	// Exit non-zero on error/denied status.
+	if resp.Status == pb.ResponseStatus_ERROR || resp.Status == pb.ResponseStatus_DENIED {
+		os.Exit(1)
+	}
+}
+
+// Back-off for requests the server refuses as overloaded.
+const (
+	errResourceExhausted = "ERR_RESOURCE_EXHAUSTED"
+	defaultRetryAfter    = 250 * time.Millisecond
+	maxRetryDelay        = 10 * time.Second
+	defaultRetries       = 5
+)
+
+// sendWithRetry calls Send and retries while the server answers with a
+// retryable ERR_RESOURCE_EXHAUSTED, waiting retryDelay between attempts.
+// The request keeps its request_id, so a retry never runs a handler that
+// already ran. It gives up after DENDEN_RETRIES retries or at the
+// deadline and returns the last response.
+func sendWithRetry(ctx context.Context, client pb.DendenClient, req *pb.DenDenRequest, random func() float64) (*pb.DenDenResponse, error) {
+	retries := defaultRetries
+	if n, err := strconv.Atoi(os.Getenv("DENDEN_RETRIES")); err == nil && n >= 0 {
+		retries = n
+	}
+	for attempt := 0; ; attempt++ {
+		resp, err := client.Send(ctx, req)
+		if err != nil || attempt >= retries || !overloaded(resp) {
+			return resp, err
+		}
+		timer := time.NewTimer(retryDelay(resp.GetError().GetRetryAfterMs(), attempt, random))
+		select {
+		case <-ctx.Done():
+			timer.Stop()
+			return resp, nil
+		case <-timer.C:
+		}
+	}
+}
+
+// overloaded reports whether resp asks the client to back off and retry.
+func overloaded(resp *pb.DenDenResponse) bool {
+	e := resp.GetError()
+	return resp.GetStatus() == pb.ResponseStatus_ERROR && e.GetRetryable() && e.GetCode() == errResourceExhausted
+}
+
+// retryDelay doubles the server's retry_after_ms hint (or a default) per
+// attempt up to maxRetryDelay, then keeps half of it and randomizes the
+// other half so refused clients do not all come back at once.
+func retryDelay(hintMs int64, attempt int, random func() float64) time.Duration {
+	d := defaultRetryAfter
+	if hintMs > 0 {
+		d = time.Duration(hintMs) * time.Millisecond
+	}
+	for i := 0; i < attempt && d < maxRetryDelay; i++ {
+		d *= 2
+	}
+	if d > maxRetryDelay {
+		d = maxRetryDelay
+	}
+	return d/2 + time.Duration(random()*float64(d/2))
+}
+
+// sendStream calls SendStream and prints each event as one line of JSON
+// (NDJSON) as soon as it arrives. It returns the final response.
+func sendStream(ctx context.Context, client pb.DendenClient, req *pb.DenDenRequest) *pb.DenDenResponse {
+	events, err := client.SendStream(ctx, req)
+	if err != nil {
+		printGRPCError(err)
+		os.Exit(1)
+	}
+	var final *pb.DenDenResponse
+	for {
+		ev, err := events.Recv()
+		if errors.Is(err, io.EOF) {
+			break
+		}
+		if err != nil {
+			printGRPCError(err)
+			os.Exit(1)
+		}
+		printProtoLine(ev)
+		if r := ev.GetResponse(); r != nil {
+			final = r
+		}
+	}
+	if final == nil {
+		fmt.Fprintln(os.Stderr, "error: stream ended without a response")
+		os.Exit(1)
+	}
+	return final
+}
+
+// handleBatch reads requests from stdin and dispatches them with one
+// SendBatch (or SendBatchStream) call. Exits 1 if any response is an
+// error or denial.
+func handleBatch() {
+	var stream bool
+	var parallel int
+	args := os.Args[2:]
+	for i := 0; i < len(args); i++ {
+		switch args[i] {
+		case "--stream":
+			stream = true
+		case "--parallel":
+			if i+1 >= len(args) {
+				fmt.Fprintln(os.Stderr, "usage: denden batch [--stream] [--parallel N] < requests")
+				os.Exit(1)
+			}
+			n, err := strconv.Atoi(args[i+1])
+			if err != nil || n < 1 {
+				fmt.Fprintf(os.Stderr, "invalid --parallel value: %s\n", args[i+1])
+				os.Exit(1)
+			}
+			parallel = n
+			i++
+		default:
+			fmt.Fprintf(os.Stderr, "unknown batch flag: %s\n", args[i])
+			os.Exit(1)
+		}
+	}
+
+	input, err := io.ReadAll(os.Stdin)
+	if err != nil {
+		fmt.Fprintf(os.Stderr, "error reading stdin: %v\n", err)
+		os.Exit(1)
+	}
+	raws, err := splitRequests(input)
+	if err != nil {
+		fmt.Fprintf(os.Stderr, "invalid JSON: %v\n", err)
+		os.Exit(1)
+	}
+	batch := &pb.BatchRequest{MaxParallel: int32(parallel)}
+	for _, raw := range raws {
+		batch.Requests = append(batch.Requests, buildRequest(string(raw)))
+	}
+
+	conn, ctx, cancel := dial()
+	defer conn.Close()
+	defer cancel()
+
+	client := pb.NewDendenClient(conn)
+	failed := false
+	if stream {
+		items, err := client.SendBatchStream(ctx, batch)
+		if err != nil {
+			printGRPCError(err)
+			os.Exit(1)
+		}
+		for {
+			item, err := items.Recv()
+			if errors.Is(err, io.EOF) {
+				break
+			}
+			if err != nil {
+				printGRPCError(err)
+				os.Exit(1)
+			}
+			printProtoLine(item)
+			failed = failed || !isOK(item.GetResponse())
+		}
+	} else {
+		resp, err := client.SendBatch(ctx, batch)
+		if err != nil {
+			printGRPCError(err)
+			os.Exit(1)
+		}
+		for _, r := range resp.Responses {
+			printProtoLine(r)
+			failed = failed || !isOK(r)
+		}
+	}
+	if failed {
+		os.Exit(1)
+	}
+}
+
+// splitRequests splits stdin into raw request objects. It accepts a JSON
+// array of requests or a stream of objects (NDJSON).
+func splitRequests(input []byte) ([]json.RawMessage, error) {
+	input = bytes.TrimSpace(input)
+	var raws []json.RawMessage
+	if len(input) > 0 && input[0] == '[' {
+		err := json.Unmarshal(input, &raws)
+		return raws, err
+	}
+	dec := json.NewDecoder(bytes.NewReader(input))
+	for {
+		var raw json.RawMessage
+		err := dec.Decode(&raw)
+		if errors.Is(err, io.EOF) {
+			return raws, nil
+		}
+		if err != nil {
+			return nil, err
+		}
+		raws = append(raws, raw)
+	}
+}
+
+// isOK reports whether a response is neither an error nor a denial.
+func isOK(resp *pb.DenDenResponse) bool {
+	s := resp.GetStatus()
+	return s != pb.ResponseStatus_ERROR && s != pb.ResponseStatus_DENIED
+}
+
+// handleSubmit starts a request as a background job and prints its handle.
+func handleSubmit() {
+	if len(os.Args) < 3 {
+		fmt.Fprintln(os.Stderr, "usage: denden submit '<json>'")
+		os.Exit(1)
+	}
+	req := buildRequest(os.Args[2])
+
+	conn, ctx, cancel := dial()
+	defer conn.Close()
+	defer cancel()
+
+	client := pb.NewDendenClient(conn)
+	handle, err := client.Submit(ctx, req)
+	if err != nil {
+		printGRPCError(err)
+		os.Exit(1)
+	}
+	printProto(handle)
+}
+
+// handleJobStatus prints a job's state, waiting for it first when wait is set.
+// Exit codes: 0 done OK, 1 error/denied/not found, 3 still pending or running.
+func handleJobStatus(wait bool) {
 	if len(os.Args) < 3 {
-		fmt.Fprintln(os.Stderr, "usage: denden send '<json>'")
+		fmt.Fprintf(os.Stderr, "usage: denden %s <job_id>\n", os.Args[1])
+		os.Exit(1)
+	}
+	jobID := os.Args[2]
+
+	conn, ctx, cancel := dial()
+	defer conn.Close()
+	defer cancel()
+
+	client := pb.NewDendenClient(conn)
+	var st *pb.JobStatus
+	var err error
+	if wait {
+		req := &pb.AwaitRequest{JobId: jobID}
+		if deadline, ok := ctx.Deadline(); ok {
+			// Ask the server to answer slightly before our own deadline so a
+			// still-running job comes back as a status rather than an RPC error.
+			req.TimeoutMs = max(time.Until(deadline).Milliseconds()-awaitMarginMs, 1)
+		}
+		st, err = client.Await(ctx, req)
+	} else {
+		st, err = client.Poll(ctx, &pb.PollRequest{JobId: jobID})
+	}
+	if err != nil {
+		printGRPCError(err)
 		os.Exit(1)
 	}
+	printProto(st)
 
-	rawJSON := os.Args[2]
+	switch st.State {
+	case pb.JobState_DONE:
+		if s := st.GetResponse().GetStatus(); s == pb.ResponseStatus_ERROR || s == pb.ResponseStatus_DENIED {
+			os.Exit(1)
+		}
+	case pb.JobState_NOT_FOUND:
+		os.Exit(1)
+	default:
+		os.Exit(3)
+	}
+}
+
+// awaitMarginMs is how much earlier than the CLI deadline the server is asked
+// to give up waiting on a job.
+const awaitMarginMs = 250
+
+// buildRequest parses raw JSON into a DenDenRequest and auto-fills envelope
+// fields (request_id, version, trace, timestamp). Exits on invalid input.
+func buildRequest(rawJSON string) *pb.DenDenRequest {
+	input := []byte(rawJSON)
+	var extra []byte
+	if raw, _ := strconv.ParseBool(os.Getenv("DENDEN_RAW_JSON")); raw {
+		input, extra = splitTaskExtra(input)
+	}
 
 	// Parse the raw JSON into a protobuf message.
 	req := &pb.DenDenRequest{}
 	unmarshaler := protojson.UnmarshalOptions{DiscardUnknown: true}
-	if err := unmarshaler.Unmarshal([]byte(rawJSON), req); err != nil {
+	if err := unmarshaler.Unmarshal(input, req); err != nil {
 		fmt.Fprintf(os.Stderr, "invalid JSON: %v\n", err)
 		os.Exit(1)
 	}
+	if extra != nil {
+		req.GetDelegate().Task.ExtraEncoded = &pb.EncodedValue{ContentType: jsonContentType, Data: extra}
+	}
 
 	// Auto-fill envelope fields if not provided.
 	if req.DendenVersion == "" {
@@ -95,40 +458,138 @@ func handleSend() {
 	}
 
 	// Validate that a payload is set (oneof).
-	if req.GetAskUser() == nil && req.GetDelegate() == nil && req.GetRemember() == nil {
-		fmt.Fprintln(os.Stderr, "error: a payload field (askUser, delegate, or remember) is required")
+	if req.GetAskUser() == nil && req.GetDelegate() == nil && req.GetRemember() == nil && req.GetRecall() == nil {
+		fmt.Fprintln(os.Stderr, "error: a payload field (askUser, delegate, remember, or recall) is required")
 		os.Exit(1)
 	}
+	return req
+}
 
-	// Send via gRPC.
-	conn, ctx, cancel := dial()
-	defer conn.Close()
-	defer cancel()
+// jsonContentType is the EncodedValue content type of JSON payloads.
+const jsonContentType = "application/json"
 
-	client := pb.NewDendenClient(conn)
-	resp, err := client.Send(ctx, req)
+// splitTaskExtra takes delegate.task.extra out of a request's JSON and
+// returns the rest and the extra object, compacted. The object then goes
+// out as bytes instead of a Struct, which would cost a conversion on each
+// side and round every number to a double. Input without an extra object
+// comes back as it is, with nil, for protojson to parse or reject.
+func splitTaskExtra(input []byte) ([]byte, []byte) {
+	var root, delegate, task map[string]json.RawMessage
+	if json.Unmarshal(input, &root) != nil ||
+		json.Unmarshal(root["delegate"], &delegate) != nil ||
+		json.Unmarshal(delegate["task"], &task) != nil {
+		return input, nil
+	}
+	extra := bytes.TrimSpace(task["extra"])
+	if len(extra) == 0 || extra[0] != '{' {
+		return input, nil
+	}
+	var compact bytes.Buffer
+	if json.Compact(&compact, extra) != nil {
+		return input, nil
+	}
+	delete(task, "extra")
+	var err error
+	if delegate["task"], err = json.Marshal(task); err != nil {
+		return input, nil
+	}
+	if root["delegate"], err = json.Marshal(delegate); err != nil {
+		return input, nil
+	}
+	out, err := json.Marshal(root)
 	if err != nil {
-		printGRPCError(err)
-		os.Exit(1)
+		return input, nil
 	}
+	return out, compact.Bytes()
+}
 
-	// Output response as JSON.
+// inlineEncoded replaces the JSON-encoded values of *Encoded fields
+// (outputEncoded, extraEncoded) in protobuf JSON with the JSON they hold,
+// under the plain field name, so readers see the shape a Struct would
+// have given. Numbers are copied as written. Other content types stay
+// base64 bytes.
+func inlineEncoded(out []byte, indent string) []byte {
+	if !bytes.Contains(out, []byte(`Encoded"`)) {
+		return out
+	}
+	var v any
+	dec := json.NewDecoder(bytes.NewReader(out))
+	dec.UseNumber()
+	if dec.Decode(&v) != nil {
+		return out
+	}
+	var buf bytes.Buffer
+	enc := json.NewEncoder(&buf)
+	enc.SetEscapeHTML(false)
+	enc.SetIndent("", indent)
+	if enc.Encode(inlineValue(v)) != nil {
+		return out
+	}
+	return bytes.TrimSuffix(buf.Bytes(), []byte("\n"))
+}
+
+func inlineValue(v any) any {
+	switch v := v.(type) {
+	case map[string]any:
+		for k, child := range v {
+			if name, ok := strings.CutSuffix(k, "Encoded"); ok {
+				if raw := encodedJSON(child); raw != nil {
+					delete(v, k)
+					v[name] = raw
+					continue
+				}
+			}
+			v[k] = inlineValue(child)
+		}
+	case []any:
+		for i, child := range v {
+			v[i] = inlineValue(child)
+		}
+	}
+	return v
+}
+
+// encodedJSON returns the data of a JSON EncodedValue in protobuf JSON
+// form, or nil if v is not one.
+func encodedJSON(v any) json.RawMessage {
+	m, ok := v.(map[string]any)
+	if !ok {
+		return nil
+	}
+	if ct, _ := m["contentType"].(string); ct != "" && ct != jsonContentType {
+		return nil
+	}
+	s, _ := m["data"].(string)
+	data, err := base64.StdEncoding.DecodeString(s)
+	if err != nil || !json.Valid(data) {
+		return nil
+	}
+	return json.RawMessage(data)
+}
+
+// printProto writes a message to stdout as indented protobuf JSON.
+func printProto(m proto.Message) {
 	marshaler := protojson.MarshalOptions{
 		Multiline:       true,
 		Indent:          "  ",
 		EmitUnpopulated: false,
 	}
-	out, err := marshaler.Marshal(resp)
+	out, err := marshaler.Marshal(m)
 	if err != nil {
 		fmt.Fprintf(os.Stderr, "error marshaling response: %v\n", err)
 		os.Exit(1)
 	}
-	fmt.Println(string(out))
+	fmt.Println(string(inlineEncoded(out, "  ")))
+}
 
-	// Exit non-zero on error/denied status.
-	if resp.Status == pb.ResponseStatus_ERROR || resp.Status == pb.ResponseStatus_DENIED {
+// printProtoLine writes a message to stdout as single-line protobuf JSON.
+func printProtoLine(m proto.Message) {
+	out, err := protojson.Marshal(m)
+	if err != nil {
+		fmt.Fprintf(os.Stderr, "error marshaling response: %v\n", err)
 		os.Exit(1)
 	}
+	fmt.Println(string(inlineEncoded(out, "")))
 }
 
 func handleStatus() {
@@ -143,19 +604,253 @@ func handleStatus() {
 		os.Exit(1)
 	}
 
+	payloads := []map[string]any{}
+	for _, p := range resp.Payloads {
+		errs := map[string]int64{}
+		for _, e := range p.Errors {
+			errs[e.Code] = e.Count
+		}
+		payloads = append(payloads, map[string]any{
+			"payload_type": p.PayloadType,
+			"in_flight":    p.InFlight,
+			"ok":           p.Ok,
+			"denied":       p.Denied,
+			"error":        p.Error,
+			"errors":       errs,
+			"p50_ms":       p.P50Ms,
+			"p90_ms":       p.P90Ms,
+			"p99_ms":       p.P99Ms,
+			"max_ms":       p.MaxMs,
+		})
+	}
+
+	lanes := []map[string]any{}
+	for _, l := range resp.Lanes {
+		lanes = append(lanes, map[string]any{
+			"name":        l.Name,
+			"concurrency": l.Concurrency,
+			"max_queued":  l.MaxQueued,
+			"running":     l.Running,
+			"queued":      l.Queued,
+			"rejected":    l.Rejected,
+		})
+	}
+
 	enc := json.NewEncoder(os.Stdout)
 	enc.SetIndent("", "  ")
 	enc.Encode(map[string]any{
 		"uptime_seconds": resp.UptimeSeconds,
 		"active_agents":  resp.ActiveAgents,
+		"in_flight":      resp.InFlight,
+		"queue_depth":    resp.QueueDepth,
+		"payloads":       payloads,
+		"lanes":          lanes,
+		"workers":        resp.Workers,
 	})
 }
 
-func dial() (*grpc.ClientConn, context.Context, context.CancelFunc) {
-	addr := os.Getenv("DENDEN_ADDR")
-	if addr == "" {
-		addr = "127.0.0.1:9700"
+func handleTrace() {
+	query := &pb.TraceQuery{RunId: os.Getenv("DENDEN_RUN_ID")}
+	usage := "usage: denden trace [run_id] [--agent ID] [--critical | --slowest N]"
+	args := os.Args[2:]
+	for i := 0; i < len(args); i++ {
+		switch args[i] {
+		case "--agent":
+			if i+1 >= len(args) {
+				fmt.Fprintln(os.Stderr, usage)
+				os.Exit(1)
+			}
+			query.AgentInstanceId = args[i+1]
+			i++
+		case "--critical":
+			query.Kind = pb.TraceQueryKind_CRITICAL_PATH
+		case "--slowest":
+			if i+1 >= len(args) {
+				fmt.Fprintln(os.Stderr, usage)
+				os.Exit(1)
+			}
+			n, err := strconv.Atoi(args[i+1])
+			if err != nil || n < 1 {
+				fmt.Fprintf(os.Stderr, "invalid --slowest value: %s\n", args[i+1])
+				os.Exit(1)
+			}
+			query.Kind = pb.TraceQueryKind_SLOWEST_BRANCHES
+			query.Limit = int32(n)
+			i++
+		default:
+			if strings.HasPrefix(args[i], "--") {
+				fmt.Fprintf(os.Stderr, "unknown trace flag: %s\n", args[i])
+				os.Exit(1)
+			}
+			query.RunId = args[i]
+		}
+	}
+	if query.RunId == "" {
+		fmt.Fprintln(os.Stderr, usage)
+		os.Exit(1)
+	}
+
+	conn, ctx, cancel := dial()
+	defer conn.Close()
+	defer cancel()
+
+	client := pb.NewDendenClient(conn)
+	resp, err := client.QueryTrace(ctx, query)
+	if err != nil {
+		printGRPCError(err)
+		os.Exit(1)
 	}
+	printProto(resp)
+	if !resp.Found {
+		os.Exit(1)
+	}
+}
+
+// artifactChunkSize is how much of a file goes into one PutArtifact message.
+const artifactChunkSize = 1 << 20
+
+// handlePut uploads a file or stdin and prints the artifact's ref.
+func handlePut() {
+	if len(os.Args) < 3 {
+		fmt.Fprintln(os.Stderr, "usage: denden put <file|->")
+		os.Exit(1)
+	}
+	var in io.Reader = os.Stdin
+	if path := os.Args[2]; path != "-" {
+		f, err := os.Open(path)
+		if err != nil {
+			fmt.Fprintf(os.Stderr, "error: %v\n", err)
+			os.Exit(1)
+		}
+		defer f.Close()
+		in = f
+	}
+
+	conn, ctx, cancel := dial()
+	defer conn.Close()
+	defer cancel()
+
+	ref, err := putArtifact(ctx, pb.NewDendenClient(conn), in, os.Getenv("DENDEN_RUN_ID"))
+	if err != nil {
+		printGRPCError(err)
+		os.Exit(1)
+	}
+	printProto(ref)
+}
+
+// putArtifact streams r to the server in chunks; the first chunk names
+// the run that holds the artifact.
+func putArtifact(ctx context.Context, client pb.DendenClient, r io.Reader, runID string) (*pb.ArtifactRef, error) {
+	stream, err := client.PutArtifact(ctx)
+	if err != nil {
+		return nil, err
+	}
+	buf := make([]byte, artifactChunkSize)
+	for first := true; ; first = false {
+		n, readErr := io.ReadFull(r, buf)
+		if n > 0 || first {
+			chunk := &pb.ArtifactChunk{Data: buf[:n]}
+			if first {
+				chunk.RunId = runID
+			}
+			// io.EOF means the server ended the call; CloseAndRecv has its status.
+			if err := stream.Send(chunk); errors.Is(err, io.EOF) {
+				break
+			} else if err != nil {
+				return nil, err
+			}
+		}
+		if errors.Is(readErr, io.EOF) || errors.Is(readErr, io.ErrUnexpectedEOF) {
+			break
+		}
+		if readErr != nil {
+			return nil, readErr
+		}
+	}
+	return stream.CloseAndRecv()
+}
+
+// handleGet downloads an artifact to stdout or the -o file.
+func handleGet() {
+	usage := "usage: denden get <ref> [-o FILE]"
+	var ref, out string
+	args := os.Args[2:]
+	for i := 0; i < len(args); i++ {
+		switch args[i] {
+		case "-o", "--output":
+			if i+1 >= len(args) {
+				fmt.Fprintln(os.Stderr, usage)
+				os.Exit(1)
+			}
+			i++
+			out = args[i]
+		default:
+			ref = args[i]
+		}
+	}
+	if ref == "" {
+		fmt.Fprintln(os.Stderr, usage)
+		os.Exit(1)
+	}
+
+	conn, ctx, cancel := dial()
+	defer conn.Close()
+	defer cancel()
+
+	var w io.Writer = os.Stdout
+	var f *os.File
+	if out != "" {
+		var err error
+		if f, err = os.Create(out); err != nil {
+			fmt.Fprintf(os.Stderr, "error: %v\n", err)
+			os.Exit(1)
+		}
+		w = f
+	}
+	err := getArtifact(ctx, pb.NewDendenClient(conn), ref, w)
+	if f != nil {
+		if closeErr := f.Close(); err == nil {
+			err = closeErr
+		}
+		if err != nil {
+			os.Remove(out)
+		}
+	}
+	if err != nil {
+		printGRPCError(err)
+		os.Exit(1)
+	}
+}
+
+// getArtifact writes the artifact ref to w and checks its content against
+// the digest in the ref.
+func getArtifact(ctx context.Context, client pb.DendenClient, ref string, w io.Writer) error {
+	chunks, err := client.GetArtifact(ctx, &pb.GetArtifactRequest{Ref: ref})
+	if err != nil {
+		return err
+	}
+	h := sha256.New()
+	w = io.MultiWriter(w, h)
+	for {
+		chunk, err := chunks.Recv()
+		if errors.Is(err, io.EOF) {
+			break
+		}
+		if err != nil {
+			return err
+		}
+		if _, err := w.Write(chunk.Data); err != nil {
+			return err
+		}
+	}
+	if got := "sha256:" + hex.EncodeToString(h.Sum(nil)); got != ref {
+		return fmt.Errorf("artifact %s arrived corrupted (content hashes to %s)", ref, got)
+	}
+	return nil
+}
+
+func dial() (*grpc.ClientConn, context.Context, context.CancelFunc) {
+	addr := resolveAddr(os.Getenv("DENDEN_ADDR"))
 
 	var ctx context.Context
 	var cancel context.CancelFunc
@@ -167,6 +862,17 @@ func dial() (*grpc.ClientConn, context.Context, context.CancelFunc) {
 	if ctx == nil {
 		ctx, cancel = context.WithCancel(context.Background())
 	}
+	// A parent's handler passes its own deadline down so nested requests
+	// give up when nobody is waiting for them anymore.
+	if ms, err := strconv.ParseInt(os.Getenv("DENDEN_DEADLINE"), 10, 64); err == nil && ms > 0 {
+		var cancelDeadline context.CancelFunc
+		ctx, cancelDeadline = context.WithDeadline(ctx, time.UnixMilli(ms))
+		parentCancel := cancel
+		cancel = func() {
+			cancelDeadline()
+			parentCancel()
+		}
+	}
 
 	conn, err := grpc.NewClient(addr,
 		grpc.WithTransportCredentials(insecure.NewCredentials()),
@@ -183,6 +889,29 @@ func dial() (*grpc.ClientConn, context.Context, context.CancelFunc) {
 	return conn, ctx, cancel
 }
 
+// resolveAddr picks the dial target from DENDEN_ADDR. The value may list
+// several listeners separated by commas (as reported by the server); a
+// unix: or unix-abstract: socket is preferred over TCP loopback.
+func resolveAddr(env string) string {
+	var first string
+	for _, a := range strings.Split(env, ",") {
+		a = strings.TrimSpace(a)
+		if a == "" {
+			continue
+		}
+		if strings.HasPrefix(a, "unix:") || strings.HasPrefix(a, "unix-abstract:") {
+			return a
+		}
+		if first == "" {
+			first = a
+		}
+	}
+	if first == "" {
+		return "127.0.0.1:9700"
+	}
+	return first
+}
+
 func printGRPCError(err error) {
 	if st, ok := status.FromError(err); ok {
 		fmt.Fprintf(os.Stderr, "error: %s: %s\n", st.Code(), st.Message())
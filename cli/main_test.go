@@ -2,17 +2,25 @@ package main
 
 import (
 	"context"
+	"crypto/sha256"
+	"encoding/hex"
 	"encoding/json"
+	"errors"
 	"fmt"
+	"io"
 	"net"
 	"os"
 	"os/exec"
 	"strings"
+	"sync"
 	"testing"
 	"time"
 
 	pb "github.com/strawpot/denden/cli/gen/denden"
 	"google.golang.org/grpc"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/credentials/insecure"
+	"google.golang.org/grpc/status"
 	"google.golang.org/protobuf/encoding/protojson"
 	"google.golang.org/protobuf/types/known/timestamppb"
 )
@@ -21,6 +29,8 @@ import (
 type echoServer struct {
 	pb.UnimplementedDendenServer
 	startTime time.Time
+	jobs      sync.Map // job_id -> *pb.DenDenResponse
+	artifacts sync.Map // ref -> []byte
 }
 
 func (s *echoServer) Send(ctx context.Context, req *pb.DenDenRequest) (*pb.DenDenResponse, error) {
@@ -65,6 +75,81 @@ func (s *echoServer) Send(ctx context.Context, req *pb.DenDenRequest) (*pb.DenDe
 	}
 }
 
+// Submit runs the request immediately and stores the result as a finished job.
+func (s *echoServer) Submit(ctx context.Context, req *pb.DenDenRequest) (*pb.JobHandle, error) {
+	resp, err := s.Send(ctx, req)
+	if err != nil {
+		return nil, err
+	}
+	jobID := "job_" + req.RequestId
+	s.jobs.Store(jobID, resp)
+	return &pb.JobHandle{JobId: jobID, RequestId: req.RequestId, State: pb.JobState_DONE}, nil
+}
+
+func (s *echoServer) Await(ctx context.Context, req *pb.AwaitRequest) (*pb.JobStatus, error) {
+	return s.collect(req.JobId), nil
+}
+
+func (s *echoServer) Poll(ctx context.Context, req *pb.PollRequest) (*pb.JobStatus, error) {
+	return s.collect(req.JobId), nil
+}
+
+func (s *echoServer) collect(jobID string) *pb.JobStatus {
+	resp, ok := s.jobs.LoadAndDelete(jobID)
+	if !ok {
+		return &pb.JobStatus{JobId: jobID, State: pb.JobState_NOT_FOUND}
+	}
+	return &pb.JobStatus{JobId: jobID, State: pb.JobState_DONE, Response: resp.(*pb.DenDenResponse)}
+}
+
+// SendStream emits one progress event, then the Send response.
+func (s *echoServer) SendStream(req *pb.DenDenRequest, stream grpc.ServerStreamingServer[pb.StreamEvent]) error {
+	progress := &pb.StreamEvent{
+		RequestId: req.RequestId,
+		Seq:       1,
+		Event:     &pb.StreamEvent_Progress{Progress: &pb.Progress{Message: "working", Fraction: 0.5}},
+	}
+	if err := stream.Send(progress); err != nil {
+		return err
+	}
+	resp, err := s.Send(stream.Context(), req)
+	if err != nil {
+		return err
+	}
+	return stream.Send(&pb.StreamEvent{
+		RequestId: req.RequestId,
+		Seq:       2,
+		Event:     &pb.StreamEvent_Response{Response: resp},
+	})
+}
+
+// SendBatch echoes every request in order.
+func (s *echoServer) SendBatch(ctx context.Context, req *pb.BatchRequest) (*pb.BatchResponse, error) {
+	out := &pb.BatchResponse{}
+	for _, r := range req.Requests {
+		resp, err := s.Send(ctx, r)
+		if err != nil {
+			return nil, err
+		}
+		out.Responses = append(out.Responses, resp)
+	}
+	return out, nil
+}
+
+// SendBatchStream echoes every request, last one first.
+func (s *echoServer) SendBatchStream(req *pb.BatchRequest, stream grpc.ServerStreamingServer[pb.BatchItem]) error {
+	for i := len(req.Requests) - 1; i >= 0; i-- {
+		resp, err := s.Send(stream.Context(), req.Requests[i])
+		if err != nil {
+			return err
+		}
+		if err := stream.Send(&pb.BatchItem{Index: int32(i), Response: resp}); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
 func (s *echoServer) Status(ctx context.Context, req *pb.StatusRequest) (*pb.StatusResponse, error) {
 	return &pb.StatusResponse{
 		UptimeSeconds: int64(time.Since(s.startTime).Seconds()),
@@ -72,6 +157,57 @@ func (s *echoServer) Status(ctx context.Context, req *pb.StatusRequest) (*pb.Sta
 	}, nil
 }
 
+// QueryTrace knows a single run, "run-1", and echoes the query back as
+// its node list.
+func (s *echoServer) QueryTrace(ctx context.Context, req *pb.TraceQuery) (*pb.TraceResult, error) {
+	if req.RunId != "run-1" {
+		return &pb.TraceResult{RunId: req.RunId}, nil
+	}
+	return &pb.TraceResult{
+		RunId: req.RunId,
+		Found: true,
+		Nodes: []*pb.TraceNode{{
+			AgentInstanceId: req.AgentInstanceId,
+			Depth:           int32(req.Kind),
+			Calls:           req.Limit,
+		}},
+	}, nil
+}
+
+// PutArtifact keeps an upload in memory under its digest.
+func (s *echoServer) PutArtifact(stream grpc.ClientStreamingServer[pb.ArtifactChunk, pb.ArtifactRef]) error {
+	var data []byte
+	for {
+		chunk, err := stream.Recv()
+		if errors.Is(err, io.EOF) {
+			break
+		}
+		if err != nil {
+			return err
+		}
+		data = append(data, chunk.Data...)
+	}
+	sum := sha256.Sum256(data)
+	ref := "sha256:" + hex.EncodeToString(sum[:])
+	s.artifacts.Store(ref, data)
+	return stream.SendAndClose(&pb.ArtifactRef{Ref: ref, Size: int64(len(data))})
+}
+
+// GetArtifact sends a stored artifact in two chunks.
+func (s *echoServer) GetArtifact(req *pb.GetArtifactRequest, stream grpc.ServerStreamingServer[pb.ArtifactChunk]) error {
+	v, ok := s.artifacts.Load(req.Ref)
+	if !ok {
+		return status.Errorf(codes.NotFound, "no artifact %s", req.Ref)
+	}
+	data := v.([]byte)
+	for _, part := range [][]byte{data[:len(data)/2], data[len(data)/2:]} {
+		if err := stream.Send(&pb.ArtifactChunk{Data: part}); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
 // startTestServer starts a gRPC server on a random port, returns the address.
 func startTestServer(t *testing.T) string {
 	t.Helper()
@@ -92,6 +228,12 @@ func startTestServer(t *testing.T) string {
 // runCLI builds and runs the CLI binary with the given args and env.
 func runCLI(t *testing.T, addr string, args ...string) (stdout, stderr string, exitCode int) {
 	t.Helper()
+	return runCLIWithInput(t, addr, "", args...)
+}
+
+// runCLIWithInput is runCLI with stdin set to input.
+func runCLIWithInput(t *testing.T, addr, input string, args ...string) (stdout, stderr string, exitCode int) {
+	t.Helper()
 
 	// Build the binary once.
 	binPath := t.TempDir() + "/denden"
@@ -103,6 +245,7 @@ func runCLI(t *testing.T, addr string, args ...string) (stdout, stderr string, e
 
 	cmd := exec.Command(binPath, args...)
 	cmd.Env = append(os.Environ(), "DENDEN_ADDR="+addr, "DENDEN_TIMEOUT=5s")
+	cmd.Stdin = strings.NewReader(input)
 
 	var outBuf, errBuf strings.Builder
 	cmd.Stdout = &outBuf
@@ -190,8 +333,10 @@ func TestStatus(t *testing.T) {
 	if err := json.Unmarshal([]byte(stdout), &result); err != nil {
 		t.Fatalf("failed to parse status JSON: %v", err)
 	}
-	if _, ok := result["uptime_seconds"]; !ok {
-		t.Error("missing uptime_seconds in status response")
+	for _, key := range []string{"uptime_seconds", "active_agents", "in_flight", "queue_depth", "payloads"} {
+		if _, ok := result[key]; !ok {
+			t.Errorf("missing %s in status response", key)
+		}
 	}
 }
 
@@ -370,5 +515,367 @@ func TestNoTimeoutByDefault(t *testing.T) {
 	}
 }
 
+func TestSubmitAndAwait(t *testing.T) {
+	addr := startTestServer(t)
+	stdout, _, exitCode := runCLI(t, addr, "submit", `{"askUser":{"question":"later"}}`)
+	if exitCode != 0 {
+		t.Fatalf("expected exit 0, got %d", exitCode)
+	}
+
+	var handle pb.JobHandle
+	if err := protojson.Unmarshal([]byte(stdout), &handle); err != nil {
+		t.Fatalf("failed to parse job handle: %v\nstdout: %s", err, stdout)
+	}
+	if !strings.HasPrefix(handle.JobId, "job_") {
+		t.Fatalf("unexpected job id: %s", handle.JobId)
+	}
+
+	stdout, _, exitCode = runCLI(t, addr, "await", handle.JobId)
+	if exitCode != 0 {
+		t.Fatalf("expected exit 0 from await, got %d", exitCode)
+	}
+	var st pb.JobStatus
+	if err := protojson.Unmarshal([]byte(stdout), &st); err != nil {
+		t.Fatalf("failed to parse job status: %v\nstdout: %s", err, stdout)
+	}
+	if st.State != pb.JobState_DONE {
+		t.Errorf("expected DONE, got %v", st.State)
+	}
+	if st.GetResponse().GetAskUserResult().GetText() != "later" {
+		t.Errorf("unexpected answer: %s", st.GetResponse().GetAskUserResult().GetText())
+	}
+
+	// Collected jobs are removed from the server.
+	_, _, exitCode = runCLI(t, addr, "poll", handle.JobId)
+	if exitCode != 1 {
+		t.Errorf("expected exit 1 for collected job, got %d", exitCode)
+	}
+}
+
+func TestSendStream(t *testing.T) {
+	addr := startTestServer(t)
+	stdout, _, exitCode := runCLI(t, addr, "send", "--stream", `{"delegate":{"delegateTo":"implementer","task":{"text":"build it"}}}`)
+	if exitCode != 0 {
+		t.Fatalf("expected exit 0, got %d", exitCode)
+	}
+
+	lines := strings.Split(strings.TrimSpace(stdout), "\n")
+	if len(lines) != 2 {
+		t.Fatalf("expected 2 NDJSON lines, got %d:\n%s", len(lines), stdout)
+	}
+	var first, last pb.StreamEvent
+	if err := protojson.Unmarshal([]byte(lines[0]), &first); err != nil {
+		t.Fatalf("failed to parse event: %v\nline: %s", err, lines[0])
+	}
+	if err := protojson.Unmarshal([]byte(lines[1]), &last); err != nil {
+		t.Fatalf("failed to parse event: %v\nline: %s", err, lines[1])
+	}
+	if first.GetProgress().GetMessage() != "working" {
+		t.Errorf("expected progress event first, got %v", &first)
+	}
+	if last.GetResponse().GetDelegateResult().GetSummary() != "build it" {
+		t.Errorf("unexpected final event: %v", &last)
+	}
+}
+
+func TestBatchJSONArray(t *testing.T) {
+	addr := startTestServer(t)
+	input := `[{"askUser":{"question":"one"}}, {"delegate":{"delegateTo":"x","task":{"text":"two"}}}]`
+	stdout, _, exitCode := runCLIWithInput(t, addr, input, "batch")
+	if exitCode != 0 {
+		t.Fatalf("expected exit 0, got %d", exitCode)
+	}
+
+	lines := strings.Split(strings.TrimSpace(stdout), "\n")
+	if len(lines) != 2 {
+		t.Fatalf("expected 2 lines, got %d:\n%s", len(lines), stdout)
+	}
+	var first, second pb.DenDenResponse
+	if err := protojson.Unmarshal([]byte(lines[0]), &first); err != nil {
+		t.Fatalf("failed to parse response: %v", err)
+	}
+	if err := protojson.Unmarshal([]byte(lines[1]), &second); err != nil {
+		t.Fatalf("failed to parse response: %v", err)
+	}
+	if first.GetAskUserResult().GetText() != "one" {
+		t.Errorf("unexpected first response: %v", &first)
+	}
+	if second.GetDelegateResult().GetSummary() != "two" {
+		t.Errorf("unexpected second response: %v", &second)
+	}
+	if first.RequestId == "" || first.RequestId == second.RequestId {
+		t.Errorf("expected distinct auto-filled request ids, got %q and %q", first.RequestId, second.RequestId)
+	}
+}
+
+func TestBatchNDJSONStream(t *testing.T) {
+	addr := startTestServer(t)
+	input := "{\"askUser\":{\"question\":\"a\"}}\n{\"askUser\":{\"question\":\"b\"}}\n"
+	stdout, _, exitCode := runCLIWithInput(t, addr, input, "batch", "--stream", "--parallel", "2")
+	if exitCode != 0 {
+		t.Fatalf("expected exit 0, got %d", exitCode)
+	}
+
+	lines := strings.Split(strings.TrimSpace(stdout), "\n")
+	if len(lines) != 2 {
+		t.Fatalf("expected 2 lines, got %d:\n%s", len(lines), stdout)
+	}
+	var item pb.BatchItem
+	if err := protojson.Unmarshal([]byte(lines[0]), &item); err != nil {
+		t.Fatalf("failed to parse batch item: %v", err)
+	}
+	if item.Index != 1 || item.GetResponse().GetAskUserResult().GetText() != "b" {
+		t.Errorf("unexpected first streamed item: %v", &item)
+	}
+}
+
+func TestSplitRequests(t *testing.T) {
+	for _, input := range []string{
+		`[{"a":1},{"b":2}]`,
+		"{\"a\":1}\n{\"b\":2}\n",
+		`  {"a":1} {"b":2}`,
+	} {
+		raws, err := splitRequests([]byte(input))
+		if err != nil {
+			t.Fatalf("splitRequests(%q): %v", input, err)
+		}
+		if len(raws) != 2 {
+			t.Errorf("splitRequests(%q): expected 2 requests, got %d", input, len(raws))
+		}
+	}
+	if _, err := splitRequests([]byte(`{"a":`)); err == nil {
+		t.Error("expected error for truncated input")
+	}
+}
+
+func TestRawJSONExtra(t *testing.T) {
+	raw := `{"delegate":{"delegateTo":"reviewer","task":{"text":"t","extra":{"id": 9007199254740993, "tag":"<a>"}}}}`
+	if req := buildRequest(raw); req.GetDelegate().Task.ExtraEncoded != nil {
+		t.Error("extra should stay a Struct without DENDEN_RAW_JSON")
+	}
+
+	t.Setenv("DENDEN_RAW_JSON", "1")
+	req := buildRequest(raw)
+	task := req.GetDelegate().Task
+	if task.Extra != nil || task.Text != "t" || req.GetDelegate().DelegateTo != "reviewer" {
+		t.Fatalf("unexpected task: %v", task)
+	}
+	if got := string(task.ExtraEncoded.GetData()); got != `{"id":9007199254740993,"tag":"<a>"}` {
+		t.Errorf("extraEncoded data = %s", got)
+	}
+	if task.ExtraEncoded.GetContentType() != "application/json" {
+		t.Errorf("content type = %q", task.ExtraEncoded.GetContentType())
+	}
+	if req := buildRequest(`{"askUser":{"question":"q"}}`); req.GetAskUser().Question != "q" {
+		t.Error("requests without extra should parse as usual")
+	}
+}
+
+func TestInlineEncoded(t *testing.T) {
+	resp := &pb.DenDenResponse{
+		RequestId: "req-1",
+		Result: &pb.DenDenResponse_DelegateResult{DelegateResult: &pb.DelegateResult{
+			Summary:       "done",
+			OutputEncoded: &pb.EncodedValue{ContentType: "application/json", Data: []byte(`{"id":9007199254740993}`)},
+		}},
+	}
+	out, err := protojson.Marshal(resp)
+	if err != nil {
+		t.Fatal(err)
+	}
+	got := string(inlineEncoded(out, ""))
+	if !strings.Contains(got, `"output":{"id":9007199254740993}`) || strings.Contains(got, "outputEncoded") {
+		t.Errorf("output not inlined: %s", got)
+	}
+	if !strings.Contains(got, `"summary":"done"`) {
+		t.Errorf("other fields lost: %s", got)
+	}
+
+	resp.GetDelegateResult().OutputEncoded.ContentType = "application/msgpack"
+	out, _ = protojson.Marshal(resp)
+	if got := string(inlineEncoded(out, "")); !strings.Contains(got, "outputEncoded") {
+		t.Errorf("msgpack output should stay encoded: %s", got)
+	}
+}
+
+func TestResolveAddr(t *testing.T) {
+	cases := map[string]string{
+		"":                                    "127.0.0.1:9700",
+		"127.0.0.1:9800":                      "127.0.0.1:9800",
+		"127.0.0.1:9800,unix:/tmp/d.sock":     "unix:/tmp/d.sock",
+		" unix-abstract:denden , 127.0.0.1:1": "unix-abstract:denden",
+	}
+	for env, want := range cases {
+		if got := resolveAddr(env); got != want {
+			t.Errorf("resolveAddr(%q) = %q, want %q", env, got, want)
+		}
+	}
+}
+
+func TestSendOverUnixSocket(t *testing.T) {
+	sock := t.TempDir() + "/denden.sock"
+	lis, err := net.Listen("unix", sock)
+	if err != nil {
+		t.Fatalf("failed to listen: %v", err)
+	}
+	srv := grpc.NewServer()
+	pb.RegisterDendenServer(srv, &echoServer{startTime: time.Now()})
+	go srv.Serve(lis)
+	t.Cleanup(func() { srv.Stop() })
+
+	stdout, _, exitCode := runCLI(t, "127.0.0.1:1,unix:"+sock, "send", `{"askUser":{"question":"over uds"}}`)
+	if exitCode != 0 {
+		t.Fatalf("expected exit 0, got %d", exitCode)
+	}
+	var resp pb.DenDenResponse
+	if err := protojson.Unmarshal([]byte(stdout), &resp); err != nil {
+		t.Fatalf("failed to parse response: %v\nstdout: %s", err, stdout)
+	}
+	if resp.GetAskUserResult().GetText() != "over uds" {
+		t.Errorf("unexpected answer: %s", resp.GetAskUserResult().GetText())
+	}
+}
+
+func TestTrace(t *testing.T) {
+	addr := startTestServer(t)
+	stdout, stderr, exitCode := runCLI(t, addr, "trace", "run-1", "--agent", "a1", "--slowest", "3")
+	if exitCode != 0 {
+		t.Fatalf("expected exit 0, got %d\nstderr: %s", exitCode, stderr)
+	}
+	var result pb.TraceResult
+	if err := protojson.Unmarshal([]byte(stdout), &result); err != nil {
+		t.Fatalf("failed to parse trace result: %v\nstdout: %s", err, stdout)
+	}
+	node := result.Nodes[0]
+	if node.AgentInstanceId != "a1" || node.Depth != int32(pb.TraceQueryKind_SLOWEST_BRANCHES) || node.Calls != 3 {
+		t.Errorf("query not forwarded: %v", node)
+	}
+
+	_, _, exitCode = runCLI(t, addr, "trace", "other-run")
+	if exitCode != 1 {
+		t.Errorf("expected exit 1 for unknown run, got %d", exitCode)
+	}
+}
+
 // Suppress unused import warnings.
 var _ = fmt.Sprintf
+
+func TestRetryDelay(t *testing.T) {
+	half := func() float64 { return 0.5 }
+	cases := []struct {
+		hintMs  int64
+		attempt int
+		want    time.Duration
+	}{
+		{0, 0, 187500 * time.Microsecond}, // default 250ms: 125ms + 62.5ms
+		{100, 0, 75 * time.Millisecond},
+		{100, 2, 300 * time.Millisecond},
+		{100, 20, 7500 * time.Millisecond}, // capped at 10s
+	}
+	for _, c := range cases {
+		if got := retryDelay(c.hintMs, c.attempt, half); got != c.want {
+			t.Errorf("retryDelay(%d, %d) = %v, want %v", c.hintMs, c.attempt, got, c.want)
+		}
+	}
+	if got := retryDelay(100, 0, func() float64 { return 0 }); got != 50*time.Millisecond {
+		t.Errorf("zero jitter: got %v, want 50ms", got)
+	}
+}
+
+// overloadServer refuses its first `refusals` sends as overloaded.
+type overloadServer struct {
+	echoServer
+	mu       sync.Mutex
+	refusals int
+	calls    int
+}
+
+func (s *overloadServer) Send(ctx context.Context, req *pb.DenDenRequest) (*pb.DenDenResponse, error) {
+	s.mu.Lock()
+	s.calls++
+	refuse := s.calls <= s.refusals
+	s.mu.Unlock()
+	if refuse {
+		return &pb.DenDenResponse{
+			DendenVersion: version,
+			RequestId:     req.RequestId,
+			Status:        pb.ResponseStatus_ERROR,
+			Error: &pb.ErrorDetail{
+				Code: errResourceExhausted, Message: "overloaded", Retryable: true, RetryAfterMs: 1,
+			},
+		}, nil
+	}
+	return s.echoServer.Send(ctx, req)
+}
+
+func TestSendRetriesWhenOverloaded(t *testing.T) {
+	lis, err := net.Listen("tcp", "127.0.0.1:0")
+	if err != nil {
+		t.Fatalf("listen: %v", err)
+	}
+	srv := grpc.NewServer()
+	overload := &overloadServer{refusals: 2}
+	pb.RegisterDendenServer(srv, overload)
+	go srv.Serve(lis)
+	t.Cleanup(srv.Stop)
+
+	conn, err := grpc.NewClient(lis.Addr().String(), grpc.WithTransportCredentials(insecure.NewCredentials()))
+	if err != nil {
+		t.Fatalf("dial: %v", err)
+	}
+	defer conn.Close()
+	client := pb.NewDendenClient(conn)
+	req := &pb.DenDenRequest{
+		RequestId: "r1",
+		Payload:   &pb.DenDenRequest_AskUser{AskUser: &pb.AskUserPayload{Question: "hi"}},
+	}
+
+	resp, err := sendWithRetry(context.Background(), client, req, func() float64 { return 0 })
+	if err != nil || resp.Status != pb.ResponseStatus_OK {
+		t.Fatalf("expected OK after retries, got %v, %v", resp, err)
+	}
+	if overload.calls != 3 {
+		t.Errorf("expected 3 calls, got %d", overload.calls)
+	}
+
+	t.Setenv("DENDEN_RETRIES", "0")
+	overload.calls, overload.refusals = 0, 1
+	resp, _ = sendWithRetry(context.Background(), client, req, func() float64 { return 0 })
+	if !overloaded(resp) || overload.calls != 1 {
+		t.Errorf("expected one refused call with retries disabled, got %d calls", overload.calls)
+	}
+}
+
+func TestPutAndGetArtifact(t *testing.T) {
+	addr := startTestServer(t)
+	content := strings.Repeat("artifact bytes\n", 1000)
+	stdout, stderr, exitCode := runCLIWithInput(t, addr, content, "put", "-")
+	if exitCode != 0 {
+		t.Fatalf("expected exit 0, got %d\nstderr: %s", exitCode, stderr)
+	}
+	var ref pb.ArtifactRef
+	if err := protojson.Unmarshal([]byte(stdout), &ref); err != nil {
+		t.Fatalf("failed to parse ref: %v\nstdout: %s", err, stdout)
+	}
+	sum := sha256.Sum256([]byte(content))
+	if ref.Ref != "sha256:"+hex.EncodeToString(sum[:]) || ref.Size != int64(len(content)) {
+		t.Errorf("unexpected ref %v", &ref)
+	}
+
+	stdout, stderr, exitCode = runCLI(t, addr, "get", ref.Ref)
+	if exitCode != 0 || stdout != content {
+		t.Fatalf("get: exit %d, %d bytes\nstderr: %s", exitCode, len(stdout), stderr)
+	}
+	out := t.TempDir() + "/artifact"
+	if _, stderr, exitCode = runCLI(t, addr, "get", ref.Ref, "-o", out); exitCode != 0 {
+		t.Fatalf("get -o: exit %d\nstderr: %s", exitCode, stderr)
+	}
+	if got, err := os.ReadFile(out); err != nil || string(got) != content {
+		t.Errorf("get -o wrote %d bytes, %v", len(got), err)
+	}
+
+	_, stderr, exitCode = runCLI(t, addr, "get", "sha256:"+strings.Repeat("0", 64))
+	if exitCode != 1 || !strings.Contains(stderr, "NotFound") {
+		t.Errorf("expected NotFound, got exit %d: %s", exitCode, stderr)
+	}
+}
@@ -1,23 +1,111 @@
-from denden.server import (
-    DenDenServer,
-    RequestHandler,
-    ok_response,
-    denied_response,
-    error_response,
-    DENY_ROLE_NOT_ALLOWED,
-    DENY_DEPTH_LIMIT,
-    DENY_BUDGET_EXCEEDED,
-    DENY_TOOLS_NOT_ALLOWED,
-    DENY_POLICY_REQUIRES_HUMAN,
-    ERR_SUBAGENT_TIMEOUT,
-    ERR_SUBAGENT_FAILURE,
-)
-from denden.modules.base import Module
+"""denden server library.
+
+The names below are imported on first use, so ``import denden`` (and the
+``denden-server`` entry point) only pays for the parts actually used.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "DenDenServer": "denden.server",
+    "RequestHandler": "denden.server",
+    "ok_response": "denden.server",
+    "denied_response": "denden.server",
+    "error_response": "denden.server",
+    "DENY_ROLE_NOT_ALLOWED": "denden.server",
+    "DENY_DEPTH_LIMIT": "denden.server",
+    "DENY_BUDGET_EXCEEDED": "denden.server",
+    "DENY_TOOLS_NOT_ALLOWED": "denden.server",
+    "DENY_POLICY_REQUIRES_HUMAN": "denden.server",
+    "ERR_SUBAGENT_TIMEOUT": "denden.server",
+    "ERR_SUBAGENT_FAILURE": "denden.server",
+    "ERR_RESOURCE_EXHAUSTED": "denden.server",
+    "Admission": "denden.admission",
+    "ArtifactStore": "denden.artifacts",
+    "AsyncDenDenServer": "denden.aio",
+    "AsyncRequestHandler": "denden.aio",
+    "AsyncClient": "denden.client",
+    "Client": "denden.client",
+    "BoundedCache": "denden.cache",
+    "DelegateCache": "denden.cache",
+    "ResponseCache": "denden.cache",
+    "Journal": "denden.journal",
+    "Lane": "denden.lanes",
+    "ProcessPool": "denden.procpool",
+    "RequestContext": "denden.context",
+    "RequestCancelled": "denden.context",
+    "current_context": "denden.context",
+    "ServerMetrics": "denden.metrics",
+    "TraceIndex": "denden.traces",
+    "Module": "denden.modules.base",
+}
+
+if TYPE_CHECKING:
+    from denden.admission import Admission
+    from denden.artifacts import ArtifactStore
+    from denden.aio import AsyncDenDenServer, AsyncRequestHandler
+    from denden.cache import BoundedCache, DelegateCache, ResponseCache
+    from denden.client import AsyncClient, Client
+    from denden.context import RequestCancelled, RequestContext, current_context
+    from denden.journal import Journal
+    from denden.lanes import Lane
+    from denden.metrics import ServerMetrics
+    from denden.modules.base import Module
+    from denden.procpool import ProcessPool
+    from denden.server import (
+        DENY_BUDGET_EXCEEDED,
+        DENY_DEPTH_LIMIT,
+        DENY_POLICY_REQUIRES_HUMAN,
+        DENY_ROLE_NOT_ALLOWED,
+        DENY_TOOLS_NOT_ALLOWED,
+        ERR_RESOURCE_EXHAUSTED,
+        ERR_SUBAGENT_FAILURE,
+        ERR_SUBAGENT_TIMEOUT,
+        DenDenServer,
+        RequestHandler,
+        denied_response,
+        error_response,
+        ok_response,
+    )
+    from denden.traces import TraceIndex
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'denden' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
+
 
 __all__ = [
     "DenDenServer",
+    "AsyncDenDenServer",
     "RequestHandler",
+    "AsyncRequestHandler",
+    "Client",
+    "AsyncClient",
     "Module",
+    "Admission",
+    "ArtifactStore",
+    "BoundedCache",
+    "DelegateCache",
+    "ResponseCache",
+    "Journal",
+    "Lane",
+    "ProcessPool",
+    "RequestContext",
+    "RequestCancelled",
+    "current_context",
+    "ServerMetrics",
+    "TraceIndex",
     "ok_response",
     "denied_response",
     "error_response",
@@ -28,4 +116,5 @@ __all__ = [
     "DENY_POLICY_REQUIRES_HUMAN",
     "ERR_SUBAGENT_TIMEOUT",
     "ERR_SUBAGENT_FAILURE",
+    "ERR_RESOURCE_EXHAUSTED",
 ]
@@ -4,17 +4,102 @@ from __future__ import annotations
 import argparse
 import logging
 import os
+import sys
+import time
 
 
-def main() -> None:
+class _StartupProfile:
+    """Wall-clock time of each startup phase, for ``--startup-profile``."""
+
+    def __init__(self) -> None:
+        self._start = self._last = time.perf_counter()
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self) -> str:
+        total = self._last - self._start
+        lines = [f"  {phase:<40} {seconds * 1000:8.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"  {'total (from main)':<40} {total * 1000:8.1f} ms")
+        return "startup profile:\n" + "\n".join(lines)
+
+
+def _lazy_module(value: str) -> tuple[str, list[str]]:
+    path, sep, methods = value.partition("=")
+    names = [m.strip() for m in methods.split(",") if m.strip()]
+    if not sep or not path or not names:
+        raise argparse.ArgumentTypeError("expected MODULE=METHOD[,METHOD...]")
+    return path, names
+
+
+def _lane(value: str) -> tuple[str, int, int | None]:
+    name, sep, limits = value.partition("=")
+    concurrency, _, queued = limits.partition(":")
+    try:
+        lane = (name, int(concurrency), int(queued) if queued else None)
+    except ValueError:
+        lane = None
+    if not sep or not name or lane is None or lane[1] < 1 or (lane[2] or 0) < 0:
+        raise argparse.ArgumentTypeError("expected NAME=CONCURRENCY[:MAX_QUEUED], e.g. delegate=8:32")
+    return lane
+
+
+def _route(value: str) -> tuple[str, str]:
+    method, sep, lane = value.partition("=")
+    if not sep or not method or not lane:
+        raise argparse.ArgumentTypeError("expected METHOD=LANE, e.g. recall=memory")
+    return method, lane
+
+
+def _payload_timeout(value: str) -> tuple[str, float]:
+    payload, sep, seconds = value.partition("=")
+    try:
+        timeout = float(seconds)
+    except ValueError:
+        timeout = 0.0
+    if not sep or not payload or timeout <= 0:
+        raise argparse.ArgumentTypeError("expected PAYLOAD=SECONDS, e.g. delegate=600")
+    return payload, timeout
+
+
+def main(argv: list[str] | None = None) -> None:
+    profile = _StartupProfile()
+    argv = sys.argv[1:] if argv is None else argv
+    command_argv = list(argv)
+    if argv[:1] == ["replay"]:
+        from denden.replay import main as replay_main
+
+        sys.exit(replay_main(argv[1:]))
+    record = argv[:1] == ["record"]
+    if record:
+        argv = argv[1:]
+
     parser = argparse.ArgumentParser(
-        prog="denden-server",
-        description="denden communication server",
+        prog="denden-server record" if record else "denden-server",
+        description=(
+            "denden server that records its traffic for 'denden-server replay'"
+            if record else "denden communication server"
+        ),
+        epilog=None if record else (
+            "'denden-server record DIR ...' serves while recording traffic to DIR; "
+            "'denden-server replay DIR ...' re-sends it (see --help of each)"
+        ),
     )
+    if record:
+        parser.add_argument(
+            "directory",
+            help="journal directory to record requests, responses and their timing in",
+        )
     parser.add_argument(
         "--addr",
         default=os.environ.get("DENDEN_ADDR", "127.0.0.1:9700"),
-        help="listen address (default: 127.0.0.1:9700)",
+        help=(
+            "listen address: host:port, unix:PATH or unix-abstract:NAME; "
+            "comma-separate several to listen on all of them (default: 127.0.0.1:9700)"
+        ),
     )
     parser.add_argument(
         "--load-module",
@@ -23,36 +108,336 @@ def main() -> None:
         dest="modules",
         help="Python module to load (can be repeated)",
     )
+    parser.add_argument(
+        "--lazy-module",
+        type=_lazy_module,
+        action="append",
+        default=[],
+        dest="lazy_modules",
+        metavar="MODULE=METHOD[,METHOD...]",
+        help="import MODULE on the first request for one of its METHODs (can be repeated)",
+    )
+    parser.add_argument(
+        "--process-module",
+        action="append",
+        default=[],
+        dest="process_modules",
+        metavar="MODULE",
+        help=(
+            "load MODULE into a pool of worker processes and run its handlers there, "
+            "for CPU-bound handlers (can be repeated)"
+        ),
+    )
+    parser.add_argument(
+        "--process-workers",
+        type=int,
+        metavar="N",
+        help="size of the --process-module pool (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--asyncio",
+        action="store_true",
+        help="serve on grpc.aio (handlers may be async def coroutines)",
+    )
+    parser.add_argument(
+        "--response-cache",
+        action="store_true",
+        help="replay cached responses for retried request_ids instead of re-running handlers",
+    )
+    parser.add_argument(
+        "--delegate-cache",
+        choices=["global", "run"],
+        default=None,
+        help="reuse results of identical delegate payloads, shared server-wide or per trace run_id",
+    )
+    parser.add_argument(
+        "--delegate-cache-exclude",
+        action="append",
+        default=[],
+        metavar="ROLE",
+        help="delegate_to role that always bypasses the delegate cache (can be repeated)",
+    )
+    parser.add_argument(
+        "--batch-parallelism",
+        type=int,
+        default=16,
+        metavar="N",
+        help="max requests of one SendBatch dispatched at once (default: 16)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=_payload_timeout,
+        action="append",
+        default=[],
+        dest="timeouts",
+        metavar="PAYLOAD=SECONDS",
+        help="answer ERR_SUBAGENT_TIMEOUT and cancel handlers of PAYLOAD running longer (can be repeated)",
+    )
+    parser.add_argument(
+        "--lane",
+        type=_lane,
+        action="append",
+        default=[],
+        dest="lanes",
+        metavar="NAME=CONCURRENCY[:MAX_QUEUED]",
+        help=(
+            "run at most CONCURRENCY handlers of payload type NAME at once and queue "
+            "up to MAX_QUEUED more, refusing the rest (can be repeated)"
+        ),
+    )
+    parser.add_argument(
+        "--route",
+        type=_route,
+        action="append",
+        default=[],
+        dest="routes",
+        metavar="METHOD=LANE",
+        help="run METHOD's handlers in LANE instead of the lane named after it (can be repeated)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        metavar="N",
+        help="refuse requests with a retryable ERR_RESOURCE_EXHAUSTED while N are in flight",
+    )
+    parser.add_argument(
+        "--max-in-flight-per-run",
+        type=int,
+        metavar="N",
+        help="like --max-in-flight, counted per trace run_id",
+    )
+    parser.add_argument(
+        "--max-in-flight-per-agent",
+        type=int,
+        metavar="N",
+        help="like --max-in-flight, counted per trace agent_instance_id",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=0.25,
+        metavar="SECONDS",
+        help="back-off hint sent with refused requests (default: 0.25)",
+    )
+    parser.add_argument(
+        "--metrics-addr",
+        default=os.environ.get("DENDEN_METRICS_ADDR"),
+        metavar="HOST:PORT",
+        help="serve Prometheus metrics over HTTP at /metrics on this address",
+    )
+    parser.add_argument(
+        "--journal",
+        default=os.environ.get("DENDEN_JOURNAL"),
+        metavar="DIR",
+        help=(
+            "append every request and response to a journal in DIR; on start, "
+            "responses recorded there warm --response-cache"
+        ),
+    )
+    parser.add_argument(
+        "--artifacts",
+        default=os.environ.get("DENDEN_ARTIFACTS"),
+        metavar="DIR",
+        help="serve PutArtifact/GetArtifact from a content-addressed store in DIR",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "serve from N processes sharing the TCP port (SO_REUSEPORT), each loading "
+            "the same modules; crashed workers are restarted (default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="print how long imports, module loading and binding took",
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
         help="enable debug logging",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if record:
+        args.journal = args.directory
+
+    worker = None
+    if args.workers != 1:
+        from denden import workers
+
+        if args.workers < 1:
+            parser.error("--workers must be at least 1")
+        if args.journal:
+            parser.error("--journal cannot be shared by --workers processes")
+        worker = workers.worker_from_env()
 
     logging.basicConfig(
         level=logging.DEBUG if args.verbose else logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        format=(
+            "%(asctime)s [%(levelname)s] %(name)s: %(message)s" if worker is None
+            else f"%(asctime)s [%(levelname)s] worker {worker.index} %(name)s: %(message)s"
+        ),
     )
+    profile.mark("parse arguments")
 
-    from denden.server import DenDenServer
+    if args.workers != 1 and worker is None:
+        try:
+            supervisor = workers.Supervisor(command_argv, args.workers, args.addr)
+            sys.exit(supervisor.run())
+        except ValueError as e:
+            parser.error(str(e))
 
-    server = DenDenServer(addr=args.addr)
+    addr = args.addr
+    peers: list[str] = []
+    if worker is not None:
+        addr = f"{worker.addr},{worker.status_addr}"
+        peers = worker.peers()
+        worker.watch_supervisor()
 
-    for mod_path in args.modules:
-        import importlib
-        mod = importlib.import_module(mod_path)
-        if hasattr(mod, "module"):
-            instance = mod.module
-        elif hasattr(mod, "create_module"):
-            instance = mod.create_module()
-        else:
-            raise ValueError(
-                f"module {mod_path} must expose 'module' or 'create_module'"
+    response_cache = None
+    if args.response_cache:
+        from denden.cache import ResponseCache
+
+        response_cache = ResponseCache()
+
+    delegate_cache = None
+    if args.delegate_cache:
+        from denden.cache import DelegateCache
+
+        delegate_cache = DelegateCache(
+            per_run=args.delegate_cache == "run",
+            exclude_roles=args.delegate_cache_exclude,
+        )
+
+    journal = None
+    if args.journal:
+        from denden import journal as journal_mod
+
+        state = journal_mod.recover(args.journal)
+        if state.in_flight:
+            logging.getLogger("denden").warning(
+                "journal: %d request(s) were in flight when the server last stopped",
+                len(state.in_flight),
             )
-        for method_name, handler in instance.methods().items():
-            server._servicer.set_handler(method_name, handler)
-        instance.on_load(server)
+        if response_cache is not None:
+            response_cache.preload(state.responses)
+        journal = journal_mod.Journal(args.journal)
+
+    if response_cache is not None or delegate_cache is not None or journal is not None:
+        profile.mark("set up caches and journal")
+
+    lanes = []
+    if args.lanes:
+        from denden.lanes import Lane
+
+        lanes = [Lane(name, concurrency, queued) for name, concurrency, queued in args.lanes]
+        known = {lane.name for lane in lanes}
+        for method, lane in args.routes:
+            if lane not in known:
+                parser.error(f"--route {method}={lane}: no --lane named {lane!r}")
+    elif args.routes:
+        parser.error("--route needs a --lane to route to")
+
+    admission = None
+    limits = (args.max_in_flight, args.max_in_flight_per_run, args.max_in_flight_per_agent)
+    if any(limit is not None for limit in limits):
+        from denden.admission import Admission
+
+        try:
+            admission = Admission(*limits, retry_after=args.retry_after)
+        except ValueError as e:
+            parser.error(str(e))
+
+    artifacts = None
+    if args.artifacts:
+        from denden.artifacts import ArtifactStore
+
+        artifacts = ArtifactStore(args.artifacts)
+
+    if args.asyncio:
+        from denden.aio import AsyncDenDenServer
+
+        profile.mark("import denden.aio")
+        server = AsyncDenDenServer(
+            addr=addr,
+            response_cache=response_cache,
+            delegate_cache=delegate_cache,
+            batch_parallelism=args.batch_parallelism,
+            journal=journal,
+            timeouts=dict(args.timeouts),
+            lanes=lanes,
+            admission=admission,
+            peers=peers,
+            artifacts=artifacts,
+        )
+    else:
+        from denden.server import DenDenServer
+
+        profile.mark("import denden.server")
+        server = DenDenServer(
+            addr=addr,
+            response_cache=response_cache,
+            delegate_cache=delegate_cache,
+            batch_parallelism=args.batch_parallelism,
+            journal=journal,
+            timeouts=dict(args.timeouts),
+            lanes=lanes,
+            admission=admission,
+            peers=peers,
+            artifacts=artifacts,
+        )
+
+    if args.modules or args.lazy_modules:
+        from denden.modules import loader
+
+        for mod_path in args.modules:
+            loader.register(server, loader.load(mod_path))
+            profile.mark(f"load {mod_path}")
+        for mod_path, methods in args.lazy_modules:
+            loader.register(server, loader.LazyModule(mod_path, methods))
+        if args.lazy_modules:
+            profile.mark("register lazy modules")
+
+    if args.process_modules:
+        from denden.modules import loader
+        from denden.procpool import ProcessPool
+
+        try:
+            pool = ProcessPool(args.process_workers, args.process_modules)
+        except ValueError as e:
+            parser.error(f"--process-workers: {e}")
+        pool.start()
+        for mod_path in args.process_modules:
+            loader.register(server, pool.module(mod_path))
+        server.on_stop(pool.shutdown)
+        profile.mark("start process pool")
+    elif args.process_workers is not None:
+        parser.error("--process-workers needs a --process-module")
+
+    for method, lane in args.routes:
+        server.route(method, lane)
+
+    if args.metrics_addr:
+        from denden.metrics import start_http_server
+
+        metrics_addr = args.metrics_addr
+        if worker is not None:
+            # Workers cannot share the HTTP port; each takes the next one.
+            host, port = metrics_addr.rsplit(":", 1)
+            if int(port):
+                metrics_addr = f"{host}:{int(port) + worker.index}"
+        start_http_server(server.metrics, metrics_addr)
+        profile.mark("start metrics endpoint")
+
+    if args.startup_profile:
+        def _report() -> None:
+            profile.mark("bind and start")
+            print(profile.report(), file=sys.stderr, flush=True)
+
+        server.on_start(_report)
 
     server.run()
 
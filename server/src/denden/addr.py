@@ -0,0 +1,95 @@
+"""Listen address handling shared by the threaded and asyncio servers.
+
+An address is ``host:port`` (TCP), ``unix:PATH`` (a socket file) or
+``unix-abstract:NAME`` (Linux abstract namespace, nothing on disk).
+Several listeners can be given as a list or one comma-separated string,
+e.g. ``"unix:/tmp/denden.sock,127.0.0.1:9700"``.
+"""
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import socket
+import stat
+from typing import Iterable, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+Addr = Union[str, Sequence[str]]
+
+
+def split_addrs(addr: Addr) -> list[str]:
+    """Normalize *addr* into a list of individual listen addresses."""
+    parts: Iterable[str] = addr.split(",") if isinstance(addr, str) else addr
+    addrs = [a.strip() for a in parts if a.strip()]
+    if not addrs:
+        raise ValueError("at least one listen address is required")
+    return addrs
+
+
+def unix_socket_path(addr: str) -> str | None:
+    """Filesystem path of a ``unix:`` address, or ``None`` for other kinds."""
+    if not addr.startswith("unix:"):
+        return None
+    path = addr[len("unix:"):]
+    if path.startswith("//"):  # unix:///abs/path
+        path = path[2:]
+    return path
+
+
+def _remove_stale_socket(path: str) -> None:
+    # A crashed server leaves its socket file behind and bind() then fails
+    # with EADDRINUSE. Remove it only if nobody is accepting on it.
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError as e:
+        if e.errno == errno.ECONNREFUSED:
+            logger.info("removing stale socket %s", path)
+            os.unlink(path)
+    finally:
+        probe.close()
+
+
+def bind_all(server, addrs: Sequence[str]) -> list[str]:
+    """Add an insecure port on *server* for every address.
+
+    Works for both ``grpc.Server`` and ``grpc.aio.Server``. Returns the
+    bound addresses, with TCP port 0 replaced by the actual port.
+    """
+    bound = []
+    for addr in addrs:
+        path = unix_socket_path(addr)
+        if path is not None:
+            _remove_stale_socket(path)
+        try:
+            port = server.add_insecure_port(addr)
+        except RuntimeError:
+            port = 0
+        if port == 0:
+            raise RuntimeError(f"failed to bind to {addr}")
+        if addr.startswith(("unix:", "unix-abstract:")):
+            bound.append(addr)
+        else:
+            host = addr.rsplit(":", 1)[0]
+            bound.append(f"{host}:{port}")
+    return bound
+
+
+def cleanup(addrs: Iterable[str]) -> None:
+    """Remove socket files left behind by ``unix:`` listeners."""
+    for addr in addrs:
+        path = unix_socket_path(addr)
+        if path is None:
+            continue
+        try:
+            if stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
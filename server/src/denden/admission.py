@@ -0,0 +1,98 @@
+"""Admission control: bounded in-flight requests, globally and per caller.
+
+A server with thousands of worker threads accepts almost anything, so
+under overload it keeps taking requests and grows in memory long before
+anything pushes back. :class:`Admission` sits in front of the handlers
+and refuses a request right away once too many are in flight, either in
+total, in the request's run (``trace.run_id``) or from its agent
+(``trace.agent_instance_id``)::
+
+    server = DenDenServer(admission=Admission(
+        max_in_flight=2_000, per_run=500, per_agent=50,
+    ))
+
+A refused request is answered with a retryable ``ERR_RESOURCE_EXHAUSTED``
+whose ``retry_after_ms`` tells the client how long to back off. The CLI
+retries such responses with jittered exponential backoff. A refusal
+runs no handler and takes one lock acquisition and a few dict lookups.
+"""
+from __future__ import annotations
+
+import threading
+
+from denden.gen import denden_pb2
+from denden.server import ERR_RESOURCE_EXHAUSTED, error_response
+
+
+class Admission:
+    """Limits on requests in flight; ``None`` leaves a limit off.
+
+    *retry_after* is the back-off hint in seconds sent with refusals.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int | None = None,
+        per_run: int | None = None,
+        per_agent: int | None = None,
+        retry_after: float = 0.25,
+    ) -> None:
+        for name, limit in (
+            ("max_in_flight", max_in_flight), ("per_run", per_run), ("per_agent", per_agent),
+        ):
+            if limit is not None and limit < 1:
+                raise ValueError(f"{name} must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.per_run = per_run
+        self.per_agent = per_agent
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.refused = 0
+        self._runs: dict[str, int] = {}
+        self._agents: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def admit(self, request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse | None:
+        """Count *request* in flight and return ``None``, or return the
+        refusal to answer it with. Pair every admission with :meth:`release`."""
+        run = request.trace.run_id if self.per_run is not None else ""
+        agent = request.trace.agent_instance_id if self.per_agent is not None else ""
+        with self._lock:
+            if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+                reason = f"server has {self.in_flight} requests in flight"
+            elif run and self._runs.get(run, 0) >= self.per_run:
+                reason = f"run {run} has {self.per_run} requests in flight"
+            elif agent and self._agents.get(agent, 0) >= self.per_agent:
+                reason = f"agent {agent} has {self.per_agent} requests in flight"
+            else:
+                self.in_flight += 1
+                if run:
+                    self._runs[run] = self._runs.get(run, 0) + 1
+                if agent:
+                    self._agents[agent] = self._agents.get(agent, 0) + 1
+                return None
+            self.refused += 1
+        response = error_response(
+            request.request_id, ERR_RESOURCE_EXHAUSTED, f"overloaded: {reason}", retryable=True,
+        )
+        response.error.retry_after_ms = int(self.retry_after * 1000)
+        return response
+
+    def release(self, request: denden_pb2.DenDenRequest) -> None:
+        """Mark an admitted *request* finished."""
+        run = request.trace.run_id if self.per_run is not None else ""
+        agent = request.trace.agent_instance_id if self.per_agent is not None else ""
+        with self._lock:
+            self.in_flight -= 1
+            if run:
+                _decrement(self._runs, run)
+            if agent:
+                _decrement(self._agents, agent)
+
+
+def _decrement(counts: dict[str, int], key: str) -> None:
+    n = counts[key] - 1
+    if n:
+        counts[key] = n
+    else:
+        del counts[key]  # keep the maps as small as what is in flight
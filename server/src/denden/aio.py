@@ -0,0 +1,776 @@
+"""asyncio variant of the denden server, built on ``grpc.aio``.
+
+Handlers may be ``async def`` coroutines or async generators, which run
+directly on the event loop, or plain synchronous callables and generators,
+which are offloaded to a thread pool so they never block the loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+import itertools
+import logging
+import signal
+from concurrent import futures
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Mapping,
+    Sequence,
+    Union,
+)
+
+import grpc
+
+from denden import addr as listen
+from denden import stream
+from denden.context import (
+    CANCELLED,
+    TIMEOUT,
+    RequestCancelled,
+    RequestContext,
+    activate,
+    current_context,
+    deactivate,
+    new_context,
+)
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.jobs import JobTable, not_found_status
+from denden.lanes import Lane, LaneFull, Lanes
+from denden.metrics import ServerMetrics
+from denden.traces import TraceIndex
+from denden.server import (
+    DEFAULT_BATCH_PARALLELISM,
+    ERR_SUBAGENT_FAILURE,
+    RequestHandler,
+    _NO_ARTIFACT_STORE,
+    _abandoned_response,
+    _artifact_error,
+    _await_timeout,
+    _batch_limit,
+    _cancelled_response,
+    _end_reason,
+    _error_response,
+    _lane_full_response,
+    _resolve_handler,
+    _rpc_time_remaining,
+    ok_response,
+)
+
+if TYPE_CHECKING:
+    from denden.admission import Admission
+    from denden.artifacts import ArtifactStore
+    from denden.cache import DelegateCache, ResponseCache
+    from denden.journal import Journal
+
+logger = logging.getLogger(__name__)
+
+# Type alias for coroutine request handlers.
+AsyncRequestHandler = Callable[
+    [denden_pb2.DenDenRequest], Awaitable[denden_pb2.DenDenResponse]
+]
+
+AnyRequestHandler = Union[RequestHandler, AsyncRequestHandler]
+
+
+def _is_async_callable(handler: Callable) -> bool:
+    """Return True if calling *handler* produces a coroutine or async generator."""
+    call = getattr(handler, "__call__", None)
+    return any(
+        check(handler) or check(call)
+        for check in (inspect.iscoroutinefunction, inspect.isasyncgenfunction)
+    )
+
+
+class AsyncDendenServicer(denden_pb2_grpc.DendenServicer):
+    """``grpc.aio`` servicer with the same envelope validation as :class:`DendenServicer`."""
+
+    def __init__(
+        self,
+        executor: futures.Executor | None = None,
+        response_cache: ResponseCache | None = None,
+        delegate_cache: DelegateCache | None = None,
+        batch_parallelism: int = DEFAULT_BATCH_PARALLELISM,
+        metrics: ServerMetrics | None = None,
+        traces: TraceIndex | None = None,
+        journal: Journal | None = None,
+        timeouts: Mapping[str, float] | None = None,
+        lanes: Iterable[Lane] = (),
+        admission: Admission | None = None,
+        peers: Sequence[str] = (),
+        artifacts: ArtifactStore | None = None,
+    ) -> None:
+        self.metrics = metrics if metrics is not None else ServerMetrics()
+        self.traces = traces if traces is not None else TraceIndex()
+        self.journal = journal
+        self.admission = admission
+        self.peers = list(peers)
+        self.artifacts = artifacts
+        self.lanes = Lanes(lanes)
+        for lane in self.lanes:
+            self.metrics.watch_lane(lane)
+        self._timeouts = dict(timeouts or {})
+        self._handlers: dict[str, AnyRequestHandler] = {}
+        self._response_cache = response_cache
+        self._delegate_cache = delegate_cache
+        self._batch_parallelism = batch_parallelism
+        self._async_handlers: set[str] = set()
+        self._executor = executor
+        self._jobs = JobTable()
+        self._job_tasks: set[asyncio.Task] = set()
+
+    def set_handler(self, payload_key: str, handler: AnyRequestHandler) -> None:
+        """Register a sync or async handler for a payload type."""
+        self._handlers[payload_key] = handler
+        if _is_async_callable(handler):
+            self._async_handlers.add(payload_key)
+        else:
+            self._async_handlers.discard(payload_key)
+
+    def route(self, payload_key: str, lane: str) -> None:
+        """Run handlers for *payload_key* in the lane named *lane*."""
+        self.lanes.route(payload_key, lane)
+
+    async def _call(
+        self, payload_type: str, handler: AnyRequestHandler,
+        request: denden_pb2.DenDenRequest,
+    ):
+        if payload_type in self._async_handlers:
+            result = handler(request)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._executor, contextvars.copy_context().run, handler, request,
+        )
+        # Sync callables may still hand back an awaitable (e.g. a lambda
+        # wrapping a coroutine function).
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def Send(
+        self, request: denden_pb2.DenDenRequest, context,
+    ) -> denden_pb2.DenDenResponse:
+        """Validate envelope and dispatch to the registered handler."""
+        return await self._dispatch(request, context)
+
+    async def _dispatch(
+        self, request: denden_pb2.DenDenRequest, rpc=None,
+    ) -> denden_pb2.DenDenResponse:
+        token = self.metrics.begin(request)
+        span = self.traces.begin(request)
+        admission = self.admission
+        if admission is not None:
+            refused = admission.admit(request)
+            if refused is not None:
+                self.metrics.finish(token, refused)
+                self.traces.finish(span, refused)
+                return refused
+        journal = self.journal
+        if journal is not None:
+            journal.append_request(request)
+        ctx = self._context(request, rpc)
+        activation = activate(ctx)
+        response = None
+        try:
+            response = await self._handle(request)
+            return response
+        except asyncio.CancelledError:
+            # grpc.aio cancels the task when the client goes away.
+            ctx.cancel(CANCELLED)
+            raise
+        finally:
+            ctx.close()
+            deactivate(activation)
+            if admission is not None:
+                admission.release(request)
+            self.metrics.finish(token, response)
+            self.traces.finish(span, response)
+            if journal is not None and response is not None:
+                journal.append_response(response)
+
+    def _context(self, request: denden_pb2.DenDenRequest, rpc) -> RequestContext:
+        ctx = new_context(
+            request.request_id,
+            _rpc_time_remaining(rpc),
+            self._timeouts.get(request.WhichOneof("payload")),
+        )
+        if rpc is not None:
+            rpc.add_done_callback(lambda _: ctx.cancel(_end_reason(rpc)))
+        return ctx
+
+    async def _handle(
+        self, request: denden_pb2.DenDenRequest,
+    ) -> denden_pb2.DenDenResponse:
+        handler, error = _resolve_handler(self._handlers, request)
+        if error is not None:
+            return error
+        cache = self._response_cache
+        if cache is None:
+            return await self._run(handler, request)
+
+        cached, pending = cache.begin(request.request_id)
+        if cached is not None:
+            return cached
+        if pending is not None:
+            # Shielded: a waiter that goes away must not cancel the shared future.
+            return await asyncio.shield(asyncio.wrap_future(pending))
+        try:
+            response = await self._run(handler, request)
+        except asyncio.CancelledError:
+            cache.finish(request.request_id, _abandoned_response(request))
+            raise
+        except BaseException as e:
+            cache.finish(request.request_id, exc=e)
+            raise
+        cache.finish(request.request_id, response)
+        return response
+
+    async def _run(
+        self, handler: AnyRequestHandler, request: denden_pb2.DenDenRequest,
+    ) -> denden_pb2.DenDenResponse:
+        cache = self._delegate_cache
+        if cache is None:
+            return await self._invoke(handler, request)
+        key, result = cache.lookup(request)
+        if result is not None:
+            return ok_response(request.request_id, delegate_result=result)
+        response = await self._invoke(handler, request)
+        if key is not None:
+            cache.store(key, response)
+        return response
+
+    async def _invoke(
+        self, handler: AnyRequestHandler, request: denden_pb2.DenDenRequest,
+    ) -> denden_pb2.DenDenResponse:
+        ctx = current_context()
+        try:
+            if ctx.deadline_reason == TIMEOUT and ctx.deadline is not None:
+                return await asyncio.wait_for(
+                    self._collect(handler, request), ctx.time_remaining(),
+                )
+            return await self._collect(handler, request)
+        except asyncio.TimeoutError:
+            ctx.cancel(TIMEOUT)
+            return _cancelled_response(request, TIMEOUT, self._timeouts)
+        except LaneFull as e:
+            return _lane_full_response(request, e)
+        except RequestCancelled as e:
+            return _cancelled_response(request, e.reason, self._timeouts)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("handler failed for request %s", request.request_id)
+            return _error_response(
+                request.request_id,
+                ERR_SUBAGENT_FAILURE,
+                str(e),
+                retryable=False,
+            )
+
+    async def _collect(
+        self, handler: AnyRequestHandler, request: denden_pb2.DenDenRequest,
+    ) -> denden_pb2.DenDenResponse:
+        payload_type = request.WhichOneof("payload")
+        lane = self.lanes.get(payload_type)
+        if lane is None:
+            result = await self._call(payload_type, handler, request)
+            return await stream.acollect(result, self._executor)
+        # Waiting for the lane counts against the server timeout as well.
+        await lane.enter_async(current_context())
+        try:
+            result = await self._call(payload_type, handler, request)
+            return await stream.acollect(result, self._executor)
+        finally:
+            lane.leave()
+
+    async def SendStream(
+        self, request: denden_pb2.DenDenRequest, context,
+    ) -> AsyncIterator[denden_pb2.StreamEvent]:
+        """Like :meth:`Send`, but stream the handler's progress and partial results."""
+        seq = itertools.count(1)
+        token = self.metrics.begin(request)
+        span = self.traces.begin(request)
+        admission = self.admission
+        if admission is not None:
+            refused = admission.admit(request)
+            if refused is not None:
+                self.metrics.finish(token, refused)
+                self.traces.finish(span, refused)
+                event = stream.final(refused)
+                event.request_id = request.request_id
+                event.seq = next(seq)
+                yield event
+                return
+        journal = self.journal
+        if journal is not None:
+            journal.append_request(request)
+        ctx = self._context(request, context)
+        activation = activate(ctx)
+        response = None
+        try:
+            async for event in self._stream(request):
+                event.request_id = request.request_id
+                event.seq = next(seq)
+                if event.HasField("response"):
+                    response = event.response
+                yield event
+        except asyncio.CancelledError:
+            ctx.cancel(CANCELLED)
+            raise
+        finally:
+            ctx.close()
+            deactivate(activation)
+            if admission is not None:
+                admission.release(request)
+            self.metrics.finish(token, response)
+            self.traces.finish(span, response)
+            if journal is not None and response is not None:
+                journal.append_response(response)
+
+    async def _stream(
+        self, request: denden_pb2.DenDenRequest,
+    ) -> AsyncIterator[denden_pb2.StreamEvent]:
+        handler, error = _resolve_handler(self._handlers, request)
+        if error is not None:
+            yield stream.final(error)
+            return
+        cache = self._response_cache
+        if cache is None:
+            async for event in self._run_stream(handler, request):
+                yield event
+            return
+
+        cached, pending = cache.begin(request.request_id)
+        if cached is not None:
+            yield stream.final(cached)
+            return
+        if pending is not None:
+            yield stream.final(await asyncio.shield(asyncio.wrap_future(pending)))
+            return
+        finished = False
+        try:
+            async for event in self._run_stream(handler, request):
+                if event.HasField("response"):
+                    cache.finish(request.request_id, event.response)
+                    finished = True
+                yield event
+        finally:
+            if not finished:
+                cache.finish(request.request_id, _abandoned_response(request))
+
+    async def _run_stream(
+        self, handler: AnyRequestHandler, request: denden_pb2.DenDenRequest,
+    ) -> AsyncIterator[denden_pb2.StreamEvent]:
+        cache = self._delegate_cache
+        key = None
+        if cache is not None:
+            key, result = cache.lookup(request)
+            if result is not None:
+                yield stream.final(ok_response(request.request_id, delegate_result=result))
+                return
+        lane = self.lanes.get(request.WhichOneof("payload"))
+        if lane is None:
+            async for event in self._call_stream(handler, request, key):
+                yield event
+            return
+        try:
+            await lane.enter_async(current_context())
+        except LaneFull as e:
+            yield stream.final(_lane_full_response(request, e))
+            return
+        except RequestCancelled as e:
+            yield stream.final(_cancelled_response(request, e.reason, self._timeouts))
+            return
+        try:
+            async for event in self._call_stream(handler, request, key):
+                yield event
+        finally:
+            lane.leave()
+
+    async def _call_stream(
+        self,
+        handler: AnyRequestHandler,
+        request: denden_pb2.DenDenRequest,
+        key: str | None,
+    ) -> AsyncIterator[denden_pb2.StreamEvent]:
+        """Stream *handler*'s events, storing the final response under
+        delegate cache *key* if given."""
+        cache = self._delegate_cache
+        ctx = current_context()
+        try:
+            result = await self._call(request.WhichOneof("payload"), handler, request)
+            events = stream.aevents(result, self._executor)
+            try:
+                async for event in events:
+                    if ctx.reason == TIMEOUT:
+                        yield stream.final(_cancelled_response(request, TIMEOUT, self._timeouts))
+                        return
+                    if key is not None and event.HasField("response"):
+                        cache.store(key, event.response)
+                    yield event
+            finally:
+                await events.aclose()
+        except RequestCancelled as e:
+            yield stream.final(_cancelled_response(request, e.reason, self._timeouts))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("handler failed for request %s", request.request_id)
+            yield stream.final(_error_response(
+                request.request_id,
+                ERR_SUBAGENT_FAILURE,
+                str(e),
+                retryable=False,
+            ))
+
+    async def SendBatch(
+        self, request: denden_pb2.BatchRequest, context,
+    ) -> denden_pb2.BatchResponse:
+        """Dispatch every request concurrently and return responses in order."""
+        responses: list[denden_pb2.DenDenResponse | None] = [None] * len(request.requests)
+        async for index, response in self._run_batch(request, context):
+            responses[index] = response
+        return denden_pb2.BatchResponse(responses=responses)
+
+    async def SendBatchStream(
+        self, request: denden_pb2.BatchRequest, context,
+    ) -> AsyncIterator[denden_pb2.BatchItem]:
+        """Dispatch every request concurrently, streaming each response as it completes."""
+        async for index, response in self._run_batch(request, context):
+            yield denden_pb2.BatchItem(index=index, response=response)
+
+    async def _run_batch(
+        self, request: denden_pb2.BatchRequest, rpc=None,
+    ) -> AsyncIterator[tuple[int, denden_pb2.DenDenResponse]]:
+        """Yield ``(index, response)`` pairs in completion order."""
+        if not request.requests:
+            return
+        limit = asyncio.Semaphore(_batch_limit(request, self._batch_parallelism))
+
+        async def run(index: int, item: denden_pb2.DenDenRequest):
+            async with limit:
+                return index, await self._dispatch(item, rpc)
+
+        tasks = [
+            asyncio.ensure_future(run(index, item))
+            for index, item in enumerate(request.requests)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _start_job(self, request: denden_pb2.DenDenRequest) -> futures.Future:
+        # Bridge the task into a concurrent future so JobTable can track it
+        # the same way as jobs run by the threaded servicer.
+        future: futures.Future = futures.Future()
+        future.set_running_or_notify_cancel()
+        task = asyncio.ensure_future(self._dispatch(request))
+        self._job_tasks.add(task)
+
+        def _done(t: asyncio.Task) -> None:
+            self._job_tasks.discard(t)
+            if t.cancelled():
+                future.set_exception(asyncio.CancelledError())
+            else:
+                future.set_result(t.result())
+
+        task.add_done_callback(_done)
+        return future
+
+    async def Submit(
+        self, request: denden_pb2.DenDenRequest, context,
+    ) -> denden_pb2.JobHandle:
+        """Start *request* as a background task and return its handle immediately."""
+        job = self._jobs.submit(request.request_id, lambda: self._start_job(request))
+        return job.handle()
+
+    async def Await(self, request: denden_pb2.AwaitRequest, context) -> denden_pb2.JobStatus:
+        """Wait for a job to finish, up to ``timeout_ms`` or the RPC deadline."""
+        job = self._jobs.get(request.job_id)
+        if job is None:
+            return not_found_status(request.job_id)
+        timeout = _await_timeout(request, context)
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(job.future)), timeout
+            )
+        except asyncio.TimeoutError:
+            pass
+        return self._jobs.collect(request.job_id)
+
+    async def Poll(self, request: denden_pb2.PollRequest, context) -> denden_pb2.JobStatus:
+        """Return a job's state; a finished job is collected and removed."""
+        return self._jobs.collect(request.job_id)
+
+    async def Status(self, request, context) -> denden_pb2.StatusResponse:
+        """Health check with request counts, latencies and gauges, merged
+        across :attr:`peers` unless the request asks for the local status."""
+        status = self.metrics.status()
+        if self.peers and not request.local:
+            from denden.workers import aggregate_status
+
+            status = await asyncio.to_thread(aggregate_status, status, self.peers)
+        return status
+
+    async def QueryTrace(self, request: denden_pb2.TraceQuery, context) -> denden_pb2.TraceResult:
+        """Answer a subtree, critical-path or slowest-branches query on a run."""
+        return self.traces.query(request)
+
+    async def PutArtifact(self, request_iterator, context) -> denden_pb2.ArtifactRef:
+        """Store an uploaded artifact and return its ref; disk writes run
+        in a thread."""
+        store = await self._artifact_store(context)
+        upload = None
+        try:
+            async for chunk in request_iterator:
+                if upload is None:
+                    upload = store.upload(chunk.run_id)
+                await asyncio.to_thread(upload.write, chunk.data)
+            if upload is None:
+                upload = store.upload()
+            return await asyncio.to_thread(upload.commit)
+        except BaseException:
+            if upload is not None:
+                upload.abort()
+            raise
+
+    async def GetArtifact(
+        self, request: denden_pb2.GetArtifactRequest, context,
+    ) -> AsyncIterator[denden_pb2.ArtifactChunk]:
+        """Stream an artifact, or a byte range of it, in chunks read in a
+        thread (a page fault must not stall the event loop)."""
+        store = await self._artifact_store(context)
+        try:
+            chunks = store.chunks(request.ref, request.offset, request.length)
+        except (LookupError, ValueError) as e:
+            await context.abort(*_artifact_error(e))
+        try:
+            while (data := await asyncio.to_thread(next, chunks, None)) is not None:
+                yield denden_pb2.ArtifactChunk(data=data)
+        finally:
+            chunks.close()
+
+    async def ReleaseArtifacts(
+        self, request: denden_pb2.ReleaseArtifactsRequest, context,
+    ) -> denden_pb2.ReleaseArtifactsResponse:
+        """Drop a run's artifact references."""
+        store = await self._artifact_store(context)
+        released, deleted = await asyncio.to_thread(store.release_run, request.run_id)
+        return denden_pb2.ReleaseArtifactsResponse(released=released, deleted=deleted)
+
+    async def _artifact_store(self, context) -> ArtifactStore:
+        if self.artifacts is None:
+            await context.abort(grpc.StatusCode.UNIMPLEMENTED, _NO_ARTIFACT_STORE)
+        return self.artifacts
+
+
+class AsyncDenDenServer:
+    """``grpc.aio`` transport server for the DenDen protocol.
+
+    Blocked ``ask_user`` or long ``delegate`` calls written as coroutines
+    cost a suspended task instead of an OS thread. Synchronous handlers are
+    still accepted and run on a thread pool of up to *max_workers* threads.
+
+    Usage (standalone)::
+
+        server = AsyncDenDenServer(addr="127.0.0.1:9700")
+        server.on_delegate(my_async_delegate_handler)
+        server.run()  # blocks
+
+    Usage (embedded, inside a running event loop)::
+
+        server = AsyncDenDenServer(addr="127.0.0.1:0")
+        server.on_ask_user(my_async_handler)
+        await server.start()
+        print(server.bound_addr)
+        ...
+        await server.stop()
+    """
+
+    def __init__(
+        self,
+        addr: listen.Addr = "127.0.0.1:9700",
+        max_workers: int = 64,
+        response_cache: ResponseCache | None = None,
+        delegate_cache: DelegateCache | None = None,
+        batch_parallelism: int = DEFAULT_BATCH_PARALLELISM,
+        metrics: ServerMetrics | None = None,
+        traces: TraceIndex | None = None,
+        journal: Journal | None = None,
+        timeouts: Mapping[str, float] | None = None,
+        lanes: Iterable[Lane] = (),
+        admission: Admission | None = None,
+        peers: Sequence[str] = (),
+        artifacts: ArtifactStore | None = None,
+    ) -> None:
+        self.addr = addr
+        self.addrs = listen.split_addrs(addr)
+        self.max_workers = max_workers
+        self._executor: futures.ThreadPoolExecutor | None = None
+        self._servicer = AsyncDendenServicer(
+            response_cache=response_cache,
+            delegate_cache=delegate_cache,
+            batch_parallelism=batch_parallelism,
+            metrics=metrics,
+            traces=traces,
+            journal=journal,
+            timeouts=timeouts,
+            lanes=lanes,
+            admission=admission,
+            peers=peers,
+            artifacts=artifacts,
+        )
+        self._server: grpc.aio.Server | None = None
+        self._bound_addrs: list[str] = []
+        self._start_hooks: list[Callable[[], None]] = []
+        self._stop_hooks: list[Callable[[], None]] = []
+
+    @property
+    def metrics(self) -> ServerMetrics:
+        """Request counters, latency histograms and gauges for this server."""
+        return self._servicer.metrics
+
+    @property
+    def traces(self) -> TraceIndex:
+        """Agent call trees of recent runs, built from request traces."""
+        return self._servicer.traces
+
+    @property
+    def artifacts(self) -> ArtifactStore | None:
+        """The store behind the artifact RPCs, if the server has one."""
+        return self._servicer.artifacts
+
+    def on_ask_user(self, handler: AnyRequestHandler) -> None:
+        """Register a handler for ask_user requests."""
+        self._servicer.set_handler("ask_user", handler)
+
+    def on_delegate(self, handler: AnyRequestHandler) -> None:
+        """Register a handler for delegate requests."""
+        self._servicer.set_handler("delegate", handler)
+
+    def on_remember(self, handler: AnyRequestHandler) -> None:
+        """Register a handler for remember requests."""
+        self._servicer.set_handler("remember", handler)
+
+    def on_recall(self, handler: AnyRequestHandler) -> None:
+        """Register a handler for recall requests."""
+        self._servicer.set_handler("recall", handler)
+
+    def route(self, payload_key: str, lane: str) -> None:
+        """Run handlers for *payload_key* in the lane named *lane* instead
+        of the lane named after it."""
+        self._servicer.route(payload_key, lane)
+
+    def on_start(self, callback: Callable[[], None]) -> None:
+        """Run *callback* at the end of :meth:`start`, once the server is
+        listening. It runs on the event loop, so it must not block."""
+        self._start_hooks.append(callback)
+
+    def on_stop(self, callback: Callable[[], None]) -> None:
+        """Run *callback* during :meth:`stop`, after the server has stopped
+        taking requests (e.g. to flush buffered writes)."""
+        self._stop_hooks.append(callback)
+
+    @property
+    def bound_addr(self) -> str:
+        """Actual address the server is listening on.
+
+        With several listeners this is their comma-separated list, in the
+        same form ``--addr`` and ``DENDEN_ADDR`` accept. Only valid after
+        :meth:`start` or :meth:`run` has been called.
+        """
+        return ",".join(self.bound_addrs)
+
+    @property
+    def bound_addrs(self) -> list[str]:
+        """Every address the server is listening on, in *addr* order."""
+        if not self._bound_addrs:
+            raise RuntimeError("server not started")
+        return list(self._bound_addrs)
+
+    async def start(self) -> None:
+        """Create and start the gRPC server on the running event loop."""
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="denden-sync-handler",
+        )
+        self._servicer._executor = self._executor
+        self.metrics.watch_executor("sync-handler", self._executor)
+        self._server = grpc.aio.server(
+            options=[
+                ("grpc.max_send_message_length", -1),
+                ("grpc.max_receive_message_length", -1),
+                # Accept the keepalive pings of denden.client channels.
+                ("grpc.keepalive_permit_without_calls", 1),
+                ("grpc.http2.min_ping_interval_without_data_ms", 20_000),
+            ],
+        )
+        denden_pb2_grpc.add_DendenServicer_to_server(self._servicer, self._server)
+        self._bound_addrs = listen.bind_all(self._server, self.addrs)
+        await self._server.start()
+        logger.info("denden asyncio server listening on %s", self.bound_addr)
+        for hook in self._start_hooks:
+            try:
+                hook()
+            except Exception:
+                logger.exception("start hook %r failed", hook)
+
+    async def stop(self, grace: float | None = 5) -> None:
+        """Stop the gRPC server gracefully, run the :meth:`on_stop` hooks,
+        commit the journal, release the handler threads and remove socket
+        files."""
+        if self._server is not None:
+            await self._server.stop(grace)
+        hooks, self._stop_hooks = self._stop_hooks, []
+        for hook in hooks:
+            try:
+                await asyncio.to_thread(hook)
+            except Exception:
+                logger.exception("stop hook %r failed", hook)
+        if self._servicer.journal is not None:
+            await asyncio.to_thread(self._servicer.journal.close)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        listen.cleanup(self._bound_addrs)
+
+    async def wait_for_termination(self, timeout: float | None = None) -> bool:
+        """Wait until the server terminates.
+
+        Returns ``True`` if the server stopped within *timeout*,
+        ``False`` if the timeout expired.
+        """
+        if self._server is not None:
+            return await self._server.wait_for_termination(timeout=timeout)
+        return True
+
+    async def serve(self) -> None:
+        """Start the server and wait until SIGINT/SIGTERM stops it."""
+        await self.start()
+        loop = asyncio.get_running_loop()
+
+        def _shutdown() -> None:
+            logger.info("shutting down...")
+            loop.create_task(self.stop(grace=5))
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, _shutdown)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        await self.wait_for_termination()
+
+    def run(self) -> None:
+        """Run the server on a fresh event loop and block until interrupted."""
+        asyncio.run(self.serve())
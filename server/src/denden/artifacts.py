@@ -0,0 +1,262 @@
+"""Content-addressed artifact store.
+
+Agents that inline large files into ``Task.extra`` or
+``DelegateResult.output`` pay for converting them to and from ``Struct``
+on every hop. Instead an artifact is uploaded once with ``PutArtifact``
+(``denden put FILE``), passed on as its ref (``sha256:<hex>``) in
+``artifact_refs``, and fetched with ``GetArtifact`` (``denden get REF``)
+only by whoever reads it. Handlers in the server can use the store
+directly::
+
+    ref = server.artifacts.put(report_bytes, run_id=request.trace.run_id).ref
+    with server.artifacts.open(ref) as data:  # memory-mapped, read-only
+        ...
+
+Artifacts live under *root* as ``blobs/<2 hex>/<hex>``, named by the
+SHA-256 of their content, so identical uploads are stored once.
+Downloads are served in chunks from a memory map of the file.
+
+A run that uploads an artifact, or claims it with
+:meth:`ArtifactStore.hold`, holds a reference to it. The reference is a
+hard link ``runs/<run>/<hex>``, so the blob's link count is its
+reference count.
+:meth:`ArtifactStore.release_run` (the ``ReleaseArtifacts`` RPC) drops all
+of a run's references and deletes the artifacts no other run holds.
+Uploads without a run are held under the empty run id until it is
+released. Changes to references take a file lock, so ``--workers``
+processes can share one store.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+from typing import Iterable, Iterator
+from urllib.parse import quote
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not POSIX; only threads are excluded
+    fcntl = None
+
+from denden.gen import denden_pb2
+
+logger = logging.getLogger(__name__)
+
+# Bytes per ArtifactChunk sent by GetArtifact.
+CHUNK_SIZE = 1024 * 1024
+
+# Seconds after which a temporary upload file counts as abandoned.
+_STALE_UPLOAD = 3600
+
+_PREFIX = "sha256:"
+
+
+class UnknownArtifact(LookupError):
+    """The store has no artifact with this ref."""
+
+
+def parse_ref(ref: str) -> str:
+    """Hex digest of *ref*; raises ``ValueError`` if it is not a ``sha256:`` ref."""
+    digest = ref[len(_PREFIX):] if ref.startswith(_PREFIX) else ""
+    if len(digest) != 64 or digest.strip("0123456789abcdef"):
+        raise ValueError(f"not an artifact ref: {ref!r}")
+    return digest
+
+
+class ArtifactStore:
+    """Artifacts under the directory *root*; *chunk_size* is the size of
+    the chunks :meth:`chunks` yields."""
+
+    def __init__(self, root: str, chunk_size: int = CHUNK_SIZE) -> None:
+        self.root = root
+        self.chunk_size = chunk_size
+        for sub in ("blobs", "runs", "tmp"):
+            os.makedirs(os.path.join(root, sub), exist_ok=True)
+        self._lock = threading.Lock()
+        self._lock_file = open(os.path.join(root, "lock"), "a")
+        self.collect()
+
+    def upload(self, run_id: str = "") -> Upload:
+        """Start an upload held by *run_id*; write it, then commit it."""
+        return Upload(self, run_id)
+
+    def put(self, data: bytes | Iterable[bytes], run_id: str = "") -> denden_pb2.ArtifactRef:
+        """Store *data* (bytes or an iterable of chunks) for *run_id*."""
+        upload = self.upload(run_id)
+        try:
+            for chunk in [data] if isinstance(data, (bytes, bytearray, memoryview)) else data:
+                upload.write(chunk)
+        except BaseException:
+            upload.abort()
+            raise
+        return upload.commit()
+
+    def hold(self, ref: str, run_id: str) -> None:
+        """Make *run_id* hold a reference to the stored artifact *ref*."""
+        digest = parse_ref(ref)
+        with self._locked():
+            blob = self._blob(digest)
+            if not os.path.exists(blob):
+                raise UnknownArtifact(ref)
+            self._link(blob, digest, run_id)
+
+    def size(self, ref: str) -> int:
+        try:
+            return os.stat(self._blob(parse_ref(ref))).st_size
+        except FileNotFoundError:
+            raise UnknownArtifact(ref) from None
+
+    @contextlib.contextmanager
+    def open(self, ref: str) -> Iterator[mmap.mmap | bytes]:
+        """Read-only memory map of artifact *ref* (``b""`` if it is empty)."""
+        with self._open_blob(ref) as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+
+    def chunks(self, ref: str, offset: int = 0, length: int = 0) -> Iterator[bytes]:
+        """The bytes of *ref* from *offset*, *length* of them (0: to the
+        end), in chunks of :attr:`chunk_size`. The ref is checked before
+        this returns; the file is read as the chunks are consumed."""
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must not be negative")
+        size = self.size(ref)
+        end = size if length == 0 else min(size, offset + length)
+        return self._read(ref, offset, end)
+
+    def _read(self, ref: str, offset: int, end: int) -> Iterator[bytes]:
+        if offset >= end:
+            return
+        with self.open(ref) as data:
+            for start in range(offset, end, self.chunk_size):
+                yield data[start:min(start + self.chunk_size, end)]
+
+    def release_run(self, run_id: str) -> tuple[int, int]:
+        """Drop *run_id*'s references; returns how many it held and how
+        many artifacts were deleted because no run holds them anymore."""
+        run_dir = self._run_dir(run_id)
+        deleted = 0
+        with self._locked():
+            try:
+                names = os.listdir(run_dir)
+            except FileNotFoundError:
+                return 0, 0
+            for name in names:
+                os.unlink(os.path.join(run_dir, name))
+                if self._unlink_unheld(self._blob(name)):
+                    deleted += 1
+            os.rmdir(run_dir)
+        return len(names), deleted
+
+    def collect(self) -> int:
+        """Delete artifacts no run holds and abandoned uploads, e.g. after
+        a crash; returns how many artifacts were deleted."""
+        deleted = 0
+        with self._locked():
+            cutoff = time.time() - _STALE_UPLOAD
+            for entry in os.scandir(os.path.join(self.root, "tmp")):
+                # Younger files may be uploads in progress in another worker.
+                with contextlib.suppress(FileNotFoundError):
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+            for fan in os.listdir(os.path.join(self.root, "blobs")):
+                fan_dir = os.path.join(self.root, "blobs", fan)
+                for name in os.listdir(fan_dir):
+                    if self._unlink_unheld(os.path.join(fan_dir, name)):
+                        deleted += 1
+        if deleted:
+            logger.info("artifacts: deleted %d artifact(s) no run holds", deleted)
+        return deleted
+
+    def close(self) -> None:
+        self._lock_file.close()
+
+    def _commit(self, tmp: str, digest: str, run_id: str) -> None:
+        blob = self._blob(digest)
+        with self._locked():
+            if os.path.exists(blob):
+                os.unlink(tmp)  # already stored
+            else:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                os.chmod(tmp, 0o444)
+                os.replace(tmp, blob)
+            self._link(blob, digest, run_id)
+
+    def _link(self, blob: str, digest: str, run_id: str) -> None:
+        run_dir = self._run_dir(run_id)
+        os.makedirs(run_dir, exist_ok=True)
+        with contextlib.suppress(FileExistsError):
+            os.link(blob, os.path.join(run_dir, digest))
+
+    @staticmethod
+    def _unlink_unheld(blob: str) -> bool:
+        try:
+            if os.stat(blob).st_nlink > 1:
+                return False
+            os.unlink(blob)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _open_blob(self, ref: str):
+        try:
+            return open(self._blob(parse_ref(ref)), "rb")
+        except FileNotFoundError:
+            raise UnknownArtifact(ref) from None
+
+    def _blob(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], digest)
+
+    def _run_dir(self, run_id: str) -> str:
+        return os.path.join(self.root, "runs", "run-" + quote(run_id, safe=""))
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+
+class Upload:
+    """An artifact being written to a temporary file and hashed; see
+    :meth:`ArtifactStore.upload`."""
+
+    def __init__(self, store: ArtifactStore, run_id: str) -> None:
+        self.run_id = run_id
+        self.size = 0
+        self._store = store
+        fd, self._tmp = tempfile.mkstemp(dir=os.path.join(store.root, "tmp"))
+        self._file = os.fdopen(fd, "wb")
+        self._hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._hash.update(data)
+        self.size += len(data)
+
+    def commit(self) -> denden_pb2.ArtifactRef:
+        """Store the artifact and return its ref."""
+        self._file.close()
+        digest = self._hash.hexdigest()
+        self._store._commit(self._tmp, digest, self.run_id)
+        return denden_pb2.ArtifactRef(ref=_PREFIX + digest, size=self.size)
+
+    def abort(self) -> None:
+        """Discard what was written."""
+        self._file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._tmp)
@@ -0,0 +1,16 @@
+"""Benchmark and load-generation suite for the denden server.
+
+Run ``python -m denden.bench --help``. Results are JSON so runs from
+different releases can be diffed with ``python -m denden.bench compare``.
+"""
+from denden.bench.runner import BenchResult, run_cli, run_grpc, run_inproc
+from denden.bench.scenarios import SCENARIOS, Scenario
+
+__all__ = [
+    "BenchResult",
+    "Scenario",
+    "SCENARIOS",
+    "run_cli",
+    "run_grpc",
+    "run_inproc",
+]
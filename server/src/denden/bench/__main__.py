@@ -0,0 +1,160 @@
+"""Entry point for ``python -m denden.bench``."""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+from importlib import metadata
+from pathlib import Path
+
+import grpc
+
+from denden.bench import runner, scenarios
+
+MODES = ("inproc", "grpc", "cli")
+
+
+def _default_cli() -> str | None:
+    env = os.environ.get("DENDEN_CLI")
+    if env:
+        return env
+    # Repository checkout: server/src/denden/bench -> cli/denden
+    repo_bin = Path(__file__).resolve().parents[4] / "cli" / "denden"
+    if repo_bin.is_file():
+        return str(repo_bin)
+    return shutil.which("denden")
+
+
+def _version() -> str:
+    try:
+        return metadata.version("denden-server")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _make_scenario(name: str, args: argparse.Namespace) -> scenarios.Scenario:
+    if name == "blocking":
+        return scenarios.blocking(hold=args.hold)
+    if name == "large":
+        return scenarios.large(size_kb=args.size_kb)
+    if name == "large_encoded":
+        return scenarios.large_encoded(size_kb=args.size_kb)
+    return scenarios.SCENARIOS[name]()
+
+
+def run(args: argparse.Namespace) -> dict:
+    modes = args.mode or ["inproc", "grpc", "cli"]
+    names = args.scenario or list(scenarios.SCENARIOS)
+    cli_bin = args.cli or _default_cli()
+
+    results = []
+    for name in names:
+        scenario = _make_scenario(name, args)
+        for mode in modes:
+            if mode == "cli":
+                if not cli_bin:
+                    print("skipping cli mode: no denden binary found (set --cli)", file=sys.stderr)
+                    continue
+                result = runner.run_cli(scenario, args.cli_requests, args.concurrency, cli_bin)
+            elif mode == "grpc":
+                result = runner.run_grpc(scenario, args.requests, args.concurrency)
+            else:
+                result = runner.run_inproc(scenario, args.requests, args.concurrency)
+            print(
+                f"{mode:>6} {name:<8} {result.throughput_rps:>10.1f} req/s  "
+                f"p50 {result.latency_ms['p50']:.3f}ms  p99 {result.latency_ms['p99']:.3f}ms  "
+                f"errors {result.errors}",
+                file=sys.stderr,
+            )
+            results.append(result.to_dict())
+
+    return {
+        "denden_version": _version(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "grpc": grpc.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "requests": args.requests,
+            "cli_requests": args.cli_requests,
+            "concurrency": args.concurrency,
+            "hold": args.hold,
+            "size_kb": args.size_kb,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict) -> list[str]:
+    """Human-readable throughput and p99 deltas between two runs."""
+    base = {(r["mode"], r["scenario"]): r for r in baseline["results"]}
+    lines = []
+    for r in current["results"]:
+        b = base.get((r["mode"], r["scenario"]))
+        if b is None:
+            continue
+
+        def delta(new: float, old: float) -> str:
+            return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+        lines.append(
+            f"{r['mode']:>6} {r['scenario']:<8} "
+            f"throughput {delta(r['throughput_rps'], b['throughput_rps']):>8}  "
+            f"p99 {delta(r['latency_ms']['p99'], b['latency_ms']['p99']):>8}"
+        )
+    return lines
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m denden.bench",
+        description="Measure denden server throughput, tail latency and resource use.",
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    cmp_parser = sub.add_parser("compare", help="compare two JSON results")
+    cmp_parser.add_argument("baseline")
+    cmp_parser.add_argument("current")
+
+    parser.add_argument("--mode", action="append", choices=MODES,
+                        help="driver to run (repeatable; default: all)")
+    parser.add_argument("--scenario", action="append", choices=sorted(scenarios.SCENARIOS),
+                        help="workload to run (repeatable; default: all)")
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="requests per in-process / gRPC run (default: 2000)")
+    parser.add_argument("--cli-requests", type=int, default=200,
+                        help="requests per CLI run; each one spawns a process (default: 200)")
+    parser.add_argument("--concurrency", "-c", type=int, default=32,
+                        help="concurrent clients (default: 32)")
+    parser.add_argument("--hold", type=float, default=0.05,
+                        help="seconds the blocking scenario holds each request (default: 0.05)")
+    parser.add_argument("--size-kb", type=int, default=96,
+                        help="payload size for the large scenarios (default: 96)")
+    parser.add_argument("--cli", help="path to the denden CLI binary (default: $DENDEN_CLI, cli/denden, or PATH)")
+    parser.add_argument("--output", "-o", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        print("\n".join(compare(baseline, current)))
+        return
+
+    report = run(args)
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Benchmark drivers and measurement.
+
+Each driver runs a :class:`~denden.bench.scenarios.Scenario` with
+*requests* calls spread over *concurrency* client threads and returns a
+:class:`BenchResult`. Latency is measured per call around the send only
+(request construction is excluded). RSS and thread counts are sampled for
+the whole benchmark process, which also hosts the server.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+from concurrent import futures
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
+
+import grpc
+
+from denden.bench.scenarios import Scenario
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import DenDenServer, DendenServicer
+
+_WARMUP = 20
+
+
+@dataclass
+class BenchResult:
+    mode: str
+    scenario: str
+    requests: int
+    concurrency: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    rss_mb: dict[str, float] = field(default_factory=dict)
+    threads: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (*q* in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(q / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux and bytes on macOS.
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _thread_count() -> int:
+    # OS threads include gRPC core's pollers, which threading can't see.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return threading.active_count()
+
+
+class _ResourceSampler:
+    """Samples RSS and thread count on a background thread."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bench-sampler", daemon=True)
+        self.rss = {"start": 0, "peak": 0, "end": 0}
+        self.threads = {"start": 0, "peak": 0, "end": 0}
+
+    def _sample(self) -> tuple[int, int]:
+        rss, threads = _rss_bytes(), _thread_count()
+        self.rss["peak"] = max(self.rss["peak"], rss)
+        self.threads["peak"] = max(self.threads["peak"], threads)
+        return rss, threads
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> _ResourceSampler:
+        self.rss["start"], self.threads["start"] = self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.rss["end"], self.threads["end"] = self._sample()
+
+
+def _measure(
+    mode: str,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    prepare: Callable[[int], Any],
+    send: Callable[[Any], bool],
+) -> BenchResult:
+    def one(i: int) -> tuple[float, bool]:
+        arg = prepare(i)
+        t0 = time.perf_counter()
+        try:
+            ok = send(arg)
+        except Exception:
+            ok = False
+        return time.perf_counter() - t0, ok
+
+    with futures.ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="bench-client",
+    ) as pool:
+        list(pool.map(one, range(-min(_WARMUP, requests), 0)))
+        with _ResourceSampler() as sampler:
+            start = time.perf_counter()
+            samples = list(pool.map(one, range(requests)))
+            duration = time.perf_counter() - start
+
+    latencies = sorted(s[0] * 1000 for s in samples)
+    return BenchResult(
+        mode=mode,
+        scenario=scenario.name,
+        requests=requests,
+        concurrency=concurrency,
+        errors=sum(1 for _, ok in samples if not ok),
+        duration_s=round(duration, 4),
+        throughput_rps=round(requests / duration, 2) if duration > 0 else 0.0,
+        latency_ms={
+            "p50": round(percentile(latencies, 50), 4),
+            "p95": round(percentile(latencies, 95), 4),
+            "p99": round(percentile(latencies, 99), 4),
+            "max": round(latencies[-1], 4) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+        },
+        rss_mb={k: round(v / 2**20, 2) for k, v in sampler.rss.items()},
+        threads=dict(sampler.threads),
+    )
+
+
+def run_inproc(scenario: Scenario, requests: int, concurrency: int) -> BenchResult:
+    """Call ``DendenServicer.Send`` directly, without gRPC."""
+    servicer = DendenServicer()
+    servicer.set_handler(scenario.payload_type, scenario.handler)
+    try:
+        return _measure(
+            "inproc", scenario, requests, concurrency,
+            scenario.make_request,
+            lambda req: servicer.Send(req, None).status == denden_pb2.OK,
+        )
+    finally:
+        servicer.close()
+
+
+def _start_server(scenario: Scenario, concurrency: int) -> DenDenServer:
+    server = DenDenServer(addr="127.0.0.1:0", max_workers=max(concurrency * 2, 16))
+    server._servicer.set_handler(scenario.payload_type, scenario.handler)
+    server.start()
+    return server
+
+
+def run_grpc(scenario: Scenario, requests: int, concurrency: int) -> BenchResult:
+    """Send over gRPC from *concurrency* clients, each with its own channel."""
+    server = _start_server(scenario, concurrency)
+    local = threading.local()
+    channels: list[grpc.Channel] = []
+    lock = threading.Lock()
+
+    def stub() -> denden_pb2_grpc.DendenStub:
+        if not hasattr(local, "stub"):
+            channel = grpc.insecure_channel(
+                server.bound_addr,
+                options=[
+                    ("grpc.max_send_message_length", -1),
+                    ("grpc.max_receive_message_length", -1),
+                ],
+            )
+            with lock:
+                channels.append(channel)
+            local.stub = denden_pb2_grpc.DendenStub(channel)
+        return local.stub
+
+    try:
+        return _measure(
+            "grpc", scenario, requests, concurrency,
+            scenario.make_request,
+            lambda req: stub().Send(req, timeout=60).status == denden_pb2.OK,
+        )
+    finally:
+        for channel in channels:
+            channel.close()
+        server.stop(grace=0)
+
+
+def run_cli(
+    scenario: Scenario, requests: int, concurrency: int, cli_bin: str,
+) -> BenchResult:
+    """Run ``denden send`` as a subprocess per request, like real agents do."""
+    server = _start_server(scenario, concurrency)
+    env = dict(os.environ, **scenario.cli_env)
+    env.update(DENDEN_ADDR=server.bound_addr, DENDEN_TIMEOUT="60s")
+
+    def send(_: Any) -> bool:
+        proc = subprocess.run(
+            [cli_bin, "send", scenario.cli_json],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        return proc.returncode == 0
+
+    try:
+        return _measure("cli", scenario, requests, concurrency, lambda i: None, send)
+    finally:
+        server.stop(grace=0)
@@ -0,0 +1,161 @@
+"""Benchmark workloads: a handler plus the requests that exercise it."""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from google.protobuf import json_format
+
+from denden import encoded
+from denden.gen import denden_pb2
+from denden.server import VERSION, RequestHandler, ok_response
+
+
+@dataclass
+class Scenario:
+    """A named workload.
+
+    *payload_type* is the handler slot ("ask_user", "delegate", ...),
+    *make_request* builds the i-th request and *cli_json* is the same
+    request as the JSON the Go CLI takes on its command line, sent with
+    *cli_env* added to its environment.
+    """
+
+    name: str
+    payload_type: str
+    handler: RequestHandler
+    make_request: Callable[[int], denden_pb2.DenDenRequest]
+    cli_json: str
+    cli_env: dict[str, str] = field(default_factory=dict)
+
+
+def _ask_request(i: int, question: str = "ping") -> denden_pb2.DenDenRequest:
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=f"bench-{i}",
+        trace=denden_pb2.Trace(run_id="bench", agent_instance_id=f"agent-{i % 64}"),
+        ask_user=denden_pb2.AskUserPayload(question=question),
+    )
+
+
+def _echo_ask(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+    return ok_response(
+        request.request_id,
+        ask_user_result=denden_pb2.AskUserResult(text=request.ask_user.question),
+    )
+
+
+def fast() -> Scenario:
+    """Trivial ask_user handler: measures pure framework overhead."""
+    return Scenario(
+        name="fast",
+        payload_type="ask_user",
+        handler=_echo_ask,
+        make_request=_ask_request,
+        cli_json='{"askUser":{"question":"ping"}}',
+    )
+
+
+def blocking(hold: float = 0.05) -> Scenario:
+    """ask_user handler that holds each request open for *hold* seconds,
+    like an agent waiting on a human."""
+
+    def handler(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+        time.sleep(hold)
+        return _echo_ask(request)
+
+    return Scenario(
+        name="blocking",
+        payload_type="ask_user",
+        handler=handler,
+        make_request=_ask_request,
+        cli_json='{"askUser":{"question":"ping"}}',
+    )
+
+
+def _large_extra(size_kb: int) -> dict:
+    # ~1 KiB per entry: a list of records with mixed value types.
+    row = {"path": "src/module/file.py", "line": 42, "ok": True, "note": "x" * 960}
+    return {"rows": [dict(row, line=i) for i in range(size_kb)]}
+
+
+def large(size_kb: int = 96) -> Scenario:
+    """delegate handler echoing a ~*size_kb* KiB ``Struct`` both ways.
+
+    The default stays under Linux's 128 KiB limit on a single command-line
+    argument so the same scenario can drive the CLI.
+    """
+    template = denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        trace=denden_pb2.Trace(run_id="bench"),
+        delegate=denden_pb2.DelegatePayload(
+            delegate_to="implementer",
+            task=denden_pb2.Task(text="summarize", return_format=denden_pb2.JSON),
+        ),
+    )
+    template.delegate.task.extra.update(_large_extra(size_kb))
+
+    def make_request(i: int) -> denden_pb2.DenDenRequest:
+        # Copying the prebuilt message keeps request construction out of
+        # the measured time.
+        req = denden_pb2.DenDenRequest()
+        req.CopyFrom(template)
+        req.request_id = f"bench-{i}"
+        req.trace.agent_instance_id = f"agent-{i % 64}"
+        return req
+
+    def handler(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+        result = denden_pb2.DelegateResult(output_format=denden_pb2.JSON, summary="ok")
+        result.output.CopyFrom(request.delegate.task.extra)
+        return ok_response(request.request_id, delegate_result=result)
+
+    cli_json = json_format.MessageToJson(
+        denden_pb2.DenDenRequest(delegate=template.delegate), indent=None,
+    )
+    return Scenario(
+        name="large",
+        payload_type="delegate",
+        handler=handler,
+        make_request=make_request,
+        cli_json=cli_json,
+    )
+
+
+def large_encoded(size_kb: int = 96) -> Scenario:
+    """Like :func:`large`, with the payload as pre-encoded JSON
+    (``extra_encoded``/``output_encoded``) instead of a ``Struct``."""
+    struct = large(size_kb)
+    template = struct.make_request(0)
+    template.delegate.task.ClearField("extra")
+    template.delegate.task.extra_encoded.CopyFrom(encoded.encode(_large_extra(size_kb)))
+
+    def make_request(i: int) -> denden_pb2.DenDenRequest:
+        req = denden_pb2.DenDenRequest()
+        req.CopyFrom(template)
+        req.request_id = f"bench-{i}"
+        req.trace.agent_instance_id = f"agent-{i % 64}"
+        return req
+
+    def handler(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+        result = denden_pb2.DelegateResult(output_format=denden_pb2.JSON, summary="ok")
+        result.output_encoded.CopyFrom(request.delegate.task.extra_encoded)
+        return ok_response(request.request_id, delegate_result=result)
+
+    # The CLI sends the same JSON; DENDEN_RAW_JSON=1 makes it pass extra through as bytes.
+    return Scenario(
+        name="large_encoded",
+        payload_type="delegate",
+        handler=handler,
+        make_request=make_request,
+        cli_json=struct.cli_json,
+        cli_env={"DENDEN_RAW_JSON": "1"},
+    )
+
+
+SCENARIOS: dict[str, Callable[[], Scenario]] = {
+    "fast": fast,
+    "blocking": blocking,
+    "large": large,
+    "large_encoded": large_encoded,
+}
@@ -0,0 +1,317 @@
+"""Response caches for the denden server.
+
+:class:`BoundedCache` is a thread-safe LRU map with optional TTL and byte
+budget. :class:`ResponseCache` builds on it to make retried sends
+idempotent: responses are keyed by ``request_id`` and a duplicate that
+arrives while the original is still running waits on the same result
+instead of starting a second run. :class:`DelegateCache` memoizes
+delegate results by the content of the ``DelegatePayload`` so identical
+delegations share one subagent run.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent import futures
+from typing import Any, Callable, Hashable, Iterable, Protocol
+
+from denden.gen import denden_pb2
+
+
+class CacheStore(Protocol):
+    """Storage backend for :class:`DelegateCache`.
+
+    :class:`BoundedCache` is the default; any object with the same
+    ``get``/``put`` signature (and its own eviction policy) can be used.
+    """
+
+    def get(self, key: Hashable) -> Any | None: ...
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None: ...
+
+
+class BoundedCache:
+    """Thread-safe LRU cache bounded by entry count, age and total size.
+
+    *ttl* is in seconds (``None`` disables expiry) and *max_bytes* caps the
+    sum of the sizes passed to :meth:`put` (``None`` disables the cap).
+    Least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (value, size, expires_at)
+        self._entries: OrderedDict[Hashable, tuple[Any, int, float]] = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or ``None`` if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, _, expires_at = entry
+            if expires_at and expires_at <= time.monotonic():
+                self._drop_locked(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        """Insert *value*, evicting old entries to stay within bounds.
+
+        Values larger than *max_bytes* on their own are not stored.
+        """
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            if key in self._entries:
+                self._drop_locked(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._drop_locked(oldest)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop_locked(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop_locked(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+def _cacheable(response: denden_pb2.DenDenResponse) -> bool:
+    # Retryable errors must not be replayed, or a retry could never succeed.
+    return not (response.status == denden_pb2.ERROR and response.error.retryable)
+
+
+class ResponseCache:
+    """Idempotency cache of responses keyed by ``request_id``.
+
+    Completed responses are kept in a :class:`BoundedCache` (LRU, *ttl*
+    seconds, *max_bytes* of serialized responses). Concurrent duplicates are
+    coalesced onto the in-flight run. Retryable errors are returned to every
+    waiter but are not cached.
+
+    Usage from a blocking caller::
+
+        response = cache.get_or_run(request.request_id, lambda: handler(request))
+
+    Async callers use :meth:`begin` / :meth:`finish` directly and await the
+    returned future.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float | None = 600.0,
+        max_bytes: int | None = 64 * 1024 * 1024,
+    ) -> None:
+        self._store = BoundedCache(max_entries=max_entries, ttl=ttl, max_bytes=max_bytes)
+        self._lock = threading.Lock()
+        self._inflight: dict[str, futures.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def begin(
+        self, key: str,
+    ) -> tuple[denden_pb2.DenDenResponse | None, futures.Future | None]:
+        """Look up *key* and claim it if nobody is running it.
+
+        Returns ``(response, None)`` on a cache hit, ``(None, future)`` when
+        another caller is already running the request (wait on *future*), or
+        ``(None, None)`` when the caller now owns the run and must call
+        :meth:`finish` with the result.
+        """
+        with self._lock:
+            cached = self._store.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached, None
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self.coalesced += 1
+                return None, pending
+            self.misses += 1
+            future = futures.Future()
+            # Running futures cannot be cancelled, so no waiter can break finish().
+            future.set_running_or_notify_cancel()
+            self._inflight[key] = future
+            return None, None
+
+    def finish(
+        self, key: str,
+        response: denden_pb2.DenDenResponse | None = None,
+        exc: BaseException | None = None,
+    ) -> None:
+        """Publish the owner's result (or exception) to waiters and the cache."""
+        with self._lock:
+            future = self._inflight.pop(key)
+            if exc is None and _cacheable(response):
+                self._store.put(key, response, response.ByteSize())
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(response)
+
+    def preload(self, responses: dict[str, denden_pb2.DenDenResponse]) -> int:
+        """Cache already-known responses by ``request_id`` (e.g. recovered
+        from a :mod:`denden.journal`); returns how many were cacheable."""
+        count = 0
+        with self._lock:
+            for key, response in responses.items():
+                if _cacheable(response):
+                    self._store.put(key, response, response.ByteSize())
+                    count += 1
+        return count
+
+    def get_or_run(
+        self, key: str, run: Callable[[], denden_pb2.DenDenResponse],
+    ) -> denden_pb2.DenDenResponse:
+        """Return the cached response for *key*, running *run* at most once."""
+        cached, pending = self.begin(key)
+        if cached is not None:
+            return cached
+        if pending is not None:
+            return pending.result()
+        try:
+            response = run()
+        except BaseException as e:
+            self.finish(key, exc=e)
+            raise
+        self.finish(key, response)
+        return response
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "entries": len(self._store),
+            "bytes": self._store.nbytes,
+            "evictions": self._store.evictions,
+        }
+
+
+def delegate_key(payload: denden_pb2.DelegatePayload, run_id: str = "") -> str:
+    """Canonical content hash of a delegate payload.
+
+    Deterministic serialization sorts the ``Struct`` map keys, so two
+    payloads with the same role, task text, artifact refs and ``extra``
+    hash the same regardless of the order fields were set in.
+    """
+    h = hashlib.sha256()
+    h.update(run_id.encode())
+    h.update(b"\0")
+    h.update(payload.SerializeToString(deterministic=True))
+    return h.hexdigest()
+
+
+class DelegateCache:
+    """Memoizes delegate results by the content of the ``DelegatePayload``.
+
+    A delegate whose payload hashes to a cached entry gets the stored
+    ``DelegateResult`` back without the handler being called. Only ``OK``
+    responses carrying a ``delegate_result`` are stored.
+
+    *per_run* scopes entries to ``Trace.run_id`` so separate runs never
+    share results. Roles in *exclude_roles* (matched against
+    ``delegate_to``) always reach the handler. *store* replaces the default
+    :class:`BoundedCache` built from *max_entries*, *ttl* and *max_bytes*.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float | None = None,
+        max_bytes: int | None = 64 * 1024 * 1024,
+        per_run: bool = False,
+        exclude_roles: Iterable[str] = (),
+        store: CacheStore | None = None,
+    ) -> None:
+        self._store = store if store is not None else BoundedCache(
+            max_entries=max_entries, ttl=ttl, max_bytes=max_bytes,
+        )
+        self.per_run = per_run
+        self.exclude_roles = set(exclude_roles)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, request: denden_pb2.DenDenRequest) -> str | None:
+        """Cache key for *request*, or ``None`` if it must not be cached."""
+        if request.WhichOneof("payload") != "delegate":
+            return None
+        if request.delegate.delegate_to in self.exclude_roles:
+            return None
+        run_id = request.trace.run_id if self.per_run else ""
+        return delegate_key(request.delegate, run_id)
+
+    def lookup(
+        self, request: denden_pb2.DenDenRequest,
+    ) -> tuple[str | None, denden_pb2.DelegateResult | None]:
+        """Return ``(key, result)``.
+
+        *result* is the cached ``DelegateResult`` on a hit. On a miss it is
+        ``None`` and the caller should pass *key* to :meth:`store` once the
+        handler returns; *key* is ``None`` when the request is not
+        cacheable at all.
+        """
+        key = self.key(request)
+        if key is None:
+            return None, None
+        result = self._store.get(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return key, result
+
+    def store(self, key: str, response: denden_pb2.DenDenResponse) -> None:
+        """Remember the result of a successful delegate run under *key*."""
+        if response.status != denden_pb2.OK or not response.HasField("delegate_result"):
+            return
+        result = response.delegate_result
+        self._store.put(key, result, result.ByteSize())
+
+    def stats(self) -> dict[str, int]:
+        stats = {"hits": self.hits, "misses": self.misses}
+        if isinstance(self._store, BoundedCache):
+            stats.update(
+                entries=len(self._store),
+                bytes=self._store.nbytes,
+                evictions=self._store.evictions,
+            )
+        return stats
@@ -0,0 +1,390 @@
+"""Python client for denden servers.
+
+Python code can call the server through the ``denden`` CLI, but then every
+call spawns a process and opens a new connection. :class:`Client` and
+:class:`AsyncClient` send requests directly, over one channel per address
+that the whole process shares::
+
+    client = Client()  # DENDEN_ADDR, DENDEN_AGENT_ID, ... as the CLI reads them
+    response = client.send(denden_pb2.DenDenRequest(
+        ask_user=denden_pb2.AskUserPayload(question="Deploy now?"),
+    ))
+    responses = client.send_batch(requests, max_parallel=8)
+
+Like ``denden send``, the clients fill in what a request leaves empty:
+``request_id``, ``denden_version``, ``trace.created_at`` and the trace ids
+from ``DENDEN_AGENT_ID``, ``DENDEN_PARENT_AGENT_ID`` and ``DENDEN_RUN_ID``.
+A call gives up at ``DENDEN_TIMEOUT`` or ``DENDEN_DEADLINE``, whichever
+comes first, and raises ``grpc.RpcError`` for gRPC failures.
+
+Responses the server marks retryable (``ErrorDetail.retryable``: overload,
+timeouts, a crashed worker) are sent again with the same ``request_id``,
+up to ``DENDEN_RETRIES`` times. The wait starts at the response's
+``retry_after_ms`` (or 0.25 s), doubles per attempt up to 10 s and is half
+random. The CLI retries only overload refusals. A batch resends just its
+retryable items.
+
+Pooled channels ping the server every 30 s, also between calls, so a dead
+connection is noticed before the next call hangs on it. A forked child
+starts with an empty pool.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import random
+import re
+import threading
+import time
+import uuid
+import weakref
+from typing import Callable, Iterable, Iterator, Sequence
+
+import grpc
+
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import VERSION
+
+DEFAULT_ADDR = "127.0.0.1:9700"
+DEFAULT_RETRIES = 5
+
+# Back-off for retryable responses; see retry_delay.
+_RETRY_AFTER = 0.25
+_MAX_RETRY_DELAY = 10.0
+
+CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30_000),
+    ("grpc.keepalive_timeout_ms", 10_000),
+    ("grpc.keepalive_permit_without_calls", 1),
+]
+
+_lock = threading.Lock()
+_channels: dict[str, grpc.Channel] = {}
+_aio_channels: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, grpc.aio.Channel]
+] = weakref.WeakKeyDictionary()
+
+
+def channel(addr: str) -> grpc.Channel:
+    """The process's shared channel to *addr*."""
+    with _lock:
+        ch = _channels.get(addr)
+        if ch is None:
+            ch = _channels[addr] = grpc.insecure_channel(addr, options=CHANNEL_OPTIONS)
+        return ch
+
+
+def aio_channel(addr: str) -> grpc.aio.Channel:
+    """The running event loop's shared channel to *addr*; an asyncio
+    channel only works on the loop that created it."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        channels = _aio_channels.setdefault(loop, {})
+        ch = channels.get(addr)
+        if ch is None:
+            ch = channels[addr] = grpc.aio.insecure_channel(addr, options=CHANNEL_OPTIONS)
+        return ch
+
+
+def close_channels() -> None:
+    """Close the pooled (non-asyncio) channels; later calls open new ones."""
+    with _lock:
+        channels = list(_channels.values())
+        _channels.clear()
+    for ch in channels:
+        ch.close()
+
+
+def _forget_channels() -> None:
+    # The parent's channels and lock are of no use in a forked child.
+    global _lock
+    _lock = threading.Lock()
+    _channels.clear()
+    _aio_channels.clear()
+
+
+os.register_at_fork(after_in_child=_forget_channels)
+
+
+def resolve_addr(env: str) -> str:
+    """Dial target for a ``DENDEN_ADDR`` value: its first unix socket if it
+    lists one, else its first address, else :data:`DEFAULT_ADDR`."""
+    addrs = [a.strip() for a in env.split(",") if a.strip()]
+    for a in addrs:
+        if a.startswith(("unix:", "unix-abstract:")):
+            return a
+    return addrs[0] if addrs else DEFAULT_ADDR
+
+
+_DURATION_PART = re.compile(r"(\d+\.?\d*|\.\d+)(ns|us|µs|μs|ms|s|m|h)")
+_DURATION_UNITS = {
+    "ns": 1e-9, "us": 1e-6, "µs": 1e-6, "μs": 1e-6, "ms": 1e-3, "s": 1.0, "m": 60.0, "h": 3600.0,
+}
+
+
+def parse_duration(text: str) -> float:
+    """Seconds in a Go duration such as ``"30s"`` or ``"1m30s"``, the
+    format of ``DENDEN_TIMEOUT``."""
+    if text == "0":
+        return 0.0
+    total, pos = 0.0, 0
+    for match in _DURATION_PART.finditer(text):
+        if match.start() != pos:
+            break
+        total += float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+        pos = match.end()
+    if pos == 0 or pos != len(text):
+        raise ValueError(f"invalid duration {text!r}")
+    return total
+
+
+def retry_delay(hint_ms: int, attempt: int, rand: Callable[[], float] = random.random) -> float:
+    """Seconds to wait before retry *attempt* (from 0) of a response with
+    ``retry_after_ms`` *hint_ms*, as the CLI waits."""
+    delay = hint_ms / 1000 if hint_ms > 0 else _RETRY_AFTER
+    for _ in range(attempt):
+        if delay >= _MAX_RETRY_DELAY:
+            break
+        delay *= 2
+    delay = min(delay, _MAX_RETRY_DELAY)
+    return delay / 2 + rand() * delay / 2
+
+
+def _retryable(response: denden_pb2.DenDenResponse) -> bool:
+    return response.status == denden_pb2.ERROR and response.error.retryable
+
+
+def _env_timeout() -> float | None:
+    try:
+        return parse_duration(os.environ.get("DENDEN_TIMEOUT", ""))
+    except ValueError:
+        return None  # unset or invalid, as the CLI treats it
+
+
+def _env_deadline() -> float | None:
+    try:
+        ms = int(os.environ.get("DENDEN_DEADLINE", ""))
+    except ValueError:
+        return None
+    return ms / 1000 if ms > 0 else None
+
+
+def _env_retries() -> int:
+    try:
+        retries = int(os.environ.get("DENDEN_RETRIES", ""))
+    except ValueError:
+        return DEFAULT_RETRIES
+    return retries if retries >= 0 else DEFAULT_RETRIES
+
+
+class _ClientBase:
+    def __init__(
+        self,
+        addr: str | None = None,
+        *,
+        agent_id: str | None = None,
+        parent_agent_id: str | None = None,
+        run_id: str | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+    ) -> None:
+        env = os.environ
+        self.addr = resolve_addr(env.get("DENDEN_ADDR", "") if addr is None else addr)
+        self.agent_id = env.get("DENDEN_AGENT_ID", "") if agent_id is None else agent_id
+        self.parent_agent_id = (
+            env.get("DENDEN_PARENT_AGENT_ID", "") if parent_agent_id is None else parent_agent_id
+        )
+        self.run_id = env.get("DENDEN_RUN_ID", "") if run_id is None else run_id
+        self.timeout = _env_timeout() if timeout is None else timeout
+        self.retries = _env_retries() if retries is None else retries
+        # Absolute (epoch seconds), passed down by a parent's handler.
+        self.deadline = _env_deadline()
+
+    def fill_envelope(self, request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenRequest:
+        """Fill the envelope fields *request* leaves empty, in place, as
+        ``denden send`` does; returns *request*."""
+        if not request.denden_version:
+            request.denden_version = VERSION
+        if not request.request_id:
+            request.request_id = f"req_{uuid.uuid4()}"
+        trace = request.trace
+        if not trace.HasField("created_at"):
+            trace.created_at.GetCurrentTime()
+        if not trace.agent_instance_id:
+            trace.agent_instance_id = self.agent_id
+        if not trace.parent_agent_instance_id:
+            trace.parent_agent_instance_id = self.parent_agent_id
+        if not trace.run_id:
+            trace.run_id = self.run_id
+        return request
+
+    def _call_deadline(self, timeout: float | None) -> float | None:
+        """Monotonic time at which a call started now must give up."""
+        now = time.monotonic()
+        timeout = self.timeout if timeout is None else timeout
+        deadlines = [now + timeout] if timeout is not None else []
+        if self.deadline is not None:
+            deadlines.append(now + self.deadline - time.time())
+        return min(deadlines, default=None)
+
+    def _backoff(
+        self,
+        responses: Iterable[denden_pb2.DenDenResponse],
+        attempt: int,
+        deadline: float | None,
+    ) -> float | None:
+        """Seconds to wait before retrying the retryable *responses*, or
+        ``None`` if there are none or no retry is left."""
+        hints = [r.error.retry_after_ms for r in responses if _retryable(r)]
+        if not hints or attempt >= self.retries:
+            return None
+        delay = retry_delay(max(hints), attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+
+def _remaining(deadline: float | None) -> float | None:
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+class Client(_ClientBase):
+    """Client for the server at *addr* (default: ``DENDEN_ADDR``).
+
+    *agent_id*, *parent_agent_id*, *run_id*, *timeout* (seconds) and
+    *retries* default to their ``DENDEN_*`` variables. Clients are cheap
+    and thread-safe; all clients of an address share its channel.
+    """
+
+    def __init__(self, addr: str | None = None, **kwargs) -> None:
+        super().__init__(addr, **kwargs)
+        self.stub = denden_pb2_grpc.DendenStub(channel(self.addr))
+
+    def send(
+        self, request: denden_pb2.DenDenRequest, *, timeout: float | None = None,
+    ) -> denden_pb2.DenDenResponse:
+        """Send *request*, retrying retryable responses; returns the last response."""
+        self.fill_envelope(request)
+        deadline = self._call_deadline(timeout)
+        for attempt in itertools.count():
+            response = self.stub.Send(request, timeout=_remaining(deadline))
+            delay = self._backoff([response], attempt, deadline)
+            if delay is None:
+                return response
+            time.sleep(delay)
+
+    def send_batch(
+        self,
+        requests: Sequence[denden_pb2.DenDenRequest],
+        *,
+        max_parallel: int = 0,
+        timeout: float | None = None,
+    ) -> list[denden_pb2.DenDenResponse]:
+        """Send *requests* in one ``SendBatch`` call; responses come back in
+        request order. Retryable responses are resent together."""
+        for request in requests:
+            self.fill_envelope(request)
+        deadline = self._call_deadline(timeout)
+        responses: list[denden_pb2.DenDenResponse] = [denden_pb2.DenDenResponse()] * len(requests)
+        pending = list(range(len(requests)))
+        for attempt in itertools.count():
+            batch = denden_pb2.BatchRequest(
+                requests=[requests[i] for i in pending], max_parallel=max_parallel,
+            )
+            result = self.stub.SendBatch(batch, timeout=_remaining(deadline))
+            for i, response in zip(pending, result.responses):
+                responses[i] = response
+            delay = self._backoff([responses[i] for i in pending], attempt, deadline)
+            if delay is None:
+                return responses
+            pending = [i for i in pending if _retryable(responses[i])]
+            time.sleep(delay)
+
+    def send_stream(
+        self, request: denden_pb2.DenDenRequest, *, timeout: float | None = None,
+    ) -> Iterator[denden_pb2.StreamEvent]:
+        """``SendStream``: progress and partial events, then the response.
+        Not retried, as events may already have been consumed."""
+        self.fill_envelope(request)
+        return self.stub.SendStream(request, timeout=_remaining(self._call_deadline(timeout)))
+
+    def status(self, *, timeout: float | None = None) -> denden_pb2.StatusResponse:
+        """The server's ``Status``."""
+        return self.stub.Status(
+            denden_pb2.StatusRequest(), timeout=_remaining(self._call_deadline(timeout)),
+        )
+
+
+class AsyncClient(_ClientBase):
+    """asyncio variant of :class:`Client`. Its channel belongs to the
+    event loop it is first used on; each loop gets its own."""
+
+    def __init__(self, addr: str | None = None, **kwargs) -> None:
+        super().__init__(addr, **kwargs)
+        self._stubs: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, denden_pb2_grpc.DendenStub
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def stub(self) -> denden_pb2_grpc.DendenStub:
+        """Stub on the running loop's channel, for RPCs without a method here."""
+        loop = asyncio.get_running_loop()
+        stub = self._stubs.get(loop)
+        if stub is None:
+            stub = self._stubs[loop] = denden_pb2_grpc.DendenStub(aio_channel(self.addr))
+        return stub
+
+    async def send(
+        self, request: denden_pb2.DenDenRequest, *, timeout: float | None = None,
+    ) -> denden_pb2.DenDenResponse:
+        """See :meth:`Client.send`."""
+        self.fill_envelope(request)
+        deadline = self._call_deadline(timeout)
+        for attempt in itertools.count():
+            response = await self.stub.Send(request, timeout=_remaining(deadline))
+            delay = self._backoff([response], attempt, deadline)
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+
+    async def send_batch(
+        self,
+        requests: Sequence[denden_pb2.DenDenRequest],
+        *,
+        max_parallel: int = 0,
+        timeout: float | None = None,
+    ) -> list[denden_pb2.DenDenResponse]:
+        """See :meth:`Client.send_batch`."""
+        for request in requests:
+            self.fill_envelope(request)
+        deadline = self._call_deadline(timeout)
+        responses: list[denden_pb2.DenDenResponse] = [denden_pb2.DenDenResponse()] * len(requests)
+        pending = list(range(len(requests)))
+        for attempt in itertools.count():
+            batch = denden_pb2.BatchRequest(
+                requests=[requests[i] for i in pending], max_parallel=max_parallel,
+            )
+            result = await self.stub.SendBatch(batch, timeout=_remaining(deadline))
+            for i, response in zip(pending, result.responses):
+                responses[i] = response
+            delay = self._backoff([responses[i] for i in pending], attempt, deadline)
+            if delay is None:
+                return responses
+            pending = [i for i in pending if _retryable(responses[i])]
+            await asyncio.sleep(delay)
+
+    def send_stream(
+        self, request: denden_pb2.DenDenRequest, *, timeout: float | None = None,
+    ) -> grpc.aio.UnaryStreamCall:
+        """See :meth:`Client.send_stream`; iterate with ``async for``."""
+        self.fill_envelope(request)
+        return self.stub.SendStream(request, timeout=_remaining(self._call_deadline(timeout)))
+
+    async def status(self, *, timeout: float | None = None) -> denden_pb2.StatusResponse:
+        """The server's ``Status``."""
+        return await self.stub.Status(
+            denden_pb2.StatusRequest(), timeout=_remaining(self._call_deadline(timeout)),
+        )
@@ -0,0 +1,217 @@
+"""Per-request deadline and cancellation for handlers.
+
+While a handler runs, :func:`current_context` returns its
+:class:`RequestContext`. The context knows the deadline: the client's gRPC
+deadline or the server's timeout for the payload type, whichever comes
+first. It is cancelled when that deadline passes or when the client goes
+away::
+
+    def delegate(request):
+        ctx = current_context()
+        proc = subprocess.Popen(cmd, env={**os.environ, **ctx.child_env()})
+        ctx.add_callback(proc.kill)  # stop the subagent nobody waits for
+        proc.wait()
+        ...
+
+A handler can also poll :attr:`RequestContext.cancelled`, sleep with
+:meth:`RequestContext.wait` or bail out with :meth:`RequestContext.check`.
+Cancellation is cooperative: a handler that ignores it keeps its thread
+until it returns, but its result is then replaced by
+``ERR_SUBAGENT_TIMEOUT`` if the server-side timeout had passed.
+
+:meth:`RequestContext.child_env` passes the deadline on to nested agents as
+``DENDEN_DEADLINE`` (Unix epoch milliseconds), which the CLI honours on
+top of ``DENDEN_TIMEOUT``.
+"""
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+import weakref
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Why a context was cancelled.
+TIMEOUT = "TIMEOUT"  # the server's timeout for the payload type passed
+DEADLINE_EXCEEDED = "DEADLINE_EXCEEDED"  # the client's deadline passed
+CANCELLED = "CANCELLED"  # the client cancelled or disconnected
+
+
+class RequestCancelled(Exception):
+    """Raised by :meth:`RequestContext.check` once the request is cancelled."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class RequestContext:
+    """Deadline, cancellation flag and cancellation callbacks of one request.
+
+    *deadline* is a :func:`time.monotonic` timestamp, or ``None``;
+    *deadline_reason* is what passing it counts as (:data:`TIMEOUT` or
+    :data:`DEADLINE_EXCEEDED`).
+    """
+
+    def __init__(
+        self,
+        request_id: str = "",
+        deadline: float | None = None,
+        deadline_reason: str = DEADLINE_EXCEEDED,
+    ) -> None:
+        self.request_id = request_id
+        self.deadline = deadline
+        self.deadline_reason = deadline_reason
+        self.reason = ""
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+        self._closed = False
+
+    def time_remaining(self) -> float | None:
+        """Seconds until the deadline (at least 0), or ``None`` without one."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = CANCELLED) -> bool:
+        """Cancel the request and run its callbacks; returns ``False`` if it
+        was already cancelled or has finished."""
+        with self._lock:
+            if self._closed or self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            _run_callback(callback)
+        return True
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Run *callback* when the request is cancelled (right away if it
+        already is). Callbacks may run on any thread."""
+        with self._lock:
+            if not self._event.is_set():
+                if not self._closed:
+                    self._callbacks.append(callback)
+                return
+        _run_callback(callback)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until cancelled or *timeout* seconds pass; returns
+        :attr:`cancelled`."""
+        return self._event.wait(timeout)
+
+    def check(self) -> None:
+        """Raise :class:`RequestCancelled` if the request is cancelled."""
+        if self._event.is_set():
+            raise RequestCancelled(self.reason)
+
+    def child_env(self) -> dict[str, str]:
+        """Environment for a nested agent so its requests share this
+        deadline; empty without one."""
+        remaining = self.time_remaining()
+        if remaining is None:
+            return {}
+        return {"DENDEN_DEADLINE": str(int((time.time() + remaining) * 1000))}
+
+    def close(self) -> None:
+        """Mark the request finished: later cancellation is ignored and
+        pending callbacks are dropped."""
+        with self._lock:
+            self._closed = True
+            self._callbacks = []
+
+
+def _run_callback(callback: Callable[[], None]) -> None:
+    try:
+        callback()
+    except Exception:
+        logger.exception("cancellation callback %r failed", callback)
+
+
+_current: contextvars.ContextVar[RequestContext] = contextvars.ContextVar("denden_request_context")
+
+
+def current_context() -> RequestContext:
+    """Context of the request being handled. Outside a request (e.g. a
+    handler called directly in a test) this is a fresh context that has no
+    deadline and is never cancelled."""
+    ctx = _current.get(None)
+    return ctx if ctx is not None else RequestContext()
+
+
+def activate(ctx: RequestContext) -> contextvars.Token:
+    """Make *ctx* the :func:`current_context`; undo with :func:`deactivate`."""
+    return _current.set(ctx)
+
+
+def deactivate(token: contextvars.Token) -> None:
+    try:
+        _current.reset(token)
+    except ValueError:
+        # A streaming handler's generator was closed from another context
+        # (e.g. garbage-collected elsewhere); there is nothing to restore.
+        pass
+
+
+class _DeadlineTimer:
+    """One thread that cancels contexts whose deadline has passed."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, weakref.ref]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def add(self, ctx: RequestContext) -> None:
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="denden-deadlines", daemon=True,
+                )
+                self._thread.start()
+            entry = (ctx.deadline, next(self._seq), weakref.ref(ctx))
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                _, _, ref = heapq.heappop(self._heap)
+            ctx = ref()
+            if ctx is not None:
+                ctx.cancel(ctx.deadline_reason)
+
+
+_timer = _DeadlineTimer()
+
+
+def new_context(
+    request_id: str,
+    rpc_remaining: float | None = None,
+    timeout: float | None = None,
+) -> RequestContext:
+    """Context for a request whose client allows *rpc_remaining* seconds
+    and whose payload type has a server-side *timeout* (either may be
+    ``None``). Only server-side timeouts need the deadline timer; a client
+    deadline cancels through the RPC's own termination callback."""
+    if timeout is not None and (rpc_remaining is None or timeout <= rpc_remaining):
+        ctx = RequestContext(request_id, time.monotonic() + timeout, TIMEOUT)
+        _timer.add(ctx)
+        return ctx
+    if rpc_remaining is not None:
+        return RequestContext(request_id, time.monotonic() + rpc_remaining, DEADLINE_EXCEEDED)
+    return RequestContext(request_id)
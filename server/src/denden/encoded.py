@@ -0,0 +1,126 @@
+"""Pre-encoded JSON and msgpack payloads in place of ``Struct``.
+
+``Task.extra`` and ``DelegateResult.output`` are ``google.protobuf.Struct``
+messages. Building one from a large nested dict, and turning it back into
+a dict, is slow, and every number becomes a double on the way. The
+``extra_encoded`` and ``output_encoded`` fields carry the same value as
+bytes with a content type instead. They cost nothing to forward, cache or
+journal, and are decoded only when a handler asks for the value::
+
+    def delegate(request):
+        extra = task_extra(request.delegate.task)  # nothing decoded yet
+        rows = extra.value["rows"]                   # decoded here, once
+        result = denden_pb2.DelegateResult(
+            output_format=denden_pb2.JSON, output_encoded=encode(summarize(rows)),
+        )
+        return ok_response(request.request_id, delegate_result=result)
+
+:func:`task_extra` and :func:`delegate_output` fall back to the ``Struct``
+field when the encoded one is unset, so handlers work with either kind
+of sender. ``application/msgpack`` needs the ``msgpack`` package
+(``pip install 'denden-server[msgpack]'``).
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from google.protobuf import json_format, struct_pb2
+
+from denden.gen import denden_pb2
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+_UNSET = object()
+
+
+class LazyValue:
+    """A payload value that is decoded on first access of :attr:`value`.
+
+    :attr:`data` and :attr:`content_type` give the encoded form, e.g. to
+    hand it to a subprocess as it came.
+    """
+
+    __slots__ = ("content_type", "_data", "_struct", "_value")
+
+    def __init__(
+        self,
+        data: bytes | None = None,
+        content_type: str = JSON,
+        struct: struct_pb2.Struct | None = None,
+    ) -> None:
+        self.content_type = content_type or JSON
+        self._data = data
+        self._struct = struct
+        self._value: Any = _UNSET
+
+    @property
+    def value(self) -> Any:
+        """The decoded value; ``{}`` if the field was empty."""
+        if self._value is _UNSET:
+            if self._data is not None:
+                self._value = decode(self._data, self.content_type)
+            elif self._struct is not None:
+                self._value = json_format.MessageToDict(self._struct)
+            else:
+                self._value = {}
+        return self._value
+
+    @property
+    def data(self) -> bytes:
+        """The value encoded as :attr:`content_type`."""
+        if self._data is None:
+            self._data = _encode(self.value, self.content_type)
+        return self._data
+
+
+def task_extra(task: denden_pb2.Task) -> LazyValue:
+    """``task.extra_encoded``, or else ``task.extra``, as a :class:`LazyValue`."""
+    return _lazy(task, "extra")
+
+
+def delegate_output(result: denden_pb2.DelegateResult) -> LazyValue:
+    """``result.output_encoded``, or else ``result.output``, as a :class:`LazyValue`."""
+    return _lazy(result, "output")
+
+
+def _lazy(message, field: str) -> LazyValue:
+    if message.HasField(f"{field}_encoded"):
+        encoded = getattr(message, f"{field}_encoded")
+        return LazyValue(encoded.data, encoded.content_type)
+    if message.HasField(field):
+        return LazyValue(struct=getattr(message, field))
+    return LazyValue()
+
+
+def encode(value: Any, content_type: str = JSON) -> denden_pb2.EncodedValue:
+    """*value* as an ``EncodedValue`` for ``extra_encoded``/``output_encoded``."""
+    return denden_pb2.EncodedValue(content_type=content_type, data=_encode(value, content_type))
+
+
+def decode(data: bytes, content_type: str = JSON) -> Any:
+    """Decode *data* of *content_type* (empty means JSON)."""
+    if content_type in (JSON, ""):
+        return json.loads(data)
+    if content_type == MSGPACK:
+        return _msgpack().unpackb(data)
+    raise ValueError(f"unsupported content type {content_type!r}")
+
+
+def _encode(value: Any, content_type: str) -> bytes:
+    if content_type in (JSON, ""):
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+    if content_type == MSGPACK:
+        return _msgpack().packb(value)
+    raise ValueError(f"unsupported content type {content_type!r}")
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise RuntimeError(
+            f"{MSGPACK} needs the msgpack package: pip install 'denden-server[msgpack]'"
+        ) from None
+    return msgpack
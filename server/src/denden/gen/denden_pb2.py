@@ -26,7 +26,7 @@ from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0c\x64\x65nden.proto\x12\x06\x64\x65nden\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto\"\xea\x01\n\rDenDenRequest\x12\x16\n\x0e\x64\x65nden_version\x18\x01 \x01(\t\x12\x12\n\nrequest_id\x18\x02 \x01(\t\x12\x1c\n\x05trace\x18\x03 \x01(\x0b\x32\r.denden.Trace\x12*\n\x08\x61sk_user\x18\n \x01(\x0b\x32\x16.denden.AskUserPayloadH\x00\x12+\n\x08\x64\x65legate\x18\x0b \x01(\x0b\x32\x17.denden.DelegatePayloadH\x00\x12+\n\x08remember\x18\x0c \x01(\x0b\x32\x17.denden.RememberPayloadH\x00\x42\t\n\x07payload\"\x84\x01\n\x05Trace\x12\x0e\n\x06run_id\x18\x01 \x01(\t\x12\x19\n\x11\x61gent_instance_id\x18\x02 \x01(\t\x12 \n\x18parent_agent_instance_id\x18\x03 \x01(\t\x12.\n\ncreated_at\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x80\x01\n\x0e\x41skUserPayload\x12\x10\n\x08question\x18\x01 \x01(\t\x12\x0f\n\x07\x63hoices\x18\x02 \x03(\t\x12\x15\n\rdefault_value\x18\x03 \x01(\t\x12\x0b\n\x03why\x18\x04 \x01(\t\x12\'\n\x0fresponse_format\x18\x05 \x01(\x0e\x32\x0e.denden.Format\"B\n\x0f\x44\x65legatePayload\x12\x13\n\x0b\x64\x65legate_to\x18\x01 \x01(\t\x12\x1a\n\x04task\x18\x02 \x01(\x0b\x32\x0c.denden.Task\"z\n\x04Task\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x15\n\rartifact_refs\x18\x02 \x03(\t\x12&\n\x05\x65xtra\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12%\n\rreturn_format\x18\x04 \x01(\x0e\x32\x0e.denden.Format\"C\n\x0fRememberPayload\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\t\x12\x10\n\x08keywords\x18\x02 \x03(\t\x12\r\n\x05scope\x18\x03 \x01(\t\"\xaa\x02\n\x0e\x44\x65nDenResponse\x12\x16\n\x0e\x64\x65nden_version\x18\x01 \x01(\t\x12\x12\n\nrequest_id\x18\x02 \x01(\t\x12&\n\x06status\x18\x03 \x01(\x0e\x32\x16.denden.ResponseStatus\x12\"\n\x05\x65rror\x18\x04 \x01(\x0b\x32\x13.denden.ErrorDetail\x12\x30\n\x0f\x61sk_user_result\x18\n \x01(\x0b\x32\x15.denden.AskUserResultH\x00\x12\x31\n\x0f\x64\x65legate_result\x18\x0b \x01(\x0b\x32\x16.denden.DelegateResultH\x00\x12\x31\n\x0fremember_result\x18\x0c \x01(\x0b\x32\x16.denden.RememberResultH\x00\x42\x08\n\x06result\"?\n\x0b\x45rrorDetail\x12\x0c\n\x04\x63ode\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\tretryable\x18\x03 \x01(\x08\"S\n\rAskUserResult\x12\x0e\n\x04text\x18\x01 \x01(\tH\x00\x12\'\n\x04json\x18\x02 \x01(\x0b\x32\x17.google.protobuf.StructH\x00\x42\t\n\x07\x63ontent\"q\n\x0e\x44\x65legateResult\x12%\n\routput_format\x18\x01 \x01(\x0e\x32\x0e.denden.Format\x12\'\n\x06output\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0f\n\x07summary\x18\x03 \x01(\t\"2\n\x0eRememberResult\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x10\n\x08\x65ntry_id\x18\x02 \x01(\t\"\x0f\n\rStatusRequest\"?\n\x0eStatusResponse\x12\x16\n\x0euptime_seconds\x18\x01 \x01(\x03\x12\x15\n\ractive_agents\x18\x02 \x01(\x05*\x1c\n\x06\x46ormat\x12\x08\n\x04TEXT\x10\x00\x12\x08\n\x04JSON\x10\x01*/\n\x0eResponseStatus\x12\x06\n\x02OK\x10\x00\x12\n\n\x06\x44\x45NIED\x10\x01\x12\t\n\x05\x45RROR\x10\x02\x32x\n\x06\x44\x65nden\x12\x35\n\x04Send\x12\x15.denden.DenDenRequest\x1a\x16.denden.DenDenResponse\x12\x37\n\x06Status\x12\x15.denden.StatusRequest\x1a\x16.denden.StatusResponseB+Z)github.com/strawpot/denden/cli/gen/dendenb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0c\x64\x65nden.proto\x12\x06\x64\x65nden\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto\"\x93\x02\n\rDenDenRequest\x12\x16\n\x0e\x64\x65nden_version\x18\x01 \x01(\t\x12\x12\n\nrequest_id\x18\x02 \x01(\t\x12\x1c\n\x05trace\x18\x03 \x01(\x0b\x32\r.denden.Trace\x12*\n\x08\x61sk_user\x18\n \x01(\x0b\x32\x16.denden.AskUserPayloadH\x00\x12+\n\x08\x64\x65legate\x18\x0b \x01(\x0b\x32\x17.denden.DelegatePayloadH\x00\x12+\n\x08remember\x18\x0c \x01(\x0b\x32\x17.denden.RememberPayloadH\x00\x12\'\n\x06recall\x18\r \x01(\x0b\x32\x15.denden.RecallPayloadH\x00\x42\t\n\x07payload\"\x84\x01\n\x05Trace\x12\x0e\n\x06run_id\x18\x01 \x01(\t\x12\x19\n\x11\x61gent_instance_id\x18\x02 \x01(\t\x12 \n\x18parent_agent_instance_id\x18\x03 \x01(\t\x12.\n\ncreated_at\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x80\x01\n\x0e\x41skUserPayload\x12\x10\n\x08question\x18\x01 \x01(\t\x12\x0f\n\x07\x63hoices\x18\x02 \x03(\t\x12\x15\n\rdefault_value\x18\x03 \x01(\t\x12\x0b\n\x03why\x18\x04 \x01(\t\x12\'\n\x0fresponse_format\x18\x05 \x01(\x0e\x32\x0e.denden.Format\"B\n\x0f\x44\x65legatePayload\x12\x13\n\x0b\x64\x65legate_to\x18\x01 \x01(\t\x12\x1a\n\x04task\x18\x02 \x01(\x0b\x32\x0c.denden.Task\"\xa7\x01\n\x04Task\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x15\n\rartifact_refs\x18\x02 \x03(\t\x12&\n\x05\x65xtra\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12%\n\rreturn_format\x18\x04 \x01(\x0e\x32\x0e.denden.Format\x12+\n\rextra_encoded\x18\x05 \x01(\x0b\x32\x14.denden.EncodedValue\"C\n\x0fRememberPayload\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\t\x12\x10\n\x08keywords\x18\x02 \x03(\t\x12\r\n\x05scope\x18\x03 \x01(\t\"O\n\rRecallPayload\x12\r\n\x05query\x18\x01 \x01(\t\x12\x10\n\x08keywords\x18\x02 \x03(\t\x12\x0e\n\x06scopes\x18\x03 \x03(\t\x12\r\n\x05top_k\x18\x04 \x01(\x05\"\xd9\x02\n\x0e\x44\x65nDenResponse\x12\x16\n\x0e\x64\x65nden_version\x18\x01 \x01(\t\x12\x12\n\nrequest_id\x18\x02 \x01(\t\x12&\n\x06status\x18\x03 \x01(\x0e\x32\x16.denden.ResponseStatus\x12\"\n\x05\x65rror\x18\x04 \x01(\x0b\x32\x13.denden.ErrorDetail\x12\x30\n\x0f\x61sk_user_result\x18\n \x01(\x0b\x32\x15.denden.AskUserResultH\x00\x12\x31\n\x0f\x64\x65legate_result\x18\x0b \x01(\x0b\x32\x16.denden.DelegateResultH\x00\x12\x31\n\x0fremember_result\x18\x0c \x01(\x0b\x32\x16.denden.RememberResultH\x00\x12-\n\rrecall_result\x18\r \x01(\x0b\x32\x14.denden.RecallResultH\x00\x42\x08\n\x06result\"W\n\x0b\x45rrorDetail\x12\x0c\n\x04\x63ode\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\tretryable\x18\x03 \x01(\x08\x12\x16\n\x0eretry_after_ms\x18\x04 \x01(\x03\"S\n\rAskUserResult\x12\x0e\n\x04text\x18\x01 \x01(\tH\x00\x12\'\n\x04json\x18\x02 \x01(\x0b\x32\x17.google.protobuf.StructH\x00\x42\t\n\x07\x63ontent\"\xb6\x01\n\x0e\x44\x65legateResult\x12%\n\routput_format\x18\x01 \x01(\x0e\x32\x0e.denden.Format\x12\'\n\x06output\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0f\n\x07summary\x18\x03 \x01(\t\x12\x15\n\rartifact_refs\x18\x04 \x03(\t\x12,\n\x0eoutput_encoded\x18\x05 \x01(\x0b\x32\x14.denden.EncodedValue\"2\n\x0c\x45ncodedValue\x12\x14\n\x0c\x63ontent_type\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\"2\n\x0eRememberResult\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x10\n\x08\x65ntry_id\x18\x02 \x01(\t\"6\n\x0cRecallResult\x12&\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x15.denden.RecalledEntry\"b\n\rRecalledEntry\x12\x10\n\x08\x65ntry_id\x18\x01 \x01(\t\x12\r\n\x05scope\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\x12\x10\n\x08keywords\x18\x04 \x03(\t\x12\r\n\x05score\x18\x05 \x01(\x01\"\xb5\x01\n\x0bStreamEvent\x12\x12\n\nrequest_id\x18\x01 \x01(\t\x12\x0b\n\x03seq\x18\x02 \x01(\x03\x12$\n\x08progress\x18\n \x01(\x0b\x32\x10.denden.ProgressH\x00\x12*\n\x07partial\x18\x0b \x01(\x0b\x32\x17.google.protobuf.StructH\x00\x12*\n\x08response\x18\x0c \x01(\x0b\x32\x16.denden.DenDenResponseH\x00\x42\x07\n\x05\x65vent\"-\n\x08Progress\x12\x0f\n\x07message\x18\x01 \x01(\t\x12\x10\n\x08\x66raction\x18\x02 \x01(\x01\"M\n\x0c\x42\x61tchRequest\x12\'\n\x08requests\x18\x01 \x03(\x0b\x32\x15.denden.DenDenRequest\x12\x14\n\x0cmax_parallel\x18\x02 \x01(\x05\":\n\rBatchResponse\x12)\n\tresponses\x18\x01 \x03(\x0b\x32\x16.denden.DenDenResponse\"D\n\tBatchItem\x12\r\n\x05index\x18\x01 \x01(\x05\x12(\n\x08response\x18\x02 \x01(\x0b\x32\x16.denden.DenDenResponse\"P\n\tJobHandle\x12\x0e\n\x06job_id\x18\x01 \x01(\t\x12\x12\n\nrequest_id\x18\x02 \x01(\t\x12\x1f\n\x05state\x18\x03 \x01(\x0e\x32\x10.denden.JobState\"2\n\x0c\x41waitRequest\x12\x0e\n\x06job_id\x18\x01 \x01(\t\x12\x12\n\ntimeout_ms\x18\x02 \x01(\x03\"\x1d\n\x0bPollRequest\x12\x0e\n\x06job_id\x18\x01 \x01(\t\"f\n\tJobStatus\x12\x0e\n\x06job_id\x18\x01 \x01(\t\x12\x1f\n\x05state\x18\x02 \x01(\x0e\x32\x10.denden.JobState\x12(\n\x08response\x18\x03 \x01(\x0b\x32\x16.denden.DenDenResponse\"l\n\nTraceQuery\x12\x0e\n\x06run_id\x18\x01 \x01(\t\x12\x19\n\x11\x61gent_instance_id\x18\x02 \x01(\t\x12$\n\x04kind\x18\x03 \x01(\x0e\x32\x16.denden.TraceQueryKind\x12\r\n\x05limit\x18\x04 \x01(\x05\"\xcd\x02\n\tTraceNode\x12\x19\n\x11\x61gent_instance_id\x18\x01 \x01(\t\x12 \n\x18parent_agent_instance_id\x18\x02 \x01(\t\x12\r\n\x05\x64\x65pth\x18\x03 \x01(\x05\x12.\n\nstarted_at\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12,\n\x08\x65nded_at\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x13\n\x0b\x64uration_ms\x18\x06 \x01(\x03\x12\x1b\n\x13subtree_duration_ms\x18\x07 \x01(\x03\x12\r\n\x05\x63\x61lls\x18\x08 \x01(\x05\x12\x11\n\tin_flight\x18\t \x01(\x05\x12\n\n\x02ok\x18\n \x01(\x05\x12\x0e\n\x06\x64\x65nied\x18\x0b \x01(\x05\x12\r\n\x05\x65rror\x18\x0c \x01(\x05\x12\x17\n\x0flast_error_code\x18\r \x01(\t\"N\n\x0bTraceResult\x12\x0e\n\x06run_id\x18\x01 \x01(\t\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\x12 \n\x05nodes\x18\x03 \x03(\x0b\x32\x11.denden.TraceNode\"\x1e\n\rStatusRequest\x12\r\n\x05local\x18\x01 \x01(\x08\"\xc2\x01\n\x0eStatusResponse\x12\x16\n\x0euptime_seconds\x18\x01 \x01(\x03\x12\x15\n\ractive_agents\x18\x02 \x01(\x05\x12\x11\n\tin_flight\x18\x03 \x01(\x03\x12\x13\n\x0bqueue_depth\x18\x04 \x01(\x03\x12&\n\x08payloads\x18\x05 \x03(\x0b\x32\x14.denden.PayloadStats\x12 \n\x05lanes\x18\x06 \x03(\x0b\x32\x11.denden.LaneStats\x12\x0f\n\x07workers\x18\x07 \x01(\x05\"u\n\tLaneStats\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x13\n\x0b\x63oncurrency\x18\x02 \x01(\x05\x12\x12\n\nmax_queued\x18\x03 \x01(\x05\x12\x0f\n\x07running\x18\x04 \x01(\x03\x12\x0e\n\x06queued\x18\x05 \x01(\x03\x12\x10\n\x08rejected\x18\x06 \x01(\x03\"\xc6\x01\n\x0cPayloadStats\x12\x14\n\x0cpayload_type\x18\x01 \x01(\t\x12\x11\n\tin_flight\x18\x02 \x01(\x03\x12\n\n\x02ok\x18\x03 \x01(\x03\x12\x0e\n\x06\x64\x65nied\x18\x04 \x01(\x03\x12\r\n\x05\x65rror\x18\x05 \x01(\x03\x12\x0e\n\x06p50_ms\x18\x06 \x01(\x01\x12\x0e\n\x06p90_ms\x18\x07 \x01(\x01\x12\x0e\n\x06p99_ms\x18\x08 \x01(\x01\x12\x0e\n\x06max_ms\x18\t \x01(\x01\x12\"\n\x06\x65rrors\x18\n \x03(\x0b\x32\x12.denden.ErrorCount\")\n\nErrorCount\x12\x0c\n\x04\x63ode\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x03\"-\n\rArtifactChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0e\n\x06run_id\x18\x02 \x01(\t\"(\n\x0b\x41rtifactRef\x12\x0b\n\x03ref\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x03\"A\n\x12GetArtifactRequest\x12\x0b\n\x03ref\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0e\n\x06length\x18\x03 \x01(\x03\")\n\x17ReleaseArtifactsRequest\x12\x0e\n\x06run_id\x18\x01 \x01(\t\"=\n\x18ReleaseArtifactsResponse\x12\x10\n\x08released\x18\x01 \x01(\x03\x12\x0f\n\x07\x64\x65leted\x18\x02 \x01(\x03*\x1c\n\x06\x46ormat\x12\x08\n\x04TEXT\x10\x00\x12\x08\n\x04JSON\x10\x01*/\n\x0eResponseStatus\x12\x06\n\x02OK\x10\x00\x12\n\n\x06\x44\x45NIED\x10\x01\x12\t\n\x05\x45RROR\x10\x02*=\n\x08JobState\x12\x0b\n\x07PENDING\x10\x00\x12\x0b\n\x07RUNNING\x10\x01\x12\x08\n\x04\x44ONE\x10\x02\x12\r\n\tNOT_FOUND\x10\x03*F\n\x0eTraceQueryKind\x12\x0b\n\x07SUBTREE\x10\x00\x12\x11\n\rCRITICAL_PATH\x10\x01\x12\x14\n\x10SLOWEST_BRANCHES\x10\x02\x32\xd1\x05\n\x06\x44\x65nden\x12\x35\n\x04Send\x12\x15.denden.DenDenRequest\x1a\x16.denden.DenDenResponse\x12:\n\nSendStream\x12\x15.denden.DenDenRequest\x1a\x13.denden.StreamEvent0\x01\x12\x38\n\tSendBatch\x12\x14.denden.BatchRequest\x1a\x15.denden.BatchResponse\x12<\n\x0fSendBatchStream\x12\x14.denden.BatchRequest\x1a\x11.denden.BatchItem0\x01\x12\x32\n\x06Submit\x12\x15.denden.DenDenRequest\x1a\x11.denden.JobHandle\x12\x30\n\x05\x41wait\x12\x14.denden.AwaitRequest\x1a\x11.denden.JobStatus\x12.\n\x04Poll\x12\x13.denden.PollRequest\x1a\x11.denden.JobStatus\x12\x35\n\nQueryTrace\x12\x12.denden.TraceQuery\x1a\x13.denden.TraceResult\x12\x37\n\x06Status\x12\x15.denden.StatusRequest\x1a\x16.denden.StatusResponse\x12;\n\x0bPutArtifact\x12\x15.denden.ArtifactChunk\x1a\x13.denden.ArtifactRef(\x01\x12\x42\n\x0bGetArtifact\x12\x1a.denden.GetArtifactRequest\x1a\x15.denden.ArtifactChunk0\x01\x12U\n\x10ReleaseArtifacts\x12\x1f.denden.ReleaseArtifactsRequest\x1a .denden.ReleaseArtifactsResponseB+Z)github.com/strawpot/denden/cli/gen/dendenb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -34,36 +34,88 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'denden_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   _globals['DESCRIPTOR']._loaded_options = None
   _globals['DESCRIPTOR']._serialized_options = b'Z)github.com/strawpot/denden/cli/gen/denden'
-  _globals['_FORMAT']._serialized_start=1551
-  _globals['_FORMAT']._serialized_end=1579
-  _globals['_RESPONSESTATUS']._serialized_start=1581
-  _globals['_RESPONSESTATUS']._serialized_end=1628
+  _globals['_FORMAT']._serialized_start=4075
+  _globals['_FORMAT']._serialized_end=4103
+  _globals['_RESPONSESTATUS']._serialized_start=4105
+  _globals['_RESPONSESTATUS']._serialized_end=4152
+  _globals['_JOBSTATE']._serialized_start=4154
+  _globals['_JOBSTATE']._serialized_end=4215
+  _globals['_TRACEQUERYKIND']._serialized_start=4217
+  _globals['_TRACEQUERYKIND']._serialized_end=4287
   _globals['_DENDENREQUEST']._serialized_start=88
-  _globals['_DENDENREQUEST']._serialized_end=322
-  _globals['_TRACE']._serialized_start=325
-  _globals['_TRACE']._serialized_end=457
-  _globals['_ASKUSERPAYLOAD']._serialized_start=460
-  _globals['_ASKUSERPAYLOAD']._serialized_end=588
-  _globals['_DELEGATEPAYLOAD']._serialized_start=590
-  _globals['_DELEGATEPAYLOAD']._serialized_end=656
-  _globals['_TASK']._serialized_start=658
-  _globals['_TASK']._serialized_end=780
-  _globals['_REMEMBERPAYLOAD']._serialized_start=782
-  _globals['_REMEMBERPAYLOAD']._serialized_end=849
-  _globals['_DENDENRESPONSE']._serialized_start=852
-  _globals['_DENDENRESPONSE']._serialized_end=1150
-  _globals['_ERRORDETAIL']._serialized_start=1152
-  _globals['_ERRORDETAIL']._serialized_end=1215
-  _globals['_ASKUSERRESULT']._serialized_start=1217
-  _globals['_ASKUSERRESULT']._serialized_end=1300
-  _globals['_DELEGATERESULT']._serialized_start=1302
-  _globals['_DELEGATERESULT']._serialized_end=1415
-  _globals['_REMEMBERRESULT']._serialized_start=1417
-  _globals['_REMEMBERRESULT']._serialized_end=1467
-  _globals['_STATUSREQUEST']._serialized_start=1469
-  _globals['_STATUSREQUEST']._serialized_end=1484
-  _globals['_STATUSRESPONSE']._serialized_start=1486
-  _globals['_STATUSRESPONSE']._serialized_end=1549
-  _globals['_DENDEN']._serialized_start=1630
-  _globals['_DENDEN']._serialized_end=1750
+  _globals['_DENDENREQUEST']._serialized_end=363
+  _globals['_TRACE']._serialized_start=366
+  _globals['_TRACE']._serialized_end=498
+  _globals['_ASKUSERPAYLOAD']._serialized_start=501
+  _globals['_ASKUSERPAYLOAD']._serialized_end=629
+  _globals['_DELEGATEPAYLOAD']._serialized_start=631
+  _globals['_DELEGATEPAYLOAD']._serialized_end=697
+  _globals['_TASK']._serialized_start=700
+  _globals['_TASK']._serialized_end=867
+  _globals['_REMEMBERPAYLOAD']._serialized_start=869
+  _globals['_REMEMBERPAYLOAD']._serialized_end=936
+  _globals['_RECALLPAYLOAD']._serialized_start=938
+  _globals['_RECALLPAYLOAD']._serialized_end=1017
+  _globals['_DENDENRESPONSE']._serialized_start=1020
+  _globals['_DENDENRESPONSE']._serialized_end=1365
+  _globals['_ERRORDETAIL']._serialized_start=1367
+  _globals['_ERRORDETAIL']._serialized_end=1454
+  _globals['_ASKUSERRESULT']._serialized_start=1456
+  _globals['_ASKUSERRESULT']._serialized_end=1539
+  _globals['_DELEGATERESULT']._serialized_start=1542
+  _globals['_DELEGATERESULT']._serialized_end=1724
+  _globals['_ENCODEDVALUE']._serialized_start=1726
+  _globals['_ENCODEDVALUE']._serialized_end=1776
+  _globals['_REMEMBERRESULT']._serialized_start=1778
+  _globals['_REMEMBERRESULT']._serialized_end=1828
+  _globals['_RECALLRESULT']._serialized_start=1830
+  _globals['_RECALLRESULT']._serialized_end=1884
+  _globals['_RECALLEDENTRY']._serialized_start=1886
+  _globals['_RECALLEDENTRY']._serialized_end=1984
+  _globals['_STREAMEVENT']._serialized_start=1987
+  _globals['_STREAMEVENT']._serialized_end=2168
+  _globals['_PROGRESS']._serialized_start=2170
+  _globals['_PROGRESS']._serialized_end=2215
+  _globals['_BATCHREQUEST']._serialized_start=2217
+  _globals['_BATCHREQUEST']._serialized_end=2294
+  _globals['_BATCHRESPONSE']._serialized_start=2296
+  _globals['_BATCHRESPONSE']._serialized_end=2354
+  _globals['_BATCHITEM']._serialized_start=2356
+  _globals['_BATCHITEM']._serialized_end=2424
+  _globals['_JOBHANDLE']._serialized_start=2426
+  _globals['_JOBHANDLE']._serialized_end=2506
+  _globals['_AWAITREQUEST']._serialized_start=2508
+  _globals['_AWAITREQUEST']._serialized_end=2558
+  _globals['_POLLREQUEST']._serialized_start=2560
+  _globals['_POLLREQUEST']._serialized_end=2589
+  _globals['_JOBSTATUS']._serialized_start=2591
+  _globals['_JOBSTATUS']._serialized_end=2693
+  _globals['_TRACEQUERY']._serialized_start=2695
+  _globals['_TRACEQUERY']._serialized_end=2803
+  _globals['_TRACENODE']._serialized_start=2806
+  _globals['_TRACENODE']._serialized_end=3139
+  _globals['_TRACERESULT']._serialized_start=3141
+  _globals['_TRACERESULT']._serialized_end=3219
+  _globals['_STATUSREQUEST']._serialized_start=3221
+  _globals['_STATUSREQUEST']._serialized_end=3251
+  _globals['_STATUSRESPONSE']._serialized_start=3254
+  _globals['_STATUSRESPONSE']._serialized_end=3448
+  _globals['_LANESTATS']._serialized_start=3450
+  _globals['_LANESTATS']._serialized_end=3567
+  _globals['_PAYLOADSTATS']._serialized_start=3570
+  _globals['_PAYLOADSTATS']._serialized_end=3768
+  _globals['_ERRORCOUNT']._serialized_start=3770
+  _globals['_ERRORCOUNT']._serialized_end=3811
+  _globals['_ARTIFACTCHUNK']._serialized_start=3813
+  _globals['_ARTIFACTCHUNK']._serialized_end=3858
+  _globals['_ARTIFACTREF']._serialized_start=3860
+  _globals['_ARTIFACTREF']._serialized_end=3900
+  _globals['_GETARTIFACTREQUEST']._serialized_start=3902
+  _globals['_GETARTIFACTREQUEST']._serialized_end=3967
+  _globals['_RELEASEARTIFACTSREQUEST']._serialized_start=3969
+  _globals['_RELEASEARTIFACTSREQUEST']._serialized_end=4010
+  _globals['_RELEASEARTIFACTSRESPONSE']._serialized_start=4012
+  _globals['_RELEASEARTIFACTSRESPONSE']._serialized_end=4073
+  _globals['_DENDEN']._serialized_start=4290
+  _globals['_DENDEN']._serialized_end=5011
 # @@protoc_insertion_point(module_scope)
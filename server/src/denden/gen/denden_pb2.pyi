@@ -21,27 +21,49 @@ class ResponseStatus(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     OK: _ClassVar[ResponseStatus]
     DENIED: _ClassVar[ResponseStatus]
     ERROR: _ClassVar[ResponseStatus]
+
+class JobState(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    PENDING: _ClassVar[JobState]
+    RUNNING: _ClassVar[JobState]
+    DONE: _ClassVar[JobState]
+    NOT_FOUND: _ClassVar[JobState]
+
+class TraceQueryKind(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    SUBTREE: _ClassVar[TraceQueryKind]
+    CRITICAL_PATH: _ClassVar[TraceQueryKind]
+    SLOWEST_BRANCHES: _ClassVar[TraceQueryKind]
 TEXT: Format
 JSON: Format
 OK: ResponseStatus
 DENIED: ResponseStatus
 ERROR: ResponseStatus
+PENDING: JobState
+RUNNING: JobState
+DONE: JobState
+NOT_FOUND: JobState
+SUBTREE: TraceQueryKind
+CRITICAL_PATH: TraceQueryKind
+SLOWEST_BRANCHES: TraceQueryKind
 
 class DenDenRequest(_message.Message):
-    __slots__ = ("denden_version", "request_id", "trace", "ask_user", "delegate", "remember")
+    __slots__ = ("denden_version", "request_id", "trace", "ask_user", "delegate", "remember", "recall")
     DENDEN_VERSION_FIELD_NUMBER: _ClassVar[int]
     REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
     TRACE_FIELD_NUMBER: _ClassVar[int]
     ASK_USER_FIELD_NUMBER: _ClassVar[int]
     DELEGATE_FIELD_NUMBER: _ClassVar[int]
     REMEMBER_FIELD_NUMBER: _ClassVar[int]
+    RECALL_FIELD_NUMBER: _ClassVar[int]
     denden_version: str
     request_id: str
     trace: Trace
     ask_user: AskUserPayload
     delegate: DelegatePayload
     remember: RememberPayload
-    def __init__(self, denden_version: _Optional[str] = ..., request_id: _Optional[str] = ..., trace: _Optional[_Union[Trace, _Mapping]] = ..., ask_user: _Optional[_Union[AskUserPayload, _Mapping]] = ..., delegate: _Optional[_Union[DelegatePayload, _Mapping]] = ..., remember: _Optional[_Union[RememberPayload, _Mapping]] = ...) -> None: ...
+    recall: RecallPayload
+    def __init__(self, denden_version: _Optional[str] = ..., request_id: _Optional[str] = ..., trace: _Optional[_Union[Trace, _Mapping]] = ..., ask_user: _Optional[_Union[AskUserPayload, _Mapping]] = ..., delegate: _Optional[_Union[DelegatePayload, _Mapping]] = ..., remember: _Optional[_Union[RememberPayload, _Mapping]] = ..., recall: _Optional[_Union[RecallPayload, _Mapping]] = ...) -> None: ...
 
 class Trace(_message.Message):
     __slots__ = ("run_id", "agent_instance_id", "parent_agent_instance_id", "created_at")
@@ -78,16 +100,18 @@ class DelegatePayload(_message.Message):
     def __init__(self, delegate_to: _Optional[str] = ..., task: _Optional[_Union[Task, _Mapping]] = ...) -> None: ...
 
 class Task(_message.Message):
-    __slots__ = ("text", "artifact_refs", "extra", "return_format")
+    __slots__ = ("text", "artifact_refs", "extra", "return_format", "extra_encoded")
     TEXT_FIELD_NUMBER: _ClassVar[int]
     ARTIFACT_REFS_FIELD_NUMBER: _ClassVar[int]
     EXTRA_FIELD_NUMBER: _ClassVar[int]
     RETURN_FORMAT_FIELD_NUMBER: _ClassVar[int]
+    EXTRA_ENCODED_FIELD_NUMBER: _ClassVar[int]
     text: str
     artifact_refs: _containers.RepeatedScalarFieldContainer[str]
     extra: _struct_pb2.Struct
     return_format: Format
-    def __init__(self, text: _Optional[str] = ..., artifact_refs: _Optional[_Iterable[str]] = ..., extra: _Optional[_Union[_struct_pb2.Struct, _Mapping]] = ..., return_format: _Optional[_Union[Format, str]] = ...) -> None: ...
+    extra_encoded: EncodedValue
+    def __init__(self, text: _Optional[str] = ..., artifact_refs: _Optional[_Iterable[str]] = ..., extra: _Optional[_Union[_struct_pb2.Struct, _Mapping]] = ..., return_format: _Optional[_Union[Format, str]] = ..., extra_encoded: _Optional[_Union[EncodedValue, _Mapping]] = ...) -> None: ...
 
 class RememberPayload(_message.Message):
     __slots__ = ("content", "keywords", "scope")
@@ -99,8 +123,20 @@ class RememberPayload(_message.Message):
     scope: str
     def __init__(self, content: _Optional[str] = ..., keywords: _Optional[_Iterable[str]] = ..., scope: _Optional[str] = ...) -> None: ...
 
+class RecallPayload(_message.Message):
+    __slots__ = ("query", "keywords", "scopes", "top_k")
+    QUERY_FIELD_NUMBER: _ClassVar[int]
+    KEYWORDS_FIELD_NUMBER: _ClassVar[int]
+    SCOPES_FIELD_NUMBER: _ClassVar[int]
+    TOP_K_FIELD_NUMBER: _ClassVar[int]
+    query: str
+    keywords: _containers.RepeatedScalarFieldContainer[str]
+    scopes: _containers.RepeatedScalarFieldContainer[str]
+    top_k: int
+    def __init__(self, query: _Optional[str] = ..., keywords: _Optional[_Iterable[str]] = ..., scopes: _Optional[_Iterable[str]] = ..., top_k: _Optional[int] = ...) -> None: ...
+
 class DenDenResponse(_message.Message):
-    __slots__ = ("denden_version", "request_id", "status", "error", "ask_user_result", "delegate_result", "remember_result")
+    __slots__ = ("denden_version", "request_id", "status", "error", "ask_user_result", "delegate_result", "remember_result", "recall_result")
     DENDEN_VERSION_FIELD_NUMBER: _ClassVar[int]
     REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
     STATUS_FIELD_NUMBER: _ClassVar[int]
@@ -108,6 +144,7 @@ class DenDenResponse(_message.Message):
     ASK_USER_RESULT_FIELD_NUMBER: _ClassVar[int]
     DELEGATE_RESULT_FIELD_NUMBER: _ClassVar[int]
     REMEMBER_RESULT_FIELD_NUMBER: _ClassVar[int]
+    RECALL_RESULT_FIELD_NUMBER: _ClassVar[int]
     denden_version: str
     request_id: str
     status: ResponseStatus
@@ -115,17 +152,20 @@ class DenDenResponse(_message.Message):
     ask_user_result: AskUserResult
     delegate_result: DelegateResult
     remember_result: RememberResult
-    def __init__(self, denden_version: _Optional[str] = ..., request_id: _Optional[str] = ..., status: _Optional[_Union[ResponseStatus, str]] = ..., error: _Optional[_Union[ErrorDetail, _Mapping]] = ..., ask_user_result: _Optional[_Union[AskUserResult, _Mapping]] = ..., delegate_result: _Optional[_Union[DelegateResult, _Mapping]] = ..., remember_result: _Optional[_Union[RememberResult, _Mapping]] = ...) -> None: ...
+    recall_result: RecallResult
+    def __init__(self, denden_version: _Optional[str] = ..., request_id: _Optional[str] = ..., status: _Optional[_Union[ResponseStatus, str]] = ..., error: _Optional[_Union[ErrorDetail, _Mapping]] = ..., ask_user_result: _Optional[_Union[AskUserResult, _Mapping]] = ..., delegate_result: _Optional[_Union[DelegateResult, _Mapping]] = ..., remember_result: _Optional[_Union[RememberResult, _Mapping]] = ..., recall_result: _Optional[_Union[RecallResult, _Mapping]] = ...) -> None: ...
 
 class ErrorDetail(_message.Message):
-    __slots__ = ("code", "message", "retryable")
+    __slots__ = ("code", "message", "retryable", "retry_after_ms")
     CODE_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
     RETRYABLE_FIELD_NUMBER: _ClassVar[int]
+    RETRY_AFTER_MS_FIELD_NUMBER: _ClassVar[int]
     code: str
     message: str
     retryable: bool
-    def __init__(self, code: _Optional[str] = ..., message: _Optional[str] = ..., retryable: bool = ...) -> None: ...
+    retry_after_ms: int
+    def __init__(self, code: _Optional[str] = ..., message: _Optional[str] = ..., retryable: bool = ..., retry_after_ms: _Optional[int] = ...) -> None: ...
 
 class AskUserResult(_message.Message):
     __slots__ = ("text", "json")
@@ -136,14 +176,26 @@ class AskUserResult(_message.Message):
     def __init__(self, text: _Optional[str] = ..., json: _Optional[_Union[_struct_pb2.Struct, _Mapping]] = ...) -> None: ...
 
 class DelegateResult(_message.Message):
-    __slots__ = ("output_format", "output", "summary")
+    __slots__ = ("output_format", "output", "summary", "artifact_refs", "output_encoded")
     OUTPUT_FORMAT_FIELD_NUMBER: _ClassVar[int]
     OUTPUT_FIELD_NUMBER: _ClassVar[int]
     SUMMARY_FIELD_NUMBER: _ClassVar[int]
+    ARTIFACT_REFS_FIELD_NUMBER: _ClassVar[int]
+    OUTPUT_ENCODED_FIELD_NUMBER: _ClassVar[int]
     output_format: Format
     output: _struct_pb2.Struct
     summary: str
-    def __init__(self, output_format: _Optional[_Union[Format, str]] = ..., output: _Optional[_Union[_struct_pb2.Struct, _Mapping]] = ..., summary: _Optional[str] = ...) -> None: ...
+    artifact_refs: _containers.RepeatedScalarFieldContainer[str]
+    output_encoded: EncodedValue
+    def __init__(self, output_format: _Optional[_Union[Format, str]] = ..., output: _Optional[_Union[_struct_pb2.Struct, _Mapping]] = ..., summary: _Optional[str] = ..., artifact_refs: _Optional[_Iterable[str]] = ..., output_encoded: _Optional[_Union[EncodedValue, _Mapping]] = ...) -> None: ...
+
+class EncodedValue(_message.Message):
+    __slots__ = ("content_type", "data")
+    CONTENT_TYPE_FIELD_NUMBER: _ClassVar[int]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    content_type: str
+    data: bytes
+    def __init__(self, content_type: _Optional[str] = ..., data: _Optional[bytes] = ...) -> None: ...
 
 class RememberResult(_message.Message):
     __slots__ = ("status", "entry_id")
@@ -153,14 +205,264 @@ class RememberResult(_message.Message):
     entry_id: str
     def __init__(self, status: _Optional[str] = ..., entry_id: _Optional[str] = ...) -> None: ...
 
+class RecallResult(_message.Message):
+    __slots__ = ("entries",)
+    ENTRIES_FIELD_NUMBER: _ClassVar[int]
+    entries: _containers.RepeatedCompositeFieldContainer[RecalledEntry]
+    def __init__(self, entries: _Optional[_Iterable[_Union[RecalledEntry, _Mapping]]] = ...) -> None: ...
+
+class RecalledEntry(_message.Message):
+    __slots__ = ("entry_id", "scope", "content", "keywords", "score")
+    ENTRY_ID_FIELD_NUMBER: _ClassVar[int]
+    SCOPE_FIELD_NUMBER: _ClassVar[int]
+    CONTENT_FIELD_NUMBER: _ClassVar[int]
+    KEYWORDS_FIELD_NUMBER: _ClassVar[int]
+    SCORE_FIELD_NUMBER: _ClassVar[int]
+    entry_id: str
+    scope: str
+    content: str
+    keywords: _containers.RepeatedScalarFieldContainer[str]
+    score: float
+    def __init__(self, entry_id: _Optional[str] = ..., scope: _Optional[str] = ..., content: _Optional[str] = ..., keywords: _Optional[_Iterable[str]] = ..., score: _Optional[float] = ...) -> None: ...
+
+class StreamEvent(_message.Message):
+    __slots__ = ("request_id", "seq", "progress", "partial", "response")
+    REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
+    SEQ_FIELD_NUMBER: _ClassVar[int]
+    PROGRESS_FIELD_NUMBER: _ClassVar[int]
+    PARTIAL_FIELD_NUMBER: _ClassVar[int]
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    request_id: str
+    seq: int
+    progress: Progress
+    partial: _struct_pb2.Struct
+    response: DenDenResponse
+    def __init__(self, request_id: _Optional[str] = ..., seq: _Optional[int] = ..., progress: _Optional[_Union[Progress, _Mapping]] = ..., partial: _Optional[_Union[_struct_pb2.Struct, _Mapping]] = ..., response: _Optional[_Union[DenDenResponse, _Mapping]] = ...) -> None: ...
+
+class Progress(_message.Message):
+    __slots__ = ("message", "fraction")
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    FRACTION_FIELD_NUMBER: _ClassVar[int]
+    message: str
+    fraction: float
+    def __init__(self, message: _Optional[str] = ..., fraction: _Optional[float] = ...) -> None: ...
+
+class BatchRequest(_message.Message):
+    __slots__ = ("requests", "max_parallel")
+    REQUESTS_FIELD_NUMBER: _ClassVar[int]
+    MAX_PARALLEL_FIELD_NUMBER: _ClassVar[int]
+    requests: _containers.RepeatedCompositeFieldContainer[DenDenRequest]
+    max_parallel: int
+    def __init__(self, requests: _Optional[_Iterable[_Union[DenDenRequest, _Mapping]]] = ..., max_parallel: _Optional[int] = ...) -> None: ...
+
+class BatchResponse(_message.Message):
+    __slots__ = ("responses",)
+    RESPONSES_FIELD_NUMBER: _ClassVar[int]
+    responses: _containers.RepeatedCompositeFieldContainer[DenDenResponse]
+    def __init__(self, responses: _Optional[_Iterable[_Union[DenDenResponse, _Mapping]]] = ...) -> None: ...
+
+class BatchItem(_message.Message):
+    __slots__ = ("index", "response")
+    INDEX_FIELD_NUMBER: _ClassVar[int]
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    index: int
+    response: DenDenResponse
+    def __init__(self, index: _Optional[int] = ..., response: _Optional[_Union[DenDenResponse, _Mapping]] = ...) -> None: ...
+
+class JobHandle(_message.Message):
+    __slots__ = ("job_id", "request_id", "state")
+    JOB_ID_FIELD_NUMBER: _ClassVar[int]
+    REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
+    STATE_FIELD_NUMBER: _ClassVar[int]
+    job_id: str
+    request_id: str
+    state: JobState
+    def __init__(self, job_id: _Optional[str] = ..., request_id: _Optional[str] = ..., state: _Optional[_Union[JobState, str]] = ...) -> None: ...
+
+class AwaitRequest(_message.Message):
+    __slots__ = ("job_id", "timeout_ms")
+    JOB_ID_FIELD_NUMBER: _ClassVar[int]
+    TIMEOUT_MS_FIELD_NUMBER: _ClassVar[int]
+    job_id: str
+    timeout_ms: int
+    def __init__(self, job_id: _Optional[str] = ..., timeout_ms: _Optional[int] = ...) -> None: ...
+
+class PollRequest(_message.Message):
+    __slots__ = ("job_id",)
+    JOB_ID_FIELD_NUMBER: _ClassVar[int]
+    job_id: str
+    def __init__(self, job_id: _Optional[str] = ...) -> None: ...
+
+class JobStatus(_message.Message):
+    __slots__ = ("job_id", "state", "response")
+    JOB_ID_FIELD_NUMBER: _ClassVar[int]
+    STATE_FIELD_NUMBER: _ClassVar[int]
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    job_id: str
+    state: JobState
+    response: DenDenResponse
+    def __init__(self, job_id: _Optional[str] = ..., state: _Optional[_Union[JobState, str]] = ..., response: _Optional[_Union[DenDenResponse, _Mapping]] = ...) -> None: ...
+
+class TraceQuery(_message.Message):
+    __slots__ = ("run_id", "agent_instance_id", "kind", "limit")
+    RUN_ID_FIELD_NUMBER: _ClassVar[int]
+    AGENT_INSTANCE_ID_FIELD_NUMBER: _ClassVar[int]
+    KIND_FIELD_NUMBER: _ClassVar[int]
+    LIMIT_FIELD_NUMBER: _ClassVar[int]
+    run_id: str
+    agent_instance_id: str
+    kind: TraceQueryKind
+    limit: int
+    def __init__(self, run_id: _Optional[str] = ..., agent_instance_id: _Optional[str] = ..., kind: _Optional[_Union[TraceQueryKind, str]] = ..., limit: _Optional[int] = ...) -> None: ...
+
+class TraceNode(_message.Message):
+    __slots__ = ("agent_instance_id", "parent_agent_instance_id", "depth", "started_at", "ended_at", "duration_ms", "subtree_duration_ms", "calls", "in_flight", "ok", "denied", "error", "last_error_code")
+    AGENT_INSTANCE_ID_FIELD_NUMBER: _ClassVar[int]
+    PARENT_AGENT_INSTANCE_ID_FIELD_NUMBER: _ClassVar[int]
+    DEPTH_FIELD_NUMBER: _ClassVar[int]
+    STARTED_AT_FIELD_NUMBER: _ClassVar[int]
+    ENDED_AT_FIELD_NUMBER: _ClassVar[int]
+    DURATION_MS_FIELD_NUMBER: _ClassVar[int]
+    SUBTREE_DURATION_MS_FIELD_NUMBER: _ClassVar[int]
+    CALLS_FIELD_NUMBER: _ClassVar[int]
+    IN_FLIGHT_FIELD_NUMBER: _ClassVar[int]
+    OK_FIELD_NUMBER: _ClassVar[int]
+    DENIED_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    LAST_ERROR_CODE_FIELD_NUMBER: _ClassVar[int]
+    agent_instance_id: str
+    parent_agent_instance_id: str
+    depth: int
+    started_at: _timestamp_pb2.Timestamp
+    ended_at: _timestamp_pb2.Timestamp
+    duration_ms: int
+    subtree_duration_ms: int
+    calls: int
+    in_flight: int
+    ok: int
+    denied: int
+    error: int
+    last_error_code: str
+    def __init__(self, agent_instance_id: _Optional[str] = ..., parent_agent_instance_id: _Optional[str] = ..., depth: _Optional[int] = ..., started_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., ended_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., duration_ms: _Optional[int] = ..., subtree_duration_ms: _Optional[int] = ..., calls: _Optional[int] = ..., in_flight: _Optional[int] = ..., ok: _Optional[int] = ..., denied: _Optional[int] = ..., error: _Optional[int] = ..., last_error_code: _Optional[str] = ...) -> None: ...
+
+class TraceResult(_message.Message):
+    __slots__ = ("run_id", "found", "nodes")
+    RUN_ID_FIELD_NUMBER: _ClassVar[int]
+    FOUND_FIELD_NUMBER: _ClassVar[int]
+    NODES_FIELD_NUMBER: _ClassVar[int]
+    run_id: str
+    found: bool
+    nodes: _containers.RepeatedCompositeFieldContainer[TraceNode]
+    def __init__(self, run_id: _Optional[str] = ..., found: bool = ..., nodes: _Optional[_Iterable[_Union[TraceNode, _Mapping]]] = ...) -> None: ...
+
 class StatusRequest(_message.Message):
-    __slots__ = ()
-    def __init__(self) -> None: ...
+    __slots__ = ("local",)
+    LOCAL_FIELD_NUMBER: _ClassVar[int]
+    local: bool
+    def __init__(self, local: bool = ...) -> None: ...
 
 class StatusResponse(_message.Message):
-    __slots__ = ("uptime_seconds", "active_agents")
+    __slots__ = ("uptime_seconds", "active_agents", "in_flight", "queue_depth", "payloads", "lanes", "workers")
     UPTIME_SECONDS_FIELD_NUMBER: _ClassVar[int]
     ACTIVE_AGENTS_FIELD_NUMBER: _ClassVar[int]
+    IN_FLIGHT_FIELD_NUMBER: _ClassVar[int]
+    QUEUE_DEPTH_FIELD_NUMBER: _ClassVar[int]
+    PAYLOADS_FIELD_NUMBER: _ClassVar[int]
+    LANES_FIELD_NUMBER: _ClassVar[int]
+    WORKERS_FIELD_NUMBER: _ClassVar[int]
     uptime_seconds: int
     active_agents: int
-    def __init__(self, uptime_seconds: _Optional[int] = ..., active_agents: _Optional[int] = ...) -> None: ...
+    in_flight: int
+    queue_depth: int
+    payloads: _containers.RepeatedCompositeFieldContainer[PayloadStats]
+    lanes: _containers.RepeatedCompositeFieldContainer[LaneStats]
+    workers: int
+    def __init__(self, uptime_seconds: _Optional[int] = ..., active_agents: _Optional[int] = ..., in_flight: _Optional[int] = ..., queue_depth: _Optional[int] = ..., payloads: _Optional[_Iterable[_Union[PayloadStats, _Mapping]]] = ..., lanes: _Optional[_Iterable[_Union[LaneStats, _Mapping]]] = ..., workers: _Optional[int] = ...) -> None: ...
+
+class LaneStats(_message.Message):
+    __slots__ = ("name", "concurrency", "max_queued", "running", "queued", "rejected")
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    CONCURRENCY_FIELD_NUMBER: _ClassVar[int]
+    MAX_QUEUED_FIELD_NUMBER: _ClassVar[int]
+    RUNNING_FIELD_NUMBER: _ClassVar[int]
+    QUEUED_FIELD_NUMBER: _ClassVar[int]
+    REJECTED_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    concurrency: int
+    max_queued: int
+    running: int
+    queued: int
+    rejected: int
+    def __init__(self, name: _Optional[str] = ..., concurrency: _Optional[int] = ..., max_queued: _Optional[int] = ..., running: _Optional[int] = ..., queued: _Optional[int] = ..., rejected: _Optional[int] = ...) -> None: ...
+
+class PayloadStats(_message.Message):
+    __slots__ = ("payload_type", "in_flight", "ok", "denied", "error", "p50_ms", "p90_ms", "p99_ms", "max_ms", "errors")
+    PAYLOAD_TYPE_FIELD_NUMBER: _ClassVar[int]
+    IN_FLIGHT_FIELD_NUMBER: _ClassVar[int]
+    OK_FIELD_NUMBER: _ClassVar[int]
+    DENIED_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    P50_MS_FIELD_NUMBER: _ClassVar[int]
+    P90_MS_FIELD_NUMBER: _ClassVar[int]
+    P99_MS_FIELD_NUMBER: _ClassVar[int]
+    MAX_MS_FIELD_NUMBER: _ClassVar[int]
+    ERRORS_FIELD_NUMBER: _ClassVar[int]
+    payload_type: str
+    in_flight: int
+    ok: int
+    denied: int
+    error: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    errors: _containers.RepeatedCompositeFieldContainer[ErrorCount]
+    def __init__(self, payload_type: _Optional[str] = ..., in_flight: _Optional[int] = ..., ok: _Optional[int] = ..., denied: _Optional[int] = ..., error: _Optional[int] = ..., p50_ms: _Optional[float] = ..., p90_ms: _Optional[float] = ..., p99_ms: _Optional[float] = ..., max_ms: _Optional[float] = ..., errors: _Optional[_Iterable[_Union[ErrorCount, _Mapping]]] = ...) -> None: ...
+
+class ErrorCount(_message.Message):
+    __slots__ = ("code", "count")
+    CODE_FIELD_NUMBER: _ClassVar[int]
+    COUNT_FIELD_NUMBER: _ClassVar[int]
+    code: str
+    count: int
+    def __init__(self, code: _Optional[str] = ..., count: _Optional[int] = ...) -> None: ...
+
+class ArtifactChunk(_message.Message):
+    __slots__ = ("data", "run_id")
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    RUN_ID_FIELD_NUMBER: _ClassVar[int]
+    data: bytes
+    run_id: str
+    def __init__(self, data: _Optional[bytes] = ..., run_id: _Optional[str] = ...) -> None: ...
+
+class ArtifactRef(_message.Message):
+    __slots__ = ("ref", "size")
+    REF_FIELD_NUMBER: _ClassVar[int]
+    SIZE_FIELD_NUMBER: _ClassVar[int]
+    ref: str
+    size: int
+    def __init__(self, ref: _Optional[str] = ..., size: _Optional[int] = ...) -> None: ...
+
+class GetArtifactRequest(_message.Message):
+    __slots__ = ("ref", "offset", "length")
+    REF_FIELD_NUMBER: _ClassVar[int]
+    OFFSET_FIELD_NUMBER: _ClassVar[int]
+    LENGTH_FIELD_NUMBER: _ClassVar[int]
+    ref: str
+    offset: int
+    length: int
+    def __init__(self, ref: _Optional[str] = ..., offset: _Optional[int] = ..., length: _Optional[int] = ...) -> None: ...
+
+class ReleaseArtifactsRequest(_message.Message):
+    __slots__ = ("run_id",)
+    RUN_ID_FIELD_NUMBER: _ClassVar[int]
+    run_id: str
+    def __init__(self, run_id: _Optional[str] = ...) -> None: ...
+
+class ReleaseArtifactsResponse(_message.Message):
+    __slots__ = ("released", "deleted")
+    RELEASED_FIELD_NUMBER: _ClassVar[int]
+    DELETED_FIELD_NUMBER: _ClassVar[int]
+    released: int
+    deleted: int
+    def __init__(self, released: _Optional[int] = ..., deleted: _Optional[int] = ...) -> None: ...
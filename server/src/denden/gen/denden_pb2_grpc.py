@@ -43,11 +43,61 @@ class DendenStub(object):
                 request_serializer=denden__pb2.DenDenRequest.SerializeToString,
                 response_deserializer=denden__pb2.DenDenResponse.FromString,
                 _registered_method=True)
+        self.SendStream = channel.unary_stream(
+                '/denden.Denden/SendStream',
+                request_serializer=denden__pb2.DenDenRequest.SerializeToString,
+                response_deserializer=denden__pb2.StreamEvent.FromString,
+                _registered_method=True)
+        self.SendBatch = channel.unary_unary(
+                '/denden.Denden/SendBatch',
+                request_serializer=denden__pb2.BatchRequest.SerializeToString,
+                response_deserializer=denden__pb2.BatchResponse.FromString,
+                _registered_method=True)
+        self.SendBatchStream = channel.unary_stream(
+                '/denden.Denden/SendBatchStream',
+                request_serializer=denden__pb2.BatchRequest.SerializeToString,
+                response_deserializer=denden__pb2.BatchItem.FromString,
+                _registered_method=True)
+        self.Submit = channel.unary_unary(
+                '/denden.Denden/Submit',
+                request_serializer=denden__pb2.DenDenRequest.SerializeToString,
+                response_deserializer=denden__pb2.JobHandle.FromString,
+                _registered_method=True)
+        self.Await = channel.unary_unary(
+                '/denden.Denden/Await',
+                request_serializer=denden__pb2.AwaitRequest.SerializeToString,
+                response_deserializer=denden__pb2.JobStatus.FromString,
+                _registered_method=True)
+        self.Poll = channel.unary_unary(
+                '/denden.Denden/Poll',
+                request_serializer=denden__pb2.PollRequest.SerializeToString,
+                response_deserializer=denden__pb2.JobStatus.FromString,
+                _registered_method=True)
+        self.QueryTrace = channel.unary_unary(
+                '/denden.Denden/QueryTrace',
+                request_serializer=denden__pb2.TraceQuery.SerializeToString,
+                response_deserializer=denden__pb2.TraceResult.FromString,
+                _registered_method=True)
         self.Status = channel.unary_unary(
                 '/denden.Denden/Status',
                 request_serializer=denden__pb2.StatusRequest.SerializeToString,
                 response_deserializer=denden__pb2.StatusResponse.FromString,
                 _registered_method=True)
+        self.PutArtifact = channel.stream_unary(
+                '/denden.Denden/PutArtifact',
+                request_serializer=denden__pb2.ArtifactChunk.SerializeToString,
+                response_deserializer=denden__pb2.ArtifactRef.FromString,
+                _registered_method=True)
+        self.GetArtifact = channel.unary_stream(
+                '/denden.Denden/GetArtifact',
+                request_serializer=denden__pb2.GetArtifactRequest.SerializeToString,
+                response_deserializer=denden__pb2.ArtifactChunk.FromString,
+                _registered_method=True)
+        self.ReleaseArtifacts = channel.unary_unary(
+                '/denden.Denden/ReleaseArtifacts',
+                request_serializer=denden__pb2.ReleaseArtifactsRequest.SerializeToString,
+                response_deserializer=denden__pb2.ReleaseArtifactsResponse.FromString,
+                _registered_method=True)
 
 
 class DendenServicer(object):
@@ -64,6 +114,56 @@ class DendenServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SendStream(self, request, context):
+        """Like Send, but streams progress and partial results before the final
+        response. The last event on the stream always carries the response.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SendBatch(self, request, context):
+        """Dispatch many requests concurrently; responses come back in request order.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SendBatchStream(self, request, context):
+        """Like SendBatch, but stream each response as soon as it completes.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Submit(self, request, context):
+        """Start a request in the background and return a job handle immediately.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Await(self, request, context):
+        """Wait for a submitted job to finish (bounded by timeout_ms / the deadline).
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Poll(self, request, context):
+        """Report the state of a submitted job without waiting.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QueryTrace(self, request, context):
+        """Query the agent call tree of a run.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Status(self, request, context):
         """Health check.
         """
@@ -71,6 +171,27 @@ class DendenServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PutArtifact(self, request_iterator, context):
+        """Upload an artifact in chunks and get back its content-addressed ref.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetArtifact(self, request, context):
+        """Download an artifact (or a byte range of it) in chunks.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReleaseArtifacts(self, request, context):
+        """Drop a run's references to artifacts, deleting those no run holds.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DendenServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -79,11 +200,61 @@ def add_DendenServicer_to_server(servicer, server):
                     request_deserializer=denden__pb2.DenDenRequest.FromString,
                     response_serializer=denden__pb2.DenDenResponse.SerializeToString,
             ),
+            'SendStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.SendStream,
+                    request_deserializer=denden__pb2.DenDenRequest.FromString,
+                    response_serializer=denden__pb2.StreamEvent.SerializeToString,
+            ),
+            'SendBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.SendBatch,
+                    request_deserializer=denden__pb2.BatchRequest.FromString,
+                    response_serializer=denden__pb2.BatchResponse.SerializeToString,
+            ),
+            'SendBatchStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.SendBatchStream,
+                    request_deserializer=denden__pb2.BatchRequest.FromString,
+                    response_serializer=denden__pb2.BatchItem.SerializeToString,
+            ),
+            'Submit': grpc.unary_unary_rpc_method_handler(
+                    servicer.Submit,
+                    request_deserializer=denden__pb2.DenDenRequest.FromString,
+                    response_serializer=denden__pb2.JobHandle.SerializeToString,
+            ),
+            'Await': grpc.unary_unary_rpc_method_handler(
+                    servicer.Await,
+                    request_deserializer=denden__pb2.AwaitRequest.FromString,
+                    response_serializer=denden__pb2.JobStatus.SerializeToString,
+            ),
+            'Poll': grpc.unary_unary_rpc_method_handler(
+                    servicer.Poll,
+                    request_deserializer=denden__pb2.PollRequest.FromString,
+                    response_serializer=denden__pb2.JobStatus.SerializeToString,
+            ),
+            'QueryTrace': grpc.unary_unary_rpc_method_handler(
+                    servicer.QueryTrace,
+                    request_deserializer=denden__pb2.TraceQuery.FromString,
+                    response_serializer=denden__pb2.TraceResult.SerializeToString,
+            ),
             'Status': grpc.unary_unary_rpc_method_handler(
                     servicer.Status,
                     request_deserializer=denden__pb2.StatusRequest.FromString,
                     response_serializer=denden__pb2.StatusResponse.SerializeToString,
             ),
+            'PutArtifact': grpc.stream_unary_rpc_method_handler(
+                    servicer.PutArtifact,
+                    request_deserializer=denden__pb2.ArtifactChunk.FromString,
+                    response_serializer=denden__pb2.ArtifactRef.SerializeToString,
+            ),
+            'GetArtifact': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetArtifact,
+                    request_deserializer=denden__pb2.GetArtifactRequest.FromString,
+                    response_serializer=denden__pb2.ArtifactChunk.SerializeToString,
+            ),
+            'ReleaseArtifacts': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReleaseArtifacts,
+                    request_deserializer=denden__pb2.ReleaseArtifactsRequest.FromString,
+                    response_serializer=denden__pb2.ReleaseArtifactsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'denden.Denden', rpc_method_handlers)
@@ -126,6 +297,195 @@ class Denden(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SendStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/denden.Denden/SendStream',
+            denden__pb2.DenDenRequest.SerializeToString,
+            denden__pb2.StreamEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SendBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/denden.Denden/SendBatch',
+            denden__pb2.BatchRequest.SerializeToString,
+            denden__pb2.BatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SendBatchStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/denden.Denden/SendBatchStream',
+            denden__pb2.BatchRequest.SerializeToString,
+            denden__pb2.BatchItem.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Submit(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/denden.Denden/Submit',
+            denden__pb2.DenDenRequest.SerializeToString,
+            denden__pb2.JobHandle.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Await(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/denden.Denden/Await',
+            denden__pb2.AwaitRequest.SerializeToString,
+            denden__pb2.JobStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Poll(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/denden.Denden/Poll',
+            denden__pb2.PollRequest.SerializeToString,
+            denden__pb2.JobStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def QueryTrace(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/denden.Denden/QueryTrace',
+            denden__pb2.TraceQuery.SerializeToString,
+            denden__pb2.TraceResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def Status(request,
             target,
@@ -152,3 +512,84 @@ class Denden(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def PutArtifact(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/denden.Denden/PutArtifact',
+            denden__pb2.ArtifactChunk.SerializeToString,
+            denden__pb2.ArtifactRef.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetArtifact(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/denden.Denden/GetArtifact',
+            denden__pb2.GetArtifactRequest.SerializeToString,
+            denden__pb2.ArtifactChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReleaseArtifacts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/denden.Denden/ReleaseArtifacts',
+            denden__pb2.ReleaseArtifactsRequest.SerializeToString,
+            denden__pb2.ReleaseArtifactsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
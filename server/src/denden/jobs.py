@@ -0,0 +1,165 @@
+"""Job table backing the ``Submit`` / ``Await`` / ``Poll`` RPCs.
+
+A submitted request runs in the background while the caller holds only a
+job handle. The finished response stays in the table until it is collected
+by ``Await``/``Poll`` or until *result_ttl* expires, so an agent whose CLI
+timed out can reconnect and pick up the result instead of resubmitting.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent import futures
+from typing import Callable
+
+from denden.gen import denden_pb2
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A single submitted request and the future producing its response."""
+
+    __slots__ = ("job_id", "request_id", "future", "created_at", "finished_at")
+
+    def __init__(self, job_id: str, request_id: str, future: futures.Future) -> None:
+        self.job_id = job_id
+        self.request_id = request_id
+        self.future = future
+        self.created_at = time.monotonic()
+        self.finished_at: float | None = None
+
+    @property
+    def state(self) -> int:
+        if self.future.done():
+            return denden_pb2.DONE
+        if self.future.running():
+            return denden_pb2.RUNNING
+        return denden_pb2.PENDING
+
+    def handle(self) -> denden_pb2.JobHandle:
+        return denden_pb2.JobHandle(
+            job_id=self.job_id, request_id=self.request_id, state=self.state,
+        )
+
+    def status(self) -> denden_pb2.JobStatus:
+        """Build a :class:`JobStatus`, including the response once done."""
+        if not self.future.done():
+            return denden_pb2.JobStatus(job_id=self.job_id, state=self.state)
+        if self.future.cancelled() or self.future.exception() is not None:
+            # Only happens when the server shuts down under a running job.
+            return not_found_status(self.job_id)
+        return denden_pb2.JobStatus(
+            job_id=self.job_id,
+            state=denden_pb2.DONE,
+            response=self.future.result(),
+        )
+
+
+def not_found_status(job_id: str) -> denden_pb2.JobStatus:
+    return denden_pb2.JobStatus(job_id=job_id, state=denden_pb2.NOT_FOUND)
+
+
+class JobTable:
+    """Thread-safe registry of submitted jobs.
+
+    Jobs are started by a caller-supplied ``start`` callable returning a
+    :class:`concurrent.futures.Future` whose result is a
+    :class:`DenDenResponse`; a future that is cancelled or raises reports
+    ``NOT_FOUND``. Submitting a
+    request whose ``request_id`` already has a live job returns that job
+    instead of starting a second run.
+
+    Finished jobs are kept until collected, until *result_ttl* seconds have
+    passed, or until more than *max_results* finished jobs are waiting, in
+    which case the oldest are dropped first.
+    """
+
+    def __init__(
+        self,
+        result_ttl: float = 3600.0,
+        max_results: int = 10_000,
+    ) -> None:
+        self.result_ttl = result_ttl
+        self.max_results = max_results
+        self._lock = threading.Lock()
+        self._jobs: dict[str, Job] = {}
+        self._by_request: dict[str, str] = {}
+        # job_id -> None, ordered by completion time.
+        self._finished: OrderedDict[str, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def submit(
+        self, request_id: str, start: Callable[[], futures.Future],
+    ) -> Job:
+        """Start a job for *request_id*, or return the live job already running it."""
+        with self._lock:
+            self._expire_locked()
+            existing = self._by_request.get(request_id)
+            if existing is not None:
+                return self._jobs[existing]
+            job = Job("job_" + os.urandom(16).hex(), request_id, start())
+            self._jobs[job.job_id] = job
+            if request_id:
+                self._by_request[request_id] = job.job_id
+        job.future.add_done_callback(lambda _f, job=job: self._on_done(job))
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            self._expire_locked()
+            return self._jobs.get(job_id)
+
+    def collect(self, job_id: str) -> denden_pb2.JobStatus:
+        """Return the job's status, removing it from the table if it is done."""
+        with self._lock:
+            self._expire_locked()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return not_found_status(job_id)
+            if job.future.done():
+                self._remove_locked(job)
+        return job.status()
+
+    def wait(self, job_id: str, timeout: float | None) -> denden_pb2.JobStatus:
+        """Block up to *timeout* seconds for the job, then :meth:`collect` it."""
+        job = self.get(job_id)
+        if job is None:
+            return not_found_status(job_id)
+        futures.wait([job.future], timeout=timeout)
+        return self.collect(job_id)
+
+    def _on_done(self, job: Job) -> None:
+        with self._lock:
+            if self._jobs.get(job.job_id) is not job:
+                return
+            job.finished_at = time.monotonic()
+            self._finished[job.job_id] = None
+            while len(self._finished) > self.max_results:
+                oldest, _ = self._finished.popitem(last=False)
+                logger.warning("dropping uncollected result for job %s", oldest)
+                self._remove_locked(self._jobs[oldest])
+
+    def _remove_locked(self, job: Job) -> None:
+        self._jobs.pop(job.job_id, None)
+        self._finished.pop(job.job_id, None)
+        if self._by_request.get(job.request_id) == job.job_id:
+            del self._by_request[job.request_id]
+
+    def _expire_locked(self) -> None:
+        if not self._finished:
+            return
+        cutoff = time.monotonic() - self.result_ttl
+        while self._finished:
+            job_id = next(iter(self._finished))
+            job = self._jobs[job_id]
+            if job.finished_at is None or job.finished_at > cutoff:
+                break
+            logger.info("expiring uncollected result for job %s", job_id)
+            self._remove_locked(job)
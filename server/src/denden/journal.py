@@ -0,0 +1,211 @@
+"""Append-only journal of requests and responses.
+
+Every record is a fixed header followed by the serialized protobuf::
+
+    length (u32) | crc32 of body (u32) | kind (u8) | time_ns (u64) | body
+
+Records go to numbered segment files (``00000001.journal``, ...) in one
+directory; a segment is closed once it passes *segment_bytes* and a new
+one is started on every open, so a torn tail left by a crash is never
+appended to.
+
+:class:`Journal` keeps ``Send`` fast: :meth:`Journal.append` serializes
+the message and pushes it onto a queue (about a microsecond for a
+typical envelope). A writer thread writes everything queued in one go
+and fsyncs once per *commit_interval* (group commit), so a crash loses at
+most that window.
+
+:func:`read` memory-maps the segments and iterates records in order,
+stopping at the first torn or corrupt record; :func:`recover` replays
+them into the set of completed responses and the requests that were
+still in flight.
+"""
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from denden.gen import denden_pb2
+
+logger = logging.getLogger(__name__)
+
+REQUEST = 1
+RESPONSE = 2
+
+_HEADER = struct.Struct("<IIBQ")
+_SUFFIX = ".journal"
+
+
+@dataclass
+class Record:
+    kind: int  # REQUEST or RESPONSE
+    time_ns: int  # wall clock when appended
+    message: denden_pb2.DenDenRequest | denden_pb2.DenDenResponse
+
+
+class Journal:
+    """Segmented append-only writer with group-commit fsync."""
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        commit_interval: float = 0.01,
+        fsync: bool = True,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        existing = _segments(directory)
+        self._next_segment = int(os.path.basename(existing[-1])[: -len(_SUFFIX)]) + 1 if existing else 1
+        self._file = self._open_segment()
+        self._queue: deque[bytes] = deque()
+        self._commit_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="denden-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, kind: int, message) -> None:
+        """Queue *message* for the next group commit."""
+        body = message.SerializeToString()
+        self._queue.append(
+            _HEADER.pack(len(body), zlib.crc32(body), kind, time.time_ns()) + body
+        )
+
+    def append_request(self, request: denden_pb2.DenDenRequest) -> None:
+        self.append(REQUEST, request)
+
+    def append_response(self, response: denden_pb2.DenDenResponse) -> None:
+        self.append(RESPONSE, response)
+
+    def flush(self) -> None:
+        """Write and fsync everything appended so far."""
+        with self._commit_lock:
+            chunks = []
+            queue = self._queue
+            while queue:
+                chunks.append(queue.popleft())
+            if not chunks:
+                return
+            self._file.write(b"".join(chunks))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            if self._file.tell() >= self.segment_bytes:
+                self._file.close()
+                self._file = self._open_segment()
+
+    def close(self) -> None:
+        """Commit what is queued and stop the writer."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+        self._file.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.commit_interval):
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("journal write failed")
+
+    def _open_segment(self):
+        path = os.path.join(self.directory, f"{self._next_segment:08d}{_SUFFIX}")
+        self._next_segment += 1
+        return open(path, "ab")
+
+
+def _segments(directory: str) -> list[str]:
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in names
+        if name.endswith(_SUFFIX) and name[: -len(_SUFFIX)].isdigit()
+    )
+
+
+def _read_segment(path: str) -> Iterator[tuple[int, int, memoryview]]:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                offset = 0
+                while offset + _HEADER.size <= size:
+                    length, crc, kind, time_ns = _HEADER.unpack_from(mm, offset)
+                    start = offset + _HEADER.size
+                    body = view[start:start + length]
+                    if start + length > size or zlib.crc32(body) != crc:
+                        logger.warning("journal %s: torn or corrupt record at byte %d", path, offset)
+                        body.release()
+                        return
+                    try:
+                        yield kind, time_ns, body
+                    finally:
+                        # Also when the reader stops early: an exported view keeps the mmap open.
+                        body.release()
+                    offset = start + length
+            finally:
+                view.release()
+
+
+def read(directory: str, run_id: str | None = None) -> Iterator[Record]:
+    """Records of every segment in *directory*, oldest first.
+
+    With *run_id*, only requests of that run and the responses to them.
+    """
+    request_ids: set[str] = set()
+    for path in _segments(directory):
+        for kind, time_ns, body in _read_segment(path):
+            if kind == REQUEST:
+                message = denden_pb2.DenDenRequest.FromString(body)
+                if run_id is not None:
+                    if message.trace.run_id != run_id:
+                        continue
+                    request_ids.add(message.request_id)
+            elif kind == RESPONSE:
+                message = denden_pb2.DenDenResponse.FromString(body)
+                if run_id is not None and message.request_id not in request_ids:
+                    continue
+            else:
+                continue
+            yield Record(kind, time_ns, message)
+
+
+@dataclass
+class State:
+    """What the journal says happened, keyed by ``request_id``."""
+
+    responses: dict[str, denden_pb2.DenDenResponse] = field(default_factory=dict)
+    in_flight: dict[str, denden_pb2.DenDenRequest] = field(default_factory=dict)
+
+
+def recover(directory: str, run_id: str | None = None) -> State:
+    """Replay the journal: the last response of every finished request and
+    the requests that never got one (in flight when the server stopped)."""
+    state = State()
+    for record in read(directory, run_id):
+        request_id = record.message.request_id
+        if record.kind == REQUEST:
+            if request_id not in state.responses:
+                state.in_flight[request_id] = record.message
+        else:
+            state.in_flight.pop(request_id, None)
+            state.responses[request_id] = record.message
+    return state
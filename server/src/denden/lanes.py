@@ -0,0 +1,190 @@
+"""Priority lanes: bounded concurrency per payload type.
+
+Every request of the threaded server runs on the same gRPC executor, so a
+burst of slow delegates could hold every thread while ``ask_user`` and
+``remember`` calls wait behind them. A :class:`Lane` caps how many
+handlers of its payload types run at once and how many more may wait for
+a slot::
+
+    server = DenDenServer(lanes=[
+        Lane("ask_user", concurrency=64),
+        Lane("delegate", concurrency=8, max_queued=32),
+        Lane("memory", concurrency=16),
+    ])
+    server.route("remember", "memory")
+    server.route("recall", "memory")
+
+A lane named after a payload type serves it unless :meth:`route` sends it
+elsewhere; payload types without a lane run unbounded, as before. Waiting
+requests are admitted in arrival order. One that finds the queue full is
+answered with a retryable ``ERR_RESOURCE_EXHAUSTED``, and one whose
+deadline passes or whose client leaves while queued gives up its place.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import threading
+from typing import Callable, Iterable, Iterator
+
+from denden.context import RequestCancelled, RequestContext
+from denden.gen import denden_pb2
+
+
+class LaneFull(Exception):
+    """Raised by :meth:`Lane.enter` when the lane's queue is full."""
+
+    def __init__(self, lane: Lane) -> None:
+        super().__init__(
+            f"lane {lane.name!r} is full "
+            f"({lane.concurrency} running, {lane.max_queued} queued)"
+        )
+        self.lane = lane
+
+
+class _Waiter:
+    __slots__ = ("wake", "granted")
+
+    def __init__(self, wake: Callable[[], None]) -> None:
+        self.wake = wake
+        self.granted: bool | None = None  # None while queued, False if abandoned
+
+
+class Lane:
+    """Runs at most *concurrency* handlers at once and queues up to
+    *max_queued* more (``None`` for no bound)."""
+
+    def __init__(self, name: str, concurrency: int, max_queued: int | None = None) -> None:
+        if concurrency < 1:
+            raise ValueError("lane concurrency must be at least 1")
+        if max_queued is not None and max_queued < 0:
+            raise ValueError("lane max_queued must not be negative")
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.rejected = 0
+        self._running = 0
+        self._waiters: collections.deque[_Waiter] = collections.deque()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def enter(self, ctx: RequestContext) -> None:
+        """Block until the lane has a free slot; pair with :meth:`leave`.
+
+        Raises :class:`LaneFull` without waiting when the queue is full,
+        and :class:`~denden.context.RequestCancelled` if *ctx* is
+        cancelled while waiting.
+        """
+        with self._lock:
+            if self._running < self.concurrency and not self._waiters:
+                self._running += 1
+                return
+            if self.max_queued is not None and len(self._waiters) >= self.max_queued:
+                self.rejected += 1
+                raise LaneFull(self)
+            event = threading.Event()
+            waiter = _Waiter(event.set)
+            self._waiters.append(waiter)
+        ctx.add_callback(lambda: self._abandon(waiter))
+        event.wait()
+        if not waiter.granted:
+            raise RequestCancelled(ctx.reason)
+
+    async def enter_async(self, ctx: RequestContext) -> None:
+        """Like :meth:`enter` for the event loop; waiting also gives up its
+        place when the task itself is cancelled."""
+        with self._lock:
+            if self._running < self.concurrency and not self._waiters:
+                self._running += 1
+                return
+            if self.max_queued is not None and len(self._waiters) >= self.max_queued:
+                self.rejected += 1
+                raise LaneFull(self)
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            waiter = _Waiter(lambda: loop.call_soon_threadsafe(_resolve, future))
+            self._waiters.append(waiter)
+        ctx.add_callback(lambda: self._abandon(waiter))
+        try:
+            await future
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            if waiter.granted:
+                self.leave()
+            raise
+        if not waiter.granted:
+            raise RequestCancelled(ctx.reason)
+
+    def leave(self) -> None:
+        """Free the slot taken by :meth:`enter`, handing it to the oldest
+        waiting request."""
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.granted = True  # the slot passes over; running is unchanged
+            else:
+                self._running -= 1
+                return
+        waiter.wake()
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        # Also runs after a cancelled request got its slot; keep it then.
+        with self._lock:
+            if waiter.granted is not None:
+                return
+            waiter.granted = False
+            self._waiters.remove(waiter)
+        waiter.wake()
+
+    def stats(self) -> denden_pb2.LaneStats:
+        with self._lock:
+            return denden_pb2.LaneStats(
+                name=self.name,
+                concurrency=self.concurrency,
+                max_queued=self.max_queued or 0,
+                running=self._running,
+                queued=len(self._waiters),
+                rejected=self.rejected,
+            )
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class Lanes:
+    """The lanes of one server and the payload types routed to each."""
+
+    def __init__(self, lanes: Iterable[Lane] = ()) -> None:
+        self._lanes: dict[str, Lane] = {}
+        self._routes: dict[str, str] = {}
+        for lane in lanes:
+            if lane.name in self._lanes:
+                raise ValueError(f"duplicate lane {lane.name!r}")
+            self._lanes[lane.name] = lane
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._lanes
+
+    def __iter__(self) -> Iterator[Lane]:
+        return iter(self._lanes.values())
+
+    def route(self, method: str, lane: str) -> None:
+        """Run handlers of *method* (a payload type) in the lane named *lane*."""
+        if lane not in self._lanes:
+            raise ValueError(f"no lane named {lane!r}")
+        self._routes[method] = lane
+
+    def get(self, method: str | None) -> Lane | None:
+        """Lane that runs *method*, or ``None`` if it runs unbounded."""
+        if not self._lanes or method is None:
+            return None
+        return self._lanes.get(self._routes.get(method, method))
@@ -20,6 +20,11 @@ class Module(ABC):
         """Return a map of method_name -> handler callable."""
         ...
 
+    def lanes(self) -> dict[str, str]:
+        """Return a map of method_name -> lane for methods that should run
+        in a lane not named after them (see :mod:`denden.lanes`)."""
+        return {}
+
     def on_load(self, server: DenDenServer) -> None:
         """Called when the module is loaded into the server."""
         pass
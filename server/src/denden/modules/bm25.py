@@ -0,0 +1,130 @@
+"""Incremental BM25 index.
+
+Documents are added and removed one at a time; there is no rebuild step.
+Term statistics (document frequency, average length) are read at query
+time, so scores always reflect the current collection.
+
+Queries use MaxScore pruning: terms are scored rarest first, and once the
+remaining terms together can no longer lift an unseen document into the
+top *k*, the rest only update documents that already have a score instead
+of walking their (long) posting lists. The result is the exact top *k*.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from operator import itemgetter
+from typing import Callable, Iterable
+
+_TOKEN = re.compile(r"\w+")
+
+# Lucene's English stop words. They occur in most entries, so they barely
+# affect ranking but would make every query walk most of the index.
+STOP_WORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "if", "in",
+    "into", "is", "it", "no", "not", "of", "on", "or", "such", "that", "the",
+    "their", "then", "there", "these", "they", "this", "to", "was", "will", "with",
+))
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased word tokens of *text*, without stop words."""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class BM25Index:
+    """Not thread-safe; callers serialize access."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}  # term -> doc id -> term frequency
+        self._lengths: dict[str, int] = {}               # doc id -> token count
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_id: str, tokens: list[str]) -> None:
+        """Index *doc_id*; it must not already be indexed."""
+        postings = self._postings
+        for term, tf in Counter(tokens).items():
+            docs = postings.get(term)
+            if docs is None:
+                docs = postings[term] = {}
+            docs[doc_id] = tf
+        self._lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, doc_id: str, tokens: list[str]) -> None:
+        """Unindex *doc_id*, given the same *tokens* it was added with."""
+        if self._lengths.pop(doc_id, None) is None:
+            return
+        self._total_length -= len(tokens)
+        for term in set(tokens):
+            docs = self._postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self._postings[term]
+
+    def search(
+        self,
+        tokens: Iterable[str],
+        k: int = 10,
+        accept: Callable[[str], bool] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Top *k* ``(doc_id, score)`` pairs for the query *tokens*, best first.
+
+        Documents for which *accept* returns false are skipped.
+        """
+        n = len(self._lengths)
+        if n == 0 or k <= 0:
+            return []
+        k1 = self.k1
+        terms = []
+        for term in dict.fromkeys(tokens):
+            docs = self._postings.get(term)
+            if docs:
+                df = len(docs)
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                terms.append((idf, docs))
+        terms.sort(key=itemgetter(0), reverse=True)
+
+        # Each term adds at most idf * (k1 + 1) to a document's score.
+        remaining = sum(idf for idf, _ in terms) * (k1 + 1)
+        lengths = self._lengths
+        base = k1 * (1 - self.b)
+        slope = k1 * self.b * n / self._total_length if self._total_length else 0.0
+        scores: dict[str, float] = {}
+        get_score = scores.get
+        threshold = 0.0
+        last = len(terms) - 1
+        for i, (idf, docs) in enumerate(terms):
+            weight = idf * (k1 + 1)
+            if len(scores) >= k and remaining <= threshold:
+                # No unseen document can reach the top k any more.
+                get_tf = docs.get
+                for doc_id in scores:
+                    tf = get_tf(doc_id)
+                    if tf:
+                        scores[doc_id] += weight * tf / (tf + base + slope * lengths[doc_id])
+            elif accept is None:
+                for doc_id, tf in docs.items():
+                    scores[doc_id] = get_score(doc_id, 0.0) + weight * tf / (
+                        tf + base + slope * lengths[doc_id]
+                    )
+            else:
+                for doc_id, tf in docs.items():
+                    score = get_score(doc_id)
+                    if score is None:
+                        if not accept(doc_id):
+                            continue
+                        score = 0.0
+                    scores[doc_id] = score + weight * tf / (tf + base + slope * lengths[doc_id])
+            remaining -= weight
+            if len(scores) >= k and i < last:
+                threshold = heapq.nlargest(k, scores.values())[-1]
+        return heapq.nlargest(k, scores.items(), key=itemgetter(1))
@@ -0,0 +1,92 @@
+"""Loading server modules by import path, eagerly or on first use."""
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from denden.modules.base import Module
+
+if TYPE_CHECKING:
+    from denden.server import DenDenServer
+
+logger = logging.getLogger(__name__)
+
+
+def load(path: str) -> Module:
+    """Import *path* and return its ``module`` attribute or the result of
+    its ``create_module()``."""
+    mod = importlib.import_module(path)
+    if hasattr(mod, "module"):
+        return mod.module
+    if hasattr(mod, "create_module"):
+        return mod.create_module()
+    raise ValueError(f"module {path} must expose 'module' or 'create_module'")
+
+
+def register(server: DenDenServer, module: Module) -> None:
+    """Register *module*'s handlers on *server*, route them to the lanes
+    the module asks for and call its ``on_load``."""
+    for method_name, handler in module.methods().items():
+        server._servicer.set_handler(method_name, handler)
+    for method_name, lane in module.lanes().items():
+        if lane in server._servicer.lanes:
+            server.route(method_name, lane)
+        else:
+            logger.warning(
+                "module %s: no lane %r configured, %s keeps its default",
+                module.name(), lane, method_name,
+            )
+    module.on_load(server)
+
+
+class LazyModule(Module):
+    """Stand-in for the module at *path* that imports it on the first
+    request for one of *methods*.
+
+    The first request pays for the import; the real handlers then replace
+    the stand-ins on the server. If the import fails the request gets an
+    error and the next one tries again.
+    """
+
+    def __init__(self, path: str, methods: Iterable[str]) -> None:
+        self.path = path
+        self._method_names = tuple(methods)
+        self._lock = threading.Lock()
+        self._server: DenDenServer | None = None
+        self._handlers: dict[str, Callable] | None = None
+
+    def name(self) -> str:
+        return self.path
+
+    def methods(self) -> dict[str, Callable]:
+        return {method: self._stand_in(method) for method in self._method_names}
+
+    def on_load(self, server: DenDenServer) -> None:
+        self._server = server
+
+    def _stand_in(self, method: str) -> Callable:
+        def handle(request):
+            return self._resolve()[method](request)
+
+        handle.__qualname__ = f"LazyModule({self.path!r}).{method}"
+        return handle
+
+    def _resolve(self) -> dict[str, Callable]:
+        handlers = self._handlers
+        if handlers is not None:
+            return handlers
+        with self._lock:
+            if self._handlers is None:
+                module = load(self.path)
+                handlers = module.methods()
+                missing = [m for m in self._method_names if m not in handlers]
+                if missing:
+                    raise ValueError(
+                        f"module {self.path} has no method(s) {', '.join(missing)}"
+                    )
+                if self._server is not None:
+                    register(self._server, module)
+                self._handlers = handlers
+            return self._handlers
@@ -0,0 +1,294 @@
+"""Reference in-memory store for ``remember`` requests.
+
+Load it with::
+
+    denden-server --load-module denden.modules.memory
+
+Entries are partitioned by scope ("global", "project" or "role"; empty
+means "global"). Each partition keeps an inverted index from keyword to
+entry ids. An entry's id is derived from a hash of its scope and content,
+so it is stable across restarts, and remembering the same content in the
+same scope again is detected with a single dict lookup and answered with
+``status="duplicate"`` and the original ``entry_id``.
+
+With *near_duplicates* set (a Jaccard similarity in (0, 1]), a reworded
+version of an existing entry in the same scope is also answered as a
+duplicate: each partition keeps a MinHash signature of every entry in an
+LSH index (see :mod:`denden.modules.minhash`), so the lookup compares
+only entries that share a band with the new one rather than scanning.
+
+``recall`` ranks entries against a free-text query with BM25 (see
+:mod:`denden.modules.bm25`), optionally restricted to some scopes and to
+entries carrying given keywords. The index is updated on every
+``remember``; nothing is ever rebuilt.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from typing import Callable
+
+from denden.gen import denden_pb2
+from denden.modules.base import Module
+from denden.modules.bm25 import BM25Index, tokenize
+from denden.modules.minhash import MinHashIndex, signature
+from denden.server import error_response, ok_response
+
+SCOPES = ("global", "project", "role")
+DEFAULT_SCOPE = "global"
+DEFAULT_TOP_K = 10
+
+
+class MemoryEntry:
+    """One remembered piece of content."""
+
+    __slots__ = ("entry_id", "scope", "content", "keywords", "created_at")
+
+    def __init__(
+        self, entry_id: str, scope: str, content: str, keywords: tuple[str, ...],
+    ) -> None:
+        self.entry_id = entry_id
+        self.scope = scope
+        self.content = content
+        self.keywords = keywords
+        self.created_at = time.time()
+
+    def tokens(self) -> list[str]:
+        """Terms the entry is indexed under for ``recall``."""
+        return tokenize(self.content) + tokenize(" ".join(self.keywords))
+
+
+class _Partition:
+    __slots__ = ("entries", "keywords", "signatures")
+
+    def __init__(self, signatures: MinHashIndex | None = None) -> None:
+        self.entries: dict[str, MemoryEntry] = {}
+        self.keywords: dict[str, set[str]] = {}  # keyword -> entry ids
+        self.signatures = signatures
+
+
+def entry_id(scope: str, content: str) -> str:
+    """Stable id of *content* remembered in *scope*."""
+    digest = hashlib.sha256(f"{scope}\0{content}".encode()).hexdigest()
+    return f"mem_{digest[:24]}"
+
+
+def normalize_keywords(keywords) -> tuple[str, ...]:
+    """Lower-cased, stripped, de-duplicated keywords in first-seen order."""
+    return tuple(dict.fromkeys(k.strip().lower() for k in keywords if k.strip()))
+
+
+class MemoryStore:
+    """Thread-safe scope-partitioned entry store with keyword and BM25 indexes.
+
+    *near_duplicates* is the estimated Jaccard similarity of content
+    words (0..1] at which a new entry counts as a duplicate of an existing
+    one in its scope; ``None`` only detects exact duplicates.
+    """
+
+    def __init__(self, near_duplicates: float | None = None) -> None:
+        self._lock = threading.Lock()
+        self._partitions = {
+            scope: _Partition(
+                MinHashIndex(near_duplicates) if near_duplicates is not None else None
+            )
+            for scope in SCOPES
+        }
+        self._entries: dict[str, MemoryEntry] = {}  # across all scopes
+        self._index = BM25Index()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self, content: str, keywords=(), scope: str = DEFAULT_SCOPE,
+    ) -> tuple[MemoryEntry, bool]:
+        """Store *content*; returns the entry and whether it is new.
+
+        A duplicate, exact or near, returns the existing entry unchanged.
+        Raises :class:`ValueError` for an unknown scope.
+        """
+        partition = self._partition(scope)
+        scope = scope or DEFAULT_SCOPE
+        eid = entry_id(scope, content)
+        signatures = partition.signatures
+        sig = signature(tokenize(content)) if signatures is not None else None
+        with self._lock:
+            existing = partition.entries.get(eid)
+            if existing is None and sig is not None:
+                near = signatures.find(sig)
+                if near is not None:
+                    existing = partition.entries[near]
+            if existing is not None:
+                return existing, False
+            entry = MemoryEntry(eid, scope, content, normalize_keywords(keywords))
+            partition.entries[eid] = entry
+            if sig is not None:
+                signatures.add(eid, sig)
+            self._entries[eid] = entry
+            for keyword in entry.keywords:
+                ids = partition.keywords.get(keyword)
+                if ids is None:
+                    ids = partition.keywords[keyword] = set()
+                ids.add(eid)
+            self._index.add(eid, entry.tokens())
+        return entry, True
+
+    def get(self, entry_id: str, scope: str = DEFAULT_SCOPE) -> MemoryEntry | None:
+        return self._partition(scope).entries.get(entry_id)
+
+    def remove(self, entry_id: str, scope: str = DEFAULT_SCOPE) -> bool:
+        """Delete an entry; returns whether it existed."""
+        partition = self._partition(scope)
+        with self._lock:
+            entry = partition.entries.pop(entry_id, None)
+            if entry is None:
+                return False
+            del self._entries[entry_id]
+            self._index.remove(entry_id, entry.tokens())
+            if partition.signatures is not None:
+                partition.signatures.remove(entry_id)
+            for keyword in entry.keywords:
+                ids = partition.keywords[keyword]
+                ids.discard(entry_id)
+                if not ids:
+                    del partition.keywords[keyword]
+        return True
+
+    def find(self, keywords, scope: str = DEFAULT_SCOPE) -> list[MemoryEntry]:
+        """Entries in *scope* tagged with every one of *keywords*, oldest first."""
+        partition = self._partition(scope)
+        wanted = normalize_keywords(keywords)
+        if not wanted:
+            return []
+        with self._lock:
+            entries = [partition.entries[i] for i in _tagged(partition, wanted)]
+        entries.sort(key=lambda e: e.created_at)
+        return entries
+
+    def search(
+        self, query: str, keywords=(), scopes=(), top_k: int = DEFAULT_TOP_K,
+    ) -> list[tuple[MemoryEntry, float]]:
+        """Best *top_k* entries for *query* with their BM25 scores.
+
+        Only entries in *scopes* (default: all) tagged with every one of
+        *keywords* are considered. Without query terms, the matching
+        entries are returned newest first with a score of 0. Raises
+        :class:`ValueError` for an unknown scope or when neither a query
+        nor keywords are given.
+        """
+        scopes = [scope or DEFAULT_SCOPE for scope in scopes] or list(SCOPES)
+        partitions = [self._partition(scope) for scope in scopes]
+        wanted = normalize_keywords(keywords)
+        if not query.strip() and not wanted:
+            raise ValueError("a query or keywords are required")
+        tokens = tokenize(query)
+        with self._lock:
+            candidates: set[str] | None = None
+            if wanted:
+                candidates = set()
+                for partition in partitions:
+                    candidates |= _tagged(partition, wanted)
+            if not tokens:
+                if candidates is None:
+                    return []  # only stop words
+                entries = sorted(
+                    (self._entries[i] for i in candidates),
+                    key=lambda e: e.created_at,
+                    reverse=True,
+                )
+                return [(entry, 0.0) for entry in entries[:top_k]]
+            if candidates is not None:
+                accept = candidates.__contains__
+            elif len(set(scopes)) < len(SCOPES):
+                by_id, allowed = self._entries, frozenset(scopes)
+
+                def accept(i: str) -> bool:
+                    return by_id[i].scope in allowed
+            else:
+                accept = None
+            hits = self._index.search(tokens, top_k, accept)
+            return [(self._entries[i], score) for i, score in hits]
+
+    def _partition(self, scope: str) -> _Partition:
+        try:
+            return self._partitions[scope or DEFAULT_SCOPE]
+        except KeyError:
+            raise ValueError(
+                f"unknown scope {scope!r}; expected one of {', '.join(SCOPES)}"
+            ) from None
+
+
+def _tagged(partition: _Partition, keywords: tuple[str, ...]) -> set[str]:
+    """Ids of entries in *partition* tagged with all *keywords* (caller holds the lock)."""
+    sets = [partition.keywords.get(k) for k in keywords]
+    if not all(sets):
+        return set()
+    sets.sort(key=len)
+    return set(sets[0]).intersection(*sets[1:])
+
+
+class MemoryModule(Module):
+    """Handles ``remember`` and ``recall`` with a :class:`MemoryStore`."""
+
+    def __init__(self, store: MemoryStore | None = None) -> None:
+        self.store = store if store is not None else MemoryStore()
+
+    def name(self) -> str:
+        return "memory"
+
+    def methods(self) -> dict[str, Callable]:
+        return {"remember": self.remember, "recall": self.recall}
+
+    def remember(self, request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+        payload = request.remember
+        if not payload.content:
+            return error_response(request.request_id, "INVALID_REQUEST", "content is required")
+        try:
+            entry, created = self.store.add(payload.content, payload.keywords, payload.scope)
+        except ValueError as e:
+            return error_response(request.request_id, "INVALID_REQUEST", str(e))
+        return ok_response(
+            request.request_id,
+            remember_result=denden_pb2.RememberResult(
+                status="accepted" if created else "duplicate",
+                entry_id=entry.entry_id,
+            ),
+        )
+
+    def recall(self, request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+        payload = request.recall
+        try:
+            hits = self.store.search(
+                payload.query,
+                keywords=payload.keywords,
+                scopes=payload.scopes,
+                top_k=payload.top_k if payload.top_k > 0 else DEFAULT_TOP_K,
+            )
+        except ValueError as e:
+            return error_response(request.request_id, "INVALID_REQUEST", str(e))
+        return ok_response(
+            request.request_id,
+            recall_result=denden_pb2.RecallResult(entries=[
+                denden_pb2.RecalledEntry(
+                    entry_id=entry.entry_id,
+                    scope=entry.scope,
+                    content=entry.content,
+                    keywords=entry.keywords,
+                    score=score,
+                )
+                for entry, score in hits
+            ]),
+        )
+
+
+def create_module() -> MemoryModule:
+    """Module for ``--load-module``.
+
+    ``DENDEN_MEMORY_NEAR_DUPLICATES`` (e.g. ``0.9``) turns on near-duplicate
+    detection at that similarity.
+    """
+    near = os.environ.get("DENDEN_MEMORY_NEAR_DUPLICATES")
+    return MemoryModule(MemoryStore(near_duplicates=float(near) if near else None))
@@ -0,0 +1,106 @@
+"""MinHash signatures and an LSH index for near-duplicate lookup.
+
+The estimated Jaccard similarity of two token sets is the fraction of
+MinHash positions on which their signatures agree. :class:`MinHashIndex`
+splits each signature into bands and buckets entries by band, so a lookup
+only compares the entries sharing at least one band with the query
+instead of scanning everything. The band size is chosen from the
+similarity threshold so that pairs above it almost always collide.
+"""
+from __future__ import annotations
+
+import hashlib
+import struct
+from typing import Iterable
+
+NUM_PERM = 64
+
+# Each token's NUM_PERM hash values are consecutive 32-bit words of one
+# SHAKE-128 digest: independent enough for MinHash, computed and unpacked
+# in C, and stable across processes and restarts.
+_unpack = struct.Struct(f"<{NUM_PERM}I").unpack
+
+
+def signature(tokens: Iterable[str]) -> tuple[int, ...] | None:
+    """MinHash signature of the set of *tokens*; ``None`` if there are none."""
+    rows = [
+        _unpack(hashlib.shake_128(token.encode()).digest(NUM_PERM * 4))
+        for token in set(tokens)
+    ]
+    if not rows:
+        return None
+    return tuple(map(min, zip(*rows)))
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _rows_per_band(threshold: float) -> int:
+    # With b bands of r rows, pairs collide with probability 1 - (1 - s^r)^b,
+    # which rises steeply around s = (1/b)^(1/r). Take the largest r whose
+    # rise sits below the threshold, so near-duplicates are rarely missed.
+    best = 1
+    for rows in (1, 2, 4, 8, 16, 32):
+        if (rows / NUM_PERM) ** (1 / rows) <= threshold:
+            best = rows
+    return best
+
+
+class MinHashIndex:
+    """Finds the stored entry most similar to a signature, above *threshold*.
+
+    Not thread-safe; callers serialize access.
+    """
+
+    def __init__(self, threshold: float = 0.8) -> None:
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.rows = _rows_per_band(threshold)
+        self._bands: list[dict[tuple[int, ...], set[str]]] = [
+            {} for _ in range(NUM_PERM // self.rows)
+        ]
+        self._signatures: dict[str, tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _keys(self, sig: tuple[int, ...]):
+        rows = self.rows
+        for band, table in enumerate(self._bands):
+            yield table, sig[band * rows:(band + 1) * rows]
+
+    def add(self, doc_id: str, sig: tuple[int, ...]) -> None:
+        self._signatures[doc_id] = sig
+        for table, key in self._keys(sig):
+            bucket = table.get(key)
+            if bucket is None:
+                bucket = table[key] = set()
+            bucket.add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        sig = self._signatures.pop(doc_id, None)
+        if sig is None:
+            return
+        for table, key in self._keys(sig):
+            bucket = table[key]
+            bucket.discard(doc_id)
+            if not bucket:
+                del table[key]
+
+    def find(self, sig: tuple[int, ...]) -> str | None:
+        """Id of the most similar stored entry at or above *threshold*, if any."""
+        seen: set[str] = set()
+        best: str | None = None
+        best_score = self.threshold
+        for table, key in self._keys(sig):
+            for doc_id in table.get(key, ()):
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                score = similarity(sig, self._signatures[doc_id])
+                if score >= best_score:
+                    best, best_score = doc_id, score
+        return best
@@ -0,0 +1,233 @@
+"""Run CPU-bound handlers in a pool of worker processes.
+
+All handlers of a server share one GIL, so a handler that computes in
+Python (scoring, parsing, similarity search) holds up every other handler
+while it runs. A :class:`ProcessPool` runs chosen handlers in worker
+processes instead, either a whole module or single functions::
+
+    pool = ProcessPool(workers=4)
+    loader.register(server, pool.module("myproject.search"))
+    server.set_handler("recall", pool.handler(score))  # a module-level function
+    pool.start()  # optional: start the workers now, not on the first request
+    server.on_stop(pool.shutdown)
+
+The request travels to a worker as protobuf bytes and the response comes
+back the same way. Each worker imports the pooled modules once, when it
+starts. If a worker dies (a crash in native code, the OOM killer), the
+requests running in the pool are answered with ``ERR_SUBAGENT_FAILURE``
+and the next request gets a fresh pool; the server itself is unaffected.
+
+Workers are spawned, not forked, because gRPC does not survive a fork.
+A pooled module's ``on_load`` is not called, as there is no server in the
+worker. In a worker, :func:`~denden.context.current_context` carries the
+request's deadline and is cancelled when it passes; a client that goes
+away only stops the server waiting. A streaming handler runs to the end
+in the worker and only its final response comes back.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent import futures
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable
+
+from denden import stream
+from denden.context import RequestCancelled, activate, current_context, deactivate, new_context
+from denden.gen import denden_pb2
+from denden.modules import loader
+from denden.modules.base import Module
+from denden.server import ERR_SUBAGENT_FAILURE, RequestHandler, error_response
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessPool:
+    """A pool of *workers* processes (default: one per CPU) that run
+    handlers registered through :meth:`handler` and :meth:`module`.
+
+    *modules* are import paths loaded into every worker, as by
+    ``--load-module``; :meth:`module` adds more until the pool starts.
+    """
+
+    def __init__(self, workers: int | None = None, modules: Iterable[str] = ()) -> None:
+        workers = workers if workers is not None else os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self._paths = list(modules)
+        self._executor: futures.ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def handler(self, fn: RequestHandler) -> RequestHandler:
+        """Handler that runs *fn* in a worker. *fn* must be importable by
+        name (a module-level function), as it is pickled by reference."""
+        def handle(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+            return self._run(request, _run_function, fn)
+
+        handle.__qualname__ = f"ProcessPool.handler({getattr(fn, '__qualname__', fn)!r})"
+        return handle
+
+    def module(self, path: str) -> Module:
+        """Stand-in for the module at *path*, loaded in the workers only;
+        pass it to :func:`denden.modules.loader.register`. Asking for its
+        methods starts the pool."""
+        if path not in self._paths:
+            with self._lock:
+                if self._executor is not None:
+                    raise ValueError(f"cannot add module {path} to a running process pool")
+                self._paths.append(path)
+        return _PooledModule(self, path)
+
+    def start(self) -> None:
+        """Start every worker and load the modules now, so the first
+        requests do not wait for it. Raises if a module fails to load."""
+        with self._lock:
+            executor = self._ensure_started()
+        # Each task that finds no idle worker starts a new one.
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        """Stop the workers; requests still queued are cancelled."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _ensure_started(self) -> futures.ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(tuple(self._paths),),
+            )
+        return self._executor
+
+    def _submit(self, task: Callable, *args) -> tuple[futures.ProcessPoolExecutor, futures.Future]:
+        with self._lock:
+            executor = self._ensure_started()
+            try:
+                return executor, executor.submit(task, *args)
+            except BrokenProcessPool:
+                executor.shutdown(wait=False)
+                self._executor = None
+                executor = self._ensure_started()
+                return executor, executor.submit(task, *args)
+
+    def _replace(self, broken: futures.ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False)
+
+    def _call(self, task: Callable, *args):
+        """Run *task* in a worker and return its result, for setup calls."""
+        executor, future = self._submit(task, *args)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._replace(executor)
+            raise
+
+    def _run(
+        self, request: denden_pb2.DenDenRequest, task: Callable, *args,
+    ) -> denden_pb2.DenDenResponse:
+        ctx = current_context()
+        executor, future = self._submit(
+            task, *args, request.SerializeToString(), ctx.time_remaining(),
+        )
+        done = threading.Event()
+        future.add_done_callback(lambda _: done.set())
+        ctx.add_callback(done.set)
+        done.wait()
+        if not future.done():
+            future.cancel()  # frees its place if no worker has picked it up yet
+            raise RequestCancelled(ctx.reason)
+        try:
+            data = future.result()
+        except BrokenProcessPool as e:
+            logger.error("process pool worker died running request %s: %s", request.request_id, e)
+            self._replace(executor)
+            # Retryable: the request may only have shared the pool with the one that crashed.
+            return error_response(
+                request.request_id, ERR_SUBAGENT_FAILURE,
+                f"handler process died: {e}", retryable=True,
+            )
+        response = denden_pb2.DenDenResponse()
+        response.ParseFromString(data)
+        return response
+
+
+class _PooledModule(Module):
+    """Module whose handlers run in a :class:`ProcessPool`."""
+
+    def __init__(self, pool: ProcessPool, path: str) -> None:
+        self._pool = pool
+        self._path = path
+        self._info: tuple[str, list[str], dict[str, str]] | None = None
+
+    def _describe(self) -> tuple[str, list[str], dict[str, str]]:
+        if self._info is None:
+            self._info = self._pool._call(_describe, self._path)
+        return self._info
+
+    def name(self) -> str:
+        return self._describe()[0]
+
+    def methods(self) -> dict[str, Callable]:
+        return {method: self._stand_in(method) for method in self._describe()[1]}
+
+    def lanes(self) -> dict[str, str]:
+        return self._describe()[2]
+
+    def _stand_in(self, method: str) -> RequestHandler:
+        def handle(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+            return self._pool._run(request, _run_method, self._path, method)
+
+        handle.__qualname__ = f"ProcessPool.module({self._path!r}).{method}"
+        return handle
+
+
+# What follows runs in the worker processes.
+
+_methods: dict[str, dict[str, Callable]] = {}
+_modules: dict[str, Module] = {}
+
+
+def _init_worker(paths: tuple[str, ...]) -> None:
+    # Ctrl-C reaches the whole process group; the server shuts the pool down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for path in paths:
+        module = loader.load(path)
+        _modules[path] = module
+        _methods[path] = module.methods()
+
+
+def _ping() -> None:
+    pass
+
+
+def _describe(path: str) -> tuple[str, list[str], dict[str, str]]:
+    module = _modules[path]
+    return module.name(), list(_methods[path]), dict(module.lanes())
+
+
+def _run_method(path: str, method: str, data: bytes, remaining: float | None) -> bytes:
+    return _run_function(_methods[path][method], data, remaining)
+
+
+def _run_function(fn: RequestHandler, data: bytes, remaining: float | None) -> bytes:
+    request = denden_pb2.DenDenRequest()
+    request.ParseFromString(data)
+    ctx = new_context(request.request_id, timeout=remaining)
+    token = activate(ctx)
+    try:
+        return stream.collect(fn(request)).SerializeToString()
+    finally:
+        ctx.close()
+        deactivate(token)
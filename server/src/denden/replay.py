@@ -0,0 +1,311 @@
+"""Record and replay agent traffic.
+
+``denden-server record DIR`` serves as usual and journals every request
+and response in *DIR* (see :mod:`denden.journal`). The journal timestamps
+give each request's arrival time and its handler latency. :func:`load`
+reads that back; :func:`replay` re-sends the requests to a server at the
+recorded pace, *speed* times faster, or as fast as *concurrency* allows;
+:func:`compare` reports latency and outcome differences against the
+recording.
+
+:func:`stub_handlers` answers from the recording after sleeping the
+recorded latency, so a new server build can be measured without the real
+handlers::
+
+    denden-server replay DIR --stub --speed 10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent import futures
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import grpc
+
+from denden import journal
+from denden.bench.runner import percentile
+from denden.client import resolve_addr
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import RequestHandler, error_response
+
+
+@dataclass
+class Recorded:
+    offset: float  # seconds after the first recorded request
+    request: denden_pb2.DenDenRequest
+    response: denden_pb2.DenDenResponse | None = None  # None if it never finished
+    latency: float | None = None  # seconds from request to response, server side
+
+
+@dataclass
+class Outcome:
+    recorded: Recorded
+    response: denden_pb2.DenDenResponse | None
+    latency: float  # seconds, as seen by the replay client
+    lag: float  # seconds the send started behind schedule
+    rpc_error: str = ""  # gRPC status code name when the call itself failed
+
+
+def load(directory: str, run_id: str | None = None) -> list[Recorded]:
+    """Recorded requests in *directory*, in arrival order, paired with
+    their responses."""
+    recording: list[Recorded] = []
+    pending: dict[str, tuple[Recorded, int]] = {}
+    start = None
+    for record in journal.read(directory, run_id):
+        message = record.message
+        if record.kind == journal.REQUEST:
+            if start is None:
+                start = record.time_ns
+            item = Recorded((record.time_ns - start) / 1e9, message)
+            recording.append(item)
+            pending[message.request_id] = (item, record.time_ns)
+        else:
+            entry = pending.pop(message.request_id, None)
+            if entry is not None:
+                item, sent_ns = entry
+                item.response = message
+                item.latency = (record.time_ns - sent_ns) / 1e9
+    return recording
+
+
+def stub_handlers(recording: list[Recorded]) -> dict[str, RequestHandler]:
+    """Handlers, per payload type in *recording*, that sleep the recorded
+    latency and return the recorded response."""
+    by_id = {item.request.request_id: item for item in recording if item.response is not None}
+
+    def handle(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+        item = by_id.get(request.request_id)
+        if item is None:
+            return error_response(
+                request.request_id, "INVALID_REQUEST", "request_id is not in the recording",
+            )
+        time.sleep(item.latency)
+        return item.response
+
+    payloads = {item.request.WhichOneof("payload") for item in recording}
+    return {payload: handle for payload in payloads if payload is not None}
+
+
+def replay(
+    recording: list[Recorded],
+    target: str,
+    speed: float | None = 1.0,
+    concurrency: int = 64,
+    timeout: float = 30.0,
+) -> list[Outcome]:
+    """Send every recorded request to *target* with ``Send``.
+
+    Requests go out at their recorded offsets divided by *speed*; with
+    *speed* ``None`` they go out as fast as *concurrency* calls in flight
+    allow. Returns one :class:`Outcome` per request, in recording order.
+    """
+    outcomes: list[Outcome | None] = [None] * len(recording)
+    slots = threading.BoundedSemaphore(concurrency)
+
+    with grpc.insecure_channel(target) as channel, futures.ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="denden-replay",
+    ) as pool:
+        stub = denden_pb2_grpc.DendenStub(channel)
+
+        def send(i: int, due: float) -> None:
+            item = recording[i]
+            t0 = time.perf_counter()
+            response, rpc_error = None, ""
+            try:
+                response = stub.Send(item.request, timeout=timeout)
+            except grpc.RpcError as e:
+                rpc_error = e.code().name
+            finally:
+                slots.release()
+            outcomes[i] = Outcome(
+                item, response, time.perf_counter() - t0, max(t0 - due, 0.0), rpc_error,
+            )
+
+        start = time.perf_counter()
+        for i, item in enumerate(recording):
+            due = start if speed is None else start + item.offset / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            slots.acquire()
+            pool.submit(send, i, due)
+    return outcomes
+
+
+def outcome_label(response: denden_pb2.DenDenResponse | None, rpc_error: str = "") -> str:
+    """``OK``, ``DENIED:<code>``, ``ERROR:<code>``, ``RPC:<code>`` or
+    ``UNFINISHED``, for comparing how two runs of a request ended."""
+    if rpc_error:
+        return f"RPC:{rpc_error}"
+    if response is None:
+        return "UNFINISHED"
+    if response.status == denden_pb2.OK:
+        return "OK"
+    return f"{denden_pb2.ResponseStatus.Name(response.status)}:{response.error.code}"
+
+
+@dataclass
+class Report:
+    requests: int
+    duration_s: float  # recorded span of request arrivals
+    max_lag_ms: float
+    # payload type (and "all") -> "recorded"/"replayed" -> p50/p95/p99/max
+    latency_ms: dict[str, dict[str, dict[str, float]]] = field(default_factory=dict)
+    # "<recorded label> -> <replayed label>" -> count, only where they differ
+    changes: dict[str, int] = field(default_factory=dict)
+    # Requests that were OK in the recording and are not on replay.
+    regressions: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def compare(outcomes: list[Outcome]) -> Report:
+    """Latency percentiles and outcome changes of a replay against its recording."""
+    recorded: dict[str, list[float]] = {}
+    replayed: dict[str, list[float]] = {}
+    changes: dict[str, int] = {}
+    regressions = []
+    for outcome in outcomes:
+        item = outcome.recorded
+        payload = item.request.WhichOneof("payload") or "none"
+        for key in (payload, "all"):
+            if item.latency is not None:
+                recorded.setdefault(key, []).append(item.latency * 1000)
+            replayed.setdefault(key, []).append(outcome.latency * 1000)
+        before = outcome_label(item.response)
+        after = outcome_label(outcome.response, outcome.rpc_error)
+        if before != after:
+            change = f"{before} -> {after}"
+            changes[change] = changes.get(change, 0) + 1
+            if before == "OK":
+                regressions.append(item.request.request_id)
+    return Report(
+        requests=len(outcomes),
+        duration_s=round(max((o.recorded.offset for o in outcomes), default=0.0), 4),
+        max_lag_ms=round(max((o.lag for o in outcomes), default=0.0) * 1000, 4),
+        latency_ms={
+            key: {
+                "recorded": _summary(recorded.get(key, [])),
+                "replayed": _summary(replayed[key]),
+            }
+            for key in sorted(replayed)
+        },
+        changes=changes,
+        regressions=regressions,
+    )
+
+
+def _summary(latencies: list[float]) -> dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        "p50": round(percentile(latencies, 50), 4),
+        "p95": round(percentile(latencies, 95), 4),
+        "p99": round(percentile(latencies, 99), 4),
+        "max": round(latencies[-1], 4) if latencies else 0.0,
+    }
+
+
+def format_report(report: Report) -> str:
+    lines = [
+        f"{report.requests} requests over {report.duration_s:.3f}s recorded, "
+        f"max send lag {report.max_lag_ms:.1f}ms",
+        f"{'payload':<10} {'':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}",
+    ]
+    for payload, runs in report.latency_ms.items():
+        for run, s in runs.items():
+            lines.append(
+                f"{payload:<10} {run:>8} {s['p50']:>10.3f} {s['p95']:>10.3f} "
+                f"{s['p99']:>10.3f} {s['max']:>10.3f}"
+            )
+    if report.changes:
+        lines.append("outcome changes:")
+        for change, count in sorted(report.changes.items()):
+            lines.append(f"  {count:>6}  {change}")
+    else:
+        lines.append("no outcome changes")
+    return "\n".join(lines)
+
+
+def _speed(value: str) -> float | None:
+    if value == "max":
+        return None
+    speed = float(value.rstrip("x"))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def main(argv: list[str] | None = None) -> int:
+    """``denden-server replay``. Exits 1 if a request that succeeded in the
+    recording does not succeed on replay."""
+    parser = argparse.ArgumentParser(
+        prog="denden-server replay",
+        description="re-send recorded traffic and compare against the recording",
+    )
+    parser.add_argument("directory", help="journal directory written by 'denden-server record'")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
+        "--addr",
+        default=os.environ.get("DENDEN_ADDR", ""),
+        help="server to replay against; of a comma-separated list, the unix socket is used, "
+        "as by the CLI (default: $DENDEN_ADDR or 127.0.0.1:9700)",
+    )
+    target.add_argument(
+        "--stub",
+        action="store_true",
+        help="replay against an in-process server whose handlers replay the recorded responses and latencies",
+    )
+    parser.add_argument(
+        "--speed",
+        type=_speed,
+        default=1.0,
+        metavar="N|max",
+        help="send N times faster than recorded, or 'max' for as fast as possible (default: 1)",
+    )
+    parser.add_argument("--run-id", default=None, help="only replay this run")
+    parser.add_argument(
+        "--concurrency", type=int, default=64, metavar="N",
+        help="max requests in flight (default: 64)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, metavar="SECONDS",
+        help="per-request deadline (default: 30)",
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    recording = load(args.directory, args.run_id)
+    if not recording:
+        print(f"no recorded requests in {args.directory}", file=sys.stderr)
+        return 1
+
+    server = None
+    addr = resolve_addr(args.addr)
+    if args.stub:
+        from denden.server import DenDenServer
+
+        server = DenDenServer(addr="127.0.0.1:0")
+        for payload, handler in stub_handlers(recording).items():
+            server._servicer.set_handler(payload, handler)
+        server.start()
+        addr = server.bound_addr
+    try:
+        outcomes = replay(recording, addr, args.speed, args.concurrency, args.timeout)
+    finally:
+        if server is not None:
+            server.stop(grace=1)
+
+    report = compare(outcomes)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(format_report(report))
+    return 1 if report.regressions else 0
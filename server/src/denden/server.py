@@ -1,14 +1,38 @@
 from __future__ import annotations
 
+import itertools
 import logging
 import signal
-import time
 from concurrent import futures
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Mapping, Sequence
 
 import grpc
 
+from denden import addr as listen
+from denden import stream
+from denden.context import (
+    CANCELLED,
+    DEADLINE_EXCEEDED,
+    TIMEOUT,
+    RequestCancelled,
+    RequestContext,
+    activate,
+    current_context,
+    deactivate,
+    new_context,
+)
 from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.jobs import JobTable
+from denden.lanes import Lane, LaneFull, Lanes
+from denden.metrics import ServerMetrics
+from denden.traces import TraceIndex
+
+if TYPE_CHECKING:
+    # Only needed when the caller passes one in, and already imported then.
+    from denden.admission import Admission
+    from denden.artifacts import ArtifactStore
+    from denden.cache import DelegateCache, ResponseCache
+    from denden.journal import Journal
 
 logger = logging.getLogger(__name__)
 
@@ -20,70 +44,558 @@ DENY_TOOLS_NOT_ALLOWED = "DENY_TOOLS_NOT_ALLOWED"
 DENY_POLICY_REQUIRES_HUMAN = "DENY_POLICY_REQUIRES_HUMAN"
 ERR_SUBAGENT_TIMEOUT = "ERR_SUBAGENT_TIMEOUT"
 ERR_SUBAGENT_FAILURE = "ERR_SUBAGENT_FAILURE"
+ERR_RESOURCE_EXHAUSTED = "ERR_RESOURCE_EXHAUSTED"
 
 VERSION = "1.0"
 
+# Default cap on how many requests of one SendBatch run at the same time.
+DEFAULT_BATCH_PARALLELISM = 16
+
+# Seconds shaved off the caller's deadline so Await can still answer with
+# the job's current state instead of letting the RPC hit DEADLINE_EXCEEDED.
+_AWAIT_DEADLINE_MARGIN = 0.05
+
+# Sync gRPC reports "no deadline" as a huge time_remaining() instead of None.
+_NO_DEADLINE = 1e9
+
 # Type alias for request handlers.
-# A handler receives a DenDenRequest and returns a DenDenResponse.
+# A handler receives a DenDenRequest and returns a DenDenResponse, or is a
+# generator yielding stream events before the final response (see
+# denden.stream).
 RequestHandler = Callable[[denden_pb2.DenDenRequest], denden_pb2.DenDenResponse]
 
 
 class DendenServicer(denden_pb2_grpc.DendenServicer):
-    """gRPC servicer that validates envelopes and dispatches to registered handlers."""
+    """gRPC servicer that validates envelopes and dispatches to registered handlers.
+
+    When *response_cache* is given, responses are cached by ``request_id``
+    so a retried send returns the original result instead of running the
+    handler again. When *delegate_cache* is given, delegates with identical
+    payloads share one handler run. *batch_parallelism* caps how many
+    requests of a single batch are dispatched at once. Every request is
+    recorded in *metrics* (see :attr:`metrics`) and, by its trace, in the
+    agent call trees of *traces* (see :attr:`traces`). When *journal* is
+    given, every request and response is appended to it.
+
+    Handlers see their :class:`~denden.context.RequestContext` through
+    :func:`~denden.context.current_context`. *timeouts* maps payload types
+    to a server-side limit in seconds; a handler still running past it is
+    cancelled and its request answered with ``ERR_SUBAGENT_TIMEOUT``.
+
+    *lanes* bound how many handlers of each payload type run at once (see
+    :mod:`denden.lanes`); :meth:`route` assigns a payload type to a lane
+    not named after it. *admission* refuses requests beyond its in-flight
+    limits before they reach a handler (see :mod:`denden.admission`).
+    *peers* are the private addresses of sibling worker processes whose
+    status :meth:`Status` merges into this one's (see :mod:`denden.workers`).
+    *artifacts* is the store behind the artifact RPCs (see
+    :mod:`denden.artifacts`); without one they fail with ``UNIMPLEMENTED``.
+    """
 
-    def __init__(self) -> None:
-        self._start_time = time.monotonic()
+    def __init__(
+        self,
+        job_workers: int = 10_000,
+        response_cache: ResponseCache | None = None,
+        delegate_cache: DelegateCache | None = None,
+        batch_parallelism: int = DEFAULT_BATCH_PARALLELISM,
+        metrics: ServerMetrics | None = None,
+        traces: TraceIndex | None = None,
+        journal: Journal | None = None,
+        timeouts: Mapping[str, float] | None = None,
+        lanes: Iterable[Lane] = (),
+        admission: Admission | None = None,
+        peers: Sequence[str] = (),
+        artifacts: ArtifactStore | None = None,
+    ) -> None:
+        self.metrics = metrics if metrics is not None else ServerMetrics()
+        self.traces = traces if traces is not None else TraceIndex()
+        self.journal = journal
+        self.admission = admission
+        self.peers = list(peers)
+        self.artifacts = artifacts
+        self.lanes = Lanes(lanes)
+        for lane in self.lanes:
+            self.metrics.watch_lane(lane)
+        self._timeouts = dict(timeouts or {})
         self._handlers: dict[str, RequestHandler] = {}
+        self._response_cache = response_cache
+        self._delegate_cache = delegate_cache
+        self._batch_parallelism = batch_parallelism
+        self._jobs = JobTable()
+        self._job_executor = futures.ThreadPoolExecutor(
+            max_workers=job_workers, thread_name_prefix="denden-job",
+        )
+        self.metrics.watch_executor("job", self._job_executor)
 
     def set_handler(self, payload_key: str, handler: RequestHandler) -> None:
-        """Register a handler for a payload type ('ask_user', 'delegate', or 'remember')."""
+        """Register a handler for a payload type ('ask_user', 'delegate', 'remember' or 'recall')."""
         self._handlers[payload_key] = handler
 
+    def route(self, payload_key: str, lane: str) -> None:
+        """Run handlers for *payload_key* in the lane named *lane*."""
+        self.lanes.route(payload_key, lane)
+
     def Send(self, request: denden_pb2.DenDenRequest, context) -> denden_pb2.DenDenResponse:
         """Validate envelope and dispatch to the registered handler."""
-        if not request.request_id:
-            return _error_response(
-                "", "INVALID_REQUEST", "request_id is required", retryable=False
-            )
-        if request.HasField("trace"):
-            trace = request.trace
-            if not trace.run_id and not trace.agent_instance_id:
-                logger.warning("request %s missing trace fields", request.request_id)
-
-        payload_type = request.WhichOneof("payload")
-        if payload_type is None:
-            return _error_response(
-                request.request_id,
-                "INVALID_REQUEST",
-                "a payload field (ask_user, delegate, or remember) is required",
-                retryable=False,
+        return self._dispatch(request, context)
+
+    def _dispatch(
+        self, request: denden_pb2.DenDenRequest, rpc=None,
+    ) -> denden_pb2.DenDenResponse:
+        """Handle *request*; *rpc* is the gRPC context it arrived on, if
+        any, whose deadline and cancellation the handler inherits."""
+        token = self.metrics.begin(request)
+        span = self.traces.begin(request)
+        admission = self.admission
+        if admission is not None:
+            refused = admission.admit(request)
+            if refused is not None:
+                self.metrics.finish(token, refused)
+                self.traces.finish(span, refused)
+                return refused
+        journal = self.journal
+        if journal is not None:
+            journal.append_request(request)
+        ctx = self._context(request, rpc)
+        activation = activate(ctx)
+        response = None
+        try:
+            response = self._handle(request)
+            return response
+        finally:
+            ctx.close()
+            deactivate(activation)
+            if admission is not None:
+                admission.release(request)
+            self.metrics.finish(token, response)
+            self.traces.finish(span, response)
+            if journal is not None and response is not None:
+                journal.append_response(response)
+
+    def _context(self, request: denden_pb2.DenDenRequest, rpc) -> RequestContext:
+        ctx = new_context(
+            request.request_id,
+            _rpc_time_remaining(rpc),
+            self._timeouts.get(request.WhichOneof("payload")),
+        )
+        if rpc is not None:
+            # Also fires once the RPC completes normally; by then ctx is closed.
+            rpc.add_callback(lambda: ctx.cancel(_end_reason(rpc)))
+        return ctx
+
+    def _handle(self, request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+        handler, error = _resolve_handler(self._handlers, request)
+        if error is not None:
+            return error
+        if self._response_cache is not None:
+            return self._response_cache.get_or_run(
+                request.request_id, lambda: self._run(handler, request)
             )
+        return self._run(handler, request)
+
+    def _run(
+        self, handler: RequestHandler, request: denden_pb2.DenDenRequest,
+    ) -> denden_pb2.DenDenResponse:
+        cache = self._delegate_cache
+        if cache is None:
+            return self._invoke(handler, request)
+        key, result = cache.lookup(request)
+        if result is not None:
+            return ok_response(request.request_id, delegate_result=result)
+        response = self._invoke(handler, request)
+        if key is not None:
+            cache.store(key, response)
+        return response
+
+    def _invoke(
+        self, handler: RequestHandler, request: denden_pb2.DenDenRequest,
+    ) -> denden_pb2.DenDenResponse:
+        lane = self.lanes.get(request.WhichOneof("payload"))
+        if lane is None:
+            return self._call(handler, request)
+        try:
+            lane.enter(current_context())
+        except LaneFull as e:
+            return _lane_full_response(request, e)
+        except RequestCancelled as e:
+            return _cancelled_response(request, e.reason, self._timeouts)
+        try:
+            return self._call(handler, request)
+        finally:
+            lane.leave()
 
-        handler = self._handlers.get(payload_type)
-        if handler is None:
+    def _call(
+        self, handler: RequestHandler, request: denden_pb2.DenDenRequest,
+    ) -> denden_pb2.DenDenResponse:
+        try:
+            response = stream.collect(handler(request))
+        except RequestCancelled as e:
+            return _cancelled_response(request, e.reason, self._timeouts)
+        except Exception as e:
+            logger.exception("handler failed for request %s", request.request_id)
             return _error_response(
                 request.request_id,
-                "INVALID_REQUEST",
-                f"no handler registered for payload type: {payload_type}",
+                ERR_SUBAGENT_FAILURE,
+                str(e),
                 retryable=False,
             )
+        if current_context().reason == TIMEOUT:
+            return _cancelled_response(request, TIMEOUT, self._timeouts)
+        return response
+
+    def SendStream(
+        self, request: denden_pb2.DenDenRequest, context,
+    ) -> Iterator[denden_pb2.StreamEvent]:
+        """Like :meth:`Send`, but stream the handler's progress and partial results."""
+        seq = itertools.count(1)
+        token = self.metrics.begin(request)
+        span = self.traces.begin(request)
+        admission = self.admission
+        if admission is not None:
+            refused = admission.admit(request)
+            if refused is not None:
+                self.metrics.finish(token, refused)
+                self.traces.finish(span, refused)
+                event = stream.final(refused)
+                event.request_id = request.request_id
+                event.seq = next(seq)
+                yield event
+                return
+        journal = self.journal
+        if journal is not None:
+            journal.append_request(request)
+        ctx = self._context(request, context)
+        activation = activate(ctx)
+        response = None
+        try:
+            for event in self._stream(request):
+                event.request_id = request.request_id
+                event.seq = next(seq)
+                if event.HasField("response"):
+                    response = event.response
+                yield event
+        finally:
+            ctx.close()
+            deactivate(activation)
+            if admission is not None:
+                admission.release(request)
+            self.metrics.finish(token, response)
+            self.traces.finish(span, response)
+            if journal is not None and response is not None:
+                journal.append_response(response)
+
+    def _stream(
+        self, request: denden_pb2.DenDenRequest,
+    ) -> Iterator[denden_pb2.StreamEvent]:
+        handler, error = _resolve_handler(self._handlers, request)
+        if error is not None:
+            yield stream.final(error)
+            return
+        cache = self._response_cache
+        if cache is None:
+            yield from self._run_stream(handler, request)
+            return
+
+        cached, pending = cache.begin(request.request_id)
+        if cached is not None:
+            yield stream.final(cached)
+            return
+        if pending is not None:
+            yield stream.final(pending.result())
+            return
+        finished = False
+        try:
+            for event in self._run_stream(handler, request):
+                if event.HasField("response"):
+                    cache.finish(request.request_id, event.response)
+                    finished = True
+                yield event
+        finally:
+            if not finished:
+                cache.finish(request.request_id, _abandoned_response(request))
+
+    def _run_stream(
+        self, handler: RequestHandler, request: denden_pb2.DenDenRequest,
+    ) -> Iterator[denden_pb2.StreamEvent]:
+        cache = self._delegate_cache
+        key = None
+        if cache is not None:
+            key, result = cache.lookup(request)
+            if result is not None:
+                yield stream.final(ok_response(request.request_id, delegate_result=result))
+                return
+        lane = self.lanes.get(request.WhichOneof("payload"))
+        if lane is None:
+            yield from self._call_stream(handler, request, key)
+            return
+        try:
+            lane.enter(current_context())
+        except LaneFull as e:
+            yield stream.final(_lane_full_response(request, e))
+            return
+        except RequestCancelled as e:
+            yield stream.final(_cancelled_response(request, e.reason, self._timeouts))
+            return
+        try:
+            yield from self._call_stream(handler, request, key)
+        finally:
+            lane.leave()
 
+    def _call_stream(
+        self,
+        handler: RequestHandler,
+        request: denden_pb2.DenDenRequest,
+        key: str | None,
+    ) -> Iterator[denden_pb2.StreamEvent]:
+        """Stream *handler*'s events, storing the final response under
+        delegate cache *key* if given."""
+        cache = self._delegate_cache
+        ctx = current_context()
         try:
-            return handler(request)
+            events = stream.events(handler(request))
+            try:
+                for event in events:
+                    if ctx.reason == TIMEOUT:
+                        yield stream.final(_cancelled_response(request, TIMEOUT, self._timeouts))
+                        return
+                    if key is not None and event.HasField("response"):
+                        cache.store(key, event.response)
+                    yield event
+            finally:
+                events.close()
+        except RequestCancelled as e:
+            yield stream.final(_cancelled_response(request, e.reason, self._timeouts))
         except Exception as e:
             logger.exception("handler failed for request %s", request.request_id)
-            return _error_response(
+            yield stream.final(_error_response(
                 request.request_id,
                 ERR_SUBAGENT_FAILURE,
                 str(e),
                 retryable=False,
-            )
+            ))
+
+    def SendBatch(self, request: denden_pb2.BatchRequest, context) -> denden_pb2.BatchResponse:
+        """Dispatch every request concurrently and return responses in order."""
+        responses: list[denden_pb2.DenDenResponse | None] = [None] * len(request.requests)
+        for index, response in self._run_batch(request, context):
+            responses[index] = response
+        return denden_pb2.BatchResponse(responses=responses)
+
+    def SendBatchStream(
+        self, request: denden_pb2.BatchRequest, context,
+    ) -> Iterator[denden_pb2.BatchItem]:
+        """Dispatch every request concurrently, streaming each response as it completes."""
+        for index, response in self._run_batch(request, context):
+            yield denden_pb2.BatchItem(index=index, response=response)
+
+    def _run_batch(
+        self, request: denden_pb2.BatchRequest, rpc=None,
+    ) -> Iterator[tuple[int, denden_pb2.DenDenResponse]]:
+        """Yield ``(index, response)`` pairs in completion order."""
+        if not request.requests:
+            return
+        limit = _batch_limit(request, self._batch_parallelism)
+        pool = futures.ThreadPoolExecutor(
+            max_workers=limit, thread_name_prefix="denden-batch",
+        )
+        try:
+            pending = {
+                pool.submit(self._dispatch, item, rpc): index
+                for index, item in enumerate(request.requests)
+            }
+            for future in futures.as_completed(pending):
+                yield pending[future], future.result()
+        finally:
+            # A client that goes away mid-stream cancels whatever hasn't started.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def Submit(self, request: denden_pb2.DenDenRequest, context) -> denden_pb2.JobHandle:
+        """Start *request* on the job executor and return its handle immediately."""
+        job = self._jobs.submit(
+            request.request_id,
+            lambda: self._job_executor.submit(self._dispatch, request),
+        )
+        return job.handle()
+
+    def Await(self, request: denden_pb2.AwaitRequest, context) -> denden_pb2.JobStatus:
+        """Wait for a job to finish, up to ``timeout_ms`` or the RPC deadline."""
+        timeout = _await_timeout(request, context)
+        return self._jobs.wait(request.job_id, timeout)
+
+    def Poll(self, request: denden_pb2.PollRequest, context) -> denden_pb2.JobStatus:
+        """Return a job's state; a finished job is collected and removed."""
+        return self._jobs.collect(request.job_id)
+
+    def close(self) -> None:
+        """Cancel queued jobs, release the job executor and commit the journal."""
+        self._job_executor.shutdown(wait=False, cancel_futures=True)
+        if self.journal is not None:
+            self.journal.close()
 
     def Status(self, request, context) -> denden_pb2.StatusResponse:
-        uptime = int(time.monotonic() - self._start_time)
-        return denden_pb2.StatusResponse(
-            uptime_seconds=uptime,
+        """Health check with request counts, latencies and gauges, merged
+        across :attr:`peers` unless the request asks for the local status."""
+        status = self.metrics.status()
+        if self.peers and not request.local:
+            from denden.workers import aggregate_status
+
+            status = aggregate_status(status, self.peers)
+        return status
+
+    def QueryTrace(self, request: denden_pb2.TraceQuery, context) -> denden_pb2.TraceResult:
+        """Answer a subtree, critical-path or slowest-branches query on a run."""
+        return self.traces.query(request)
+
+    def PutArtifact(self, request_iterator, context) -> denden_pb2.ArtifactRef:
+        """Store an uploaded artifact and return its ref."""
+        store = self._artifact_store(context)
+        upload = None
+        try:
+            for chunk in request_iterator:
+                if upload is None:
+                    upload = store.upload(chunk.run_id)
+                upload.write(chunk.data)
+            if upload is None:
+                upload = store.upload()
+            return upload.commit()
+        except BaseException:
+            if upload is not None:
+                upload.abort()
+            raise
+
+    def GetArtifact(
+        self, request: denden_pb2.GetArtifactRequest, context,
+    ) -> Iterator[denden_pb2.ArtifactChunk]:
+        """Stream an artifact, or a byte range of it, in chunks."""
+        store = self._artifact_store(context)
+        try:
+            chunks = store.chunks(request.ref, request.offset, request.length)
+        except (LookupError, ValueError) as e:
+            context.abort(*_artifact_error(e))
+        for data in chunks:
+            yield denden_pb2.ArtifactChunk(data=data)
+
+    def ReleaseArtifacts(
+        self, request: denden_pb2.ReleaseArtifactsRequest, context,
+    ) -> denden_pb2.ReleaseArtifactsResponse:
+        """Drop a run's artifact references."""
+        released, deleted = self._artifact_store(context).release_run(request.run_id)
+        return denden_pb2.ReleaseArtifactsResponse(released=released, deleted=deleted)
+
+    def _artifact_store(self, context) -> ArtifactStore:
+        if self.artifacts is None:
+            context.abort(grpc.StatusCode.UNIMPLEMENTED, _NO_ARTIFACT_STORE)
+        return self.artifacts
+
+
+_NO_ARTIFACT_STORE = "this server has no artifact store (start it with --artifacts DIR)"
+
+
+def _artifact_error(e: Exception) -> tuple[grpc.StatusCode, str]:
+    """gRPC status for a bad or unknown artifact ref."""
+    if isinstance(e, LookupError):
+        return grpc.StatusCode.NOT_FOUND, f"no artifact {e}"
+    return grpc.StatusCode.INVALID_ARGUMENT, str(e)
+
+
+def _await_timeout(request: denden_pb2.AwaitRequest, context) -> float | None:
+    """Seconds an Await call may block, or ``None`` to wait until done."""
+    timeout = request.timeout_ms / 1000 if request.timeout_ms > 0 else None
+    remaining = context.time_remaining() if context is not None else None
+    if remaining is not None:
+        remaining = max(remaining - _AWAIT_DEADLINE_MARGIN, 0.0)
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    return timeout
+
+
+def _rpc_time_remaining(rpc) -> float | None:
+    """Seconds left before the client's deadline, or ``None`` without one."""
+    if rpc is None:
+        return None
+    remaining = rpc.time_remaining()
+    return remaining if remaining is not None and remaining < _NO_DEADLINE else None
+
+
+def _end_reason(rpc) -> str:
+    """Why an RPC ended early: its deadline passed or the client left."""
+    return DEADLINE_EXCEEDED if _rpc_time_remaining(rpc) == 0 else CANCELLED
+
+
+def _cancelled_response(
+    request: denden_pb2.DenDenRequest, reason: str, timeouts: Mapping[str, float],
+) -> denden_pb2.DenDenResponse:
+    """Answer for a request whose context was cancelled for *reason*."""
+    if reason == CANCELLED:
+        return _error_response(
+            request.request_id, "CANCELLED", "request cancelled by the client", retryable=True,
         )
+    if reason == TIMEOUT:
+        payload = request.WhichOneof("payload")
+        message = f"{payload} handler exceeded the server timeout of {timeouts[payload]:g}s"
+    else:
+        message = "client deadline exceeded"
+    return _error_response(request.request_id, ERR_SUBAGENT_TIMEOUT, message, retryable=True)
+
+
+def _lane_full_response(
+    request: denden_pb2.DenDenRequest, full: LaneFull,
+) -> denden_pb2.DenDenResponse:
+    return _error_response(
+        request.request_id, ERR_RESOURCE_EXHAUSTED, str(full), retryable=True,
+    )
+
+
+def _abandoned_response(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+    """Answer for duplicates of a request whose run ended without a response."""
+    return _error_response(
+        request.request_id, "CANCELLED", "the request this one duplicated was aborted",
+        retryable=True,
+    )
+
+
+def _batch_limit(request: denden_pb2.BatchRequest, server_limit: int) -> int:
+    """Parallelism for one batch: the client's ask, capped by the server limit."""
+    limit = server_limit
+    if request.max_parallel > 0:
+        limit = min(limit, request.max_parallel)
+    return max(1, min(limit, len(request.requests)))
+
+
+def _resolve_handler(
+    handlers: dict, request: denden_pb2.DenDenRequest,
+) -> tuple[Callable | None, denden_pb2.DenDenResponse | None]:
+    """Validate the request envelope and look up its handler.
+
+    Returns ``(handler, None)`` on success or ``(None, error_response)``
+    when the envelope is invalid or no handler is registered.
+    """
+    if not request.request_id:
+        return None, _error_response(
+            "", "INVALID_REQUEST", "request_id is required", retryable=False
+        )
+    if request.HasField("trace"):
+        trace = request.trace
+        if not trace.run_id and not trace.agent_instance_id:
+            logger.warning("request %s missing trace fields", request.request_id)
+
+    payload_type = request.WhichOneof("payload")
+    if payload_type is None:
+        return None, _error_response(
+            request.request_id,
+            "INVALID_REQUEST",
+            "a payload field (ask_user, delegate, remember, or recall) is required",
+            retryable=False,
+        )
+
+    handler = handlers.get(payload_type)
+    if handler is None:
+        return None, _error_response(
+            request.request_id,
+            "INVALID_REQUEST",
+            f"no handler registered for payload type: {payload_type}",
+            retryable=False,
+        )
+    return handler, None
 
 
 # ---------------------------------------------------------------------------
@@ -96,6 +608,7 @@ def ok_response(
     ask_user_result: denden_pb2.AskUserResult | None = None,
     delegate_result: denden_pb2.DelegateResult | None = None,
     remember_result: "denden_pb2.RememberResult | None" = None,
+    recall_result: denden_pb2.RecallResult | None = None,
 ) -> denden_pb2.DenDenResponse:
     kwargs: dict = {
         "denden_version": VERSION,
@@ -108,6 +621,8 @@ def ok_response(
         kwargs["delegate_result"] = delegate_result
     if remember_result is not None:
         kwargs["remember_result"] = remember_result
+    if recall_result is not None:
+        kwargs["recall_result"] = recall_result
     return denden_pb2.DenDenResponse(**kwargs)
 
 
@@ -170,14 +685,55 @@ class DenDenServer:
 
     def __init__(
         self,
-        addr: str = "127.0.0.1:9700",
+        addr: listen.Addr = "127.0.0.1:9700",
         max_workers: int = 10_000,
+        response_cache: ResponseCache | None = None,
+        delegate_cache: DelegateCache | None = None,
+        batch_parallelism: int = DEFAULT_BATCH_PARALLELISM,
+        metrics: ServerMetrics | None = None,
+        traces: TraceIndex | None = None,
+        journal: Journal | None = None,
+        timeouts: Mapping[str, float] | None = None,
+        lanes: Iterable[Lane] = (),
+        admission: Admission | None = None,
+        peers: Sequence[str] = (),
+        artifacts: ArtifactStore | None = None,
     ) -> None:
         self.addr = addr
+        self.addrs = listen.split_addrs(addr)
         self.max_workers = max_workers
-        self._servicer = DendenServicer()
+        self._servicer = DendenServicer(
+            response_cache=response_cache,
+            delegate_cache=delegate_cache,
+            batch_parallelism=batch_parallelism,
+            metrics=metrics,
+            traces=traces,
+            journal=journal,
+            timeouts=timeouts,
+            lanes=lanes,
+            admission=admission,
+            peers=peers,
+            artifacts=artifacts,
+        )
         self._server: grpc.Server | None = None
-        self._bound_addr: str | None = None
+        self._bound_addrs: list[str] = []
+        self._start_hooks: list[Callable[[], None]] = []
+        self._stop_hooks: list[Callable[[], None]] = []
+
+    @property
+    def metrics(self) -> ServerMetrics:
+        """Request counters, latency histograms and gauges for this server."""
+        return self._servicer.metrics
+
+    @property
+    def traces(self) -> TraceIndex:
+        """Agent call trees of recent runs, built from request traces."""
+        return self._servicer.traces
+
+    @property
+    def artifacts(self) -> ArtifactStore | None:
+        """The store behind the artifact RPCs, if the server has one."""
+        return self._servicer.artifacts
 
     def on_ask_user(self, handler: RequestHandler) -> None:
         """Register a handler for ask_user requests."""
@@ -191,15 +747,41 @@ class DenDenServer:
         """Register a handler for remember requests."""
         self._servicer.set_handler("remember", handler)
 
+    def on_recall(self, handler: RequestHandler) -> None:
+        """Register a handler for recall requests."""
+        self._servicer.set_handler("recall", handler)
+
+    def route(self, payload_key: str, lane: str) -> None:
+        """Run handlers for *payload_key* in the lane named *lane* instead
+        of the lane named after it."""
+        self._servicer.route(payload_key, lane)
+
+    def on_start(self, callback: Callable[[], None]) -> None:
+        """Run *callback* at the end of :meth:`start`, once the server is
+        listening on :attr:`bound_addrs`."""
+        self._start_hooks.append(callback)
+
+    def on_stop(self, callback: Callable[[], None]) -> None:
+        """Run *callback* during :meth:`stop`, after the server has stopped
+        taking requests (e.g. to flush buffered writes)."""
+        self._stop_hooks.append(callback)
+
     @property
     def bound_addr(self) -> str:
-        """Actual ``host:port`` the server is listening on.
+        """Actual address the server is listening on.
 
-        Only valid after :meth:`start` or :meth:`run` has been called.
+        With several listeners this is their comma-separated list, in the
+        same form ``--addr`` and ``DENDEN_ADDR`` accept. Only valid after
+        :meth:`start` or :meth:`run` has been called.
         """
-        if self._bound_addr is None:
+        return ",".join(self.bound_addrs)
+
+    @property
+    def bound_addrs(self) -> list[str]:
+        """Every address the server is listening on, in *addr* order."""
+        if not self._bound_addrs:
             raise RuntimeError("server not started")
-        return self._bound_addr
+        return list(self._bound_addrs)
 
     def start(self) -> None:
         """Create and start the gRPC server (non-blocking).
@@ -208,26 +790,37 @@ class DenDenServer:
         :attr:`bound_addr` reflects the actual bound address (which may
         differ from *addr* when port 0 was requested).
         """
+        executor = futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        self.metrics.watch_executor("grpc", executor)
         self._server = grpc.server(
-            futures.ThreadPoolExecutor(max_workers=self.max_workers),
+            executor,
             options=[
                 ("grpc.max_send_message_length", -1),
                 ("grpc.max_receive_message_length", -1),
+                # Accept the keepalive pings of denden.client channels.
+                ("grpc.keepalive_permit_without_calls", 1),
+                ("grpc.http2.min_ping_interval_without_data_ms", 20_000),
             ],
         )
         denden_pb2_grpc.add_DendenServicer_to_server(self._servicer, self._server)
-        port = self._server.add_insecure_port(self.addr)
-        if port == 0:
-            raise RuntimeError(f"failed to bind to {self.addr}")
-        host = self.addr.rsplit(":", 1)[0]
-        self._bound_addr = f"{host}:{port}"
+        self._bound_addrs = listen.bind_all(self._server, self.addrs)
         self._server.start()
-        logger.info("denden server listening on %s", self._bound_addr)
+        logger.info("denden server listening on %s", self.bound_addr)
+        _run_hooks("start", self._start_hooks)
 
     def stop(self, grace: float | None = 5) -> None:
-        """Stop the gRPC server gracefully."""
+        """Stop the gRPC server gracefully, run the :meth:`on_stop` hooks and
+        remove its socket files."""
+        hooks, self._stop_hooks = self._stop_hooks, []
         if self._server is not None:
-            self._server.stop(grace=grace)
+            stopped = self._server.stop(grace=grace)
+            if hooks or self._servicer.journal is not None:
+                # Let in-flight requests finish before the hooks run and
+                # the journal is committed.
+                stopped.wait()
+        _run_hooks("stop", hooks)
+        self._servicer.close()
+        listen.cleanup(self._bound_addrs)
 
     def wait_for_termination(self, timeout: float | None = None) -> bool:
         """Block until the server terminates.
@@ -255,3 +848,11 @@ class DenDenServer:
         signal.signal(signal.SIGTERM, _shutdown)
 
         self.wait_for_termination()
+
+
+def _run_hooks(kind: str, hooks: list[Callable[[], None]]) -> None:
+    for hook in hooks:
+        try:
+            hook()
+        except Exception:
+            logger.exception("%s hook %r failed", kind, hook)
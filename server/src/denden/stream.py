@@ -0,0 +1,185 @@
+"""Streaming handler support for the ``SendStream`` RPC.
+
+A handler may return a ``DenDenResponse`` as usual, or be a generator (or
+async generator) that yields progress and partial results before the
+final response::
+
+    def delegate(request):
+        yield progress("cloning repo", 0.1)
+        yield partial({"files": ["a.py"]})
+        ...
+        yield ok_response(request.request_id, delegate_result=result)
+
+Sync generators may also ``return`` the final response instead of
+yielding it. ``Send`` accepts the same handlers and only returns the final
+response.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+from concurrent import futures
+from typing import Any, AsyncIterator, Iterator, Mapping
+
+from google.protobuf import struct_pb2
+
+from denden.gen import denden_pb2
+
+
+class MissingResponseError(RuntimeError):
+    """A streaming handler finished without producing a final response."""
+
+
+def progress(message: str = "", fraction: float = 0.0) -> denden_pb2.StreamEvent:
+    """Progress event; *fraction* is 0..1, or 0 when unknown."""
+    return denden_pb2.StreamEvent(
+        progress=denden_pb2.Progress(message=message, fraction=fraction),
+    )
+
+
+def partial(data: Mapping[str, Any] | struct_pb2.Struct) -> denden_pb2.StreamEvent:
+    """Partial-output event carrying a chunk of early results."""
+    event = denden_pb2.StreamEvent()
+    if isinstance(data, struct_pb2.Struct):
+        event.partial.CopyFrom(data)
+    else:
+        event.partial.update(data)
+    return event
+
+
+def final(response: denden_pb2.DenDenResponse) -> denden_pb2.StreamEvent:
+    """Final event wrapping the handler's response."""
+    return denden_pb2.StreamEvent(response=response)
+
+
+def _as_event(item: Any) -> denden_pb2.StreamEvent:
+    if isinstance(item, denden_pb2.StreamEvent):
+        return item
+    if isinstance(item, denden_pb2.DenDenResponse):
+        return final(item)
+    if isinstance(item, (Mapping, struct_pb2.Struct)):
+        return partial(item)
+    raise TypeError(f"streaming handler yielded unsupported {type(item).__name__}")
+
+
+def _is_final(event: denden_pb2.StreamEvent) -> bool:
+    return event.WhichOneof("event") == "response"
+
+
+def events(result: Any) -> Iterator[denden_pb2.StreamEvent]:
+    """Normalize a handler result into events, ending with the final one.
+
+    Raises :class:`MissingResponseError` if a generator is exhausted
+    without producing a response.
+    """
+    if isinstance(result, denden_pb2.DenDenResponse):
+        yield final(result)
+        return
+    it = iter(result)
+    try:
+        while True:
+            try:
+                item = next(it)
+            except StopIteration as stop:
+                if stop.value is None:
+                    raise MissingResponseError(
+                        "streaming handler finished without a response"
+                    ) from None
+                yield final(stop.value)
+                return
+            event = _as_event(item)
+            yield event
+            if _is_final(event):
+                return
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()
+
+
+_DONE = object()
+
+
+def _step(it: Iterator) -> Any:
+    # StopIteration can't cross run_in_executor, so report it as a tuple.
+    try:
+        return next(it)
+    except StopIteration as stop:
+        return (_DONE, stop.value)
+
+
+async def aevents(
+    result: Any, executor: futures.Executor | None = None,
+) -> AsyncIterator[denden_pb2.StreamEvent]:
+    """Async version of :func:`events`.
+
+    Also accepts awaitables and async generators. Sync generators are
+    advanced on *executor* so a slow step never blocks the event loop.
+    """
+    if inspect.isawaitable(result):
+        result = await result
+    if isinstance(result, denden_pb2.DenDenResponse):
+        yield final(result)
+        return
+    if hasattr(result, "__aiter__"):
+        agen = result
+        try:
+            async for item in agen:
+                event = _as_event(item)
+                yield event
+                if _is_final(event):
+                    return
+        finally:
+            aclose = getattr(agen, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        raise MissingResponseError("streaming handler finished without a response")
+
+    loop = asyncio.get_running_loop()
+    it = iter(result)
+    # Steps run on executor threads but should see the caller's context
+    # (e.g. denden.context.current_context()).
+    context = contextvars.copy_context()
+    try:
+        while True:
+            item = await loop.run_in_executor(executor, context.run, _step, it)
+            if isinstance(item, tuple) and item and item[0] is _DONE:
+                if item[1] is None:
+                    raise MissingResponseError(
+                        "streaming handler finished without a response"
+                    )
+                yield final(item[1])
+                return
+            event = _as_event(item)
+            yield event
+            if _is_final(event):
+                return
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()
+
+
+def collect(result: Any) -> denden_pb2.DenDenResponse:
+    """Drain a handler result and return only its final response."""
+    if isinstance(result, denden_pb2.DenDenResponse):
+        return result
+    for event in events(result):
+        if _is_final(event):
+            return event.response
+    raise MissingResponseError("streaming handler finished without a response")
+
+
+async def acollect(
+    result: Any, executor: futures.Executor | None = None,
+) -> denden_pb2.DenDenResponse:
+    """Async version of :func:`collect`."""
+    if inspect.isawaitable(result):
+        result = await result
+    if isinstance(result, denden_pb2.DenDenResponse):
+        return result
+    async for event in aevents(result, executor):
+        if _is_final(event):
+            return event.response
+    raise MissingResponseError("streaming handler finished without a response")
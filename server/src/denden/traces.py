@@ -0,0 +1,320 @@
+"""In-memory index of agent call trees.
+
+Every request's ``Trace`` names its run, the agent that sent it and that
+agent's parent. :class:`TraceIndex` links those into one tree per run as
+requests arrive and keeps, per agent, when its first call started, when
+its last call finished, and how its calls ended. Queries walk the tree:
+the subtree under an agent, the critical path (following the child that
+finished last) and the slowest child branches.
+
+Memory is bounded: a run with no calls in flight is dropped *finished_ttl*
+seconds after its last activity, the least recently active finished run is
+dropped first once *max_runs* runs are tracked, and agents beyond
+*max_agents_per_run* in one run are not indexed.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from denden.gen import denden_pb2
+
+# Default number of child branches returned by a SLOWEST_BRANCHES query.
+DEFAULT_BRANCH_LIMIT = 5
+
+
+class _Node:
+    __slots__ = (
+        "agent_id", "parent_id", "children", "started", "ended",
+        "calls", "in_flight", "ok", "denied", "error", "last_error",
+    )
+
+    def __init__(self, agent_id: str) -> None:
+        self.agent_id = agent_id
+        self.parent_id = ""
+        self.children: list[_Node] = []
+        # Both stay 0 for an agent only ever seen as someone's parent.
+        self.started = 0.0
+        self.ended = 0.0
+        self.calls = 0
+        self.in_flight = 0
+        self.ok = 0
+        self.denied = 0
+        self.error = 0
+        self.last_error = ""
+
+
+class _Run:
+    __slots__ = ("nodes", "roots", "in_flight", "last_active")
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, _Node] = {}
+        self.roots: list[_Node] = []
+        self.in_flight = 0
+        self.last_active = 0.0
+
+
+class TraceIndex:
+    """Agent call trees per run, built from request traces.
+
+    Usage mirrors :class:`~denden.metrics.ServerMetrics`::
+
+        token = traces.begin(request)
+        response = ...
+        traces.finish(token, response)
+
+    Requests without a ``run_id`` or ``agent_instance_id`` are ignored.
+    """
+
+    def __init__(
+        self,
+        max_runs: int = 1000,
+        max_agents_per_run: int = 10_000,
+        finished_ttl: float = 3600.0,
+    ) -> None:
+        self.max_runs = max_runs
+        self.max_agents_per_run = max_agents_per_run
+        self.finished_ttl = finished_ttl
+        self._lock = threading.Lock()
+        self._runs: OrderedDict[str, _Run] = OrderedDict()  # least recently active first
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def begin(self, request: denden_pb2.DenDenRequest) -> tuple[_Run, _Node] | None:
+        """Record the start of a call; returns the token for :meth:`finish`."""
+        trace = request.trace
+        run_id = trace.run_id
+        agent_id = trace.agent_instance_id
+        if not run_id or not agent_id:
+            return None
+        now = time.time()
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                self._evict(now)
+                run = self._runs[run_id] = _Run()
+            else:
+                self._runs.move_to_end(run_id)
+            node = run.nodes.get(agent_id)
+            if node is None:
+                node = self._add(run, agent_id)
+                if node is None:
+                    return None
+            if node.calls == 0:
+                node.started = now
+                if not node.parent_id:
+                    self._link(run, node, trace.parent_agent_instance_id)
+            node.calls += 1
+            node.in_flight += 1
+            run.in_flight += 1
+            run.last_active = now
+        return run, node
+
+    def finish(
+        self,
+        token: tuple[_Run, _Node] | None,
+        response: denden_pb2.DenDenResponse | None,
+    ) -> None:
+        """Record how a call started with :meth:`begin` ended.
+
+        A ``None`` response (the call was abandoned) counts as an error
+        with code ``CANCELLED``.
+        """
+        if token is None:
+            return
+        run, node = token
+        now = time.time()
+        with self._lock:
+            node.in_flight -= 1
+            run.in_flight -= 1
+            node.ended = max(node.ended, now)
+            run.last_active = now
+            if response is None:
+                node.error += 1
+                node.last_error = "CANCELLED"
+            elif response.status == denden_pb2.OK:
+                node.ok += 1
+            else:
+                if response.status == denden_pb2.DENIED:
+                    node.denied += 1
+                else:
+                    node.error += 1
+                node.last_error = response.error.code
+
+    def _add(self, run: _Run, agent_id: str) -> _Node | None:
+        if len(run.nodes) >= self.max_agents_per_run:
+            return None
+        node = run.nodes[agent_id] = _Node(agent_id)
+        run.roots.append(node)
+        return node
+
+    def _link(self, run: _Run, node: _Node, parent_id: str) -> None:
+        """Move root *node* under *parent_id*, unless that would form a cycle."""
+        if not parent_id or parent_id == node.agent_id:
+            return
+        parent = run.nodes.get(parent_id)
+        if parent is None:
+            parent = self._add(run, parent_id)
+            if parent is None:
+                return
+        ancestor = parent
+        while ancestor.parent_id:
+            if ancestor.parent_id == node.agent_id:
+                return
+            ancestor = run.nodes[ancestor.parent_id]
+        run.roots.remove(node)
+        node.parent_id = parent_id
+        parent.children.append(node)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired finished runs, then make room for one more run."""
+        cutoff = now - self.finished_ttl
+        for run_id, run in list(self._runs.items()):
+            if run.last_active >= cutoff:
+                break
+            if run.in_flight == 0:
+                del self._runs[run_id]
+        while self._runs and len(self._runs) >= self.max_runs:
+            victim = next(
+                (run_id for run_id, run in self._runs.items() if run.in_flight == 0),
+                next(iter(self._runs)),
+            )
+            del self._runs[victim]
+
+    # -- queries --------------------------------------------------------
+
+    def subtree(self, run_id: str, agent_instance_id: str = "") -> list[denden_pb2.TraceNode]:
+        """The agent and all its descendants in pre-order (the whole run if
+        *agent_instance_id* is empty); empty if unknown."""
+        with self._lock:
+            heads = self._heads(run_id, agent_instance_id)
+            if heads is None:
+                return []
+            order, spans = _walk(heads, time.time())
+            return [_to_proto(node, depth, spans) for node, depth in order]
+
+    def critical_path(self, run_id: str, agent_instance_id: str = "") -> list[denden_pb2.TraceNode]:
+        """Agents from *agent_instance_id* (or the root that finished last)
+        down to a leaf, at each step following the child whose subtree
+        finished last."""
+        with self._lock:
+            heads = self._heads(run_id, agent_instance_id)
+            if not heads:
+                return []
+            _, spans = _walk(heads, time.time())
+            node = max(heads, key=lambda n: spans[n.agent_id][1])
+            path = []
+            while node is not None:
+                path.append(_to_proto(node, len(path), spans))
+                node = max(node.children, key=lambda n: spans[n.agent_id][1], default=None)
+            return path
+
+    def slowest_branches(
+        self, run_id: str, agent_instance_id: str = "", limit: int = DEFAULT_BRANCH_LIMIT,
+    ) -> list[denden_pb2.TraceNode]:
+        """The children of *agent_instance_id* (the run's roots if empty),
+        longest subtree duration first, at most *limit* of them."""
+        with self._lock:
+            heads = self._heads(run_id, agent_instance_id)
+            if heads is None:
+                return []
+            _, spans = _walk(heads, time.time())
+            if agent_instance_id:
+                branches, depth = heads[0].children, 1
+            else:
+                branches, depth = heads, 0
+            branches = sorted(
+                branches,
+                key=lambda n: spans[n.agent_id][1] - spans[n.agent_id][0],
+                reverse=True,
+            )
+            return [_to_proto(node, depth, spans) for node in branches[:limit]]
+
+    def query(self, request: denden_pb2.TraceQuery) -> denden_pb2.TraceResult:
+        """Answer a ``QueryTrace`` RPC."""
+        run_id, agent = request.run_id, request.agent_instance_id
+        if request.kind == denden_pb2.CRITICAL_PATH:
+            nodes = self.critical_path(run_id, agent)
+        elif request.kind == denden_pb2.SLOWEST_BRANCHES:
+            nodes = self.slowest_branches(run_id, agent, request.limit or DEFAULT_BRANCH_LIMIT)
+        else:
+            nodes = self.subtree(run_id, agent)
+        with self._lock:
+            found = self._heads(run_id, agent) is not None
+        return denden_pb2.TraceResult(run_id=run_id, found=found, nodes=nodes)
+
+    def _heads(self, run_id: str, agent_instance_id: str) -> list[_Node] | None:
+        run = self._runs.get(run_id)
+        if run is None:
+            return None
+        if not agent_instance_id:
+            return list(run.roots)
+        node = run.nodes.get(agent_instance_id)
+        return None if node is None else [node]
+
+
+def _walk(
+    heads: list[_Node], now: float,
+) -> tuple[list[tuple[_Node, int]], dict[str, tuple[float, float, bool]]]:
+    """Pre-order (node, depth) list under *heads*, and each subtree's
+    (start, end, busy) span; a busy subtree still has calls in flight and
+    its end is *now*."""
+    order: list[tuple[_Node, int]] = []
+    stack = [(node, 0) for node in reversed(heads)]
+    while stack:
+        node, depth = stack.pop()
+        order.append((node, depth))
+        stack.extend((child, depth + 1) for child in reversed(node.children))
+
+    spans: dict[str, tuple[float, float, bool]] = {}
+    for node, _ in reversed(order):
+        if node.calls:
+            start = node.started
+            busy = node.in_flight > 0
+            end = now if busy else node.ended
+        else:
+            start, end, busy = math.inf, 0.0, False
+        for child in node.children:
+            c_start, c_end, c_busy = spans[child.agent_id]
+            start = min(start, c_start)
+            end = max(end, c_end)
+            busy = busy or c_busy
+        spans[node.agent_id] = (start, end, busy)
+    return order, spans
+
+
+def _to_proto(
+    node: _Node, depth: int, spans: dict[str, tuple[float, float, bool]],
+) -> denden_pb2.TraceNode:
+    sub_start, sub_end, sub_busy = spans[node.agent_id]
+    if node.calls:
+        start, busy = node.started, node.in_flight > 0
+        end = sub_end if busy else node.ended
+    else:
+        # Only seen as a parent: its own span is that of its subtree.
+        start, end, busy = sub_start, sub_end, sub_busy
+    msg = denden_pb2.TraceNode(
+        agent_instance_id=node.agent_id,
+        parent_agent_instance_id=node.parent_id,
+        depth=depth,
+        duration_ms=_ms(end - start),
+        subtree_duration_ms=_ms(sub_end - start),
+        calls=node.calls,
+        in_flight=node.in_flight,
+        ok=node.ok,
+        denied=node.denied,
+        error=node.error,
+        last_error_code=node.last_error,
+    )
+    if math.isfinite(start):
+        msg.started_at.FromNanoseconds(int(start * 1e9))
+    if not busy and end:
+        msg.ended_at.FromNanoseconds(int(end * 1e9))
+    return msg
+
+
+def _ms(seconds: float) -> int:
+    return int(seconds * 1000) if math.isfinite(seconds) and seconds > 0 else 0
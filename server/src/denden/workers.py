@@ -0,0 +1,306 @@
+"""Multi-process serving for ``denden-server --workers N``.
+
+One Python process runs handlers on one core at a time. With ``--workers
+N`` the command becomes a :class:`Supervisor` that starts N copies of
+itself as worker processes. Each worker loads the same modules and binds
+the same TCP addresses; the kernel spreads incoming connections across
+them (``SO_REUSEPORT``, which gRPC sets on its listeners). A worker that
+exits unexpectedly is started again, with a growing delay if it keeps
+crashing.
+
+Workers are started as fresh interpreters instead of forked, because
+gRPC does not survive a fork once it is initialized. Each worker also
+listens on a private unix socket, and the ``Status`` RPC of any worker
+merges the local status of all its siblings (see :func:`merge_status`),
+so ``denden status`` describes the whole server whichever worker answers.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+from denden import addr as listen
+from denden.gen import denden_pb2
+
+logger = logging.getLogger(__name__)
+
+# Environment the supervisor passes to each worker.
+_ENV_INDEX = "DENDEN_WORKER_INDEX"
+_ENV_COUNT = "DENDEN_WORKER_COUNT"
+_ENV_ADDR = "DENDEN_WORKER_ADDR"
+_ENV_DIR = "DENDEN_WORKER_DIR"
+_ENV_SUPERVISOR = "DENDEN_WORKER_SUPERVISOR"
+
+# Delay before restarting a crashed worker, doubled while it keeps
+# crashing within _STABLE_AFTER seconds of starting.
+_RESTART_DELAY = 0.5
+_MAX_RESTART_DELAY = 30.0
+_STABLE_AFTER = 10.0
+
+# Seconds a Status call waits for sibling workers.
+STATUS_TIMEOUT = 1.0
+
+
+@dataclass(frozen=True)
+class Worker:
+    """What a worker process knows about itself and its siblings."""
+
+    index: int
+    count: int
+    addr: str  # the shared listen addresses, with port 0 already resolved
+    status_dir: str
+    supervisor_pid: int
+
+    @property
+    def status_addr(self) -> str:
+        """Private address whose ``Status`` reports only this worker."""
+        return _status_addr(self.status_dir, self.index)
+
+    def peers(self) -> list[str]:
+        """Private addresses of the sibling workers."""
+        return [_status_addr(self.status_dir, i) for i in range(self.count) if i != self.index]
+
+    def watch_supervisor(self, interval: float = 1.0) -> None:
+        """Send this process SIGTERM once the supervisor is gone, so an
+        orphaned worker does not keep serving."""
+        def run() -> None:
+            while os.getppid() == self.supervisor_pid:
+                time.sleep(interval)
+            logger.warning("supervisor %d exited, stopping", self.supervisor_pid)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        threading.Thread(target=run, name="denden-supervisor-watch", daemon=True).start()
+
+
+def worker_from_env() -> Worker | None:
+    """The :class:`Worker` this process runs as, or ``None`` if it was not
+    started by a :class:`Supervisor`."""
+    index = os.environ.get(_ENV_INDEX)
+    if index is None:
+        return None
+    return Worker(
+        index=int(index),
+        count=int(os.environ[_ENV_COUNT]),
+        addr=os.environ[_ENV_ADDR],
+        status_dir=os.environ[_ENV_DIR],
+        supervisor_pid=int(os.environ[_ENV_SUPERVISOR]),
+    )
+
+
+def _status_addr(directory: str, index: int) -> str:
+    return f"unix:{os.path.join(directory, f'{index}.sock')}"
+
+
+def reserve_ports(addrs: Sequence[str]) -> tuple[list[str], list[socket.socket]]:
+    """Replace TCP port 0 in *addrs* with a free port that every worker can
+    bind too.
+
+    Returns the resolved addresses and the placeholder sockets holding
+    those ports; keep them open while workers may (re)bind. They are bound
+    but never listen, so they receive no connections.
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise ValueError("--workers needs SO_REUSEPORT, which this platform lacks")
+    resolved, held = [], []
+    for addr in addrs:
+        if addr.startswith(("unix:", "unix-abstract:")):
+            raise ValueError(f"--workers can only share TCP addresses, not {addr}")
+        host, _, port = addr.rpartition(":")
+        if port != "0":
+            resolved.append(addr)
+            continue
+        bare = host.strip("[]")
+        family = socket.AF_INET6 if ":" in bare else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((bare or "0.0.0.0", 0))
+        held.append(sock)
+        resolved.append(f"{host}:{sock.getsockname()[1]}")
+    return resolved, held
+
+
+class Supervisor:
+    """Runs *workers* copies of ``python -m denden *argv*`` on the shared
+    *addr* and keeps them running until SIGINT or SIGTERM.
+
+    *grace* is how long stopping workers get before they are killed.
+    """
+
+    def __init__(
+        self,
+        argv: Sequence[str],
+        workers: int,
+        addr: listen.Addr,
+        grace: float = 10.0,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.command = [sys.executable, "-m", "denden", *argv]
+        self.workers = workers
+        self.addrs = listen.split_addrs(addr)
+        self.grace = grace
+        self.addr = ""
+        self._procs: list[subprocess.Popen | None] = [None] * workers
+        self._started = [0.0] * workers
+        self._delays = [_RESTART_DELAY] * workers
+        self._restart_at: dict[int, float] = {}
+        self._stopping = threading.Event()
+
+    def run(self) -> int:
+        """Start the workers and supervise them until stopped; returns the
+        exit status for the command."""
+        addrs, held = reserve_ports(self.addrs)
+        self.addr = ",".join(addrs)
+        status_dir = tempfile.mkdtemp(prefix="denden-workers-")
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda signum, frame: self._stopping.set())
+        logger.info("supervising %d workers on %s", self.workers, self.addr)
+        try:
+            for index in range(self.workers):
+                self._start(index, status_dir)
+            while not self._stopping.wait(0.2):
+                self._check(status_dir)
+        finally:
+            logger.info("stopping workers...")
+            self._stop_all()
+            shutil.rmtree(status_dir, ignore_errors=True)
+            for sock in held:
+                sock.close()
+        return 0
+
+    def _start(self, index: int, status_dir: str) -> None:
+        env = dict(
+            os.environ,
+            **{
+                _ENV_INDEX: str(index),
+                _ENV_COUNT: str(self.workers),
+                _ENV_ADDR: self.addr,
+                _ENV_DIR: status_dir,
+                _ENV_SUPERVISOR: str(os.getpid()),
+            },
+        )
+        proc = subprocess.Popen(self.command, env=env)
+        self._procs[index] = proc
+        self._started[index] = time.monotonic()
+        logger.info("worker %d started (pid %d)", index, proc.pid)
+
+    def _check(self, status_dir: str) -> None:
+        now = time.monotonic()
+        for index, proc in enumerate(self._procs):
+            if index in self._restart_at:
+                if now >= self._restart_at[index]:
+                    del self._restart_at[index]
+                    self._start(index, status_dir)
+                continue
+            if proc is None or proc.poll() is None:
+                continue
+            if now - self._started[index] >= _STABLE_AFTER:
+                self._delays[index] = _RESTART_DELAY
+            delay = self._delays[index]
+            self._delays[index] = min(delay * 2, _MAX_RESTART_DELAY)
+            logger.warning(
+                "worker %d (pid %d) exited with status %s; restarting in %.1fs",
+                index, proc.pid, proc.returncode, delay,
+            )
+            self._procs[index] = None
+            self._restart_at[index] = now + delay
+
+    def _stop_all(self) -> None:
+        procs = [p for p in self._procs if p is not None and p.poll() is None]
+        for proc in procs:
+            proc.terminate()
+        deadline = time.monotonic() + self.grace
+        for proc in procs:
+            try:
+                proc.wait(max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                logger.warning("worker pid %d did not stop in time, killing it", proc.pid)
+                proc.kill()
+                proc.wait()
+
+
+def merge_status(statuses: Iterable[denden_pb2.StatusResponse]) -> denden_pb2.StatusResponse:
+    """Combine the local status of several workers.
+
+    Counts add up. Latency quantiles cannot be merged exactly from
+    summaries, so each is the largest among the workers, an upper bound.
+    An agent that talked to two workers is counted by both.
+    """
+    merged = denden_pb2.StatusResponse()
+    payloads: dict[str, denden_pb2.PayloadStats] = {}
+    errors: dict[str, dict[str, int]] = {}
+    lanes: dict[str, denden_pb2.LaneStats] = {}
+    for status in statuses:
+        merged.uptime_seconds = max(merged.uptime_seconds, status.uptime_seconds)
+        merged.active_agents += status.active_agents
+        merged.in_flight += status.in_flight
+        merged.queue_depth += status.queue_depth
+        merged.workers += status.workers or 1
+        for p in status.payloads:
+            into = payloads.setdefault(p.payload_type, denden_pb2.PayloadStats(payload_type=p.payload_type))
+            into.in_flight += p.in_flight
+            into.ok += p.ok
+            into.denied += p.denied
+            into.error += p.error
+            into.p50_ms = max(into.p50_ms, p.p50_ms)
+            into.p90_ms = max(into.p90_ms, p.p90_ms)
+            into.p99_ms = max(into.p99_ms, p.p99_ms)
+            into.max_ms = max(into.max_ms, p.max_ms)
+            codes = errors.setdefault(p.payload_type, {})
+            for e in p.errors:
+                codes[e.code] = codes.get(e.code, 0) + e.count
+        for lane in status.lanes:
+            into = lanes.setdefault(lane.name, denden_pb2.LaneStats(name=lane.name))
+            into.concurrency += lane.concurrency
+            into.max_queued += lane.max_queued
+            into.running += lane.running
+            into.queued += lane.queued
+            into.rejected += lane.rejected
+    for name in sorted(payloads):
+        payload = payloads[name]
+        payload.errors.extend(
+            denden_pb2.ErrorCount(code=code, count=n) for code, n in sorted(errors[name].items())
+        )
+        merged.payloads.append(payload)
+    merged.lanes.extend(lanes[name] for name in sorted(lanes))
+    return merged
+
+
+def aggregate_status(
+    local: denden_pb2.StatusResponse, peers: Sequence[str], timeout: float = STATUS_TIMEOUT,
+) -> denden_pb2.StatusResponse:
+    """Merge *local* with the local status of the workers at *peers*.
+    Workers that do not answer in *timeout* seconds (e.g. one being
+    restarted) are left out; ``workers`` says how many were counted."""
+    import grpc
+
+    from denden.gen import denden_pb2_grpc
+
+    channels = [grpc.insecure_channel(peer) for peer in peers]
+    try:
+        calls = [
+            denden_pb2_grpc.DendenStub(channel).Status.future(
+                denden_pb2.StatusRequest(local=True), timeout=timeout,
+            )
+            for channel in channels
+        ]
+        statuses = [local]
+        for peer, call in zip(peers, calls):
+            try:
+                statuses.append(call.result())
+            except grpc.RpcError as e:
+                logger.debug("no status from worker at %s: %s", peer, e.code())
+        return merge_status(statuses)
+    finally:
+        for channel in channels:
+            channel.close()
@@ -0,0 +1,189 @@
+"""Write-behind batching for ``remember``.
+
+:class:`WriteBehind` answers each ``remember`` with ``status="queued"``
+as soon as the request is in a bounded in-memory queue. A background
+thread hands the queued requests to a bulk *flush* callable, either when
+*max_batch* are waiting or when the oldest has waited *max_delay*
+seconds. When the queue is full, callers block for up to *put_timeout*
+seconds and then get a retryable ``ERR_RESOURCE_EXHAUSTED``. That pushes
+back on agents instead of growing memory. Once the queue is closed,
+callers get a non-retryable ``ERR_SHUTTING_DOWN``.
+
+Usage inside a module::
+
+    class MyMemory(Module):
+        def __init__(self):
+            self.queue = WriteBehind(self.bulk_write)
+
+        def methods(self):
+            return {"remember": self.queue.remember}
+
+        def on_load(self, server):
+            server.on_stop(self.queue.close)  # drain on shutdown
+
+        def bulk_write(self, batch):
+            provider.insert_many(
+                {"id": entry_id, "content": req.remember.content}
+                for entry_id, req in batch
+            )
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from denden.gen import denden_pb2
+from denden.modules.memory import DEFAULT_SCOPE, entry_id
+from denden.server import ERR_RESOURCE_EXHAUSTED, error_response, ok_response
+
+logger = logging.getLogger(__name__)
+
+# A batch of (entry_id, request) pairs, oldest first.
+Batch = list[tuple[str, denden_pb2.DenDenRequest]]
+
+ERR_SHUTTING_DOWN = "ERR_SHUTTING_DOWN"
+
+
+class WriteBehindClosed(RuntimeError):
+    """The queue was closed and takes no more requests."""
+
+
+class WriteBehind:
+    """Bounded queue of ``remember`` requests flushed in batches.
+
+    *flush* receives a :data:`Batch`. If it raises, the batch goes back to
+    the front of the queue and is retried after *max_delay*. A batch
+    counts towards *max_pending* until it is written, so requeueing it
+    never overfills the queue.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Batch], None],
+        max_batch: int = 256,
+        max_delay: float = 0.5,
+        max_pending: int = 10_000,
+        put_timeout: float = 5.0,
+    ) -> None:
+        self._flush = flush
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.put_timeout = put_timeout
+        # (monotonic enqueue time, entry_id, request), oldest first.
+        self._queue: deque[tuple[float, str, denden_pb2.DenDenRequest]] = deque()
+        self._flushing = 0  # entries taken off the queue by the running flush
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # one flush at a time, in queue order
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="denden-write-behind", daemon=True,
+        )
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def remember(self, request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+        """``remember`` handler: enqueue and answer ``status="queued"``."""
+        payload = request.remember
+        if not payload.content:
+            return error_response(request.request_id, "INVALID_REQUEST", "content is required")
+        eid = entry_id(payload.scope or DEFAULT_SCOPE, payload.content)
+        try:
+            queued = self.put(eid, request)
+        except WriteBehindClosed:
+            return error_response(
+                request.request_id, ERR_SHUTTING_DOWN, "server is shutting down",
+            )
+        if not queued:
+            return error_response(
+                request.request_id,
+                ERR_RESOURCE_EXHAUSTED,
+                f"write-behind queue full ({self.max_pending} pending)",
+                retryable=True,
+            )
+        return ok_response(
+            request.request_id,
+            remember_result=denden_pb2.RememberResult(status="queued", entry_id=eid),
+        )
+
+    def put(self, eid: str, request: denden_pb2.DenDenRequest) -> bool:
+        """Enqueue; waits up to *put_timeout* for room. Returns ``False`` if
+        the queue stayed full and raises :class:`WriteBehindClosed` once
+        it is closed."""
+        with self._cond:
+            room = self._cond.wait_for(
+                lambda: self._closed or len(self._queue) + self._flushing < self.max_pending,
+                timeout=self.put_timeout,
+            )
+            if self._closed:
+                raise WriteBehindClosed("write-behind queue is closed")
+            if not room:
+                return False
+            self._queue.append((time.monotonic(), eid, request))
+            if len(self._queue) == 1 or len(self._queue) >= self.max_batch:
+                # Wake the flusher to start the delay timer or flush a full batch.
+                self._cond.notify_all()
+        return True
+
+    def flush(self) -> None:
+        """Write everything queued so far, in batches, on the calling thread."""
+        while self._flush_once(force=True):
+            pass
+
+    def close(self) -> None:
+        """Stop accepting requests, drain the queue and stop the flusher."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self.flush()
+        if self._queue:
+            logger.error("write-behind closed with %d unflushed entries", len(self._queue))
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._due():
+                    timeout = None
+                    if self._queue:
+                        timeout = max(self._queue[0][0] + self.max_delay - time.monotonic(), 0)
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+            if self._flush_once(force=False) is False:
+                # The flush failed: back off before retrying.
+                time.sleep(self.max_delay)
+
+    def _due(self) -> bool:
+        return bool(self._queue) and (
+            len(self._queue) >= self.max_batch
+            or time.monotonic() - self._queue[0][0] >= self.max_delay
+        )
+
+    def _flush_once(self, force: bool) -> bool | None:
+        """Flush one batch. Returns ``True`` if it was written, ``False`` if
+        the flush failed and ``None`` if there was nothing (due) to flush."""
+        with self._flush_lock:
+            with self._cond:
+                if not self._queue or not (force or self._due()):
+                    return None
+                items = [self._queue.popleft() for _ in range(min(len(self._queue), self.max_batch))]
+                self._flushing = len(items)
+            batch = [(eid, request) for _, eid, request in items]
+            try:
+                self._flush(batch)
+            except Exception:
+                logger.exception("write-behind flush of %d entries failed", len(batch))
+                with self._cond:
+                    self._queue.extendleft(reversed(items))
+                    self._flushing = 0
+                return False
+            with self._cond:
+                self._flushing = 0
+                self._cond.notify_all()  # room for blocked writers
+        return True
@@ -0,0 +1,123 @@
+"""Tests for listen addresses: unix sockets, multiple listeners, cleanup."""
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import uuid
+
+import grpc
+import pytest
+
+from denden.addr import bind_all, split_addrs, unix_socket_path
+from denden.aio import AsyncDenDenServer
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import VERSION, DenDenServer, ok_response
+
+
+def _ask(request):
+    return ok_response(
+        request.request_id,
+        ask_user_result=denden_pb2.AskUserResult(text=request.ask_user.question),
+    )
+
+
+def _send(target: str) -> denden_pb2.DenDenResponse:
+    with grpc.insecure_channel(target) as channel:
+        stub = denden_pb2_grpc.DendenStub(channel)
+        return stub.Send(denden_pb2.DenDenRequest(
+            denden_version=VERSION,
+            request_id="req-1",
+            ask_user=denden_pb2.AskUserPayload(question="hi"),
+        ), timeout=5)
+
+
+class TestAddrHelpers:
+    def test_split(self):
+        assert split_addrs("unix:/tmp/a.sock, 127.0.0.1:0") == ["unix:/tmp/a.sock", "127.0.0.1:0"]
+        assert split_addrs(["127.0.0.1:0"]) == ["127.0.0.1:0"]
+        with pytest.raises(ValueError):
+            split_addrs(" , ")
+
+    def test_unix_socket_path(self):
+        assert unix_socket_path("unix:/tmp/a.sock") == "/tmp/a.sock"
+        assert unix_socket_path("unix:///tmp/a.sock") == "/tmp/a.sock"
+        assert unix_socket_path("unix:rel.sock") == "rel.sock"
+        assert unix_socket_path("unix-abstract:name") is None
+        assert unix_socket_path("127.0.0.1:9700") is None
+
+    def test_bind_failure_raises(self):
+        class Refusing:
+            def add_insecure_port(self, addr):
+                return 0
+
+        with pytest.raises(RuntimeError, match="failed to bind"):
+            bind_all(Refusing(), ["127.0.0.1:1"])
+
+
+class TestUnixListener:
+    def test_tcp_and_unix_together(self, tmp_path):
+        sock = tmp_path / "denden.sock"
+        server = DenDenServer(addr=f"unix:{sock},127.0.0.1:0")
+        server.on_ask_user(_ask)
+        server.start()
+        try:
+            unix_addr, tcp_addr = server.bound_addrs
+            assert unix_addr == f"unix:{sock}"
+            assert tcp_addr.startswith("127.0.0.1:") and not tcp_addr.endswith(":0")
+            assert server.bound_addr == f"{unix_addr},{tcp_addr}"
+            assert sock.exists()
+            assert _send(unix_addr).ask_user_result.text == "hi"
+            assert _send(tcp_addr).ask_user_result.text == "hi"
+        finally:
+            server.stop(grace=0)
+        assert not sock.exists()
+
+    def test_stale_socket_replaced(self, tmp_path):
+        sock = tmp_path / "denden.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(sock))
+        stale.close()  # leaves the file behind with nobody listening
+        assert sock.exists()
+
+        server = DenDenServer(addr=f"unix:{sock}")
+        server.on_ask_user(_ask)
+        server.start()
+        try:
+            assert _send(server.bound_addr).status == denden_pb2.OK
+        finally:
+            server.stop(grace=0)
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX") or os.uname().sysname != "Linux",
+                        reason="abstract sockets are Linux-only")
+    def test_abstract_socket(self):
+        addr = f"unix-abstract:denden-test-{uuid.uuid4().hex}"
+        server = DenDenServer(addr=addr)
+        server.on_ask_user(_ask)
+        server.start()
+        try:
+            assert server.bound_addr == addr
+            assert _send(addr).status == denden_pb2.OK
+        finally:
+            server.stop(grace=0)
+
+    def test_asyncio_server_unix(self, tmp_path):
+        sock = tmp_path / "denden.sock"
+
+        async def scenario():
+            server = AsyncDenDenServer(addr=[f"unix:{sock}", "127.0.0.1:0"])
+            server.on_ask_user(_ask)
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(server.bound_addrs[0]) as channel:
+                    stub = denden_pb2_grpc.DendenStub(channel)
+                    return await stub.Send(denden_pb2.DenDenRequest(
+                        request_id="req-1",
+                        ask_user=denden_pb2.AskUserPayload(question="hi"),
+                    ))
+            finally:
+                await server.stop(grace=0)
+
+        resp = asyncio.run(scenario())
+        assert resp.ask_user_result.text == "hi"
+        assert not sock.exists()
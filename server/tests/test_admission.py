@@ -0,0 +1,110 @@
+"""Tests for admission control."""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from denden.admission import Admission
+from denden.aio import AsyncDendenServicer
+from denden.gen import denden_pb2
+from denden.server import ERR_RESOURCE_EXHAUSTED, VERSION, DendenServicer, ok_response
+
+
+def _request(request_id: str, run: str = "run-1", agent: str = "agent-1"):
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        trace=denden_pb2.Trace(run_id=run, agent_instance_id=agent),
+        ask_user=denden_pb2.AskUserPayload(question="ok?"),
+    )
+
+
+def _ok(request):
+    return ok_response(request.request_id, ask_user_result=denden_pb2.AskUserResult(text="ok"))
+
+
+class TestAdmission:
+    def test_global_limit(self):
+        admission = Admission(max_in_flight=2, retry_after=0.5)
+        assert admission.admit(_request("a")) is None
+        assert admission.admit(_request("b", run="run-2", agent="agent-2")) is None
+        refused = admission.admit(_request("c", run="run-3", agent="agent-3"))
+        assert refused.request_id == "c"
+        assert refused.status == denden_pb2.ERROR
+        assert refused.error.code == ERR_RESOURCE_EXHAUSTED
+        assert refused.error.retryable
+        assert refused.error.retry_after_ms == 500
+        admission.release(_request("a"))
+        assert admission.admit(_request("c", run="run-3", agent="agent-3")) is None
+        assert (admission.in_flight, admission.refused) == (2, 1)
+
+    def test_per_run_and_per_agent_limits(self):
+        admission = Admission(per_run=2, per_agent=1)
+        assert admission.admit(_request("a", agent="x")) is None
+        refused = admission.admit(_request("b", agent="x"))
+        assert "agent x" in refused.error.message
+        assert admission.admit(_request("b", agent="y")) is None
+        refused = admission.admit(_request("c", agent="z"))
+        assert "run run-1" in refused.error.message
+        # Other runs are not affected, and untraced requests only count globally.
+        assert admission.admit(_request("d", run="run-2", agent="z")) is None
+        assert admission.admit(_request("e", run="", agent="")) is None
+        for request_id, run, agent in (("a", "run-1", "x"), ("b", "run-1", "y"),
+                                       ("d", "run-2", "z"), ("e", "", "")):
+            admission.release(_request(request_id, run, agent))
+        assert admission.in_flight == 0
+        assert not admission._runs and not admission._agents
+
+    def test_rejects_bad_limits(self):
+        with pytest.raises(ValueError):
+            Admission(max_in_flight=0)
+
+
+def test_servicer_refuses_beyond_limit_and_recovers():
+    release, started = threading.Event(), threading.Event()
+
+    def handler(request):
+        started.set()
+        release.wait(5)
+        return _ok(request)
+
+    servicer = DendenServicer(admission=Admission(per_agent=1))
+    servicer.set_handler("ask_user", handler)
+    first = threading.Thread(target=servicer.Send, args=(_request("a"), None))
+    first.start()
+    try:
+        assert started.wait(2)
+        refused = servicer.Send(_request("b"), None)
+        assert refused.error.code == ERR_RESOURCE_EXHAUSTED
+        (event,) = servicer.SendStream(_request("c"), None)
+        assert event.seq == 1 and event.request_id == "c"
+        assert event.response.error.code == ERR_RESOURCE_EXHAUSTED
+    finally:
+        release.set()
+        first.join(2)
+    assert servicer.Send(_request("d"), None).status == denden_pb2.OK
+    (stats,) = servicer.metrics.status().payloads
+    assert {e.code: e.count for e in stats.errors} == {ERR_RESOURCE_EXHAUSTED: 2}
+    assert servicer.admission.in_flight == 0
+
+
+def test_async_servicer_admission():
+    servicer = AsyncDendenServicer(admission=Admission(max_in_flight=2))
+
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return _ok(request)
+
+    servicer.set_handler("ask_user", handler)
+
+    async def main():
+        return await asyncio.gather(*(
+            servicer.Send(_request(f"r{i}", agent=f"a{i}"), None) for i in range(4)
+        ))
+
+    responses = asyncio.run(main())
+    codes = sorted(r.error.code for r in responses)
+    assert codes == ["", "", ERR_RESOURCE_EXHAUSTED, ERR_RESOURCE_EXHAUSTED]
+    assert servicer.admission.in_flight == 0
@@ -0,0 +1,201 @@
+"""Tests for the grpc.aio server: async/sync handler dispatch and gRPC integration."""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import grpc
+import pytest
+
+from denden.aio import AsyncDenDenServer, AsyncDendenServicer
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import ERR_SUBAGENT_FAILURE, VERSION, ok_response
+
+
+def _ask_request(request_id: str = "req-1") -> denden_pb2.DenDenRequest:
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        ask_user=denden_pb2.AskUserPayload(question="pick a color"),
+    )
+
+
+async def _async_echo(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+    await asyncio.sleep(0)
+    return ok_response(
+        request.request_id,
+        ask_user_result=denden_pb2.AskUserResult(text=request.ask_user.question),
+    )
+
+
+def _sync_echo(request: denden_pb2.DenDenRequest) -> denden_pb2.DenDenResponse:
+    return ok_response(
+        request.request_id,
+        ask_user_result=denden_pb2.AskUserResult(
+            text=threading.current_thread().name,
+        ),
+    )
+
+
+class TestAsyncDendenServicer:
+    def test_missing_request_id(self):
+        servicer = AsyncDendenServicer()
+        req = denden_pb2.DenDenRequest(
+            ask_user=denden_pb2.AskUserPayload(question="hi"),
+        )
+        resp = asyncio.run(servicer.Send(req, None))
+        assert resp.status == denden_pb2.ERROR
+        assert resp.error.code == "INVALID_REQUEST"
+
+    def test_no_handler_registered(self):
+        servicer = AsyncDendenServicer()
+        resp = asyncio.run(servicer.Send(_ask_request(), None))
+        assert resp.status == denden_pb2.ERROR
+        assert "no handler registered" in resp.error.message
+
+    def test_async_handler(self):
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("ask_user", _async_echo)
+        resp = asyncio.run(servicer.Send(_ask_request(), None))
+        assert resp.status == denden_pb2.OK
+        assert resp.ask_user_result.text == "pick a color"
+
+    def test_sync_handler_offloaded(self):
+        """Sync handlers run off the event loop thread."""
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("ask_user", _sync_echo)
+        resp = asyncio.run(servicer.Send(_ask_request(), None))
+        assert resp.status == denden_pb2.OK
+        assert resp.ask_user_result.text != threading.current_thread().name
+
+    def test_async_callable_object(self):
+        class Handler:
+            async def __call__(self, request):
+                return await _async_echo(request)
+
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("ask_user", Handler())
+        assert "ask_user" in servicer._async_handlers
+        resp = asyncio.run(servicer.Send(_ask_request(), None))
+        assert resp.ask_user_result.text == "pick a color"
+
+    def test_handler_exception(self):
+        async def bad_handler(req):
+            raise RuntimeError("boom")
+
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("ask_user", bad_handler)
+        resp = asyncio.run(servicer.Send(_ask_request(), None))
+        assert resp.status == denden_pb2.ERROR
+        assert resp.error.code == ERR_SUBAGENT_FAILURE
+        assert "boom" in resp.error.message
+
+    def test_replacing_async_with_sync_handler(self):
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("ask_user", _async_echo)
+        servicer.set_handler("ask_user", _sync_echo)
+        assert "ask_user" not in servicer._async_handlers
+
+
+class TestAsyncDenDenServer:
+    def test_bound_addr_before_start_raises(self):
+        server = AsyncDenDenServer()
+        with pytest.raises(RuntimeError, match="not started"):
+            _ = server.bound_addr
+
+    def test_registration(self):
+        server = AsyncDenDenServer()
+        server.on_ask_user(_async_echo)
+        server.on_delegate(_sync_echo)
+        server.on_remember(_sync_echo)
+        assert set(server._servicer._handlers) == {"ask_user", "delegate", "remember"}
+
+    def test_concurrent_blocked_handlers_over_grpc(self):
+        """Many blocked coroutine handlers are served without a thread each."""
+        n = 50
+
+        async def scenario():
+            gate = asyncio.Event()
+            waiting = 0
+
+            async def blocking_ask(request):
+                nonlocal waiting
+                waiting += 1
+                if waiting == n:
+                    gate.set()
+                await gate.wait()
+                return await _async_echo(request)
+
+            server = AsyncDenDenServer(addr="127.0.0.1:0")
+            server.on_ask_user(blocking_ask)
+            await server.start()
+            try:
+                assert server.bound_addr.startswith("127.0.0.1:")
+                threads_before = threading.active_count()
+                async with grpc.aio.insecure_channel(server.bound_addr) as channel:
+                    stub = denden_pb2_grpc.DendenStub(channel)
+                    responses = await asyncio.gather(
+                        *(stub.Send(_ask_request(f"req-{i}")) for i in range(n))
+                    )
+                    status = await stub.Status(denden_pb2.StatusRequest())
+                assert threading.active_count() - threads_before < n
+            finally:
+                await server.stop(grace=0)
+            return responses, status
+
+        responses, status = asyncio.run(scenario())
+        assert [r.request_id for r in responses] == [f"req-{i}" for i in range(50)]
+        assert all(r.status == denden_pb2.OK for r in responses)
+        assert status.uptime_seconds >= 0
+
+    def test_sync_handler_over_grpc(self):
+        async def scenario():
+            server = AsyncDenDenServer(addr="127.0.0.1:0")
+            server.on_ask_user(_sync_echo)
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(server.bound_addr) as channel:
+                    stub = denden_pb2_grpc.DendenStub(channel)
+                    return await stub.Send(_ask_request())
+            finally:
+                await server.stop(grace=0)
+
+        resp = asyncio.run(scenario())
+        assert resp.status == denden_pb2.OK
+        assert resp.ask_user_result.text.startswith("denden-sync-handler")
+
+    def test_submit_and_await_async_handler(self):
+        async def scenario():
+            release = asyncio.Event()
+
+            async def slow_delegate(request):
+                await release.wait()
+                return ok_response(
+                    request.request_id,
+                    delegate_result=denden_pb2.DelegateResult(summary="finished"),
+                )
+
+            server = AsyncDenDenServer(addr="127.0.0.1:0")
+            server.on_delegate(slow_delegate)
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(server.bound_addr) as channel:
+                    stub = denden_pb2_grpc.DendenStub(channel)
+                    handle = await stub.Submit(denden_pb2.DenDenRequest(
+                        request_id="req-job",
+                        delegate=denden_pb2.DelegatePayload(delegate_to="x"),
+                    ))
+                    first = await stub.Await(
+                        denden_pb2.AwaitRequest(job_id=handle.job_id, timeout_ms=20)
+                    )
+                    release.set()
+                    second = await stub.Await(denden_pb2.AwaitRequest(job_id=handle.job_id))
+            finally:
+                await server.stop(grace=0)
+            return handle, first, second
+
+        handle, first, second = asyncio.run(scenario())
+        assert handle.state == denden_pb2.RUNNING
+        assert first.state == denden_pb2.RUNNING
+        assert second.state == denden_pb2.DONE
+        assert second.response.delegate_result.summary == "finished"
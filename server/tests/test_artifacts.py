@@ -0,0 +1,172 @@
+"""Tests for the artifact store and its RPCs."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+
+import grpc
+import pytest
+
+from denden.aio import AsyncDenDenServer
+from denden.artifacts import ArtifactStore, UnknownArtifact, parse_ref
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import DenDenServer
+
+DATA = bytes(range(256)) * 40  # 10 KiB
+
+
+def _ref(data: bytes) -> str:
+    return "sha256:" + hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArtifactStore(str(tmp_path / "artifacts"), chunk_size=4096)
+    yield store
+    store.close()
+
+
+class TestArtifactStore:
+    def test_put_is_content_addressed(self, store):
+        ref = store.put(DATA, run_id="run-1")
+        assert (ref.ref, ref.size) == (_ref(DATA), len(DATA))
+        again = store.put([DATA[:100], DATA[100:]], run_id="run-2")
+        assert again.ref == ref.ref
+        assert len(os.listdir(os.path.join(store.root, "blobs", parse_ref(ref.ref)[:2]))) == 1
+        with store.open(ref.ref) as data:
+            assert data[:] == DATA
+
+    def test_chunks_and_ranges(self, store):
+        ref = store.put(DATA).ref
+        chunks = list(store.chunks(ref))
+        assert [len(c) for c in chunks] == [4096, 4096, 2048]
+        assert b"".join(chunks) == DATA
+        assert b"".join(store.chunks(ref, offset=5000, length=100)) == DATA[5000:5100]
+        assert b"".join(store.chunks(ref, offset=10_000)) == DATA[10_000:]
+        assert list(store.chunks(ref, offset=20_000)) == []
+
+    def test_empty_artifact(self, store):
+        ref = store.put(b"").ref
+        assert ref == _ref(b"")
+        assert list(store.chunks(ref)) == []
+        with store.open(ref) as data:
+            assert data == b""
+
+    def test_release_deletes_what_no_run_holds(self, store):
+        shared = store.put(DATA, run_id="a").ref
+        store.hold(shared, "b")
+        only_a = store.put(b"only a", run_id="a").ref
+        assert store.release_run("a") == (2, 1)
+        assert store.size(shared) == len(DATA)
+        with pytest.raises(UnknownArtifact):
+            store.size(only_a)
+        assert store.release_run("b") == (1, 1)
+        assert store.release_run("b") == (0, 0)
+        with pytest.raises(UnknownArtifact):
+            store.chunks(shared)
+
+    def test_collect_after_crash(self, tmp_path):
+        root = str(tmp_path / "artifacts")
+        store = ArtifactStore(root)
+        ref = store.put(DATA, run_id="run/with slash").ref
+        store.put(b"orphan", run_id="gone")
+        store.close()
+        # A crash between writing a blob and linking it leaves it unheld.
+        os.unlink(os.path.join(root, "runs", "run-gone", parse_ref(_ref(b"orphan"))))
+        store = ArtifactStore(root)
+        assert store.size(ref) == len(DATA)
+        with pytest.raises(UnknownArtifact):
+            store.size(_ref(b"orphan"))
+        store.close()
+
+    def test_bad_refs(self, store):
+        for bad in ("", "sha256:abc", "md5:" + "0" * 64, "sha256:" + "G" * 64):
+            with pytest.raises(ValueError):
+                store.size(bad)
+        with pytest.raises(UnknownArtifact):
+            store.hold(_ref(b"missing"), "run")
+        with pytest.raises(ValueError):
+            store.chunks(store.put(DATA).ref, offset=-1)
+
+
+def _upload(stub, data: bytes, run_id: str, chunk: int = 3000) -> denden_pb2.ArtifactRef:
+    chunks = [data[i:i + chunk] for i in range(0, len(data), chunk)] or [b""]
+    return stub.PutArtifact(iter(
+        denden_pb2.ArtifactChunk(data=c, run_id=run_id if i == 0 else "")
+        for i, c in enumerate(chunks)
+    ))
+
+
+def test_artifact_rpcs(store):
+    server = DenDenServer(addr="127.0.0.1:0", artifacts=store)
+    server.start()
+    try:
+        assert server.artifacts is store
+        with grpc.insecure_channel(server.bound_addr) as channel:
+            stub = denden_pb2_grpc.DendenStub(channel)
+            ref = _upload(stub, DATA, "run-1")
+            assert (ref.ref, ref.size) == (_ref(DATA), len(DATA))
+            chunks = list(stub.GetArtifact(denden_pb2.GetArtifactRequest(ref=ref.ref)))
+            assert len(chunks) == 3
+            assert b"".join(c.data for c in chunks) == DATA
+            part = stub.GetArtifact(denden_pb2.GetArtifactRequest(ref=ref.ref, offset=10, length=5))
+            assert b"".join(c.data for c in part) == DATA[10:15]
+
+            with pytest.raises(grpc.RpcError) as e:
+                list(stub.GetArtifact(denden_pb2.GetArtifactRequest(ref=_ref(b"nope"))))
+            assert e.value.code() == grpc.StatusCode.NOT_FOUND
+            with pytest.raises(grpc.RpcError) as e:
+                list(stub.GetArtifact(denden_pb2.GetArtifactRequest(ref="report.pdf")))
+            assert e.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+            released = stub.ReleaseArtifacts(denden_pb2.ReleaseArtifactsRequest(run_id="run-1"))
+            assert (released.released, released.deleted) == (1, 1)
+    finally:
+        server.stop(grace=0)
+
+
+def test_rpcs_without_store():
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.start()
+    try:
+        with grpc.insecure_channel(server.bound_addr) as channel:
+            stub = denden_pb2_grpc.DendenStub(channel)
+            with pytest.raises(grpc.RpcError) as e:
+                _upload(stub, DATA, "run-1")
+            assert e.value.code() == grpc.StatusCode.UNIMPLEMENTED
+            assert "--artifacts" in e.value.details()
+    finally:
+        server.stop(grace=0)
+
+
+def test_async_artifact_rpcs(store):
+    async def scenario():
+        server = AsyncDenDenServer(addr="127.0.0.1:0", artifacts=store)
+        await server.start()
+        try:
+            async with grpc.aio.insecure_channel(server.bound_addr) as channel:
+                stub = denden_pb2_grpc.DendenStub(channel)
+                call = stub.PutArtifact()
+                await call.write(denden_pb2.ArtifactChunk(data=DATA[:5000], run_id="run-1"))
+                await call.write(denden_pb2.ArtifactChunk(data=DATA[5000:]))
+                await call.done_writing()
+                ref = await call
+                data = b"".join([
+                    c.data async for c in stub.GetArtifact(denden_pb2.GetArtifactRequest(ref=ref.ref))
+                ])
+                missing = stub.GetArtifact(denden_pb2.GetArtifactRequest(ref=_ref(b"nope")))
+                with pytest.raises(grpc.RpcError) as e:
+                    [c async for c in missing]
+                released = await stub.ReleaseArtifacts(
+                    denden_pb2.ReleaseArtifactsRequest(run_id="run-1"),
+                )
+                return ref, data, e.value.code(), released
+        finally:
+            await server.stop(grace=0)
+
+    ref, data, code, released = asyncio.run(scenario())
+    assert ref.ref == _ref(DATA)
+    assert data == DATA
+    assert code == grpc.StatusCode.NOT_FOUND
+    assert released.deleted == 1
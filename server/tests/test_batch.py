@@ -0,0 +1,156 @@
+"""Tests for SendBatch / SendBatchStream: ordering, parallelism cap, gRPC."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import grpc
+
+from denden.aio import AsyncDendenServicer
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import VERSION, DenDenServer, DendenServicer, ok_response
+
+
+def _delegate_request(request_id: str, text: str = "") -> denden_pb2.DenDenRequest:
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        delegate=denden_pb2.DelegatePayload(
+            delegate_to="implementer",
+            task=denden_pb2.Task(text=text),
+        ),
+    )
+
+
+def _batch(n: int, max_parallel: int = 0) -> denden_pb2.BatchRequest:
+    # Earlier requests sleep longer, so completion order is the reverse of
+    # request order when they run in parallel.
+    return denden_pb2.BatchRequest(
+        requests=[_delegate_request(f"req-{i}", str((n - i) * 0.02)) for i in range(n)],
+        max_parallel=max_parallel,
+    )
+
+
+class _SleepyHandler:
+    """Sleeps for ``float(task.text)`` seconds and tracks peak concurrency."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def __call__(self, request):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(float(request.delegate.task.text or 0))
+        finally:
+            with self._lock:
+                self.running -= 1
+        return ok_response(
+            request.request_id,
+            delegate_result=denden_pb2.DelegateResult(summary=request.request_id),
+        )
+
+
+class TestServicerBatch:
+    def test_responses_in_request_order(self):
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", _SleepyHandler())
+        resp = servicer.SendBatch(_batch(5), None)
+        assert [r.request_id for r in resp.responses] == [f"req-{i}" for i in range(5)]
+
+    def test_runs_concurrently(self):
+        handler = _SleepyHandler()
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", handler)
+        servicer.SendBatch(_batch(5), None)
+        assert handler.peak > 1
+
+    def test_client_parallelism_cap(self):
+        handler = _SleepyHandler()
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", handler)
+        servicer.SendBatch(_batch(6, max_parallel=2), None)
+        assert handler.peak <= 2
+
+    def test_server_parallelism_cap(self):
+        handler = _SleepyHandler()
+        servicer = DendenServicer(batch_parallelism=1)
+        servicer.set_handler("delegate", handler)
+        servicer.SendBatch(_batch(4, max_parallel=10), None)
+        assert handler.peak == 1
+
+    def test_stream_in_completion_order(self):
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", _SleepyHandler())
+        items = list(servicer.SendBatchStream(_batch(4), None))
+        assert sorted(i.index for i in items) == [0, 1, 2, 3]
+        assert items[0].index == 3
+        assert all(i.response.request_id == f"req-{i.index}" for i in items)
+
+    def test_invalid_item_does_not_fail_batch(self):
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", _SleepyHandler())
+        batch = denden_pb2.BatchRequest(requests=[
+            _delegate_request("req-0"),
+            denden_pb2.DenDenRequest(request_id="req-1"),
+        ])
+        resp = servicer.SendBatch(batch, None)
+        assert resp.responses[0].status == denden_pb2.OK
+        assert resp.responses[1].error.code == "INVALID_REQUEST"
+
+    def test_empty_batch(self):
+        servicer = DendenServicer()
+        assert len(servicer.SendBatch(denden_pb2.BatchRequest(), None).responses) == 0
+
+
+class TestAsyncServicerBatch:
+    def test_ordered_and_capped(self):
+        running = 0
+        peak = 0
+
+        async def delegate(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(float(request.delegate.task.text))
+            running -= 1
+            return ok_response(request.request_id)
+
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("delegate", delegate)
+        resp = asyncio.run(servicer.SendBatch(_batch(6, max_parallel=3), None))
+        assert [r.request_id for r in resp.responses] == [f"req-{i}" for i in range(6)]
+        assert peak == 3
+
+    def test_stream(self):
+        async def delegate(request):
+            await asyncio.sleep(float(request.delegate.task.text))
+            return ok_response(request.request_id)
+
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("delegate", delegate)
+
+        async def scenario():
+            return [i async for i in servicer.SendBatchStream(_batch(3), None)]
+
+        items = asyncio.run(scenario())
+        assert [i.index for i in items] == [2, 1, 0]
+
+
+def test_send_batch_over_grpc():
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_delegate(_SleepyHandler())
+    server.start()
+    try:
+        with grpc.insecure_channel(server.bound_addr) as channel:
+            stub = denden_pb2_grpc.DendenStub(channel)
+            resp = stub.SendBatch(_batch(3), timeout=5)
+            items = list(stub.SendBatchStream(_batch(3), timeout=5))
+    finally:
+        server.stop(grace=0)
+    assert [r.delegate_result.summary for r in resp.responses] == ["req-0", "req-1", "req-2"]
+    assert sorted(i.index for i in items) == [0, 1, 2]
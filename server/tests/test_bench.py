@@ -0,0 +1,82 @@
+"""Tests for the benchmark suite: scenarios, drivers and the JSON report."""
+from __future__ import annotations
+
+import json
+import shutil
+
+import pytest
+
+from denden.bench import SCENARIOS, run_cli, run_grpc, run_inproc, scenarios
+from denden.bench.__main__ import compare, main
+from denden.bench.runner import percentile
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([], 50) == 0.0
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_scenario_handler_round_trip(name):
+    scenario = SCENARIOS[name]()
+    request = scenario.make_request(1)
+    assert request.WhichOneof("payload") == scenario.payload_type
+    assert request.request_id == "bench-1"
+    assert json.loads(scenario.cli_json)
+
+
+def test_large_scenario_size():
+    scenario = scenarios.large(size_kb=8)
+    req = scenario.make_request(0)
+    assert 8 * 1024 <= req.ByteSize() < 16 * 1024
+    resp = scenario.handler(req)
+    assert resp.delegate_result.output == req.delegate.task.extra
+
+
+def test_inproc_driver():
+    result = run_inproc(scenarios.fast(), requests=50, concurrency=4)
+    assert result.errors == 0
+    assert result.requests == 50
+    assert result.throughput_rps > 0
+    assert result.latency_ms["p50"] <= result.latency_ms["p99"] <= result.latency_ms["max"]
+    assert result.threads["peak"] >= result.threads["start"] > 0
+    assert result.rss_mb["peak"] > 0
+
+
+def test_grpc_driver():
+    result = run_grpc(scenarios.blocking(hold=0.01), requests=20, concurrency=10)
+    assert result.errors == 0
+    assert result.latency_ms["p50"] >= 10
+
+
+@pytest.mark.skipif(shutil.which("true") is None, reason="needs a `true` binary")
+def test_cli_driver_counts_exit_codes():
+    ok = run_cli(scenarios.fast(), requests=5, concurrency=2, cli_bin=shutil.which("true"))
+    assert ok.errors == 0
+    failing = run_cli(scenarios.fast(), requests=5, concurrency=2, cli_bin=shutil.which("false"))
+    assert failing.errors == 5
+
+
+@pytest.mark.skipif(shutil.which("sh") is None, reason="needs a shell")
+def test_cli_driver_passes_scenario_env(tmp_path):
+    cli = tmp_path / "denden"
+    cli.write_text('#!/bin/sh\n[ "$DENDEN_RAW_JSON" = 1 ]\n')
+    cli.chmod(0o755)
+    raw = run_cli(scenarios.large_encoded(size_kb=1), requests=2, concurrency=1, cli_bin=str(cli))
+    assert raw.errors == 0
+    plain = run_cli(scenarios.large(size_kb=1), requests=2, concurrency=1, cli_bin=str(cli))
+    assert plain.errors == 2
+
+
+def test_main_writes_report_and_compare(tmp_path, capsys):
+    out = tmp_path / "bench.json"
+    main(["--mode", "inproc", "--scenario", "fast", "--requests", "20", "-c", "2", "-o", str(out)])
+    report = json.loads(out.read_text())
+    assert report["results"][0]["mode"] == "inproc"
+    assert {"python", "grpc", "timestamp", "config"} <= report.keys()
+
+    lines = compare(report, report)
+    assert lines and "+0.0%" in lines[0]
@@ -0,0 +1,69 @@
+"""Tests for the incremental BM25 index."""
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from denden.modules.bm25 import BM25Index, tokenize
+
+
+def _brute_force(index: BM25Index, tokens, k):
+    n = len(index._lengths)
+    avgdl = index._total_length / n
+    scores = {}
+    for term in set(tokens):
+        docs = index._postings.get(term, {})
+        idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+        for doc_id, tf in docs.items():
+            norm = index.k1 * (1 - index.b + index.b * index._lengths[doc_id] / avgdl)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (index.k1 + 1) / (tf + norm)
+    return sorted(scores.values(), reverse=True)[:k]
+
+
+def test_tokenize_drops_stop_words():
+    assert tokenize("The DB is on port 5432, not 5433") == ["db", "port", "5432", "5433"]
+
+
+def test_ranking():
+    index = BM25Index()
+    index.add("a", tokenize("postgres connection pool settings"))
+    index.add("b", tokenize("redis cache settings"))
+    index.add("c", tokenize("postgres postgres migration"))
+    hits = index.search(tokenize("postgres migration"), k=2)
+    assert [doc for doc, _ in hits] == ["c", "a"]
+    assert hits[0][1] > hits[1][1] > 0
+    assert index.search(tokenize("mysql")) == []
+
+
+def test_accept_filter():
+    index = BM25Index()
+    index.add("a", ["x"])
+    index.add("b", ["x", "x"])
+    assert [doc for doc, _ in index.search(["x"], accept=lambda d: d != "b")] == ["a"]
+
+
+def test_remove():
+    index = BM25Index()
+    index.add("a", ["x", "y"])
+    index.add("b", ["y"])
+    index.remove("a", ["x", "y"])
+    assert len(index) == 1
+    assert index.search(["x"]) == []
+    assert [doc for doc, _ in index.search(["y"])] == ["b"]
+    index.remove("a", ["x", "y"])  # already gone
+    assert len(index) == 1
+
+
+def test_pruned_top_k_matches_brute_force():
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(300)]
+    weights = [1 / (i + 1) for i in range(300)]
+    index = BM25Index()
+    for i in range(2000):
+        index.add(str(i), rng.choices(vocab, weights, k=rng.randint(3, 30)))
+    for _ in range(50):
+        query = rng.choices(vocab, weights, k=rng.randint(1, 5))
+        got = [score for _, score in index.search(query, k=10)]
+        assert got == pytest.approx(_brute_force(index, query, 10), rel=1e-9)
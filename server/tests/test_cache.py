@@ -0,0 +1,345 @@
+"""Tests for response caching: BoundedCache, ResponseCache, DelegateCache and idempotent sends."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent import futures
+
+import pytest
+
+from denden.aio import AsyncDendenServicer
+from denden.cache import BoundedCache, DelegateCache, ResponseCache, delegate_key
+from denden.gen import denden_pb2
+from denden.server import (
+    ERR_SUBAGENT_FAILURE,
+    VERSION,
+    DendenServicer,
+    error_response,
+    ok_response,
+)
+
+
+def _delegate_request(
+    request_id: str = "req-1",
+    text: str = "do the thing",
+    role: str = "implementer",
+    run_id: str = "",
+) -> denden_pb2.DenDenRequest:
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        trace=denden_pb2.Trace(run_id=run_id, agent_instance_id="agent-1"),
+        delegate=denden_pb2.DelegatePayload(
+            delegate_to=role,
+            task=denden_pb2.Task(text=text),
+        ),
+    )
+
+
+class _CountingHandler:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return ok_response(
+            request.request_id,
+            delegate_result=denden_pb2.DelegateResult(summary=request.delegate.task.text),
+        )
+
+
+# ---------------------------------------------------------------------------
+# BoundedCache
+# ---------------------------------------------------------------------------
+
+class TestBoundedCache:
+    def test_lru_eviction(self):
+        cache = BoundedCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # a is now most recently used
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_ttl_expiry(self):
+        cache = BoundedCache(ttl=0.01)
+        cache.put("a", 1)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_byte_budget(self):
+        cache = BoundedCache(max_bytes=10)
+        cache.put("a", 1, size=6)
+        cache.put("b", 2, size=6)
+        assert cache.get("a") is None
+        assert cache.nbytes == 6
+
+    def test_oversized_value_not_stored(self):
+        cache = BoundedCache(max_bytes=10)
+        cache.put("a", 1, size=11)
+        assert cache.get("a") is None
+        assert cache.nbytes == 0
+
+    def test_replace_updates_size(self):
+        cache = BoundedCache()
+        cache.put("a", 1, size=5)
+        cache.put("a", 2, size=3)
+        assert cache.get("a") == 2
+        assert cache.nbytes == 3
+
+
+# ---------------------------------------------------------------------------
+# ResponseCache
+# ---------------------------------------------------------------------------
+
+class TestResponseCache:
+    def test_hit_and_miss_counters(self):
+        cache = ResponseCache()
+        run = lambda: ok_response("req-1")  # noqa: E731
+        cache.get_or_run("req-1", run)
+        cache.get_or_run("req-1", run)
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["entries"] == 1
+        assert stats["bytes"] > 0
+
+    def test_retryable_error_not_cached(self):
+        cache = ResponseCache()
+        calls = []
+
+        def run():
+            calls.append(1)
+            return error_response("req-1", "BUSY", "try later", retryable=True)
+
+        cache.get_or_run("req-1", run)
+        cache.get_or_run("req-1", run)
+        assert len(calls) == 2
+
+    def test_exception_propagates_to_waiters(self):
+        cache = ResponseCache()
+        with pytest.raises(RuntimeError):
+            cache.get_or_run("req-1", lambda: (_ for _ in ()).throw(RuntimeError("x")))
+        # The key is released, so a later call runs again.
+        assert cache.get_or_run("req-1", lambda: ok_response("req-1")).request_id == "req-1"
+
+    def test_single_flight(self):
+        cache = ResponseCache()
+        handler = _CountingHandler(delay=0.1)
+        req = _delegate_request()
+        with futures.ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(
+                lambda _: cache.get_or_run("req-1", lambda: handler(req)), range(8)
+            ))
+        assert handler.calls == 1
+        assert all(r.delegate_result.summary == "do the thing" for r in results)
+        assert cache.stats()["coalesced"] + cache.stats()["hits"] == 7
+
+
+# ---------------------------------------------------------------------------
+# Servicer integration
+# ---------------------------------------------------------------------------
+
+class TestIdempotentSend:
+    def test_retried_send_runs_handler_once(self):
+        handler = _CountingHandler()
+        servicer = DendenServicer(response_cache=ResponseCache())
+        servicer.set_handler("delegate", handler)
+        first = servicer.Send(_delegate_request(), None)
+        second = servicer.Send(_delegate_request(), None)
+        assert handler.calls == 1
+        assert first == second
+
+    def test_distinct_request_ids_not_shared(self):
+        handler = _CountingHandler()
+        servicer = DendenServicer(response_cache=ResponseCache())
+        servicer.set_handler("delegate", handler)
+        servicer.Send(_delegate_request("req-1"), None)
+        servicer.Send(_delegate_request("req-2"), None)
+        assert handler.calls == 2
+
+    def test_invalid_requests_bypass_cache(self):
+        cache = ResponseCache()
+        servicer = DendenServicer(response_cache=cache)
+        resp = servicer.Send(_delegate_request(), None)
+        assert resp.status == denden_pb2.ERROR
+        assert cache.stats()["misses"] == 0
+
+    def test_without_cache_handler_reruns(self):
+        handler = _CountingHandler()
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", handler)
+        servicer.Send(_delegate_request(), None)
+        servicer.Send(_delegate_request(), None)
+        assert handler.calls == 2
+
+    def test_async_servicer_single_flight(self):
+        calls = 0
+
+        async def slow_delegate(request):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return ok_response(request.request_id)
+
+        servicer = AsyncDendenServicer(response_cache=ResponseCache())
+        servicer.set_handler("delegate", slow_delegate)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(servicer.Send(_delegate_request(), None) for _ in range(5))
+            )
+
+        responses = asyncio.run(scenario())
+        assert calls == 1
+        assert all(r.request_id == "req-1" for r in responses)
+
+    def test_async_cancelled_waiter_leaves_owner_intact(self):
+        release = asyncio.Event()
+
+        async def blocked_delegate(request):
+            await release.wait()
+            return ok_response(request.request_id)
+
+        servicer = AsyncDendenServicer(response_cache=ResponseCache())
+        servicer.set_handler("delegate", blocked_delegate)
+
+        async def scenario():
+            owner = asyncio.create_task(servicer.Send(_delegate_request(), None))
+            await asyncio.sleep(0.01)
+            duplicate = asyncio.create_task(servicer.Send(_delegate_request(), None))
+            other = asyncio.create_task(servicer.Send(_delegate_request(), None))
+            await asyncio.sleep(0.01)
+            duplicate.cancel()  # e.g. its client went away
+            await asyncio.sleep(0.01)
+            release.set()
+            return await owner, await other
+
+        owner, other = asyncio.run(scenario())
+        assert owner.status == denden_pb2.OK
+        assert other.status == denden_pb2.OK
+
+
+# ---------------------------------------------------------------------------
+# DelegateCache
+# ---------------------------------------------------------------------------
+
+class TestDelegateCache:
+    def test_key_ignores_struct_insertion_order(self):
+        a = denden_pb2.DelegatePayload(delegate_to="r", task=denden_pb2.Task(text="t"))
+        a.task.extra.update({"x": 1, "y": {"b": 2, "a": 3}})
+        b = denden_pb2.DelegatePayload(delegate_to="r", task=denden_pb2.Task(text="t"))
+        b.task.extra.update({"y": {"a": 3, "b": 2}, "x": 1})
+        assert delegate_key(a) == delegate_key(b)
+        b.task.artifact_refs.append("file.txt")
+        assert delegate_key(a) != delegate_key(b)
+
+    def test_non_delegate_not_cached(self):
+        req = denden_pb2.DenDenRequest(
+            request_id="req-1", ask_user=denden_pb2.AskUserPayload(question="q"),
+        )
+        assert DelegateCache().key(req) is None
+
+    def test_only_ok_results_stored(self):
+        cache = DelegateCache()
+        key, _ = cache.lookup(_delegate_request())
+        cache.store(key, error_response("req-1", ERR_SUBAGENT_FAILURE, "boom"))
+        assert cache.lookup(_delegate_request())[1] is None
+
+    def test_custom_store(self):
+        store = BoundedCache(max_entries=1)
+        cache = DelegateCache(store=store)
+        for text in ("a", "b"):
+            key, _ = cache.lookup(_delegate_request(text=text))
+            cache.store(key, ok_response("req-1", delegate_result=denden_pb2.DelegateResult(summary=text)))
+        assert len(store) == 1
+        assert cache.lookup(_delegate_request(text="a"))[1] is None
+        assert cache.lookup(_delegate_request(text="b"))[1].summary == "b"
+
+
+class TestDelegateCacheServicer:
+    def test_identical_delegates_share_result(self):
+        handler = _CountingHandler()
+        cache = DelegateCache()
+        servicer = DendenServicer(delegate_cache=cache)
+        servicer.set_handler("delegate", handler)
+        first = servicer.Send(_delegate_request("req-1"), None)
+        second = servicer.Send(_delegate_request("req-2"), None)
+        assert handler.calls == 1
+        assert second.request_id == "req-2"
+        assert second.status == denden_pb2.OK
+        assert second.delegate_result == first.delegate_result
+        assert cache.stats()["hits"] == 1
+
+    def test_different_task_misses(self):
+        handler = _CountingHandler()
+        servicer = DendenServicer(delegate_cache=DelegateCache())
+        servicer.set_handler("delegate", handler)
+        servicer.Send(_delegate_request("req-1", text="a"), None)
+        servicer.Send(_delegate_request("req-2", text="b"), None)
+        assert handler.calls == 2
+
+    def test_per_run_scope(self):
+        handler = _CountingHandler()
+        servicer = DendenServicer(delegate_cache=DelegateCache(per_run=True))
+        servicer.set_handler("delegate", handler)
+        servicer.Send(_delegate_request("req-1", run_id="run-a"), None)
+        servicer.Send(_delegate_request("req-2", run_id="run-a"), None)
+        servicer.Send(_delegate_request("req-3", run_id="run-b"), None)
+        assert handler.calls == 2
+
+    def test_excluded_role_always_runs(self):
+        handler = _CountingHandler()
+        servicer = DendenServicer(
+            delegate_cache=DelegateCache(exclude_roles=["reviewer"]),
+        )
+        servicer.set_handler("delegate", handler)
+        servicer.Send(_delegate_request("req-1", role="reviewer"), None)
+        servicer.Send(_delegate_request("req-2", role="reviewer"), None)
+        assert handler.calls == 2
+
+    def test_failures_rerun(self):
+        calls = []
+
+        def failing(request):
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        servicer = DendenServicer(delegate_cache=DelegateCache())
+        servicer.set_handler("delegate", failing)
+        servicer.Send(_delegate_request("req-1"), None)
+        resp = servicer.Send(_delegate_request("req-2"), None)
+        assert resp.error.code == ERR_SUBAGENT_FAILURE
+        assert len(calls) == 2
+
+    def test_async_servicer(self):
+        calls = 0
+
+        async def delegate(request):
+            nonlocal calls
+            calls += 1
+            return ok_response(
+                request.request_id,
+                delegate_result=denden_pb2.DelegateResult(summary="done"),
+            )
+
+        servicer = AsyncDendenServicer(delegate_cache=DelegateCache())
+        servicer.set_handler("delegate", delegate)
+
+        async def scenario():
+            await servicer.Send(_delegate_request("req-1"), None)
+            return await servicer.Send(_delegate_request("req-2"), None)
+
+        resp = asyncio.run(scenario())
+        assert calls == 1
+        assert resp.request_id == "req-2"
+        assert resp.delegate_result.summary == "done"
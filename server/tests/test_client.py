@@ -0,0 +1,184 @@
+"""Tests for the Python client."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import grpc
+import pytest
+
+from denden import client as client_mod
+from denden.client import AsyncClient, Client, parse_duration, resolve_addr, retry_delay
+from denden.gen import denden_pb2
+from denden.server import (
+    ERR_RESOURCE_EXHAUSTED,
+    VERSION,
+    DenDenServer,
+    error_response,
+    ok_response,
+)
+
+
+def _ask(question: str = "ok?", **fields) -> denden_pb2.DenDenRequest:
+    return denden_pb2.DenDenRequest(ask_user=denden_pb2.AskUserPayload(question=question), **fields)
+
+
+def _echo(request):
+    trace = request.trace
+    text = "|".join([trace.agent_instance_id, trace.parent_agent_instance_id, trace.run_id])
+    return ok_response(request.request_id, ask_user_result=denden_pb2.AskUserResult(text=text))
+
+
+class _Flaky:
+    """Refuses each request as overloaded *times* times, then echoes it."""
+
+    def __init__(self, times: int, retryable: bool = True) -> None:
+        self.times = times
+        self.retryable = retryable
+        self.seen: list[str] = []
+
+    def __call__(self, request):
+        self.seen.append(request.request_id)
+        if self.seen.count(request.request_id) <= self.times:
+            response = error_response(
+                request.request_id, ERR_RESOURCE_EXHAUSTED, "busy", retryable=self.retryable,
+            )
+            response.error.retry_after_ms = 1
+            return response
+        return _echo(request)
+
+
+@pytest.fixture
+def server():
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_ask_user(_echo)
+    server.start()
+    yield server
+    server.stop(grace=0)
+
+
+@pytest.fixture(autouse=True)
+def _no_denden_env(monkeypatch):
+    for name in ("DENDEN_ADDR", "DENDEN_AGENT_ID", "DENDEN_PARENT_AGENT_ID", "DENDEN_RUN_ID",
+                 "DENDEN_TIMEOUT", "DENDEN_RETRIES", "DENDEN_DEADLINE"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_resolve_addr():
+    assert resolve_addr("") == "127.0.0.1:9700"
+    assert resolve_addr("127.0.0.1:9800") == "127.0.0.1:9800"
+    assert resolve_addr("127.0.0.1:9800,unix:/tmp/d.sock") == "unix:/tmp/d.sock"
+    assert resolve_addr(" unix-abstract:denden , 127.0.0.1:1") == "unix-abstract:denden"
+
+
+def test_parse_duration():
+    assert parse_duration("30s") == 30
+    assert parse_duration("1m30s") == 90
+    assert parse_duration("1.5h") == 5400
+    assert parse_duration("250ms") == pytest.approx(0.25)
+    assert parse_duration("0") == 0
+    for bad in ("", "30", "s", "1x", "1s junk"):
+        with pytest.raises(ValueError):
+            parse_duration(bad)
+
+
+def test_retry_delay():
+    assert retry_delay(0, 0, lambda: 0) == 0.125
+    assert retry_delay(1000, 0, lambda: 1) == 1
+    assert retry_delay(1000, 2, lambda: 0) == 2
+    assert retry_delay(1000, 30, lambda: 1) == 10
+
+
+def test_channels_are_shared(server):
+    assert Client(server.bound_addr).stub is not Client(server.bound_addr).stub
+    assert client_mod.channel(server.bound_addr) is client_mod.channel(server.bound_addr)
+
+
+def test_send_fills_envelope_from_env(server, monkeypatch):
+    monkeypatch.setenv("DENDEN_ADDR", server.bound_addr)
+    monkeypatch.setenv("DENDEN_AGENT_ID", "agent-1")
+    monkeypatch.setenv("DENDEN_PARENT_AGENT_ID", "parent-1")
+    monkeypatch.setenv("DENDEN_RUN_ID", "run-1")
+    request = _ask()
+    response = Client().send(request)
+    assert response.status == denden_pb2.OK
+    assert response.ask_user_result.text == "agent-1|parent-1|run-1"
+    assert request.request_id.startswith("req_") and response.request_id == request.request_id
+    assert request.denden_version == VERSION
+    assert request.trace.HasField("created_at")
+
+    kept = _ask(request_id="mine", trace=denden_pb2.Trace(run_id="other"))
+    response = Client(run_id="run-2").send(kept)
+    assert response.request_id == "mine"
+    assert response.ask_user_result.text == "agent-1|parent-1|other"
+
+
+def test_send_retries_retryable_responses(server):
+    flaky = _Flaky(times=2)
+    server.on_ask_user(flaky)
+    response = Client(server.bound_addr).send(_ask())
+    assert response.status == denden_pb2.OK
+    assert len(flaky.seen) == 3 and len(set(flaky.seen)) == 1
+
+    flaky = _Flaky(times=2)
+    server.on_ask_user(flaky)
+    response = Client(server.bound_addr, retries=1).send(_ask())
+    assert response.error.code == ERR_RESOURCE_EXHAUSTED
+    assert len(flaky.seen) == 2
+
+    flaky = _Flaky(times=1, retryable=False)
+    server.on_ask_user(flaky)
+    assert Client(server.bound_addr).send(_ask()).status == denden_pb2.ERROR
+    assert len(flaky.seen) == 1
+
+
+def test_deadline_from_env(server, monkeypatch):
+    server.on_ask_user(lambda r: time.sleep(1) or _echo(r))
+    monkeypatch.setenv("DENDEN_DEADLINE", str(int(time.time() * 1000) + 200))
+    start = time.monotonic()
+    with pytest.raises(grpc.RpcError) as e:
+        Client(server.bound_addr).send(_ask())
+    assert e.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    assert time.monotonic() - start < 0.9
+
+    monkeypatch.delenv("DENDEN_DEADLINE")
+    monkeypatch.setenv("DENDEN_TIMEOUT", "1m")
+    assert Client(server.bound_addr).timeout == 60
+
+
+def test_send_batch_resends_only_retryable_items(server):
+    flaky = _Flaky(times=1)
+    server.on_ask_user(lambda r: flaky(r) if r.ask_user.question == "flaky" else _echo(r))
+    requests = [_ask("fine", request_id="a"), _ask("flaky", request_id="b"), _ask("fine", request_id="c")]
+    responses = Client(server.bound_addr, run_id="run-1").send_batch(requests)
+    assert [r.request_id for r in responses] == ["a", "b", "c"]
+    assert all(r.status == denden_pb2.OK for r in responses)
+    assert flaky.seen == ["b", "b"]
+    assert responses[0].ask_user_result.text == "||run-1"
+
+
+def test_send_stream_and_status(server):
+    client = Client(server.bound_addr)
+    events = list(client.send_stream(_ask()))
+    assert events[-1].response.status == denden_pb2.OK
+    assert client.status().uptime_seconds >= 0
+
+
+def test_async_client(server):
+    flaky = _Flaky(times=1)
+    server.on_ask_user(flaky)
+
+    async def scenario():
+        client = AsyncClient(server.bound_addr, agent_id="agent-1")
+        response = await client.send(_ask())
+        batch = await client.send_batch([_ask(request_id="x"), _ask(request_id="y")])
+        events = [event async for event in client.send_stream(_ask())]
+        return response, batch, events, await client.status()
+
+    response, batch, events, status = asyncio.run(scenario())
+    assert response.status == denden_pb2.OK
+    assert response.ask_user_result.text == "agent-1||"
+    assert [r.status for r in batch] == [denden_pb2.OK, denden_pb2.OK]
+    assert events[-1].response.error.code == ERR_RESOURCE_EXHAUSTED  # streams are not retried
+    assert status.uptime_seconds >= 0
+    assert len(flaky.seen) == 2 + 4 + 1
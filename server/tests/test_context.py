@@ -0,0 +1,243 @@
+"""Tests for request deadlines and cancellation."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import threading
+import time
+
+import grpc
+import pytest
+
+from denden import context
+from denden.aio import AsyncDenDenServer, AsyncDendenServicer
+from denden.context import RequestCancelled, RequestContext, current_context
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import (
+    ERR_SUBAGENT_TIMEOUT,
+    VERSION,
+    DenDenServer,
+    DendenServicer,
+    ok_response,
+)
+
+
+def _ask(request_id: str = "req-1", question: str = "hi") -> denden_pb2.DenDenRequest:
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        ask_user=denden_pb2.AskUserPayload(question=question),
+    )
+
+
+def _ok(request) -> denden_pb2.DenDenResponse:
+    return ok_response(request.request_id, ask_user_result=denden_pb2.AskUserResult(text="ok"))
+
+
+class TestRequestContext:
+    def test_no_deadline_outside_requests(self):
+        ctx = current_context()
+        assert ctx.time_remaining() is None
+        assert not ctx.cancelled
+        assert ctx.child_env() == {}
+
+    def test_cancel_runs_callbacks_once(self):
+        ctx = RequestContext("r")
+        calls = []
+        ctx.add_callback(lambda: calls.append(1))
+        ctx.add_callback(lambda: 1 / 0)  # logged, later callbacks still run
+        ctx.add_callback(lambda: calls.append(2))
+        assert ctx.cancel()
+        assert not ctx.cancel(context.TIMEOUT)
+        assert ctx.reason == context.CANCELLED
+        assert calls == [1, 2]
+        ctx.add_callback(lambda: calls.append(3))  # already cancelled: runs now
+        assert calls == [1, 2, 3]
+        with pytest.raises(RequestCancelled):
+            ctx.check()
+
+    def test_closed_context_ignores_cancel(self):
+        ctx = RequestContext("r")
+        calls = []
+        ctx.add_callback(lambda: calls.append(1))
+        ctx.close()
+        assert not ctx.cancel()
+        assert not ctx.cancelled and calls == []
+
+    def test_server_timeout_fires_timer(self):
+        ctx = context.new_context("r", rpc_remaining=None, timeout=0.05)
+        assert ctx.deadline_reason == context.TIMEOUT
+        assert ctx.wait(2)
+        assert ctx.reason == context.TIMEOUT
+
+    def test_earlier_client_deadline_wins(self):
+        ctx = context.new_context("r", rpc_remaining=1.0, timeout=60)
+        assert ctx.deadline_reason == context.DEADLINE_EXCEEDED
+        assert 0 < ctx.time_remaining() <= 1.0
+        deadline_ms = int(ctx.child_env()["DENDEN_DEADLINE"])
+        assert 0 < deadline_ms - time.time() * 1000 <= 1000
+
+
+class TestSyncServicer:
+    def test_handler_sees_context(self):
+        seen = []
+        servicer = DendenServicer(timeouts={"ask_user": 30})
+
+        def handler(request):
+            ctx = current_context()
+            seen.append((ctx.request_id, ctx.time_remaining()))
+            return _ok(request)
+
+        servicer.set_handler("ask_user", handler)
+        assert servicer.Send(_ask(), None).status == denden_pb2.OK
+        assert seen[0][0] == "req-1" and 29 < seen[0][1] <= 30
+        assert current_context().request_id == ""  # reset after the request
+
+    def test_cooperative_handler_times_out(self):
+        servicer = DendenServicer(timeouts={"ask_user": 0.05})
+        stopped = threading.Event()
+
+        def handler(request):
+            ctx = current_context()
+            ctx.add_callback(stopped.set)
+            ctx.wait(5)
+            return _ok(request)
+
+        servicer.set_handler("ask_user", handler)
+        t0 = time.monotonic()
+        resp = servicer.Send(_ask(), None)
+        assert time.monotonic() - t0 < 2
+        assert stopped.is_set()
+        assert resp.error.code == ERR_SUBAGENT_TIMEOUT
+        assert resp.error.retryable
+        assert "0.05s" in resp.error.message
+
+    def test_check_raises_into_timeout_response(self):
+        servicer = DendenServicer(timeouts={"ask_user": 0.01})
+
+        def handler(request):
+            time.sleep(0.05)
+            current_context().check()
+            return _ok(request)
+
+        servicer.set_handler("ask_user", handler)
+        assert servicer.Send(_ask(), None).error.code == ERR_SUBAGENT_TIMEOUT
+
+    def test_other_payloads_unaffected(self):
+        servicer = DendenServicer(timeouts={"delegate": 0.01})
+        servicer.set_handler("ask_user", lambda r: (time.sleep(0.05), _ok(r))[1])
+        assert servicer.Send(_ask(), None).status == denden_pb2.OK
+
+    def test_stream_timeout_between_events(self):
+        servicer = DendenServicer(timeouts={"ask_user": 0.05})
+
+        def handler(request):
+            yield {"step": 1}
+            time.sleep(0.1)
+            yield {"step": 2}
+            return _ok(request)
+
+        servicer.set_handler("ask_user", handler)
+        events = list(servicer.SendStream(_ask(), None))
+        assert events[0].partial["step"] == 1
+        assert events[-1].response.error.code == ERR_SUBAGENT_TIMEOUT
+        assert len(events) == 2
+
+
+def test_client_disconnect_cancels_handler():
+    started, cancelled = threading.Event(), threading.Event()
+
+    def handler(request):
+        ctx = current_context()
+        ctx.add_callback(cancelled.set)
+        started.set()
+        ctx.wait(5)
+        return _ok(request)
+
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_ask_user(handler)
+    server.start()
+    try:
+        with grpc.insecure_channel(server.bound_addr) as channel:
+            stub = denden_pb2_grpc.DendenStub(channel)
+            with pytest.raises(grpc.RpcError) as err:
+                stub.Send(_ask(), timeout=0.3)
+            assert err.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+            assert cancelled.wait(2)
+
+            started.clear()
+            cancelled.clear()
+            future = stub.Send.future(_ask("req-2"))
+            assert started.wait(2)
+            future.cancel()
+            assert cancelled.wait(2)
+    finally:
+        server.stop(grace=0)
+
+
+class TestAsync:
+    def test_async_handler_is_cancelled_on_timeout(self):
+        servicer = AsyncDendenServicer(timeouts={"ask_user": 0.05})
+        cancelled = []
+
+        async def handler(request):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(current_context().request_id)
+                raise
+            return _ok(request)
+
+        servicer.set_handler("ask_user", handler)
+        resp = asyncio.run(servicer.Send(_ask(), None))
+        assert resp.error.code == ERR_SUBAGENT_TIMEOUT
+        assert cancelled == ["req-1"]
+
+    def test_sync_handler_in_executor_sees_context(self):
+        servicer = AsyncDendenServicer(timeouts={"ask_user": 30})
+
+        def handler(request):
+            ctx = current_context()
+            return ok_response(
+                request.request_id,
+                ask_user_result=denden_pb2.AskUserResult(text=ctx.request_id),
+            )
+
+        servicer.set_handler("ask_user", handler)
+        resp = asyncio.run(servicer.Send(_ask(), None))
+        assert resp.ask_user_result.text == "req-1"
+
+    def test_client_deadline_cancels_handler(self):
+        async def main():
+            cancelled = asyncio.Event()
+
+            async def handler(request):
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+                return _ok(request)
+
+            server = AsyncDenDenServer(addr="127.0.0.1:0")
+            server.on_ask_user(handler)
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(server.bound_addr) as channel:
+                    stub = denden_pb2_grpc.DendenStub(channel)
+                    with pytest.raises(grpc.aio.AioRpcError):
+                        await stub.Send(_ask(), timeout=0.2)
+                await asyncio.wait_for(cancelled.wait(), 2)
+            finally:
+                await server.stop(grace=0)
+
+        asyncio.run(main())
+
+
+def test_timeout_argument():
+    from denden.__main__ import _payload_timeout
+
+    assert _payload_timeout("delegate=600") == ("delegate", 600.0)
+    for bad in ("delegate", "delegate=0", "=5", "delegate=soon"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            _payload_timeout(bad)
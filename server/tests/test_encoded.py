@@ -0,0 +1,86 @@
+"""Tests for pre-encoded payloads."""
+from __future__ import annotations
+
+import grpc
+import pytest
+from google.protobuf import struct_pb2
+
+from denden.encoded import JSON, MSGPACK, LazyValue, decode, delegate_output, encode, task_extra
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import VERSION, DenDenServer, ok_response
+
+
+def test_encoded_field_is_decoded_once_on_access():
+    task = denden_pb2.Task(extra_encoded=encode({"rows": [1, 2]}))
+    assert task.extra_encoded.data == b'{"rows":[1,2]}'
+    extra = task_extra(task)
+    assert extra.data == b'{"rows":[1,2]}'  # the bytes as sent, not re-encoded
+    assert extra.value == {"rows": [1, 2]}
+    assert extra.value is extra.value
+
+
+def test_struct_fallback():
+    task = denden_pb2.Task()
+    task.extra.update({"n": 1, "name": "x"})
+    extra = task_extra(task)
+    assert extra.value == {"n": 1.0, "name": "x"}
+    assert decode(extra.data) == {"n": 1.0, "name": "x"}
+    assert task_extra(denden_pb2.Task()).value == {}
+    assert delegate_output(denden_pb2.DelegateResult()).value == {}
+
+
+def test_numbers_keep_their_precision():
+    big = {"id": 2**63 + 1, "ratio": 0.1}
+    struct = struct_pb2.Struct()
+    struct.update(big)
+    assert int(struct["id"]) != big["id"]  # a Struct rounds it to a double
+    result = denden_pb2.DelegateResult(output_encoded=encode(big))
+    assert delegate_output(result).value == big
+
+
+def test_content_types():
+    assert decode(b'{"a":"\xc3\xa9"}', "") == {"a": "é"}
+    assert LazyValue(b"[]", content_type="").content_type == JSON
+    with pytest.raises(ValueError):
+        encode({}, "text/csv")
+    with pytest.raises(ValueError):
+        decode(b"", "text/csv")
+
+
+def test_msgpack():
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        with pytest.raises(RuntimeError, match="denden-server\\[msgpack\\]"):
+            encode({"a": 1}, MSGPACK)
+        return
+    value = encode({"a": [1, b"\x00"]}, MSGPACK)
+    assert value.content_type == MSGPACK
+    assert decode(value.data, MSGPACK) == {"a": [1, b"\x00"]}
+
+
+def test_round_trip_over_grpc():
+    def delegate(request):
+        rows = task_extra(request.delegate.task).value["rows"]
+        result = denden_pb2.DelegateResult(
+            output_format=denden_pb2.JSON, output_encoded=encode({"sum": sum(rows)}),
+        )
+        return ok_response(request.request_id, delegate_result=result)
+
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_delegate(delegate)
+    server.start()
+    try:
+        request = denden_pb2.DenDenRequest(
+            denden_version=VERSION,
+            request_id="req-1",
+            delegate=denden_pb2.DelegatePayload(
+                task=denden_pb2.Task(extra_encoded=encode({"rows": [2**60, 1]})),
+            ),
+        )
+        with grpc.insecure_channel(server.bound_addr) as channel:
+            response = denden_pb2_grpc.DendenStub(channel).Send(request)
+        assert response.status == denden_pb2.OK
+        assert delegate_output(response.delegate_result).value == {"sum": 2**60 + 1}
+    finally:
+        server.stop(grace=0)
@@ -0,0 +1,205 @@
+"""Tests for submit/await/poll jobs: the job table and the Submit/Await/Poll RPCs."""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent import futures
+
+import grpc
+import pytest
+
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.jobs import JobTable
+from denden.server import VERSION, DenDenServer, DendenServicer, ok_response
+
+
+def _delegate_request(request_id: str = "req-1") -> denden_pb2.DenDenRequest:
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        delegate=denden_pb2.DelegatePayload(
+            delegate_to="implementer",
+            task=denden_pb2.Task(text="do the thing"),
+        ),
+    )
+
+
+def _done_future(request_id: str) -> futures.Future:
+    f: futures.Future = futures.Future()
+    f.set_result(ok_response(request_id))
+    return f
+
+
+class _GatedHandler:
+    """Delegate handler that blocks until released and counts its calls."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        self.release.wait(5)
+        return ok_response(
+            request.request_id,
+            delegate_result=denden_pb2.DelegateResult(summary=request.delegate.task.text),
+        )
+
+
+# ---------------------------------------------------------------------------
+# JobTable unit tests
+# ---------------------------------------------------------------------------
+
+class TestJobTable:
+    def test_collect_removes_finished_job(self):
+        table = JobTable()
+        job = table.submit("req-1", lambda: _done_future("req-1"))
+        status = table.collect(job.job_id)
+        assert status.state == denden_pb2.DONE
+        assert status.response.request_id == "req-1"
+        assert table.collect(job.job_id).state == denden_pb2.NOT_FOUND
+        assert len(table) == 0
+
+    def test_pending_job_not_collected(self):
+        table = JobTable()
+        pending: futures.Future = futures.Future()
+        job = table.submit("req-1", lambda: pending)
+        assert table.collect(job.job_id).state == denden_pb2.PENDING
+        pending.set_running_or_notify_cancel()
+        assert table.collect(job.job_id).state == denden_pb2.RUNNING
+        pending.set_result(ok_response("req-1"))
+        assert table.collect(job.job_id).state == denden_pb2.DONE
+
+    def test_duplicate_request_id_reuses_job(self):
+        table = JobTable()
+        starts = []
+
+        def start():
+            starts.append(1)
+            return futures.Future()
+
+        first = table.submit("req-1", start)
+        second = table.submit("req-1", start)
+        assert first is second
+        assert len(starts) == 1
+
+    def test_unknown_job(self):
+        assert JobTable().collect("job_missing").state == denden_pb2.NOT_FOUND
+
+    def test_wait_times_out(self):
+        table = JobTable()
+        job = table.submit("req-1", futures.Future)
+        t0 = time.monotonic()
+        status = table.wait(job.job_id, timeout=0.05)
+        assert status.state == denden_pb2.PENDING
+        assert time.monotonic() - t0 < 1
+
+    def test_results_expire(self):
+        table = JobTable(result_ttl=0.01)
+        job = table.submit("req-1", lambda: _done_future("req-1"))
+        time.sleep(0.02)
+        assert table.get(job.job_id) is None
+
+    def test_max_results_drops_oldest(self):
+        table = JobTable(max_results=2)
+        jobs = [
+            table.submit(f"req-{i}", lambda i=i: _done_future(f"req-{i}"))
+            for i in range(3)
+        ]
+        assert table.get(jobs[0].job_id) is None
+        assert table.get(jobs[2].job_id) is not None
+
+    def test_cancelled_job_reports_not_found(self):
+        table = JobTable()
+        pending: futures.Future = futures.Future()
+        job = table.submit("req-1", lambda: pending)
+        pending.cancel()
+        assert table.collect(job.job_id).state == denden_pb2.NOT_FOUND
+
+
+# ---------------------------------------------------------------------------
+# Servicer tests
+# ---------------------------------------------------------------------------
+
+class TestServicerJobs:
+    def setup_method(self):
+        self.servicer = DendenServicer()
+        self.handler = _GatedHandler()
+        self.servicer.set_handler("delegate", self.handler)
+
+    def teardown_method(self):
+        self.handler.release.set()
+        self.servicer.close()
+
+    def test_submit_returns_before_handler_finishes(self):
+        handle = self.servicer.Submit(_delegate_request(), None)
+        assert handle.job_id.startswith("job_")
+        assert handle.request_id == "req-1"
+        assert handle.state in (denden_pb2.PENDING, denden_pb2.RUNNING)
+
+        poll = self.servicer.Poll(denden_pb2.PollRequest(job_id=handle.job_id), None)
+        assert poll.state != denden_pb2.DONE
+
+        self.handler.release.set()
+        status = self.servicer.Await(denden_pb2.AwaitRequest(job_id=handle.job_id), None)
+        assert status.state == denden_pb2.DONE
+        assert status.response.delegate_result.summary == "do the thing"
+
+    def test_await_timeout(self):
+        handle = self.servicer.Submit(_delegate_request(), None)
+        status = self.servicer.Await(
+            denden_pb2.AwaitRequest(job_id=handle.job_id, timeout_ms=20), None
+        )
+        assert status.state == denden_pb2.RUNNING
+        assert not status.HasField("response")
+
+    def test_resubmit_same_request_runs_once(self):
+        first = self.servicer.Submit(_delegate_request(), None)
+        second = self.servicer.Submit(_delegate_request(), None)
+        assert first.job_id == second.job_id
+        self.handler.release.set()
+        self.servicer.Await(denden_pb2.AwaitRequest(job_id=first.job_id), None)
+        assert self.handler.calls == 1
+
+    def test_invalid_request_finishes_with_error(self):
+        handle = self.servicer.Submit(denden_pb2.DenDenRequest(request_id="req-x"), None)
+        status = self.servicer.Await(denden_pb2.AwaitRequest(job_id=handle.job_id), None)
+        assert status.state == denden_pb2.DONE
+        assert status.response.status == denden_pb2.ERROR
+        assert "payload" in status.response.error.message
+
+
+# ---------------------------------------------------------------------------
+# gRPC integration
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def job_server():
+    handler = _GatedHandler()
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_delegate(handler)
+    server.start()
+    channel = grpc.insecure_channel(server.bound_addr)
+    yield denden_pb2_grpc.DendenStub(channel), handler
+    handler.release.set()
+    channel.close()
+    server.stop(grace=0)
+
+
+class TestGRPCJobs:
+    def test_reconnect_and_collect(self, job_server):
+        stub, handler = job_server
+        handle = stub.Submit(_delegate_request())
+
+        # The first waiter gives up when its deadline expires...
+        status = stub.Await(denden_pb2.AwaitRequest(job_id=handle.job_id), timeout=0.3)
+        assert status.state == denden_pb2.RUNNING
+
+        # ...and a later caller picks up the finished result.
+        handler.release.set()
+        status = stub.Await(denden_pb2.AwaitRequest(job_id=handle.job_id), timeout=5)
+        assert status.state == denden_pb2.DONE
+        assert status.response.delegate_result.summary == "do the thing"
+
+        status = stub.Poll(denden_pb2.PollRequest(job_id=handle.job_id))
+        assert status.state == denden_pb2.NOT_FOUND
@@ -0,0 +1,181 @@
+"""Tests for the request/response journal."""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+import grpc
+
+from denden import journal
+from denden.aio import AsyncDenDenServer
+from denden.cache import ResponseCache
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.journal import REQUEST, RESPONSE, Journal
+from denden.server import VERSION, DenDenServer, ok_response
+
+
+def _request(request_id: str, run_id: str = "run-1"):
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        trace=denden_pb2.Trace(run_id=run_id, agent_instance_id="agent-1"),
+        ask_user=denden_pb2.AskUserPayload(question="ok?"),
+    )
+
+
+def _response(request_id: str):
+    return ok_response(request_id, ask_user_result=denden_pb2.AskUserResult(text="yes"))
+
+
+def test_roundtrip_in_order(tmp_path):
+    j = Journal(str(tmp_path))
+    j.append_request(_request("a"))
+    j.append_response(_response("a"))
+    j.append_request(_request("b"))
+    j.close()
+
+    records = list(journal.read(str(tmp_path)))
+    assert [(r.kind, r.message.request_id) for r in records] == [
+        (REQUEST, "a"), (RESPONSE, "a"), (REQUEST, "b"),
+    ]
+    assert records[1].message == _response("a")
+    assert records[0].time_ns <= records[2].time_ns
+
+
+def test_abandoned_read_releases_the_segment(tmp_path, monkeypatch):
+    unraisable = []
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+    j = Journal(str(tmp_path))
+    for request_id in "abc":
+        j.append_request(_request(request_id))
+    j.close()
+
+    records = journal.read(str(tmp_path))
+    assert next(records).message.request_id == "a"
+    records.close()
+    assert [u.exc_value for u in unraisable] == []
+
+
+def test_group_commit_without_close(tmp_path):
+    j = Journal(str(tmp_path), commit_interval=0.01)
+    j.append_request(_request("a"))
+    deadline = time.monotonic() + 2
+    while not list(journal.read(str(tmp_path))) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [r.message.request_id for r in journal.read(str(tmp_path))] == ["a"]
+    j.close()
+    j.close()  # idempotent
+
+
+def test_segments_roll_over_and_reopen(tmp_path):
+    j = Journal(str(tmp_path), segment_bytes=200)
+    for i in range(5):
+        j.append_request(_request(f"r{i}"))
+        j.flush()
+    j.close()
+    first = sorted(os.listdir(tmp_path))
+    assert len(first) > 1
+
+    # A restart always starts a fresh segment after the existing ones.
+    j = Journal(str(tmp_path))
+    j.append_request(_request("r5"))
+    j.close()
+    assert sorted(os.listdir(tmp_path))[:-1] == first
+    assert [r.message.request_id for r in journal.read(str(tmp_path))] == [
+        f"r{i}" for i in range(6)
+    ]
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    j = Journal(str(tmp_path))
+    j.append_request(_request("a"))
+    j.append_request(_request("b"))
+    j.close()
+    (path,) = tmp_path.iterdir()
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    assert [r.message.request_id for r in journal.read(str(tmp_path))] == ["a"]
+
+
+def test_corrupt_record_stops_the_segment(tmp_path):
+    j = Journal(str(tmp_path))
+    j.append_request(_request("a"))
+    j.append_request(_request("b"))
+    j.close()
+    (path,) = tmp_path.iterdir()
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert [r.message.request_id for r in journal.read(str(tmp_path))] == ["a"]
+
+
+def test_filter_by_run_and_recover(tmp_path):
+    j = Journal(str(tmp_path))
+    j.append_request(_request("a", run_id="run-1"))
+    j.append_request(_request("b", run_id="run-2"))
+    j.append_request(_request("c", run_id="run-1"))
+    j.append_response(_response("b"))
+    j.append_response(_response("a"))
+    j.close()
+
+    records = list(journal.read(str(tmp_path), run_id="run-1"))
+    assert [(r.kind, r.message.request_id) for r in records] == [
+        (REQUEST, "a"), (REQUEST, "c"), (RESPONSE, "a"),
+    ]
+
+    state = journal.recover(str(tmp_path))
+    assert sorted(state.responses) == ["a", "b"]
+    assert sorted(state.in_flight) == ["c"]
+    state = journal.recover(str(tmp_path), run_id="run-2")
+    assert list(state.responses) == ["b"] and not state.in_flight
+
+
+def test_missing_directory_reads_empty(tmp_path):
+    assert list(journal.read(str(tmp_path / "nope"))) == []
+
+
+def test_recovered_responses_warm_response_cache(tmp_path):
+    j = Journal(str(tmp_path))
+    j.append_request(_request("a"))
+    j.append_response(_response("a"))
+    j.close()
+
+    cache = ResponseCache()
+    assert cache.preload(journal.recover(str(tmp_path)).responses) == 1
+    calls = []
+    assert cache.get_or_run("a", lambda: calls.append(1)) == _response("a")
+    assert not calls
+
+
+def _ask(request, context=None):
+    return _response(request.request_id)
+
+
+def test_server_journals_send_and_stream(tmp_path):
+    server = DenDenServer(addr="127.0.0.1:0", journal=Journal(str(tmp_path)))
+    server.on_ask_user(_ask)
+    server.start()
+    with grpc.insecure_channel(server.bound_addr) as channel:
+        stub = denden_pb2_grpc.DendenStub(channel)
+        stub.Send(_request("a"))
+        list(stub.SendStream(_request("b")))
+    server.stop(grace=1)
+
+    state = journal.recover(str(tmp_path))
+    assert sorted(state.responses) == ["a", "b"]
+    assert not state.in_flight
+
+
+def test_async_server_journals_send(tmp_path):
+    async def main():
+        server = AsyncDenDenServer(addr="127.0.0.1:0", journal=Journal(str(tmp_path)))
+        server.on_ask_user(_ask)
+        await server.start()
+        async with grpc.aio.insecure_channel(server.bound_addr) as channel:
+            await denden_pb2_grpc.DendenStub(channel).Send(_request("a"))
+        await server.stop(grace=0)
+
+    asyncio.run(main())
+    assert list(journal.recover(str(tmp_path)).responses) == ["a"]
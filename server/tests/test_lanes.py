@@ -0,0 +1,283 @@
+"""Tests for priority lanes."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import threading
+import time
+
+import pytest
+
+from denden.aio import AsyncDendenServicer
+from denden.context import RequestCancelled, RequestContext
+from denden.gen import denden_pb2
+from denden.lanes import Lane, LaneFull, Lanes
+from denden.modules import loader
+from denden.modules.base import Module
+from denden.server import (
+    ERR_RESOURCE_EXHAUSTED,
+    ERR_SUBAGENT_TIMEOUT,
+    VERSION,
+    DenDenServer,
+    DendenServicer,
+    ok_response,
+)
+
+
+def _request(payload: str, request_id: str = "req-1") -> denden_pb2.DenDenRequest:
+    payloads = {
+        "ask_user": {"ask_user": denden_pb2.AskUserPayload(question="ok?")},
+        "delegate": {"delegate": denden_pb2.DelegatePayload(
+            delegate_to="worker", task=denden_pb2.Task(text="work"),
+        )},
+        "remember": {"remember": denden_pb2.RememberPayload(content="fact")},
+    }
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION, request_id=request_id, **payloads[payload],
+    )
+
+
+def _ok(request) -> denden_pb2.DenDenResponse:
+    return ok_response(request.request_id)
+
+
+def _blocking(release: threading.Event, started: threading.Semaphore):
+    def handler(request):
+        started.release()
+        release.wait(5)
+        return _ok(request)
+    return handler
+
+
+class TestLane:
+    def test_admits_in_arrival_order(self):
+        lane = Lane("l", concurrency=1)
+        ctx = RequestContext()
+        lane.enter(ctx)
+        order = []
+
+        def wait(n):
+            lane.enter(ctx)
+            order.append(n)
+            lane.leave()
+
+        threads = []
+        for n in range(3):
+            threads.append(threading.Thread(target=wait, args=(n,)))
+            threads[-1].start()
+            while lane.queued <= n:
+                time.sleep(0.001)
+        assert lane.running == 1
+        lane.leave()
+        for t in threads:
+            t.join(2)
+        assert order == [0, 1, 2]
+        assert (lane.running, lane.queued) == (0, 0)
+
+    def test_full_queue_rejects(self):
+        lane = Lane("l", concurrency=1, max_queued=0)
+        lane.enter(RequestContext())
+        with pytest.raises(LaneFull, match="lane 'l' is full"):
+            lane.enter(RequestContext())
+        stats = lane.stats()
+        assert (stats.running, stats.queued, stats.rejected) == (1, 0, 1)
+
+    def test_cancelled_waiter_gives_up_its_place(self):
+        lane = Lane("l", concurrency=1)
+        lane.enter(RequestContext())
+        ctx = RequestContext()
+        errors = []
+
+        def wait():
+            try:
+                lane.enter(ctx)
+            except RequestCancelled as e:
+                errors.append(e.reason)
+
+        t = threading.Thread(target=wait)
+        t.start()
+        while not lane.queued:
+            time.sleep(0.001)
+        ctx.cancel()
+        t.join(2)
+        assert errors == ["CANCELLED"]
+        assert lane.queued == 0
+        lane.leave()
+        assert lane.running == 0
+
+    def test_routes(self):
+        lanes = Lanes([Lane("delegate", 2), Lane("memory", 4)])
+        lanes.route("remember", "memory")
+        assert lanes.get("delegate").name == "delegate"
+        assert lanes.get("remember").name == "memory"
+        assert lanes.get("ask_user") is None
+        with pytest.raises(ValueError):
+            lanes.route("recall", "nope")
+        with pytest.raises(ValueError):
+            Lanes([Lane("a", 1), Lane("a", 1)])
+
+
+class TestSyncServicer:
+    def test_slow_lane_does_not_block_others(self):
+        release, started = threading.Event(), threading.Semaphore(0)
+        servicer = DendenServicer(lanes=[Lane("delegate", 1, max_queued=0)])
+        servicer.set_handler("delegate", _blocking(release, started))
+        servicer.set_handler("ask_user", _ok)
+        first = threading.Thread(target=servicer.Send, args=(_request("delegate", "d1"), None))
+        first.start()
+        try:
+            assert started.acquire(timeout=2)
+            refused = servicer.Send(_request("delegate", "d2"), None)
+            assert refused.error.code == ERR_RESOURCE_EXHAUSTED
+            assert refused.error.retryable
+            assert servicer.Send(_request("ask_user"), None).status == denden_pb2.OK
+        finally:
+            release.set()
+            first.join(2)
+        (lane,) = servicer.metrics.status().lanes
+        assert (lane.name, lane.running, lane.rejected) == ("delegate", 0, 1)
+
+    def test_queued_request_times_out(self):
+        release, started = threading.Event(), threading.Semaphore(0)
+        servicer = DendenServicer(
+            lanes=[Lane("memory", 1)], timeouts={"remember": 0.1},
+        )
+        servicer.route("remember", "memory")
+        servicer.set_handler("remember", _blocking(release, started))
+        first = threading.Thread(target=servicer.Send, args=(_request("remember", "r1"), None))
+        first.start()
+        try:
+            assert started.acquire(timeout=2)
+            resp = servicer.Send(_request("remember", "r2"), None)
+            assert resp.error.code == ERR_SUBAGENT_TIMEOUT
+        finally:
+            release.set()
+            first.join(2)
+
+    def test_stream_holds_its_slot(self):
+        lane = Lane("ask_user", 1, max_queued=0)
+        servicer = DendenServicer(lanes=[lane])
+
+        def handler(request):
+            yield {"step": 1}
+            return _ok(request)
+
+        servicer.set_handler("ask_user", handler)
+        events = servicer.SendStream(_request("ask_user"), None)
+        next(events)
+        assert lane.running == 1
+        refused = list(servicer.SendStream(_request("ask_user", "req-2"), None))
+        assert refused[-1].response.error.code == ERR_RESOURCE_EXHAUSTED
+        assert list(events)[-1].response.status == denden_pb2.OK
+        assert lane.running == 0
+
+    def test_prometheus_exports_lanes(self):
+        servicer = DendenServicer(lanes=[Lane("delegate", 3, max_queued=5)])
+        text = servicer.metrics.prometheus()
+        assert 'denden_lane_running{lane="delegate"} 0' in text
+        assert 'denden_lane_queued{lane="delegate"} 0' in text
+        assert 'denden_lane_rejected_total{lane="delegate"} 0' in text
+
+
+class TestAsync:
+    def test_async_lane_bounds_concurrency(self):
+        lane = Lane("delegate", 2)
+        servicer = AsyncDendenServicer(lanes=[lane])
+        peak = 0
+
+        async def handler(request):
+            nonlocal peak
+            peak = max(peak, lane.running)
+            await asyncio.sleep(0.01)
+            return _ok(request)
+
+        servicer.set_handler("delegate", handler)
+
+        async def main():
+            return await asyncio.gather(*(
+                servicer.Send(_request("delegate", f"d{i}"), None) for i in range(6)
+            ))
+
+        responses = asyncio.run(main())
+        assert all(r.status == denden_pb2.OK for r in responses)
+        assert peak == 2
+        assert (lane.running, lane.queued) == (0, 0)
+
+    def test_async_full_queue_rejects(self):
+        servicer = AsyncDendenServicer(lanes=[Lane("delegate", 1, max_queued=1)])
+
+        async def handler(request):
+            await asyncio.sleep(0.05 if request.request_id == "d1" else 0)
+            return _ok(request)
+
+        servicer.set_handler("delegate", handler)
+
+        async def main():
+            return await asyncio.gather(*(
+                servicer.Send(_request("delegate", f"d{i}"), None) for i in range(1, 4)
+            ))
+
+        first, second, third = asyncio.run(main())
+        assert first.status == second.status == denden_pb2.OK
+        assert third.error.code == ERR_RESOURCE_EXHAUSTED
+
+    def test_async_queued_stream_times_out(self):
+        lane = Lane("memory", 1)
+        servicer = AsyncDendenServicer(lanes=[lane], timeouts={"remember": 0.1})
+        servicer.route("ask_user", "memory")
+        servicer.route("remember", "memory")
+
+        async def slow(request):
+            await asyncio.sleep(0.5)
+            return _ok(request)
+
+        servicer.set_handler("ask_user", slow)
+        servicer.set_handler("remember", _ok)
+
+        async def queued():
+            await asyncio.sleep(0.01)
+            start = time.monotonic()
+            events = [e async for e in servicer.SendStream(_request("remember", "r2"), None)]
+            return events, time.monotonic() - start
+
+        async def main():
+            return await asyncio.gather(servicer.Send(_request("ask_user", "r1"), None), queued())
+
+        first, (events, elapsed) = asyncio.run(main())
+        assert first.status == denden_pb2.OK
+        assert events[-1].response.error.code == ERR_SUBAGENT_TIMEOUT
+        assert elapsed < 0.4  # at its own deadline, not when the slot frees
+        assert (lane.running, lane.queued) == (0, 0)
+
+
+class _MemoryModule(Module):
+    def name(self) -> str:
+        return "memory"
+
+    def methods(self):
+        return {"remember": _ok, "recall": _ok}
+
+    def lanes(self):
+        return {"remember": "memory", "recall": "search"}
+
+
+def test_module_routes_to_configured_lanes(caplog):
+    server = DenDenServer(addr="127.0.0.1:0", lanes=[Lane("memory", 4)])
+    loader.register(server, _MemoryModule())
+    lanes = server._servicer.lanes
+    assert lanes.get("remember").name == "memory"
+    assert lanes.get("recall") is None
+    assert "no lane 'search' configured" in caplog.text
+
+
+def test_lane_arguments():
+    from denden.__main__ import _lane, _route
+
+    assert _lane("delegate=8:32") == ("delegate", 8, 32)
+    assert _lane("ask_user=64") == ("ask_user", 64, None)
+    assert _route("recall=memory") == ("recall", "memory")
+    for bad in ("delegate", "delegate=0", "delegate=x", "delegate=2:-1", "=3"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            _lane(bad)
+    with pytest.raises(argparse.ArgumentTypeError):
+        _route("recall")
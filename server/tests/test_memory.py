@@ -0,0 +1,173 @@
+"""Tests for the built-in memory module."""
+from __future__ import annotations
+
+import pytest
+
+from denden.gen import denden_pb2
+from denden.modules import memory
+from denden.modules.memory import MemoryModule, MemoryStore, entry_id
+from denden.server import VERSION, DendenServicer
+
+
+def _remember(content: str, keywords=(), scope: str = "", request_id: str = "req-1"):
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        remember=denden_pb2.RememberPayload(content=content, keywords=keywords, scope=scope),
+    )
+
+
+class TestMemoryStore:
+    def test_add_and_duplicate(self):
+        store = MemoryStore()
+        entry, created = store.add("use ruff", ["Lint", "python"])
+        assert created
+        assert entry.scope == "global"
+        assert entry.keywords == ("lint", "python")
+        again, created = store.add("use ruff", ["other"])
+        assert not created
+        assert again is entry
+        assert len(store) == 1
+
+    def test_stable_ids_per_scope(self):
+        store = MemoryStore()
+        project, _ = store.add("fact", scope="project")
+        role, _ = store.add("fact", scope="role")
+        assert project.entry_id != role.entry_id
+        assert project.entry_id == entry_id("project", "fact")
+        assert MemoryStore().add("fact", scope="project")[0].entry_id == project.entry_id
+
+    def test_find_intersects_keywords(self):
+        store = MemoryStore()
+        a, _ = store.add("a", ["db", "postgres"])
+        b, _ = store.add("b", ["db"])
+        store.add("c", ["db"], scope="project")
+        assert store.find(["DB"]) == [a, b]
+        assert store.find(["db", "postgres"]) == [a]
+        assert store.find(["mysql"]) == []
+        assert store.find([]) == []
+
+    def test_remove(self):
+        store = MemoryStore()
+        entry, _ = store.add("a", ["db"])
+        assert store.remove(entry.entry_id)
+        assert not store.remove(entry.entry_id)
+        assert store.find(["db"]) == []
+        assert store.get(entry.entry_id) is None
+
+    def test_unknown_scope(self):
+        with pytest.raises(ValueError, match="unknown scope"):
+            MemoryStore().add("a", scope="team")
+
+
+class TestMemoryModule:
+    def test_remember_through_servicer(self):
+        module = memory.create_module()
+        servicer = DendenServicer()
+        for name, handler in module.methods().items():
+            servicer.set_handler(name, handler)
+
+        first = servicer.Send(_remember("use ruff", ["lint"], "project"), None)
+        second = servicer.Send(_remember("use ruff", request_id="req-2", scope="project"), None)
+        servicer.close()
+        assert first.status == denden_pb2.OK
+        assert first.remember_result.status == "accepted"
+        assert second.remember_result.status == "duplicate"
+        assert second.remember_result.entry_id == first.remember_result.entry_id
+
+    def test_invalid_requests(self):
+        module = MemoryModule()
+        empty = module.remember(_remember(""))
+        assert empty.status == denden_pb2.ERROR
+        assert empty.error.code == "INVALID_REQUEST"
+        bad_scope = module.remember(_remember("x", scope="team"))
+        assert bad_scope.error.code == "INVALID_REQUEST"
+        assert "unknown scope" in bad_scope.error.message
+
+
+def _recall(query: str = "", keywords=(), scopes=(), top_k: int = 0):
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id="recall-1",
+        recall=denden_pb2.RecallPayload(query=query, keywords=keywords, scopes=scopes, top_k=top_k),
+    )
+
+
+class TestRecall:
+    def _module(self):
+        module = MemoryModule()
+        store = module.store
+        store.add("Postgres runs on port 5432 in dev", ["db"], "project")
+        store.add("Use the postgres connection pool for tests", ["db", "tests"], "global")
+        store.add("Redis is only used for caching", ["cache"], "global")
+        return module
+
+    def test_ranked_query(self):
+        response = self._module().recall(_recall("postgres port"))
+        assert response.status == denden_pb2.OK
+        entries = response.recall_result.entries
+        assert [e.content for e in entries] == [
+            "Postgres runs on port 5432 in dev",
+            "Use the postgres connection pool for tests",
+        ]
+        assert entries[0].score > entries[1].score
+        assert entries[0].scope == "project"
+        assert list(entries[0].keywords) == ["db"]
+
+    def test_scope_keyword_and_top_k(self):
+        module = self._module()
+        only_global = module.recall(_recall("postgres", scopes=["global"]))
+        assert [e.scope for e in only_global.recall_result.entries] == ["global"]
+        tagged = module.recall(_recall("postgres", keywords=["tests"]))
+        assert len(tagged.recall_result.entries) == 1
+        assert len(module.recall(_recall("postgres", top_k=1)).recall_result.entries) == 1
+
+    def test_keywords_without_query(self):
+        module = self._module()
+        for offset, entry in enumerate(module.store.find(["db"], "global")):
+            entry.created_at += 1 + offset
+        entries = module.recall(_recall(keywords=["db"])).recall_result.entries
+        assert [e.score for e in entries] == [0.0, 0.0]
+        assert entries[0].content.startswith("Use the postgres")  # newest first
+
+    def test_recall_sees_new_and_removed_entries(self):
+        module = self._module()
+        entry, _ = module.store.add("kafka topic naming", ["queue"])
+        assert module.recall(_recall("kafka")).recall_result.entries[0].entry_id == entry.entry_id
+        module.store.remove(entry.entry_id)
+        assert not module.recall(_recall("kafka")).recall_result.entries
+
+    def test_invalid(self):
+        module = self._module()
+        assert module.recall(_recall()).error.code == "INVALID_REQUEST"
+        assert module.recall(_recall("x", scopes=["team"])).error.code == "INVALID_REQUEST"
+        assert module.recall(_recall("the")).recall_result.entries == []
+
+
+class TestNearDuplicates:
+    def test_reworded_entry_is_duplicate(self):
+        store = MemoryStore(near_duplicates=0.6)
+        entry, _ = store.add("The staging database runs postgres 15 on port 5432", scope="project")
+        again, created = store.add("staging database runs Postgres 15 on port 5433", scope="project")
+        assert not created
+        assert again is entry
+        _, created = store.add("staging database runs Postgres 15 on port 5433", scope="role")
+        assert created
+
+    def test_removed_entry_no_longer_matches(self):
+        store = MemoryStore(near_duplicates=0.6)
+        entry, _ = store.add("staging database runs postgres 15 on port 5432")
+        store.remove(entry.entry_id)
+        assert store.add("staging database runs postgres 15 on port 5433")[1]
+
+    def test_off_by_default(self):
+        store = MemoryStore()
+        store.add("staging database runs postgres 15 on port 5432")
+        assert store.add("staging database runs postgres 15 on port 5433")[1]
+
+    def test_create_module_reads_env(self, monkeypatch):
+        monkeypatch.setenv("DENDEN_MEMORY_NEAR_DUPLICATES", "0.6")
+        module = memory.create_module()
+        module.store.add("staging database runs postgres 15 on port 5432")
+        response = module.remember(_remember("staging database runs postgres 15 on port 5433"))
+        assert response.remember_result.status == "duplicate"
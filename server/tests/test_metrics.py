@@ -0,0 +1,199 @@
+"""Tests for server metrics: histogram, counters, Status and Prometheus export."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import urllib.request
+
+import grpc
+
+from denden.aio import AsyncDendenServicer
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.metrics import (
+    Histogram,
+    ServerMetrics,
+    _bucket_index,
+    _bucket_upper,
+    start_http_server,
+)
+from denden.server import (
+    DENY_ROLE_NOT_ALLOWED,
+    VERSION,
+    DenDenServer,
+    DendenServicer,
+    denied_response,
+    ok_response,
+)
+from denden.stream import progress
+
+
+def _request(request_id: str = "req-1", agent: str = "agent-1", payload: str = "delegate"):
+    req = denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        trace=denden_pb2.Trace(run_id="run-1", agent_instance_id=agent),
+    )
+    if payload == "delegate":
+        req.delegate.delegate_to = "implementer"
+    elif payload == "ask_user":
+        req.ask_user.question = "?"
+    return req
+
+
+class TestHistogram:
+    def test_bucket_bounds_cover_values(self):
+        for value in list(range(2000)) + [10**6, 10**9]:
+            index = _bucket_index(value)
+            assert value <= _bucket_upper(index)
+            assert index == 0 or _bucket_upper(index - 1) < value
+
+    def test_relative_error(self):
+        for value in (100, 1_000, 123_456, 10**8):
+            upper = _bucket_upper(_bucket_index(value))
+            assert (upper - value) / value <= 0.125
+
+    def test_quantiles(self):
+        h = Histogram()
+        for v in range(1, 101):
+            h.record(v * 1000)
+        assert 45_000 <= h.quantile(0.5) <= 57_000
+        assert 90_000 <= h.quantile(0.99) <= 100_000
+        assert h.quantile(1.0) == 100_000
+        assert Histogram().quantile(0.5) == 0
+
+    def test_cumulative(self):
+        h = Histogram()
+        for v in (10, 500, 5_000_000):
+            h.record(v)
+        assert h.cumulative((0.0001, 0.001, 1.0, 10.0), 1e6) == [1, 2, 2, 3]
+
+
+class TestServerMetrics:
+    def test_counts_by_status_and_code(self):
+        def handler(request):
+            if request.request_id == "deny":
+                return denied_response(request.request_id, DENY_ROLE_NOT_ALLOWED, "no")
+            return ok_response(request.request_id)
+
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", handler)
+        servicer.Send(_request("ok-1"), None)
+        servicer.Send(_request("ok-2"), None)
+        servicer.Send(_request("deny"), None)
+        servicer.Send(_request("bad", payload="none"), None)
+
+        status = servicer.Status(denden_pb2.StatusRequest(), None)
+        by_type = {p.payload_type: p for p in status.payloads}
+        assert by_type["delegate"].ok == 2
+        assert by_type["delegate"].denied == 1
+        assert [(e.code, e.count) for e in by_type["delegate"].errors] == [
+            (DENY_ROLE_NOT_ALLOWED, 1)
+        ]
+        assert by_type["none"].error == 1
+        assert status.in_flight == 0
+        assert by_type["delegate"].max_ms >= by_type["delegate"].p50_ms
+
+    def test_in_flight_and_active_agents(self):
+        gate = threading.Event()
+        entered = threading.Event()
+
+        def handler(request):
+            entered.set()
+            gate.wait(5)
+            return ok_response(request.request_id)
+
+        servicer = DendenServicer()
+        servicer.set_handler("ask_user", handler)
+        t = threading.Thread(
+            target=servicer.Send, args=(_request(agent="agent-2", payload="ask_user"), None),
+        )
+        t.start()
+        entered.wait(5)
+        try:
+            status = servicer.Status(denden_pb2.StatusRequest(), None)
+            assert status.in_flight == 1
+            assert status.active_agents == 1
+        finally:
+            gate.set()
+            t.join()
+        assert servicer.Status(denden_pb2.StatusRequest(), None).in_flight == 0
+        servicer.close()
+
+    def test_active_window_expires(self):
+        metrics = ServerMetrics(active_window=0)
+        metrics.finish(metrics.begin(_request()), ok_response("req-1"))
+        assert metrics.active_agents() == 0
+
+    def test_expired_agents_pruned_without_status_calls(self):
+        metrics = ServerMetrics(active_window=0.05)
+        for i in range(100):
+            metrics.finish(metrics.begin(_request(agent=f"agent-{i}")), ok_response("req-1"))
+        time.sleep(0.1)
+        metrics.finish(metrics.begin(_request(agent="late")), ok_response("req-1"))
+        assert list(metrics._agents) == ["late"]
+
+    def test_stream_and_cancel_recorded(self):
+        def handler(request):
+            yield progress("working")
+            return ok_response(request.request_id)
+
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", handler)
+        list(servicer.SendStream(_request("req-1"), None))
+        it = servicer.SendStream(_request("req-2"), None)
+        next(it)
+        it.close()
+
+        stats = servicer.metrics.status().payloads[0]
+        assert stats.ok == 1
+        assert [(e.code, e.count) for e in stats.errors] == [("CANCELLED", 1)]
+
+    def test_async_servicer(self):
+        async def handler(request):
+            return ok_response(request.request_id)
+
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("delegate", handler)
+        status = asyncio.run(self._send_then_status(servicer))
+        assert status.payloads[0].ok == 1
+
+    @staticmethod
+    async def _send_then_status(servicer):
+        await servicer.Send(_request(), None)
+        return await servicer.Status(denden_pb2.StatusRequest(), None)
+
+    def test_prometheus_text(self):
+        metrics = ServerMetrics()
+        metrics.finish(metrics.begin(_request()), ok_response("req-1"))
+        text = metrics.prometheus()
+        assert '# TYPE denden_requests_total counter' in text
+        assert 'denden_requests_total{payload="delegate",status="OK",code=""} 1' in text
+        assert 'denden_request_duration_seconds_bucket{payload="delegate",le="+Inf"} 1' in text
+        assert 'denden_request_duration_seconds_count{payload="delegate"} 1' in text
+        assert 'denden_in_flight_requests{payload="delegate"} 0' in text
+        assert "denden_active_agents 1" in text
+
+
+def test_status_and_http_endpoint():
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_delegate(lambda r: ok_response(r.request_id))
+    server.start()
+    httpd = start_http_server(server.metrics, "127.0.0.1:0")
+    try:
+        with grpc.insecure_channel(server.bound_addr) as channel:
+            stub = denden_pb2_grpc.DendenStub(channel)
+            stub.Send(_request(), timeout=5)
+            status = stub.Status(denden_pb2.StatusRequest(), timeout=5)
+        host, port = httpd.server_address[:2]
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as resp:
+            body = resp.read().decode()
+            content_type = resp.headers["Content-Type"]
+    finally:
+        httpd.shutdown()
+        server.stop(grace=0)
+    assert status.active_agents == 1
+    assert status.payloads[0].payload_type == "delegate"
+    assert content_type.startswith("text/plain")
+    assert 'denden_requests_total{payload="delegate",status="OK",code=""} 1' in body
+    assert 'denden_executor_queue_depth{executor="grpc"} 0' in body
@@ -0,0 +1,50 @@
+"""Tests for MinHash signatures and the LSH near-duplicate index."""
+from __future__ import annotations
+
+import pytest
+
+from denden.modules.bm25 import tokenize
+from denden.modules.minhash import MinHashIndex, _rows_per_band, signature, similarity
+
+
+def _sig(text: str):
+    return signature(tokenize(text))
+
+
+def test_signature_is_stable_and_order_free():
+    assert _sig("alpha beta gamma") == _sig("gamma alpha beta alpha")
+    assert signature([]) is None
+
+
+def test_similarity_estimates_jaccard():
+    base = " ".join(f"w{i}" for i in range(40))
+    reworded = " ".join(f"w{i}" for i in range(4, 44))  # Jaccard 36/44
+    assert similarity(_sig(base), _sig(base)) == 1.0
+    assert 0.6 <= similarity(_sig(base), _sig(reworded)) <= 1.0
+    assert similarity(_sig(base), _sig("completely unrelated words here")) < 0.2
+
+
+def test_rows_per_band_tracks_threshold():
+    assert _rows_per_band(0.5) < _rows_per_band(0.8) < _rows_per_band(0.95)
+
+
+class TestMinHashIndex:
+    def test_find_near_duplicate(self):
+        index = MinHashIndex(threshold=0.6)
+        index.add("a", _sig("the staging database runs postgres 15 on port 5432"))
+        index.add("b", _sig("deploy the frontend with pnpm build"))
+        assert index.find(_sig("staging database runs postgres 15 on port 5433")) == "a"
+        assert index.find(_sig("rotate the api keys every quarter")) is None
+
+    def test_remove(self):
+        index = MinHashIndex()
+        sig = _sig("one two three four")
+        index.add("a", sig)
+        index.remove("a")
+        index.remove("a")
+        assert len(index) == 0
+        assert index.find(sig) is None
+
+    def test_invalid_threshold(self):
+        with pytest.raises(ValueError):
+            MinHashIndex(threshold=0)
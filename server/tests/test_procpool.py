@@ -0,0 +1,131 @@
+"""Tests for process-pool handlers."""
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from denden.context import current_context
+from denden.gen import denden_pb2
+from denden.modules import loader
+from denden.modules.base import Module
+from denden.procpool import ProcessPool
+from denden.server import (
+    ERR_SUBAGENT_FAILURE,
+    ERR_SUBAGENT_TIMEOUT,
+    VERSION,
+    DenDenServer,
+    DendenServicer,
+    ok_response,
+)
+
+
+def _request(request_id: str = "req-1", question: str = "ok?") -> denden_pb2.DenDenRequest:
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        ask_user=denden_pb2.AskUserPayload(question=question),
+    )
+
+
+# Handlers run in the workers, so they live at module level.
+
+def pid(request):
+    return ok_response(request.request_id, ask_user_result=denden_pb2.AskUserResult(text=str(os.getpid())))
+
+
+def fail(request):
+    raise RuntimeError(f"cannot answer {request.ask_user.question}")
+
+
+def crash(request):
+    os._exit(3)
+
+
+def wait_for_deadline(request):
+    ctx = current_context()
+    ctx.wait(5)
+    return ok_response(request.request_id, ask_user_result=denden_pb2.AskUserResult(text=ctx.reason))
+
+
+class _PidModule(Module):
+    def name(self) -> str:
+        return "pids"
+
+    def methods(self):
+        return {"ask_user": pid}
+
+    def lanes(self):
+        return {"ask_user": "cpu"}
+
+
+module = _PidModule()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ProcessPool(workers=2, modules=[__name__])
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_handler_runs_in_another_process(pool):
+    servicer = DendenServicer()
+    servicer.set_handler("ask_user", pool.handler(pid))
+    responses = [servicer.Send(_request(f"r{i}"), None) for i in range(4)]
+    assert all(r.status == denden_pb2.OK for r in responses)
+    assert {r.request_id for r in responses} == {"r0", "r1", "r2", "r3"}
+    assert str(os.getpid()) not in {r.ask_user_result.text for r in responses}
+
+
+def test_module_is_loaded_in_the_workers(pool, caplog):
+    server = DenDenServer(addr="127.0.0.1:0")
+    loader.register(server, pool.module(__name__))
+    response = server._servicer.Send(_request(), None)
+    assert response.status == denden_pb2.OK
+    assert response.ask_user_result.text != str(os.getpid())
+    assert "no lane 'cpu' configured" in caplog.text
+
+
+def test_handler_error_becomes_failure(pool):
+    servicer = DendenServicer()
+    servicer.set_handler("ask_user", pool.handler(fail))
+    response = servicer.Send(_request(question="why"), None)
+    assert response.error.code == ERR_SUBAGENT_FAILURE
+    assert response.error.message == "cannot answer why"
+
+
+def test_deadline_reaches_the_worker(pool):
+    servicer = DendenServicer(timeouts={"ask_user": 0.2})
+    servicer.set_handler("ask_user", pool.handler(wait_for_deadline))
+    start = time.monotonic()
+    response = servicer.Send(_request(), None)
+    assert response.error.code == ERR_SUBAGENT_TIMEOUT
+    assert time.monotonic() - start < 2
+    # The worker saw the deadline too and gave its slot back.
+    servicer = DendenServicer()
+    servicer.set_handler("ask_user", pool.handler(pid))
+    assert servicer.Send(_request(), None).status == denden_pb2.OK
+
+
+def test_worker_crash_is_isolated():
+    pool = ProcessPool(workers=1)
+    try:
+        servicer = DendenServicer()
+        servicer.set_handler("ask_user", pool.handler(crash))
+        response = servicer.Send(_request(), None)
+        assert response.error.code == ERR_SUBAGENT_FAILURE
+        assert response.error.retryable
+        servicer.set_handler("ask_user", pool.handler(pid))
+        assert servicer.Send(_request(), None).status == denden_pb2.OK
+    finally:
+        pool.shutdown()
+
+
+def test_cannot_add_modules_once_started(pool):
+    with pytest.raises(ValueError):
+        pool.module("denden.modules.memory")
+    with pytest.raises(ValueError):
+        ProcessPool(workers=0)
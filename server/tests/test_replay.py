@@ -0,0 +1,140 @@
+"""Tests for traffic record and replay."""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import grpc
+import pytest
+
+from denden import replay
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.journal import Journal
+from denden.server import VERSION, DenDenServer, error_response, ok_response
+
+
+def _request(request_id: str, question: str = "ok?"):
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        trace=denden_pb2.Trace(run_id="run-1", agent_instance_id="agent-1"),
+        ask_user=denden_pb2.AskUserPayload(question=question),
+    )
+
+
+def _slow_ask(request):
+    time.sleep(0.05 if request.ask_user.question == "slow" else 0)
+    return ok_response(request.request_id, ask_user_result=denden_pb2.AskUserResult(text="yes"))
+
+
+@pytest.fixture
+def recording_dir(tmp_path):
+    server = DenDenServer(addr="127.0.0.1:0", journal=Journal(str(tmp_path)))
+    server.on_ask_user(_slow_ask)
+    server.start()
+    with grpc.insecure_channel(server.bound_addr) as channel:
+        stub = denden_pb2_grpc.DendenStub(channel)
+        stub.Send(_request("a"))
+        time.sleep(0.1)
+        stub.Send(_request("b", "slow"))
+        stub.Send(_request("c"))
+    server.stop(grace=1)
+    return str(tmp_path)
+
+
+def _serve(handler) -> DenDenServer:
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_ask_user(handler)
+    server.start()
+    return server
+
+
+def test_load_pairs_timing_and_latency(recording_dir):
+    recording = replay.load(recording_dir)
+    assert [item.request.request_id for item in recording] == ["a", "b", "c"]
+    assert recording[0].offset == 0
+    assert recording[1].offset >= 0.1
+    assert recording[1].latency >= 0.05 > recording[0].latency
+    assert all(item.response.status == denden_pb2.OK for item in recording)
+
+
+def test_stub_handlers_reproduce_latency(recording_dir):
+    recording = replay.load(recording_dir)
+    handlers = replay.stub_handlers(recording)
+    assert list(handlers) == ["ask_user"]
+    t0 = time.perf_counter()
+    assert handlers["ask_user"](_request("b")) == recording[1].response
+    assert time.perf_counter() - t0 >= 0.05
+    assert handlers["ask_user"](_request("zzz")).error.code == "INVALID_REQUEST"
+
+
+def test_replay_keeps_pace_and_scales(recording_dir):
+    recording = replay.load(recording_dir)
+    server = _serve(_slow_ask)
+    try:
+        t0 = time.perf_counter()
+        outcomes = replay.replay(recording, server.bound_addr, speed=1.0)
+        assert time.perf_counter() - t0 >= recording[-1].offset
+        fast = replay.replay(recording, server.bound_addr, speed=None)
+    finally:
+        server.stop(grace=0)
+    assert [o.recorded.request.request_id for o in outcomes] == ["a", "b", "c"]
+    assert outcomes[1].latency >= 0.05
+    report = replay.compare(fast)
+    assert report.requests == 3
+    assert not report.changes and not report.regressions
+    assert set(report.latency_ms) == {"all", "ask_user"}
+
+
+def test_compare_reports_outcome_changes(recording_dir):
+    recording = replay.load(recording_dir)
+
+    def failing(request):
+        if request.ask_user.question == "slow":
+            return error_response(request.request_id, "ERR_SUBAGENT_FAILURE", "boom")
+        return _slow_ask(request)
+
+    server = _serve(failing)
+    try:
+        report = replay.compare(replay.replay(recording, server.bound_addr, speed=None))
+    finally:
+        server.stop(grace=0)
+    assert report.changes == {"OK -> ERROR:ERR_SUBAGENT_FAILURE": 1}
+    assert report.regressions == ["b"]
+    assert "OK -> ERROR:ERR_SUBAGENT_FAILURE" in replay.format_report(report)
+
+
+def test_rpc_failure_is_an_outcome(recording_dir):
+    recording = replay.load(recording_dir)[:1]
+    (outcome,) = replay.replay(recording, "127.0.0.1:1", speed=None, timeout=0.5)
+    assert outcome.rpc_error == "UNAVAILABLE"
+    assert replay.compare([outcome]).regressions == ["a"]
+
+
+def test_cli_stub_replay(recording_dir, capsys):
+    assert replay.main([recording_dir, "--stub", "--speed", "max", "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["requests"] == 3
+    assert report["changes"] == {}
+    assert report["latency_ms"]["ask_user"]["replayed"]["max"] >= 50
+
+
+def test_cli_resolves_addr_list(recording_dir, tmp_path, monkeypatch, capsys):
+    sock = f"unix:{tmp_path}/denden.sock"
+    server = DenDenServer(addr=sock)
+    server.on_ask_user(_slow_ask)
+    server.start()
+    try:
+        monkeypatch.setenv("DENDEN_ADDR", f"127.0.0.1:1,{sock}")
+        assert replay.main([recording_dir, "--speed", "max", "--json"]) == 0
+    finally:
+        server.stop(grace=0)
+    assert json.loads(capsys.readouterr().out)["changes"] == {}
+
+
+def test_speed_argument():
+    assert replay._speed("max") is None
+    assert replay._speed("10x") == 10.0
+    with pytest.raises(argparse.ArgumentTypeError):
+        replay._speed("0")
@@ -1,6 +1,7 @@
 """Tests for the denden server: servicer, response helpers, module loading, and gRPC integration."""
 from __future__ import annotations
 
+import argparse
 import importlib
 import sys
 import threading
@@ -207,6 +208,17 @@ class TestDenDenServer:
         server.start()
         server.stop(grace=0)
 
+    def test_start_hooks_run_once_listening(self):
+        """on_start() hooks run after binding; a failing hook is logged."""
+        server = DenDenServer(addr="127.0.0.1:0")
+        seen = []
+        server.on_start(lambda: seen.append(server.bound_addr))
+        server.on_start(lambda: 1 / 0)
+        server.on_start(lambda: seen.append("after"))
+        server.start()
+        server.stop(grace=0)
+        assert seen[0].startswith("127.0.0.1:") and seen[1] == "after"
+
     def test_run_backward_compat(self):
         """run() in a thread still works and bound_addr is accessible."""
         server = DenDenServer(addr="127.0.0.1:0")
@@ -421,3 +433,106 @@ class TestModuleLoading:
                 with mock.patch.object(DenDenServer, "run"):
                     with pytest.raises(ValueError, match="must expose"):
                         main()
+
+    def test_startup_profile(self, capsys):
+        """--startup-profile prints each phase once the server is listening."""
+        from denden.__main__ import main
+
+        fake_mod = types.ModuleType("fake_profiled_mod")
+        fake_mod.module = _EchoModule()
+        argv = ["--addr", "127.0.0.1:0", "--load-module", "fake_profiled_mod", "--startup-profile"]
+
+        def run(server):
+            server.start()
+            server.stop(grace=0)
+
+        with mock.patch.dict(sys.modules, {"fake_profiled_mod": fake_mod}):
+            with mock.patch.object(DenDenServer, "run", run):
+                main(argv)
+        err = capsys.readouterr().err
+        for phase in ("import denden.server", "load fake_profiled_mod", "bind and start", "total"):
+            assert phase in err
+
+
+class TestLazyModule:
+    def _server(self, fake_mod, methods=("ask_user",)):
+        from denden.modules.loader import LazyModule, register
+
+        server = DenDenServer()
+        lazy = LazyModule("fake_lazy_mod", methods)
+        register(server, lazy)
+        return server, lazy
+
+    def test_imported_on_first_request(self):
+        """The module is imported by the first request for one of its methods."""
+        fake_mod = types.ModuleType("fake_lazy_mod")
+        created = []
+        fake_mod.create_module = lambda: created.append(1) or _EchoModule()
+
+        with mock.patch.dict(sys.modules, {"fake_lazy_mod": fake_mod}):
+            server, _ = self._server(fake_mod)
+            assert not created
+            resp = server._servicer.Send(_ask_request(), None)
+            assert resp.ask_user_result.text == "pick a color"
+            server._servicer.Send(_ask_request("req-2"), None)
+        assert created == [1]
+        # The real handler replaced the stand-in.
+        assert server._servicer._handlers["ask_user"] is _echo_handler
+
+    def test_on_load_receives_server(self):
+        """The loaded module's on_load() sees the server."""
+        loaded_into = []
+
+        class _Recording(_EchoModule):
+            def on_load(self, server):
+                loaded_into.append(server)
+
+        fake_mod = types.ModuleType("fake_lazy_mod")
+        fake_mod.module = _Recording()
+        with mock.patch.dict(sys.modules, {"fake_lazy_mod": fake_mod}):
+            server, _ = self._server(fake_mod)
+            server._servicer.Send(_ask_request(), None)
+        assert loaded_into == [server]
+
+    def test_failed_import_is_retried(self):
+        """A request that fails to load the module errors; the next one retries."""
+        fake_mod = types.ModuleType("fake_lazy_mod")
+        with mock.patch.dict(sys.modules, {"fake_lazy_mod": fake_mod}):
+            server, _ = self._server(fake_mod)
+            resp = server._servicer.Send(_ask_request(), None)
+            assert resp.error.code == ERR_SUBAGENT_FAILURE
+            assert "must expose" in resp.error.message
+            fake_mod.module = _EchoModule()
+            resp = server._servicer.Send(_ask_request(), None)
+        assert resp.status == denden_pb2.OK
+
+    def test_missing_method(self):
+        """Declaring a method the module does not have fails the request."""
+        fake_mod = types.ModuleType("fake_lazy_mod")
+        fake_mod.module = _EchoModule()
+        with mock.patch.dict(sys.modules, {"fake_lazy_mod": fake_mod}):
+            server, _ = self._server(fake_mod, methods=("ask_user", "recall"))
+            resp = server._servicer.Send(_ask_request(), None)
+        assert "no method(s) recall" in resp.error.message
+
+    def test_cli_flag(self):
+        """--lazy-module registers stand-ins without importing the module."""
+        from denden.__main__ import _lazy_module, main
+
+        assert _lazy_module("pkg.mod=remember, recall") == ("pkg.mod", ["remember", "recall"])
+        for bad in ("pkg.mod", "pkg.mod=", "=remember"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                _lazy_module(bad)
+        with mock.patch.object(DenDenServer, "run"):
+            main(["--lazy-module", "not_importable_yet=ask_user"])
+
+
+def test_package_exports_are_lazy():
+    """``import denden`` resolves its public names on first access."""
+    import denden
+
+    assert denden.DenDenServer is DenDenServer
+    assert "Journal" in dir(denden)
+    with pytest.raises(AttributeError):
+        denden.NotAThing
+
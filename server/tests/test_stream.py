@@ -0,0 +1,273 @@
+"""Tests for SendStream: stream helpers, sync/async generator handlers, gRPC."""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent import futures
+
+import grpc
+import pytest
+
+from denden.aio import AsyncDendenServicer
+from denden.cache import DelegateCache, ResponseCache
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import (
+    ERR_SUBAGENT_FAILURE,
+    VERSION,
+    DenDenServer,
+    DendenServicer,
+    ok_response,
+)
+from denden.stream import MissingResponseError, collect, events, partial, progress
+
+
+def _delegate_request(request_id: str = "req-1") -> denden_pb2.DenDenRequest:
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        delegate=denden_pb2.DelegatePayload(
+            delegate_to="implementer",
+            task=denden_pb2.Task(text="do the thing"),
+        ),
+    )
+
+
+def _result(request_id: str, summary: str = "done") -> denden_pb2.DenDenResponse:
+    return ok_response(
+        request_id, delegate_result=denden_pb2.DelegateResult(summary=summary),
+    )
+
+
+def streaming_delegate(request):
+    yield progress("starting", 0.1)
+    yield partial({"files": ["a.py"]})
+    yield {"files": ["b.py"]}
+    return _result(request.request_id)
+
+
+async def async_streaming_delegate(request):
+    yield progress("starting", 0.1)
+    await asyncio.sleep(0)
+    yield partial({"files": ["a.py"]})
+    yield _result(request.request_id)
+
+
+def _kinds(evts) -> list[str]:
+    return [e.WhichOneof("event") for e in evts]
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class TestStreamHelpers:
+    def test_plain_response_is_single_final_event(self):
+        evts = list(events(_result("req-1")))
+        assert _kinds(evts) == ["response"]
+
+    def test_generator_return_value_is_final(self):
+        evts = list(events(streaming_delegate(_delegate_request())))
+        assert _kinds(evts) == ["progress", "partial", "partial", "response"]
+        assert evts[1].partial["files"][0] == "a.py"
+
+    def test_stops_after_yielded_response(self):
+        closed = []
+
+        def gen():
+            try:
+                yield _result("req-1")
+                yield progress("never seen")
+            finally:
+                closed.append(True)
+
+        assert _kinds(events(gen())) == ["response"]
+        assert closed == [True]
+
+    def test_missing_response(self):
+        def gen():
+            yield progress("only progress")
+
+        with pytest.raises(MissingResponseError):
+            list(events(gen()))
+
+    def test_unsupported_item(self):
+        def gen():
+            yield 42
+
+        with pytest.raises(TypeError):
+            list(events(gen()))
+
+    def test_collect(self):
+        assert collect(streaming_delegate(_delegate_request())).delegate_result.summary == "done"
+
+
+# ---------------------------------------------------------------------------
+# Servicers
+# ---------------------------------------------------------------------------
+
+class TestServicerStream:
+    def test_sync_generator_handler(self):
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", streaming_delegate)
+        evts = list(servicer.SendStream(_delegate_request(), None))
+        assert _kinds(evts) == ["progress", "partial", "partial", "response"]
+        assert [e.seq for e in evts] == [1, 2, 3, 4]
+        assert all(e.request_id == "req-1" for e in evts)
+
+    def test_send_with_generator_handler_returns_final(self):
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", streaming_delegate)
+        resp = servicer.Send(_delegate_request(), None)
+        assert resp.delegate_result.summary == "done"
+
+    def test_plain_handler_streams_single_event(self):
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", lambda r: _result(r.request_id))
+        evts = list(servicer.SendStream(_delegate_request(), None))
+        assert _kinds(evts) == ["response"]
+
+    def test_invalid_request(self):
+        servicer = DendenServicer()
+        evts = list(servicer.SendStream(_delegate_request(), None))
+        assert _kinds(evts) == ["response"]
+        assert evts[0].response.error.code == "INVALID_REQUEST"
+
+    def test_handler_failure_mid_stream(self):
+        def failing(request):
+            yield progress("working")
+            raise RuntimeError("boom")
+
+        servicer = DendenServicer()
+        servicer.set_handler("delegate", failing)
+        evts = list(servicer.SendStream(_delegate_request(), None))
+        assert _kinds(evts) == ["progress", "response"]
+        assert evts[-1].response.error.code == ERR_SUBAGENT_FAILURE
+
+    def test_response_cache_replays_final(self):
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            yield progress("working")
+            return _result(request.request_id)
+
+        servicer = DendenServicer(response_cache=ResponseCache())
+        servicer.set_handler("delegate", handler)
+        list(servicer.SendStream(_delegate_request(), None))
+        replay = list(servicer.SendStream(_delegate_request(), None))
+        assert _kinds(replay) == ["response"]
+        assert len(calls) == 1
+
+    def test_abandoned_stream_releases_request_id(self):
+        servicer = DendenServicer(response_cache=ResponseCache())
+        servicer.set_handler("delegate", streaming_delegate)
+        it = servicer.SendStream(_delegate_request(), None)
+        next(it)
+        it.close()
+        evts = list(servicer.SendStream(_delegate_request(), None))
+        assert _kinds(evts)[-1] == "response"
+        assert len(evts) == 4
+
+    def test_aborted_stream_answers_waiting_duplicates(self):
+        servicer = DendenServicer(response_cache=ResponseCache())
+        servicer.set_handler("delegate", streaming_delegate)
+        it = servicer.SendStream(_delegate_request(), None)
+        next(it)
+        with futures.ThreadPoolExecutor(max_workers=1) as pool:
+            duplicate = pool.submit(servicer.Send, _delegate_request(), None)
+            time.sleep(0.05)  # let it start waiting on the running stream
+            it.close()
+            response = duplicate.result(timeout=5)
+        assert response.error.code == "CANCELLED"
+        assert response.error.retryable
+
+    def test_delegate_cache_hit(self):
+        servicer = DendenServicer(delegate_cache=DelegateCache())
+        servicer.set_handler("delegate", streaming_delegate)
+        list(servicer.SendStream(_delegate_request("req-1"), None))
+        evts = list(servicer.SendStream(_delegate_request("req-2"), None))
+        assert _kinds(evts) == ["response"]
+        assert evts[0].response.request_id == "req-2"
+
+
+class TestAsyncServicerStream:
+    def _drain(self, servicer, request):
+        async def scenario():
+            return [e async for e in servicer.SendStream(request, None)]
+
+        return asyncio.run(scenario())
+
+    def test_cancelled_owner_answers_waiting_duplicates(self):
+        async def blocked_delegate(request):
+            await asyncio.Event().wait()
+
+        servicer = AsyncDendenServicer(response_cache=ResponseCache())
+        servicer.set_handler("delegate", blocked_delegate)
+
+        async def scenario():
+            owner = asyncio.create_task(servicer.Send(_delegate_request(), None))
+            await asyncio.sleep(0.01)
+            duplicate = asyncio.create_task(
+                self._collect(servicer.SendStream(_delegate_request(), None)),
+            )
+            await asyncio.sleep(0.01)
+            owner.cancel()
+            return await duplicate
+
+        evts = asyncio.run(scenario())
+        assert _kinds(evts) == ["response"]
+        assert evts[0].response.error.code == "CANCELLED"
+        assert evts[0].response.error.retryable
+
+    @staticmethod
+    async def _collect(events):
+        return [e async for e in events]
+
+    def test_async_generator_handler(self):
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("delegate", async_streaming_delegate)
+        assert "delegate" in servicer._async_handlers
+        evts = self._drain(servicer, _delegate_request())
+        assert _kinds(evts) == ["progress", "partial", "response"]
+        assert [e.seq for e in evts] == [1, 2, 3]
+
+    def test_sync_generator_handler(self):
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("delegate", streaming_delegate)
+        evts = self._drain(servicer, _delegate_request())
+        assert _kinds(evts) == ["progress", "partial", "partial", "response"]
+
+    def test_send_with_async_generator_handler(self):
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("delegate", async_streaming_delegate)
+        resp = asyncio.run(servicer.Send(_delegate_request(), None))
+        assert resp.delegate_result.summary == "done"
+
+    def test_async_generator_without_response(self):
+        async def incomplete(request):
+            yield progress("working")
+
+        servicer = AsyncDendenServicer()
+        servicer.set_handler("delegate", incomplete)
+        evts = self._drain(servicer, _delegate_request())
+        assert _kinds(evts) == ["progress", "response"]
+        assert evts[-1].response.error.code == ERR_SUBAGENT_FAILURE
+
+
+# ---------------------------------------------------------------------------
+# gRPC integration
+# ---------------------------------------------------------------------------
+
+def test_send_stream_over_grpc():
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_delegate(streaming_delegate)
+    server.start()
+    try:
+        with grpc.insecure_channel(server.bound_addr) as channel:
+            stub = denden_pb2_grpc.DendenStub(channel)
+            evts = list(stub.SendStream(_delegate_request(), timeout=5))
+    finally:
+        server.stop(grace=0)
+    assert _kinds(evts) == ["progress", "partial", "partial", "response"]
+    assert evts[0].progress.message == "starting"
+    assert evts[-1].response.delegate_result.summary == "done"
@@ -0,0 +1,211 @@
+"""Tests for the trace index and the QueryTrace RPC."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import grpc
+
+from denden.aio import AsyncDendenServicer
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.server import (
+    DENY_ROLE_NOT_ALLOWED,
+    VERSION,
+    DenDenServer,
+    DendenServicer,
+    denied_response,
+    ok_response,
+)
+from denden.traces import TraceIndex
+
+
+def _request(agent: str, parent: str = "", run: str = "run-1"):
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=f"{run}-{agent}",
+        trace=denden_pb2.Trace(
+            run_id=run, agent_instance_id=agent, parent_agent_instance_id=parent,
+        ),
+        delegate=denden_pb2.DelegatePayload(delegate_to="implementer"),
+    )
+
+
+def _call(index: TraceIndex, agent: str, parent: str = "", run: str = "run-1", response=None):
+    index.finish(index.begin(_request(agent, parent, run)), response or ok_response("r"))
+
+
+def _ids(nodes):
+    return [(n.agent_instance_id, n.depth) for n in nodes]
+
+
+class TestTree:
+    def test_subtree_pre_order(self):
+        index = TraceIndex()
+        _call(index, "root")
+        _call(index, "a", "root")
+        _call(index, "b", "root")
+        _call(index, "a1", "a")
+        assert _ids(index.subtree("run-1")) == [("root", 0), ("a", 1), ("a1", 2), ("b", 1)]
+        assert _ids(index.subtree("run-1", "a")) == [("a", 0), ("a1", 1)]
+        assert index.subtree("run-1", "missing") == []
+        assert index.subtree("other") == []
+
+    def test_child_before_parent(self):
+        index = TraceIndex()
+        _call(index, "child", "parent")
+        nodes = index.subtree("run-1")
+        assert _ids(nodes) == [("parent", 0), ("child", 1)]
+        placeholder = nodes[0]
+        assert placeholder.calls == 0
+        assert placeholder.started_at == nodes[1].started_at
+
+        _call(index, "parent", "root")
+        assert _ids(index.subtree("run-1")) == [("root", 0), ("parent", 1), ("child", 2)]
+        assert index.subtree("run-1", "parent")[0].calls == 1
+
+    def test_cycle_ignored(self):
+        index = TraceIndex()
+        _call(index, "a", "b")
+        _call(index, "b", "a")
+        assert _ids(index.subtree("run-1")) == [("b", 0), ("a", 1)]
+
+    def test_outcomes(self):
+        index = TraceIndex()
+        _call(index, "a")
+        _call(index, "a", response=denied_response("r", DENY_ROLE_NOT_ALLOWED, "no"))
+        index.finish(index.begin(_request("a")), None)
+        node = index.subtree("run-1")[0]
+        assert (node.calls, node.ok, node.denied, node.error) == (3, 1, 1, 1)
+        assert node.last_error_code == "CANCELLED"
+
+    def test_in_flight_has_no_end(self):
+        index = TraceIndex()
+        token = index.begin(_request("a"))
+        node = index.subtree("run-1")[0]
+        assert node.in_flight == 1
+        assert not node.HasField("ended_at")
+        index.finish(token, ok_response("r"))
+        assert index.subtree("run-1")[0].HasField("ended_at")
+
+    def test_requests_without_trace_ignored(self):
+        index = TraceIndex()
+        assert index.begin(denden_pb2.DenDenRequest(request_id="r")) is None
+        index.finish(None, ok_response("r"))
+        assert len(index) == 0
+
+
+class TestQueries:
+    def _tree(self):
+        # root -> fast, slow -> slow1, slow2 (slow2 finishes last)
+        index = TraceIndex()
+        root = index.begin(_request("root"))
+        _call(index, "fast", "root")
+        slow = index.begin(_request("slow", "root"))
+        _call(index, "slow1", "slow")
+        time.sleep(0.02)
+        _call(index, "slow2", "slow")
+        index.finish(slow, ok_response("r"))
+        index.finish(root, ok_response("r"))
+        return index
+
+    def test_critical_path(self):
+        index = self._tree()
+        path = index.critical_path("run-1")
+        assert [n.agent_instance_id for n in path] == ["root", "slow", "slow2"]
+        assert [n.depth for n in path] == [0, 1, 2]
+        assert [n.agent_instance_id for n in index.critical_path("run-1", "slow")] == [
+            "slow", "slow2",
+        ]
+
+    def test_slowest_branches(self):
+        index = self._tree()
+        branches = index.slowest_branches("run-1", "root")
+        assert [n.agent_instance_id for n in branches] == ["slow", "fast"]
+        assert branches[0].subtree_duration_ms >= 20
+        assert [n.agent_instance_id for n in index.slowest_branches("run-1", "root", 1)] == [
+            "slow",
+        ]
+        assert [n.agent_instance_id for n in index.slowest_branches("run-1")] == ["root"]
+
+    def test_query(self):
+        index = self._tree()
+        result = index.query(denden_pb2.TraceQuery(
+            run_id="run-1", agent_instance_id="root", kind=denden_pb2.SLOWEST_BRANCHES, limit=1,
+        ))
+        assert result.found
+        assert [n.agent_instance_id for n in result.nodes] == ["slow"]
+        leaf = index.query(denden_pb2.TraceQuery(
+            run_id="run-1", agent_instance_id="fast", kind=denden_pb2.SLOWEST_BRANCHES,
+        ))
+        assert leaf.found and not leaf.nodes
+        assert not index.query(denden_pb2.TraceQuery(run_id="nope")).found
+
+
+class TestEviction:
+    def test_max_runs_prefers_finished(self):
+        index = TraceIndex(max_runs=2)
+        busy = index.begin(_request("a", run="busy"))
+        _call(index, "a", run="done")
+        _call(index, "a", run="new")
+        assert index.subtree("busy")
+        assert not index.subtree("done")
+        assert index.subtree("new")
+        index.finish(busy, ok_response("r"))
+
+    def test_finished_ttl(self):
+        index = TraceIndex(finished_ttl=0)
+        busy = index.begin(_request("a", run="busy"))
+        _call(index, "a", run="done")
+        time.sleep(0.01)
+        _call(index, "a", run="new")
+        assert index.subtree("busy")
+        assert not index.subtree("done")
+        index.finish(busy, ok_response("r"))
+
+    def test_max_agents_per_run(self):
+        index = TraceIndex(max_agents_per_run=2)
+        _call(index, "a")
+        _call(index, "b", "a")
+        assert index.begin(_request("c", "a")) is None
+        assert len(index.subtree("run-1")) == 2
+
+
+def test_servicers_index_requests():
+    servicer = DendenServicer()
+    servicer.set_handler("delegate", lambda r: ok_response(r.request_id))
+    servicer.Send(_request("root"), None)
+    list(servicer.SendStream(_request("child", "root"), None))
+    assert _ids(servicer.traces.subtree("run-1")) == [("root", 0), ("child", 1)]
+    servicer.close()
+
+    async def send():
+        async def handler(request):
+            return ok_response(request.request_id)
+
+        aservicer = AsyncDendenServicer()
+        aservicer.set_handler("delegate", handler)
+        await aservicer.Send(_request("root"), None)
+        return await aservicer.QueryTrace(denden_pb2.TraceQuery(run_id="run-1"), None)
+
+    assert [n.agent_instance_id for n in asyncio.run(send()).nodes] == ["root"]
+
+
+def test_query_trace_rpc():
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_delegate(lambda r: ok_response(r.request_id))
+    server.start()
+    try:
+        with grpc.insecure_channel(server.bound_addr) as channel:
+            stub = denden_pb2_grpc.DendenStub(channel)
+            stub.Send(_request("root"), timeout=5)
+            stub.Send(_request("child", "root"), timeout=5)
+            result = stub.QueryTrace(
+                denden_pb2.TraceQuery(run_id="run-1", kind=denden_pb2.CRITICAL_PATH),
+                timeout=5,
+            )
+    finally:
+        server.stop(grace=0)
+    assert result.found
+    assert [n.agent_instance_id for n in result.nodes] == ["root", "child"]
+    assert result.nodes[1].parent_agent_instance_id == "root"
+    assert server.traces is server._servicer.traces
@@ -0,0 +1,123 @@
+"""Tests for multi-process serving (--workers)."""
+from __future__ import annotations
+
+import os
+import queue
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import grpc
+import pytest
+
+from denden import workers
+from denden.gen import denden_pb2, denden_pb2_grpc
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def _payload(name: str, ok: int, p99: float, errors: dict[str, int]) -> denden_pb2.PayloadStats:
+    return denden_pb2.PayloadStats(
+        payload_type=name, ok=ok, error=sum(errors.values()), p50_ms=p99 / 2, p99_ms=p99, max_ms=p99,
+        errors=[denden_pb2.ErrorCount(code=c, count=n) for c, n in errors.items()],
+    )
+
+
+def test_merge_status():
+    a = denden_pb2.StatusResponse(
+        uptime_seconds=10, active_agents=2, in_flight=1, queue_depth=0, workers=1,
+        payloads=[_payload("ask_user", 5, 4.0, {"X": 1})],
+        lanes=[denden_pb2.LaneStats(name="delegate", concurrency=4, running=1, rejected=2)],
+    )
+    b = denden_pb2.StatusResponse(
+        uptime_seconds=12, active_agents=1, in_flight=2, queue_depth=3, workers=1,
+        payloads=[_payload("ask_user", 3, 9.0, {"X": 2, "Y": 1}), _payload("delegate", 1, 1.0, {})],
+        lanes=[denden_pb2.LaneStats(name="delegate", concurrency=4, queued=5)],
+    )
+    merged = workers.merge_status([a, b])
+    assert (merged.uptime_seconds, merged.active_agents, merged.in_flight, merged.queue_depth) == (12, 3, 3, 3)
+    assert merged.workers == 2
+    ask, delegate = merged.payloads
+    assert (ask.payload_type, ask.ok, ask.error, ask.p99_ms) == ("ask_user", 8, 4, 9.0)
+    assert {e.code: e.count for e in ask.errors} == {"X": 3, "Y": 1}
+    assert delegate.ok == 1
+    (lane,) = merged.lanes
+    assert (lane.concurrency, lane.running, lane.queued, lane.rejected) == (8, 1, 5, 2)
+
+
+def test_reserve_ports():
+    addrs, held = workers.reserve_ports(["127.0.0.1:0", "127.0.0.1:9700"])
+    try:
+        assert re.fullmatch(r"127\.0\.0\.1:\d+", addrs[0]) and not addrs[0].endswith(":0")
+        assert addrs[1] == "127.0.0.1:9700"
+    finally:
+        for sock in held:
+            sock.close()
+    with pytest.raises(ValueError, match="only share TCP"):
+        workers.reserve_ports(["unix:/tmp/x.sock"])
+
+
+def test_status_aggregates_peers():
+    from denden.server import DenDenServer
+
+    sibling = DenDenServer(addr="127.0.0.1:0")
+    sibling.start()
+    server = DenDenServer(addr="127.0.0.1:0", peers=[sibling.bound_addr, "127.0.0.1:1"])
+    server.start()
+    try:
+        with grpc.insecure_channel(server.bound_addr) as channel:
+            stub = denden_pb2_grpc.DendenStub(channel)
+            assert stub.Status(denden_pb2.StatusRequest()).workers == 2  # the dead peer is skipped
+            assert stub.Status(denden_pb2.StatusRequest(local=True)).workers == 1
+    finally:
+        server.stop(grace=0)
+        sibling.stop(grace=0)
+
+
+def _status(addr: str) -> denden_pb2.StatusResponse:
+    with grpc.insecure_channel(addr) as channel:
+        return denden_pb2_grpc.DendenStub(channel).Status(denden_pb2.StatusRequest(), timeout=5)
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="SO_REUSEPORT load balancing is Linux-only")
+def test_supervisor_serves_restarts_and_stops():
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "denden", "--workers", "2", "--addr", "127.0.0.1:0"],
+        env=env, stderr=subprocess.PIPE, text=True,
+    )
+    lines: queue.Queue[str] = queue.Queue()
+    threading.Thread(target=lambda: [lines.put(line) for line in proc.stderr], daemon=True).start()
+
+    def wait_for(pattern: str, timeout: float = 15) -> re.Match:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                match = re.search(pattern, lines.get(timeout=0.1))
+            except queue.Empty:
+                continue
+            if match:
+                return match
+        raise AssertionError(f"no log line matching {pattern!r}")
+
+    try:
+        addr = wait_for(r"supervising 2 workers on (\S+)").group(1)
+        pid = int(wait_for(r"worker 0 started \(pid (\d+)\)").group(1))
+        wait_for(r"worker \d denden.server: denden server listening")
+        wait_for(r"worker \d denden.server: denden server listening")
+        assert _status(addr).workers == 2
+
+        os.kill(pid, signal.SIGKILL)
+        wait_for(r"worker 0 \(pid \d+\) exited with status -9; restarting")
+        wait_for(r"worker 0 started \(pid \d+\)")
+        wait_for(r"worker 0 denden.server: denden server listening")
+        assert _status(addr).workers == 2
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(15) == 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
@@ -0,0 +1,155 @@
+"""Tests for write-behind batching of remember requests."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import grpc
+import pytest
+
+from denden.aio import AsyncDenDenServer
+from denden.gen import denden_pb2, denden_pb2_grpc
+from denden.modules.memory import entry_id
+from denden.server import ERR_RESOURCE_EXHAUSTED, VERSION, DenDenServer
+from denden.writebehind import ERR_SHUTTING_DOWN, WriteBehind, WriteBehindClosed
+
+
+def _remember(content: str, request_id: str = "req-1", scope: str = ""):
+    return denden_pb2.DenDenRequest(
+        denden_version=VERSION,
+        request_id=request_id,
+        remember=denden_pb2.RememberPayload(content=content, scope=scope),
+    )
+
+
+class _Sink:
+    def __init__(self, fail: int = 0, gate: threading.Event | None = None):
+        self.batches: list[list[str]] = []
+        self.fail = fail
+        self.gate = gate
+        self.flushed = threading.Event()
+
+    def __call__(self, batch):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("provider down")
+        self.batches.append([req.remember.content for _, req in batch])
+        self.flushed.set()
+
+
+def test_queued_response_and_size_flush():
+    sink = _Sink()
+    queue = WriteBehind(sink, max_batch=3, max_delay=60)
+    responses = [queue.remember(_remember(f"fact {i}", f"req-{i}")) for i in range(3)]
+    assert sink.flushed.wait(5)
+    queue.close()
+    assert [r.remember_result.status for r in responses] == ["queued"] * 3
+    assert responses[0].remember_result.entry_id == entry_id("global", "fact 0")
+    assert sink.batches == [["fact 0", "fact 1", "fact 2"]]
+
+
+def test_time_flush():
+    sink = _Sink()
+    queue = WriteBehind(sink, max_batch=100, max_delay=0.05)
+    queue.remember(_remember("fact"))
+    assert sink.flushed.wait(5)
+    queue.close()
+    assert sink.batches == [["fact"]]
+
+
+def test_close_drains_in_batches():
+    sink = _Sink()
+    queue = WriteBehind(sink, max_batch=2, max_delay=60)
+    queue.put("a", _remember("a"))  # below max_batch: waits for max_delay
+    queue.close()
+    assert sink.batches == [["a"]]
+    late = queue.remember(_remember("late"))
+    assert late.error.code == ERR_SHUTTING_DOWN
+    assert not late.error.retryable
+    with pytest.raises(WriteBehindClosed):
+        queue.put("b", _remember("b"))
+
+
+def test_backpressure_when_full():
+    gate = threading.Event()
+    sink = _Sink(gate=gate)
+    queue = WriteBehind(sink, max_batch=1, max_delay=0, max_pending=2, put_timeout=0.05)
+    queue.remember(_remember("first"))  # taken by the flusher, which blocks on gate
+    deadline = time.monotonic() + 5
+    while len(queue) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    queue.remember(_remember("second"))  # with "first", still unwritten, fills the queue
+    rejected = queue.remember(_remember("third"))
+    assert rejected.status == denden_pb2.ERROR
+    assert rejected.error.code == ERR_RESOURCE_EXHAUSTED
+    assert rejected.error.retryable
+    gate.set()
+    queue.close()
+    assert sink.batches == [["first"], ["second"]]
+
+
+def test_failed_flush_is_retried_in_order():
+    sink = _Sink(fail=1)
+    queue = WriteBehind(sink, max_batch=2, max_delay=0.01)
+    queue.remember(_remember("a"))
+    queue.remember(_remember("b"))
+    assert sink.flushed.wait(5)
+    queue.close()
+    assert sink.batches == [["a", "b"]]
+
+
+def test_failed_flush_keeps_the_bound():
+    gate = threading.Event()
+    sink = _Sink(fail=1, gate=gate)
+    queue = WriteBehind(sink, max_batch=2, max_delay=0.2, max_pending=2, put_timeout=0.05)
+    queue.remember(_remember("a"))
+    queue.remember(_remember("b"))
+    deadline = time.monotonic() + 5
+    while len(queue) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The failing batch still counts, so nothing else fits while it is out.
+    assert queue.remember(_remember("c")).error.code == ERR_RESOURCE_EXHAUSTED
+    gate.set()
+    assert sink.flushed.wait(5)
+    queue.close()
+    assert sink.batches == [["a", "b"]]
+
+
+def test_invalid_request():
+    queue = WriteBehind(_Sink())
+    assert queue.remember(_remember("")).error.code == "INVALID_REQUEST"
+    queue.close()
+
+
+def test_server_stop_flushes():
+    sink = _Sink()
+    queue = WriteBehind(sink, max_batch=100, max_delay=60)
+    server = DenDenServer(addr="127.0.0.1:0")
+    server.on_remember(queue.remember)
+    server.on_stop(queue.close)
+    server.start()
+    with grpc.insecure_channel(server.bound_addr) as channel:
+        stub = denden_pb2_grpc.DendenStub(channel)
+        response = stub.Send(_remember("fact"), timeout=5)
+    server.stop(grace=1)
+    assert response.remember_result.status == "queued"
+    assert sink.batches == [["fact"]]
+
+
+def test_async_server_stop_hooks():
+    calls = []
+
+    async def main():
+        server = AsyncDenDenServer(addr="127.0.0.1:0")
+        server.on_stop(lambda: calls.append("flushed"))
+        server.on_stop(lambda: 1 / 0)  # logged, does not stop later hooks
+        server.on_stop(lambda: calls.append("after"))
+        await server.start()
+        await server.stop(grace=0)
+        await server.stop(grace=0)  # hooks run once
+
+    asyncio.run(main())
+    assert calls == ["flushed", "after"]